@@ -0,0 +1,170 @@
+"""Background writer of download request analytics.
+
+Download endpoints record who downloaded what, but this is not something their
+clients should wait for. Instead, records are put in a bounded in-memory queue,
+which is drained by a background thread that saves them in batches, each with
+a single transaction.
+
+A batch is saved as soon as it is full or when its oldest record has waited for
+the flush interval, whichever comes first. Records still in the queue are saved
+when the writer is stopped. If the queue is full, because the DB cannot keep up
+or is unavailable, new records are dropped rather than slowing down downloads.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import (
+    Optional,
+    Union,
+)
+
+import sqlalchemy
+import sqlmodel
+
+from . import db
+from .schemas.analytics import (
+    ForecastCoverageDownloadRequestCreate,
+    HistoricalCoverageDownloadRequestCreate,
+    TimeSeriesDownloadRequestCreate,
+)
+
+logger = logging.getLogger(__name__)
+
+# this is a module global, which is managed by the web application's lifespan
+_ANALYTICS_WRITER: Optional["AnalyticsWriter"] = None
+
+DownloadRequestCreate = Union[
+    ForecastCoverageDownloadRequestCreate,
+    HistoricalCoverageDownloadRequestCreate,
+    TimeSeriesDownloadRequestCreate,
+]
+
+_STOP = object()
+
+
+class AnalyticsWriter:
+    def __init__(
+        self,
+        engine: sqlalchemy.Engine,
+        *,
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval_seconds: float,
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.num_written = 0
+        self.num_dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, download_request: DownloadRequestCreate) -> bool:
+        """Enqueue a download request to be saved, without blocking.
+
+        Returns whether the download request has been accepted.
+        """
+        try:
+            self._queue.put_nowait(download_request)
+        except queue.Full:
+            self.num_dropped += 1
+            logger.warning("Analytics queue is full, dropping download request record")
+            return False
+        return True
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="analytics-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout_seconds: Optional[float] = None) -> None:
+        """Save pending download requests and stop the background thread."""
+        if self._thread is not None:
+            # the sentinel must not be dropped, so this may block while the
+            # queue is full
+            self._queue.put(_STOP)
+            self._thread.join(timeout_seconds)
+            self._thread = None
+
+    def _run(self) -> None:
+        batch = []
+        deadline = None
+        while True:
+            timeout = (
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._write(batch)
+                return
+            if item is not None:
+                if len(batch) == 0:
+                    deadline = time.monotonic() + self.flush_interval_seconds
+                batch.append(item)
+            if len(batch) >= self.batch_size or (
+                deadline is not None and time.monotonic() >= deadline
+            ):
+                self._write(batch)
+                batch = []
+                deadline = None
+
+    def _write(self, batch: list[DownloadRequestCreate]) -> None:
+        if len(batch) == 0:
+            return
+        try:
+            with sqlmodel.Session(self.engine) as session:
+                db.create_many_download_requests(session, batch)
+        except sqlalchemy.exc.SQLAlchemyError:
+            self.num_dropped += len(batch)
+            logger.exception(f"Could not save {len(batch)} download request records")
+        else:
+            self.num_written += len(batch)
+
+
+def get_analytics_writer() -> Optional[AnalyticsWriter]:
+    return _ANALYTICS_WRITER
+
+
+def start_analytics_writer(
+    engine: sqlalchemy.Engine,
+    *,
+    max_queue_size: int,
+    batch_size: int,
+    flush_interval_seconds: float,
+) -> AnalyticsWriter:
+    global _ANALYTICS_WRITER
+    _ANALYTICS_WRITER = AnalyticsWriter(
+        engine,
+        max_queue_size=max_queue_size,
+        batch_size=batch_size,
+        flush_interval_seconds=flush_interval_seconds,
+    )
+    _ANALYTICS_WRITER.start()
+    return _ANALYTICS_WRITER
+
+
+def stop_analytics_writer() -> None:
+    global _ANALYTICS_WRITER
+    if _ANALYTICS_WRITER is not None:
+        _ANALYTICS_WRITER.stop()
+        _ANALYTICS_WRITER = None
+
+
+def record_download_request(
+    session: sqlmodel.Session, download_request: DownloadRequestCreate
+) -> None:
+    """Record a download request.
+
+    The download request is handed to the analytics writer, if it is running.
+    Otherwise, it is saved right away, using the input session.
+    """
+    if (writer := get_analytics_writer()) is not None:
+        writer.submit(download_request)
+    else:
+        db.create_many_download_requests(session, [download_request])
@@ -1,4 +1,5 @@
 import decimal
+import ipaddress
 import logging
 from decimal import Decimal
 from pathlib import Path
@@ -35,11 +36,21 @@ class PrefectSettings(pydantic.BaseModel):
     station_variables_refresher_flow_cron_schedule: str = (
         "0 5 * * 1"  # run once every week, at 05:00 on monday
     )
+    download_request_rollups_refresher_flow_cron_schedule: str = (
+        "15 * * * *"  # run once every hour, at minute 15
+    )
     arpav_rest_api_task_concurrency_limit: int = 20
     arpafvg_rest_api_task_concurrency_limit: int = 20
     use_db_task_concurrency_limit: int = 5
 
 
+class ObservationsHarvesterSettings(pydantic.BaseModel):
+    http_timeout_seconds: float = 30
+    max_request_attempts: int = 5
+    retry_base_delay_seconds: float = 1
+    retry_max_delay_seconds: float = 30
+
+
 class ThreddsServerSettings(pydantic.BaseModel):
     base_url: str = "http://localhost:8080/thredds"
     wms_service_url_fragment: str = "wms"
@@ -60,6 +71,13 @@ class ThreddsServerSettings(pydantic.BaseModel):
         return self
 
 
+class DatasetMirrorSettings(pydantic.BaseModel):
+    max_concurrent_downloads: int = 8
+    download_chunk_size_bytes: int = 1024 * 1024
+    manifest_file_name: str = "mirror-manifest.json"
+    change_list_file_name: str = "mirror-changes.json"
+
+
 class AdminUserSettings(pydantic.BaseModel):
     username: str = "arpavadmin"
     password: str = "arpavpassword"
@@ -120,9 +138,28 @@ class ArpavPpcvSettings(BaseSettings):  # noqa
     palette_num_stops: int = 5
     transparent_images_dir: Path = Path(__file__).parents[1] / "data/transparents"
     prefect: PrefectSettings = PrefectSettings()
+    observations_harvester: ObservationsHarvesterSettings = (
+        ObservationsHarvesterSettings()
+    )
     vector_tile_server_base_url: str = "http://localhost:5001/vector-tiles"
     nearest_station_radius_meters_forecasts: int = 1000
     nearest_station_radius_meters_historical: int = 2500
+    station_index_check_interval_seconds: int = 60
+    municipality_index_check_interval_seconds: int = 60
+    unfiltered_totals_cache_ttl_seconds: int = 300
+    vector_tile_cache_max_entries: int = 1024
+    vector_tile_cache_check_interval_seconds: int = 60
+    analytics_writer_max_queue_size: int = 10_000
+    analytics_writer_batch_size: int = 100
+    analytics_writer_flush_interval_seconds: float = 5
+    server_timing_sample_rate: float = 0.1
+    metrics_multiprocess_dir: Optional[Path] = None
+    metrics_allowed_networks: list[pydantic.IPvAnyNetwork] = [
+        ipaddress.ip_network("127.0.0.0/8"),
+        ipaddress.ip_network("::1/128"),
+    ]
+    query_profiling_max_statements: int = 50
+    query_profiling_max_repeated_statements: int = 5
     v2_api_mount_prefix: str = "/api/v2"
     v3_api_mount_prefix: str = "/api/v3"
     log_config_file: Path | None = None
@@ -135,6 +172,7 @@ class ArpavPpcvSettings(BaseSettings):  # noqa
     variable_stations_db_schema: str = "stations"
     num_uvicorn_worker_processes: int = 1
     http_client_timeout_seconds: float = 30.0
+    dataset_mirror: DatasetMirrorSettings = DatasetMirrorSettings()
     arpav_observations_base_url: str = "https://api.arpa.veneto.it/REST/v1"
     arpafvg_observations_base_url: str = "https://api.meteo.fvg.it"
     arpafvg_auth_token: str = "changeme"
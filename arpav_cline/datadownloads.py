@@ -13,6 +13,7 @@ import shapely
 from . import (
     config,
     exceptions,
+    metrics,
 )
 from .schemas.coverages import (
     ForecastCoverageInternal,
@@ -31,9 +32,10 @@ async def retrieve_coverage_data(
     bbox: shapely.Polygon | None,
     temporal_range: tuple[Optional[dt.datetime], Optional[dt.datetime]],
 ):
-    if (
-        cache_path := settings.coverage_download_settings.cache_dir / cache_key
-    ).is_file():
+    cache_path = settings.coverage_download_settings.cache_dir / cache_key
+    is_cached = cache_path.is_file()
+    metrics.count_cache_request("coverage_downloads", hit=is_cached)
+    if is_cached:
         logger.debug(f"Found cached data at {cache_path!r}...")
     else:
         logger.debug("Retrieving data from THREDDS server...")
@@ -4,6 +4,7 @@ from .analytics import (
     collect_all_time_series_download_requests,  # noqa
     create_forecast_coverage_download_request,  # noqa
     create_historical_coverage_download_request,  # noqa
+    create_many_download_requests,  # noqa
     create_time_series_download_request,  # noqa
     delete_forecast_coverage_download_request,  # noqa
     delete_historical_coverage_download_request,  # noqa
@@ -11,9 +12,21 @@ from .analytics import (
     get_forecast_coverage_download_request,  # noqa
     get_historical_coverage_download_request,  # noqa
     get_time_series_download_request,  # noqa
+    list_download_request_aggregates,  # noqa
     list_forecast_coverage_download_requests,  # noqa
     list_historical_coverage_download_requests,  # noqa
     list_time_series_download_requests,  # noqa
+    refresh_download_request_rollups,  # noqa
+    stream_all_download_request_aggregates,  # noqa
+    stream_all_forecast_coverage_download_requests,  # noqa
+    stream_all_historical_coverage_download_requests,  # noqa
+    stream_all_time_series_download_requests,  # noqa
+)
+
+from .base import (
+    get_total_num_records,  # noqa
+    get_unfiltered_total_num_records,  # noqa
+    invalidate_unfiltered_totals,  # noqa
 )
 
 from .climaticindicators import (
@@ -49,6 +62,7 @@ from .forecastcoverages import (
     get_forecast_coverage,  # noqa
     get_forecast_coverage_configuration,  # noqa
     get_forecast_coverage_configuration_by_identifier,  # noqa
+    get_forecast_coverage_configuration_identifier_expression,  # noqa
     # get_forecast_coverage_data_series,  # noqa
     get_forecast_model,  # noqa
     get_forecast_model_by_name,  # noqa
@@ -87,6 +101,7 @@ from .historicalcoverages import (
     get_historical_coverage,  # noqa
     get_historical_coverage_configuration,  # noqa
     get_historical_coverage_configuration_by_identifier,  # noqa
+    get_historical_coverage_configuration_identifier_expression,  # noqa
     get_historical_year_period_group,  # noqa
     get_historical_year_period_group_by_name,  # noqa
     legacy_collect_all_historical_coverage_configurations,  # noqa
@@ -105,11 +120,15 @@ from .municipalities import (
     collect_all_municipalities,  # noqa
     create_many_municipalities,  # noqa
     delete_all_municipalities,  # noqa
+    get_municipalities_vector_tile,  # noqa
     list_municipalities,  # noqa
     list_municipality_centroids,  # noqa
+    list_municipality_geojson_features,  # noqa
+    update_municipality_simplified_geometries,  # noqa
 )
 
 from .observationseries import (
+    bulk_load_observation_measurements,  # noqa
     collect_all_observation_measurements,  # noqa
     collect_all_observation_series_configurations,  # noqa
     create_many_observation_measurements,  # noqa
@@ -117,12 +136,14 @@ from .observationseries import (
     create_observation_series_configuration,  # noqa
     delete_observation_measurement,  # noqa
     delete_observation_series_configuration,  # noqa
-    find_new_station_measurements,  # noqa
+    get_latest_observation_measurement_dates,  # noqa
     get_observation_measurement,  # noqa
+    get_observation_measurement_series,  # noqa
     get_observation_series_configuration,  # noqa
     get_observation_series_configuration_by_identifier,  # noqa
     list_observation_measurements,  # noqa
     list_observation_series_configurations,  # noqa
+    stream_all_observation_measurements,  # noqa
     update_observation_series_configuration,  # noqa
 )
 
@@ -131,11 +152,15 @@ from .observationstations import (
     create_many_observation_stations,  # noqa
     create_observation_station,  # noqa
     delete_observation_station,  # noqa
+    find_nearest_observation_station,  # noqa
+    get_climatic_indicator_stations_view_name,  # noqa
     get_observation_station,  # noqa
     get_observation_station_by_code,  # noqa
     get_observation_station_by_name,  # noqa
+    get_observation_stations_vector_tile,  # noqa
     list_observation_stations,  # noqa
     update_observation_station,  # noqa
+    upsert_observation_stations,  # noqa
 )
 
 from .overviews import (
@@ -143,6 +168,7 @@ from .overviews import (
     collect_all_forecast_overview_series_configurations,  # noqa
     get_forecast_overview_series_configuration,  # noqa
     get_forecast_overview_series_configuration_by_identifier,  # noqa
+    get_forecast_overview_identifier_expression,  # noqa
     create_forecast_overview_series_configuration,  # noqa
     update_forecast_overview_series_configuration,  # noqa
     delete_forecast_overview_series_configuration,  # noqa
@@ -150,6 +176,7 @@ from .overviews import (
     collect_all_observation_overview_series_configurations,  # noqa
     get_observation_overview_series_configuration,  # noqa
     get_observation_overview_series_configuration_by_identifier,  # noqa
+    get_observation_overview_identifier_expression,  # noqa
     create_observation_overview_series_configuration,  # noqa
     update_observation_overview_series_configuration,  # noqa
     delete_observation_overview_series_configuration,  # noqa
@@ -1,12 +1,19 @@
+import datetime as dt
 from typing import (
+    Iterator,
     Optional,
     Sequence,
+    Union,
 )
 
 import sqlalchemy
 import sqlmodel
 
+from ..schemas import static
 from ..schemas.analytics import (
+    DOWNLOAD_REQUEST_ROLLUP_DIMENSIONS,
+    DownloadRequestAggregate,
+    DownloadRequestDailyRollup,
     ForecastCoverageDownloadRequest,
     ForecastCoverageDownloadRequestCreate,
     HistoricalCoverageDownloadRequest,
@@ -16,9 +23,23 @@ from ..schemas.analytics import (
 )
 from .base import (
     add_substring_filter,
+    collect_all_records,
     get_total_num_records,
+    stream_all_records,
 )
 
+_DOWNLOAD_REQUEST_MODELS = {
+    ForecastCoverageDownloadRequestCreate: ForecastCoverageDownloadRequest,
+    HistoricalCoverageDownloadRequestCreate: HistoricalCoverageDownloadRequest,
+    TimeSeriesDownloadRequestCreate: TimeSeriesDownloadRequest,
+}
+
+_ROLLED_UP_DOWNLOAD_REQUEST_MODELS = {
+    static.DownloadRequestKind.FORECAST_COVERAGE: ForecastCoverageDownloadRequest,
+    static.DownloadRequestKind.HISTORICAL_COVERAGE: HistoricalCoverageDownloadRequest,
+    static.DownloadRequestKind.TIME_SERIES: TimeSeriesDownloadRequest,
+}
+
 
 def get_forecast_coverage_download_request(
     session: sqlmodel.Session,
@@ -36,15 +57,9 @@ def list_forecast_coverage_download_requests(
     climatological_variable_name_filter: Optional[str] = None,
 ) -> tuple[Sequence[ForecastCoverageDownloadRequest], Optional[int]]:
     """List existing forecast coverage download requests."""
-    statement = sqlmodel.select(ForecastCoverageDownloadRequest).order_by(
-        ForecastCoverageDownloadRequest.request_datetime  # noqa
+    statement = _get_forecast_coverage_download_requests_statement(
+        climatological_variable_name_filter=climatological_variable_name_filter
     )
-    if climatological_variable_name_filter is not None:
-        statement = add_substring_filter(
-            statement,
-            climatological_variable_name_filter,
-            ForecastCoverageDownloadRequest.climatological_variable,
-        )
     items = session.exec(statement.offset(offset).limit(limit)).all()
     num_items = get_total_num_records(session, statement) if include_total else None
     return items, num_items
@@ -54,19 +69,40 @@ def collect_all_forecast_coverage_download_requests(
     session: sqlmodel.Session,
     climatological_variable_name_filter: Optional[str] = None,
 ) -> Sequence[ForecastCoverageDownloadRequest]:
-    _, num_total = list_forecast_coverage_download_requests(
+    return collect_all_records(
         session,
-        limit=1,
-        include_total=True,
-        climatological_variable_name_filter=climatological_variable_name_filter,
+        _get_forecast_coverage_download_requests_statement(
+            climatological_variable_name_filter=climatological_variable_name_filter
+        ),
     )
-    result, _ = list_forecast_coverage_download_requests(
+
+
+def stream_all_forecast_coverage_download_requests(
+    session: sqlmodel.Session,
+    climatological_variable_name_filter: Optional[str] = None,
+) -> Iterator[ForecastCoverageDownloadRequest]:
+    return stream_all_records(
         session,
-        limit=num_total,
-        include_total=False,
-        climatological_variable_name_filter=climatological_variable_name_filter,
+        _get_forecast_coverage_download_requests_statement(
+            climatological_variable_name_filter=climatological_variable_name_filter
+        ),
     )
-    return result
+
+
+def _get_forecast_coverage_download_requests_statement(
+    *,
+    climatological_variable_name_filter: Optional[str] = None,
+):
+    statement = sqlmodel.select(ForecastCoverageDownloadRequest).order_by(
+        ForecastCoverageDownloadRequest.request_datetime  # noqa
+    )
+    if climatological_variable_name_filter is not None:
+        statement = add_substring_filter(
+            statement,
+            climatological_variable_name_filter,
+            ForecastCoverageDownloadRequest.climatological_variable,
+        )
+    return statement
 
 
 def create_forecast_coverage_download_request(
@@ -114,15 +150,9 @@ def list_historical_coverage_download_requests(
     climatological_variable_name_filter: Optional[str] = None,
 ) -> tuple[Sequence[HistoricalCoverageDownloadRequest], Optional[int]]:
     """List existing historical coverage download requests."""
-    statement = sqlmodel.select(HistoricalCoverageDownloadRequest).order_by(
-        HistoricalCoverageDownloadRequest.request_datetime  # noqa
+    statement = _get_historical_coverage_download_requests_statement(
+        climatological_variable_name_filter=climatological_variable_name_filter
     )
-    if climatological_variable_name_filter is not None:
-        statement = add_substring_filter(
-            statement,
-            climatological_variable_name_filter,
-            HistoricalCoverageDownloadRequest.climatological_variable,
-        )
     items = session.exec(statement.offset(offset).limit(limit)).all()
     num_items = get_total_num_records(session, statement) if include_total else None
     return items, num_items
@@ -132,19 +162,40 @@ def collect_all_historical_coverage_download_requests(
     session: sqlmodel.Session,
     climatological_variable_name_filter: Optional[str] = None,
 ) -> Sequence[HistoricalCoverageDownloadRequest]:
-    _, num_total = list_historical_coverage_download_requests(
+    return collect_all_records(
         session,
-        limit=1,
-        include_total=True,
-        climatological_variable_name_filter=climatological_variable_name_filter,
+        _get_historical_coverage_download_requests_statement(
+            climatological_variable_name_filter=climatological_variable_name_filter
+        ),
     )
-    result, _ = list_historical_coverage_download_requests(
+
+
+def stream_all_historical_coverage_download_requests(
+    session: sqlmodel.Session,
+    climatological_variable_name_filter: Optional[str] = None,
+) -> Iterator[HistoricalCoverageDownloadRequest]:
+    return stream_all_records(
         session,
-        limit=num_total,
-        include_total=False,
-        climatological_variable_name_filter=climatological_variable_name_filter,
+        _get_historical_coverage_download_requests_statement(
+            climatological_variable_name_filter=climatological_variable_name_filter
+        ),
     )
-    return result
+
+
+def _get_historical_coverage_download_requests_statement(
+    *,
+    climatological_variable_name_filter: Optional[str] = None,
+):
+    statement = sqlmodel.select(HistoricalCoverageDownloadRequest).order_by(
+        HistoricalCoverageDownloadRequest.request_datetime  # noqa
+    )
+    if climatological_variable_name_filter is not None:
+        statement = add_substring_filter(
+            statement,
+            climatological_variable_name_filter,
+            HistoricalCoverageDownloadRequest.climatological_variable,
+        )
+    return statement
 
 
 def create_historical_coverage_download_request(
@@ -192,15 +243,9 @@ def list_time_series_download_requests(
     climatological_variable_name_filter: Optional[str] = None,
 ) -> tuple[Sequence[TimeSeriesDownloadRequest], Optional[int]]:
     """List existing time series download requests."""
-    statement = sqlmodel.select(TimeSeriesDownloadRequest).order_by(
-        TimeSeriesDownloadRequest.request_datetime  # noqa
+    statement = _get_time_series_download_requests_statement(
+        climatological_variable_name_filter=climatological_variable_name_filter
     )
-    if climatological_variable_name_filter is not None:
-        statement = add_substring_filter(
-            statement,
-            climatological_variable_name_filter,
-            TimeSeriesDownloadRequest.climatological_variable,
-        )
     items = session.exec(statement.offset(offset).limit(limit)).all()
     num_items = get_total_num_records(session, statement) if include_total else None
     return items, num_items
@@ -210,19 +255,40 @@ def collect_all_time_series_download_requests(
     session: sqlmodel.Session,
     climatological_variable_name_filter: Optional[str] = None,
 ) -> Sequence[TimeSeriesDownloadRequest]:
-    _, num_total = list_time_series_download_requests(
+    return collect_all_records(
         session,
-        limit=1,
-        include_total=True,
-        climatological_variable_name_filter=climatological_variable_name_filter,
+        _get_time_series_download_requests_statement(
+            climatological_variable_name_filter=climatological_variable_name_filter
+        ),
     )
-    result, _ = list_time_series_download_requests(
+
+
+def stream_all_time_series_download_requests(
+    session: sqlmodel.Session,
+    climatological_variable_name_filter: Optional[str] = None,
+) -> Iterator[TimeSeriesDownloadRequest]:
+    return stream_all_records(
         session,
-        limit=num_total,
-        include_total=False,
-        climatological_variable_name_filter=climatological_variable_name_filter,
+        _get_time_series_download_requests_statement(
+            climatological_variable_name_filter=climatological_variable_name_filter
+        ),
     )
-    return result
+
+
+def _get_time_series_download_requests_statement(
+    *,
+    climatological_variable_name_filter: Optional[str] = None,
+):
+    statement = sqlmodel.select(TimeSeriesDownloadRequest).order_by(
+        TimeSeriesDownloadRequest.request_datetime  # noqa
+    )
+    if climatological_variable_name_filter is not None:
+        statement = add_substring_filter(
+            statement,
+            climatological_variable_name_filter,
+            TimeSeriesDownloadRequest.climatological_variable,
+        )
+    return statement
 
 
 def create_time_series_download_request(
@@ -252,3 +318,180 @@ def delete_time_series_download_request(
         session.commit()
     else:
         raise RuntimeError("Time series download request not found")
+
+
+def create_many_download_requests(
+    session: sqlmodel.Session,
+    download_requests_to_create: Sequence[
+        Union[
+            ForecastCoverageDownloadRequestCreate,
+            HistoricalCoverageDownloadRequestCreate,
+            TimeSeriesDownloadRequestCreate,
+        ]
+    ],
+) -> None:
+    """Create download requests of any kind, in a single transaction.
+
+    Each kind of download request is saved with a single multi-row insert. The
+    created records are not returned.
+    """
+    grouped_values = {}
+    for to_create in download_requests_to_create:
+        grouped_values.setdefault(_DOWNLOAD_REQUEST_MODELS[type(to_create)], []).append(
+            to_create.model_dump()
+        )
+    for model, values in grouped_values.items():
+        session.execute(sqlalchemy.insert(model), values)
+    session.commit()
+
+
+def refresh_download_request_rollups(
+    session: sqlmodel.Session, *, since: Optional[dt.date] = None
+) -> int:
+    """Update the daily rollups of download requests, in a single transaction.
+
+    Rollups are recomputed for all days starting at ``since``. By default, this
+    is the most recent day which has already been rolled up, as it may have
+    been incomplete back then, so that each refresh only needs to scan the
+    latest download requests. If there are no rollups yet, all download
+    requests are rolled up.
+
+    Returns the number of rollup records that have been created.
+    """
+    if since is None:
+        since = session.exec(
+            sqlmodel.select(sqlalchemy.func.max(DownloadRequestDailyRollup.day))
+        ).first()
+    delete_statement = sqlalchemy.delete(DownloadRequestDailyRollup)
+    if since is not None:
+        delete_statement = delete_statement.where(
+            DownloadRequestDailyRollup.day >= since  # noqa
+        )
+    session.execute(delete_statement)
+    num_created = 0
+    for kind, model in _ROLLED_UP_DOWNLOAD_REQUEST_MODELS.items():
+        result = session.execute(
+            sqlalchemy.insert(DownloadRequestDailyRollup).from_select(
+                ["day", "download_kind", *DOWNLOAD_REQUEST_ROLLUP_DIMENSIONS[1:]]
+                + ["num_requests"],
+                _get_daily_rollup_statement(kind, model, since),
+            )
+        )
+        num_created += result.rowcount
+    session.commit()
+    return num_created
+
+
+def _get_daily_rollup_statement(
+    download_kind: static.DownloadRequestKind, model, since: Optional[dt.date]
+):
+    day = sqlalchemy.cast(model.request_datetime, sqlalchemy.Date)
+    dimensions = []
+    grouped = [day]
+    for name in DOWNLOAD_REQUEST_ROLLUP_DIMENSIONS[1:]:
+        column = getattr(model, name, None)
+        if column is None:
+            # dimension does not apply to this kind of download request
+            dimensions.append(sqlalchemy.literal(""))
+            continue
+        if name == "is_public_sector":
+            dimension = column
+        else:
+            # a literal column renders the same in the select and group by
+            # clauses, whereas a bound parameter would not
+            dimension = sqlalchemy.func.coalesce(
+                column, sqlalchemy.literal_column("''")
+            )
+        dimensions.append(dimension)
+        grouped.append(dimension)
+    statement = sqlalchemy.select(
+        day,
+        sqlalchemy.literal(download_kind.value),
+        *dimensions,
+        sqlalchemy.func.count(),
+    ).group_by(*grouped)
+    if since is not None:
+        statement = statement.where(
+            model.request_datetime >= dt.datetime.combine(since, dt.time())
+        )
+    return statement
+
+
+def list_download_request_aggregates(
+    session: sqlmodel.Session,
+    *,
+    granularity: static.AnalyticsRollupGranularity = (
+        static.AnalyticsRollupGranularity.DAY
+    ),
+    start: Optional[dt.date] = None,
+    end: Optional[dt.date] = None,
+    limit: int = 20,
+    offset: int = 0,
+    include_total: bool = False,
+) -> tuple[Sequence[DownloadRequestAggregate], Optional[int]]:
+    """List numbers of download requests per period, as read from the rollups.
+
+    The ``start`` and ``end`` dates are inclusive and refer to rolled up days.
+    """
+    statement = _get_download_request_aggregates_statement(
+        granularity=granularity, start=start, end=end
+    )
+    items = [
+        DownloadRequestAggregate(**row._mapping)
+        for row in session.execute(statement.offset(offset).limit(limit))
+    ]
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def stream_all_download_request_aggregates(
+    session: sqlmodel.Session,
+    *,
+    granularity: static.AnalyticsRollupGranularity = (
+        static.AnalyticsRollupGranularity.DAY
+    ),
+    start: Optional[dt.date] = None,
+    end: Optional[dt.date] = None,
+) -> Iterator[DownloadRequestAggregate]:
+    statement = _get_download_request_aggregates_statement(
+        granularity=granularity, start=start, end=end
+    )
+    for row in stream_all_records(session, statement):
+        yield DownloadRequestAggregate(**row._mapping)
+
+
+def _get_download_request_aggregates_statement(
+    *,
+    granularity: static.AnalyticsRollupGranularity,
+    start: Optional[dt.date] = None,
+    end: Optional[dt.date] = None,
+):
+    if granularity == static.AnalyticsRollupGranularity.MONTH:
+        period_start = sqlalchemy.cast(
+            sqlalchemy.func.date_trunc(
+                sqlalchemy.literal_column("'month'"), DownloadRequestDailyRollup.day
+            ),
+            sqlalchemy.Date,
+        )
+    else:
+        period_start = DownloadRequestDailyRollup.day
+    dimensions = [
+        getattr(DownloadRequestDailyRollup, name)
+        for name in DOWNLOAD_REQUEST_ROLLUP_DIMENSIONS
+    ]
+    statement = (
+        sqlmodel.select(
+            period_start.label("period_start"),
+            *dimensions,
+            sqlalchemy.func.sum(DownloadRequestDailyRollup.num_requests).label(
+                "num_requests"
+            ),
+        )
+        .group_by(period_start, *dimensions)
+        .order_by(period_start, *dimensions)
+    )
+    if start is not None:
+        statement = statement.where(DownloadRequestDailyRollup.day >= start)  # noqa
+    if end is not None:
+        statement = statement.where(DownloadRequestDailyRollup.day <= end)  # noqa
+    return statement
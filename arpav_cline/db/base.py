@@ -1,9 +1,19 @@
 import enum
+import itertools
+import time
 import typing
+from collections.abc import Iterator
 
 import sqlalchemy
+import sqlalchemy.orm
 import sqlmodel
 
+from .. import metrics
+
+# this is a module global, which caches the total number of records of each table,
+# keyed by table name. Values are a tuple of (monotonic time of the count, count)
+_UNFILTERED_TOTALS: dict[str, tuple[float, int]] = {}
+
 
 def add_values_in_list_filter(
     statement,
@@ -92,12 +102,177 @@ def old_add_substring_filter(statement, value: str, *columns):
     return result
 
 
+def lower_enum_name(column):
+    """Return an SQL expression which renders an enum column as its value.
+
+    Enums are stored by name, which is the upper case version of their value.
+    """
+    return sqlalchemy.func.lower(sqlalchemy.cast(column, sqlalchemy.String))
+
+
+def get_related_name_expression(related_model, foreign_key_column):
+    """Return an SQL expression which renders the name of a related record."""
+    return (
+        sqlalchemy.select(related_model.name)
+        .where(related_model.id == foreign_key_column)
+        .scalar_subquery()
+    )
+
+
 def get_total_num_records(session: sqlmodel.Session, statement):
     return session.exec(
         sqlmodel.select(sqlmodel.func.count()).select_from(statement)
     ).first()
 
 
+def add_keyset_filter(
+    statement,
+    id_column: sqlalchemy.Column,
+    after_id: typing.Any,
+    *sort_columns: sqlalchemy.Column,
+):
+    """Restrict the statement to the records which sort after the given record.
+
+    The statement is expected to be ordered by ``sort_columns`` and then by
+    ``id_column``, which makes the sort order unique. The sort key of the
+    ``after_id`` record is looked up in a subquery, which means that callers only
+    need to keep track of the id of the last record they have seen.
+    """
+    sort_key = sqlalchemy.tuple_(*sort_columns, id_column)
+    reference_sort_key = (
+        sqlalchemy.select(*sort_columns, id_column)
+        .where(id_column == after_id)
+        .correlate(None)
+        .scalar_subquery()
+    )
+    return statement.where(sort_key > reference_sort_key)
+
+
+def get_unfiltered_total_num_records(
+    session: sqlmodel.Session,
+    model: typing.Type[sqlmodel.SQLModel],
+    *,
+    max_age_seconds: float,
+) -> int:
+    """Return the total number of records in the model's table.
+
+    Totals are cached. The cached value is discarded whenever this process
+    writes to the table, while writes made by other processes are only picked up
+    after ``max_age_seconds``.
+    """
+    table_name = model.__tablename__
+    now = time.monotonic()
+    cached = _UNFILTERED_TOTALS.get(table_name)
+    is_hit = cached is not None and now - cached[0] <= max_age_seconds
+    metrics.count_cache_request("unfiltered_totals", hit=is_hit)
+    if is_hit:
+        return cached[1]
+    total = get_total_num_records(session, sqlmodel.select(model))
+    _UNFILTERED_TOTALS[table_name] = (now, total)
+    return total
+
+
+def invalidate_unfiltered_totals(*table_names: str) -> None:
+    """Discard cached totals of the given tables, or of all tables."""
+    if len(table_names) == 0:
+        _UNFILTERED_TOTALS.clear()
+    for table_name in table_names:
+        _UNFILTERED_TOTALS.pop(table_name, None)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_flush")
+def _invalidate_flushed_unfiltered_totals(session, flush_context) -> None:
+    table_names = {
+        getattr(instance, "__tablename__", None)
+        for instance in itertools.chain(session.new, session.deleted)
+    }
+    invalidate_unfiltered_totals(*(n for n in table_names if n is not None))
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "do_orm_execute")
+def _invalidate_executed_unfiltered_totals(
+    orm_execute_state: sqlalchemy.orm.ORMExecuteState,
+) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            invalidate_unfiltered_totals(table.name)
+
+
+def collect_all_records(session: sqlmodel.Session, statement) -> list:
+    """Fetch all records matched by the statement, with a single query.
+
+    Meant for tables which are small enough to be fully loaded in memory. For
+    large tables, prefer ``stream_all_records()``.
+    """
+    return list(session.exec(statement).all())
+
+
+def stream_all_records(
+    session: sqlmodel.Session, statement, *, batch_size: int = 1000
+) -> Iterator:
+    """Iterate over all records matched by the statement, with a single query.
+
+    Records are fetched from a server-side cursor in batches of ``batch_size``,
+    so memory usage does not grow with the number of records. The session must
+    be kept open, and must not be committed, until iteration is finished.
+    """
+    yield from session.exec(statement.execution_options(yield_per=batch_size))
+
+
+def get_vector_tile(
+    session: sqlmodel.Session,
+    statement,
+    geom_column,
+    *property_columns,
+    layer_name: str,
+    z: int,
+    x: int,
+    y: int,
+    output_geom_column=None,
+    extent: int = 4096,
+    buffer: int = 64,
+) -> bytes:
+    """Render the records matched by the statement as a Mapbox Vector Tile.
+
+    ``geom_column`` is expected to be in the EPSG:4326 CRS. Records are selected
+    by intersecting it with the tile's bounds, which lets the DB use the spatial
+    index, and their geometries are then clipped and encoded by
+    ``ST_AsMVTGeom``. A different geometry can be encoded by passing
+    ``output_geom_column``, e.g. a simplified one. ``property_columns`` become
+    the features' attributes.
+    """
+    if output_geom_column is None:
+        output_geom_column = geom_column
+    envelope = sqlalchemy.func.ST_TileEnvelope(z, x, y)
+    features = (
+        statement.where(
+            geom_column.intersects(sqlalchemy.func.ST_Transform(envelope, 4326))
+        )
+        .with_only_columns(
+            sqlalchemy.func.ST_AsMVTGeom(
+                sqlalchemy.func.ST_Transform(output_geom_column, 3857),
+                envelope,
+                extent,
+                buffer,
+                True,
+            ).label("geom"),
+            *property_columns,
+        )
+        .order_by(None)
+        .subquery("tile_features")
+    )
+    tile_statement = sqlalchemy.select(
+        sqlalchemy.func.ST_AsMVT(
+            sqlalchemy.literal_column(features.name),
+            layer_name,
+            extent,
+            "geom",
+        )
+    ).select_from(features)
+    return bytes(session.execute(tile_statement).scalar() or b"")
+
+
 def slugify_internal_value(value: str) -> str:
     """Replace characters in input string in to make it usable as a name."""
     to_translate = "-\, '"
@@ -25,9 +25,12 @@ from ..schemas.static import (
     MeasureType,
 )
 from .base import (
+    add_keyset_filter,
     add_multiple_values_filter,
     add_substring_filter,
+    collect_all_records,
     get_total_num_records,
+    lower_enum_name,
 )
 
 logger = logging.getLogger(__name__)
@@ -60,6 +63,26 @@ def get_climatic_indicator_by_identifier(
         return session.exec(statement).first()  # noqa
 
 
+def get_climatic_indicator_identifier_expression(climatic_indicator_id_column):
+    """Return an SQL expression which renders a climatic indicator identifier.
+
+    This mirrors ``ClimaticIndicator.identifier`` for the climatic indicator
+    referenced by the input column, allowing to filter and sort on identifiers
+    of related records in the DB.
+    """
+    return (
+        sqlalchemy.select(
+            ClimaticIndicator.name  # noqa
+            + "-"
+            + lower_enum_name(ClimaticIndicator.measure_type)  # noqa
+            + "-"
+            + lower_enum_name(ClimaticIndicator.aggregation_period)  # noqa
+        )
+        .where(ClimaticIndicator.id == climatic_indicator_id_column)  # noqa
+        .scalar_subquery()
+    )
+
+
 def list_climatic_indicators(
     session: sqlmodel.Session,
     *,
@@ -72,13 +95,70 @@ def list_climatic_indicators(
         Union[list[AggregationPeriod], AggregationPeriod]
     ] = None,
     perform_exact_matches: bool = False,
+    after_id: Optional[int] = None,
 ) -> tuple[Sequence[ClimaticIndicator], Optional[int]]:
-    """List existing climatic indicators."""
+    """List existing climatic indicators.
+
+    When ``after_id`` is given, only the climatic indicators which come after it
+    are listed, which allows paginating without an offset.
+    """
+    statement = _get_climatic_indicators_statement(
+        name_filter=name_filter,
+        measure_type_filter=measure_type_filter,
+        aggregation_period_filter=aggregation_period_filter,
+        perform_exact_matches=perform_exact_matches,
+    )
+    page_statement = statement
+    if after_id is not None:
+        page_statement = add_keyset_filter(
+            statement,
+            ClimaticIndicator.id,  # noqa
+            after_id,
+            ClimaticIndicator.sort_order,  # noqa
+            ClimaticIndicator.name,  # noqa
+            ClimaticIndicator.aggregation_period,  # noqa
+            ClimaticIndicator.measure_type,  # noqa
+        )
+    items = session.exec(page_statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def collect_all_climatic_indicators(
+    session: sqlmodel.Session,
+    name_filter: Optional[Union[list[str], str]] = None,
+    measure_type_filter: Optional[Union[list[MeasureType], MeasureType]] = None,
+    aggregation_period_filter: Optional[
+        Union[list[AggregationPeriod], AggregationPeriod]
+    ] = None,
+    perform_exact_matches: bool = False,
+) -> Sequence[ClimaticIndicator]:
+    return collect_all_records(
+        session,
+        _get_climatic_indicators_statement(
+            name_filter=name_filter,
+            measure_type_filter=measure_type_filter,
+            aggregation_period_filter=aggregation_period_filter,
+            perform_exact_matches=perform_exact_matches,
+        ),
+    )
+
+
+def _get_climatic_indicators_statement(
+    *,
+    name_filter: Optional[Union[list[str], str]] = None,
+    measure_type_filter: Optional[Union[list[MeasureType], MeasureType]] = None,
+    aggregation_period_filter: Optional[
+        Union[list[AggregationPeriod], AggregationPeriod]
+    ] = None,
+    perform_exact_matches: bool = False,
+):
     statement = sqlmodel.select(ClimaticIndicator).order_by(
         ClimaticIndicator.sort_order,  # noqa
         ClimaticIndicator.name,  # noqa
         ClimaticIndicator.aggregation_period,  # noqa
         ClimaticIndicator.measure_type,  # noqa
+        ClimaticIndicator.id,  # noqa
     )
     if name_filter is not None:
         if perform_exact_matches:
@@ -103,39 +183,7 @@ def list_climatic_indicators(
             aggregation_period_filter,
             ClimaticIndicator.aggregation_period,  # noqa
         )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
-
-
-def collect_all_climatic_indicators(
-    session: sqlmodel.Session,
-    name_filter: Optional[Union[list[str], str]] = None,
-    measure_type_filter: Optional[Union[list[MeasureType], MeasureType]] = None,
-    aggregation_period_filter: Optional[
-        Union[list[AggregationPeriod], AggregationPeriod]
-    ] = None,
-    perform_exact_matches: bool = False,
-) -> Sequence[ClimaticIndicator]:
-    _, num_total = list_climatic_indicators(
-        session,
-        limit=1,
-        include_total=True,
-        name_filter=name_filter,
-        measure_type_filter=measure_type_filter,
-        aggregation_period_filter=aggregation_period_filter,
-        perform_exact_matches=perform_exact_matches,
-    )
-    result, _ = list_climatic_indicators(
-        session,
-        limit=num_total,
-        include_total=False,
-        name_filter=name_filter,
-        measure_type_filter=measure_type_filter,
-        aggregation_period_filter=aggregation_period_filter,
-        perform_exact_matches=perform_exact_matches,
-    )
-    return result
+    return statement
 
 
 def create_climatic_indicator(
@@ -1,6 +1,8 @@
 import typing
 import sqlmodel
 
+from .. import metrics
+
 if typing.TYPE_CHECKING:
     from .. import config
 
@@ -36,5 +38,6 @@ def get_engine(
                 echo=True if settings.verbose_db_logs else False,
                 pool_size=settings.db_pool_size,
             )
+            metrics.instrument_engine_pool(_DB_ENGINE)
         result = _DB_ENGINE
     return result
@@ -10,6 +10,7 @@ import sqlalchemy
 import sqlmodel
 
 from .. import exceptions
+from ..schemas.base import SpatialRegion
 from ..schemas.climaticindicators import (
     ClimaticIndicator,
 )
@@ -45,13 +46,16 @@ from ..schemas.static import (
 
 from .base import (
     add_multiple_values_filter,
-    add_values_in_list_filter,
     add_substring_filter,
+    add_values_in_list_filter,
+    collect_all_records,
+    get_related_name_expression,
     get_total_num_records,
 )
 from .climaticindicators import (
     collect_all_climatic_indicators,
     get_climatic_indicator_by_identifier,
+    get_climatic_indicator_identifier_expression,
 )
 from .observationseries import get_observation_series_configuration
 from .spatialregions import get_spatial_region_by_name
@@ -76,6 +80,58 @@ def list_forecast_coverage_configurations(
     perform_exact_matches: bool = False,
 ) -> tuple[Sequence[ForecastCoverageConfiguration], Optional[int]]:
     """List existing forecast coverage configurations."""
+    statement = _get_forecast_coverage_configurations_statement(
+        climatic_indicator_name_filter=climatic_indicator_name_filter,
+        climatic_indicator_filter=climatic_indicator_filter,
+        forecast_model_name_filter=forecast_model_name_filter,
+        scenario_filter=scenario_filter,
+        year_period_filter=year_period_filter,
+        time_window_name_filter=time_window_name_filter,
+        perform_exact_matches=perform_exact_matches,
+    )
+    items = session.exec(statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def collect_all_forecast_coverage_configurations(
+    session: sqlmodel.Session,
+    climatic_indicator_name_filter: Optional[str] = None,
+    climatic_indicator_filter: Optional[ClimaticIndicator] = None,
+    forecast_model_name_filter: Optional[Union[list[str], str]] = None,
+    scenario_filter: Optional[Union[list[ForecastScenario], ForecastScenario]] = None,
+    year_period_filter: Optional[
+        Union[list[ForecastYearPeriod], ForecastYearPeriod]
+    ] = None,
+    time_window_name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+) -> Sequence[ForecastCoverageConfiguration]:
+    return collect_all_records(
+        session,
+        _get_forecast_coverage_configurations_statement(
+            climatic_indicator_name_filter=climatic_indicator_name_filter,
+            climatic_indicator_filter=climatic_indicator_filter,
+            forecast_model_name_filter=forecast_model_name_filter,
+            scenario_filter=scenario_filter,
+            year_period_filter=year_period_filter,
+            time_window_name_filter=time_window_name_filter,
+            perform_exact_matches=perform_exact_matches,
+        ),
+    )
+
+
+def _get_forecast_coverage_configurations_statement(
+    *,
+    climatic_indicator_name_filter: Optional[str] = None,
+    climatic_indicator_filter: Optional[ClimaticIndicator] = None,
+    forecast_model_name_filter: Optional[Union[list[str], str]] = None,
+    scenario_filter: Optional[Union[list[ForecastScenario], ForecastScenario]] = None,
+    year_period_filter: Optional[
+        Union[list[ForecastYearPeriod], ForecastYearPeriod]
+    ] = None,
+    time_window_name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+):
     statement = sqlmodel.select(ForecastCoverageConfiguration).order_by(
         ForecastCoverageConfiguration.id  # noqa
     )
@@ -149,60 +205,50 @@ def list_forecast_coverage_configurations(
             ClimaticIndicator.id  # noqa
             == ForecastCoverageConfiguration.climatic_indicator_id,  # noqa
         ).where(ClimaticIndicator.name.ilike(filter_))  # noqa
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
-
-
-def collect_all_forecast_coverage_configurations(
-    session: sqlmodel.Session,
-    climatic_indicator_name_filter: Optional[str] = None,
-    climatic_indicator_filter: Optional[ClimaticIndicator] = None,
-    forecast_model_name_filter: Optional[Union[list[str], str]] = None,
-    scenario_filter: Optional[Union[list[ForecastScenario], ForecastScenario]] = None,
-    year_period_filter: Optional[
-        Union[list[ForecastYearPeriod], ForecastYearPeriod]
-    ] = None,
-    time_window_name_filter: Optional[Union[list[str], str]] = None,
-    perform_exact_matches: bool = False,
-) -> Sequence[ForecastCoverageConfiguration]:
-    _, num_total = list_forecast_coverage_configurations(
-        session,
-        limit=1,
-        include_total=True,
-        climatic_indicator_name_filter=climatic_indicator_name_filter,
-        climatic_indicator_filter=climatic_indicator_filter,
-        forecast_model_name_filter=forecast_model_name_filter,
-        scenario_filter=scenario_filter,
-        year_period_filter=year_period_filter,
-        time_window_name_filter=time_window_name_filter,
-        perform_exact_matches=perform_exact_matches,
-    )
-    result, _ = list_forecast_coverage_configurations(
-        session,
-        limit=num_total,
-        include_total=False,
-        climatic_indicator_name_filter=climatic_indicator_name_filter,
-        climatic_indicator_filter=climatic_indicator_filter,
-        forecast_model_name_filter=forecast_model_name_filter,
-        scenario_filter=scenario_filter,
-        year_period_filter=year_period_filter,
-        time_window_name_filter=time_window_name_filter,
-        perform_exact_matches=perform_exact_matches,
-    )
-    return result
+    return statement
 
 
 def collect_all_forecast_coverage_configurations_with_identifier_filter(
     session: sqlmodel.Session,
     identifier_filter: Optional[str] = None,
 ) -> list[ForecastCoverageConfiguration]:
-    all_fccs = collect_all_forecast_coverage_configurations(session)
+    statement = _get_forecast_coverage_configurations_statement()
     if identifier_filter is not None:
-        result = [fcc for fcc in all_fccs if identifier_filter in fcc.identifier]
-    else:
-        result = all_fccs
-    return result
+        statement = statement.where(
+            get_forecast_coverage_configuration_identifier_expression().contains(
+                identifier_filter, autoescape=True
+            )
+        )
+    return collect_all_records(session, statement)
+
+
+def get_forecast_coverage_configuration_identifier_expression():
+    """Return an SQL expression rendering forecast coverage configuration identifiers.
+
+    This mirrors ``ForecastCoverageConfiguration.identifier``, allowing to filter
+    and sort on identifiers in the DB.
+    """
+    return (
+        sqlalchemy.literal(f"{DataCategory.FORECAST.value}-")
+        + get_climatic_indicator_identifier_expression(
+            ForecastCoverageConfiguration.climatic_indicator_id  # noqa
+        )
+        + "-"
+        + get_related_name_expression(
+            SpatialRegion,
+            ForecastCoverageConfiguration.spatial_region_id,  # noqa
+        )
+        + "-"
+        + get_related_name_expression(
+            ForecastYearPeriodGroup,
+            ForecastCoverageConfiguration.year_period_group_id,  # noqa
+        )
+        + "-"
+        + get_related_name_expression(
+            ForecastModelGroup,
+            ForecastCoverageConfiguration.forecast_model_group_id,  # noqa
+        )
+    )
 
 
 def get_forecast_coverage_configuration(
@@ -440,6 +486,34 @@ def list_forecast_models(
     perform_exact_matches: bool = False,
 ) -> tuple[Sequence[ForecastModel], Optional[int]]:
     """List existing forecast models."""
+    statement = _get_forecast_models_statement(
+        name_filter=name_filter,
+        perform_exact_matches=perform_exact_matches,
+    )
+    items = session.exec(statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def collect_all_forecast_models(
+    session: sqlmodel.Session,
+    name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+) -> Sequence[ForecastModel]:
+    return collect_all_records(
+        session,
+        _get_forecast_models_statement(
+            name_filter=name_filter,
+            perform_exact_matches=perform_exact_matches,
+        ),
+    )
+
+
+def _get_forecast_models_statement(
+    *,
+    name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+):
     statement = sqlmodel.select(ForecastModel).order_by(
         ForecastModel.sort_order  # noqa
     )
@@ -456,31 +530,7 @@ def list_forecast_models(
                 name_filter,
                 ForecastModel.name,  # noqa
             )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
-
-
-def collect_all_forecast_models(
-    session: sqlmodel.Session,
-    name_filter: Optional[Union[list[str], str]] = None,
-    perform_exact_matches: bool = False,
-) -> Sequence[ForecastModel]:
-    _, num_total = list_forecast_models(
-        session,
-        limit=1,
-        name_filter=name_filter,
-        include_total=True,
-        perform_exact_matches=perform_exact_matches,
-    )
-    result, _ = list_forecast_models(
-        session,
-        limit=num_total,
-        name_filter=name_filter,
-        include_total=False,
-        perform_exact_matches=perform_exact_matches,
-    )
-    return result
+    return statement
 
 
 def get_forecast_model(
@@ -552,6 +602,35 @@ def list_forecast_model_groups(
     include_total: bool = False,
 ) -> tuple[Sequence[ForecastModelGroup], Optional[int]]:
     """List existing forecast model groups."""
+    statement = _get_forecast_model_groups_statement(
+        name_filter=name_filter,
+        perform_exact_matches=perform_exact_matches,
+    )
+    items = session.exec(statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def collect_all_forecast_model_groups(
+    session: sqlmodel.Session,
+    *,
+    name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+):
+    return collect_all_records(
+        session,
+        _get_forecast_model_groups_statement(
+            name_filter=name_filter,
+            perform_exact_matches=perform_exact_matches,
+        ),
+    )
+
+
+def _get_forecast_model_groups_statement(
+    *,
+    name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+):
     statement = sqlmodel.select(ForecastModelGroup).order_by(
         ForecastModelGroup.sort_order  # noqa
     )
@@ -568,32 +647,7 @@ def list_forecast_model_groups(
                 name_filter,
                 ForecastModelGroup.name,  # noqa
             )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
-
-
-def collect_all_forecast_model_groups(
-    session: sqlmodel.Session,
-    *,
-    name_filter: Optional[Union[list[str], str]] = None,
-    perform_exact_matches: bool = False,
-):
-    _, num_total = list_forecast_model_groups(
-        session,
-        limit=1,
-        name_filter=name_filter,
-        perform_exact_matches=perform_exact_matches,
-        include_total=True,
-    )
-    result, _ = list_forecast_model_groups(
-        session,
-        limit=num_total,
-        name_filter=name_filter,
-        perform_exact_matches=perform_exact_matches,
-        include_total=False,
-    )
-    return result
+    return statement
 
 
 def get_forecast_model_group(
@@ -701,6 +755,34 @@ def list_forecast_time_windows(
     include_total: bool = False,
 ) -> tuple[Sequence[ForecastTimeWindow], Optional[int]]:
     """List existing forecast time windows."""
+    statement = _get_forecast_time_windows_statement(
+        name_filter=name_filter,
+        perform_exact_matches=perform_exact_matches,
+    )
+    items = session.exec(statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def collect_all_forecast_time_windows(
+    session: sqlmodel.Session,
+    name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+) -> Sequence[ForecastTimeWindow]:
+    return collect_all_records(
+        session,
+        _get_forecast_time_windows_statement(
+            name_filter=name_filter,
+            perform_exact_matches=perform_exact_matches,
+        ),
+    )
+
+
+def _get_forecast_time_windows_statement(
+    *,
+    name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+):
     statement = sqlmodel.select(ForecastTimeWindow).order_by(
         ForecastTimeWindow.sort_order  # noqa
     )
@@ -717,31 +799,7 @@ def list_forecast_time_windows(
                 name_filter,
                 ForecastTimeWindow.internal_value,  # noqa
             )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
-
-
-def collect_all_forecast_time_windows(
-    session: sqlmodel.Session,
-    name_filter: Optional[Union[list[str], str]] = None,
-    perform_exact_matches: bool = False,
-) -> Sequence[ForecastTimeWindow]:
-    _, num_total = list_forecast_time_windows(
-        session,
-        limit=1,
-        name_filter=name_filter,
-        perform_exact_matches=perform_exact_matches,
-        include_total=True,
-    )
-    result, _ = list_forecast_time_windows(
-        session,
-        limit=num_total,
-        name_filter=name_filter,
-        perform_exact_matches=perform_exact_matches,
-        include_total=False,
-    )
-    return result
+    return statement
 
 
 def get_forecast_time_window(
@@ -975,6 +1033,44 @@ def legacy_list_forecast_coverage_configurations(
     an early version of the project. This is kept only for compatibility reasons -
     newer code should use `list_forecast_coverage_configurations()` instead.
     """
+    statement = _get_legacy_forecast_coverage_configurations_statement(
+        name_filter=name_filter,
+        conf_param_filter=conf_param_filter,
+    )
+    items = session.exec(statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def legacy_collect_all_forecast_coverage_configurations(
+    session: sqlmodel.Session,
+    *,
+    name_filter: Optional[str] = None,
+    conf_param_filter: Optional[LegacyConfParamFilterValues] = None,
+) -> Sequence[ForecastCoverageConfiguration]:
+    """Collect all forecast coverage configurations.
+
+    NOTE:
+
+    This function supports a bunch of search filters that were previously provided by
+    the more generic `configuration_parameter` instances, which were available in
+    an early version of the project. This is kept only for compatibility reasons -
+    newer code should use `collect_all_forecast_coverage_configurations()` instead.
+    """
+    return collect_all_records(
+        session,
+        _get_legacy_forecast_coverage_configurations_statement(
+            name_filter=name_filter,
+            conf_param_filter=conf_param_filter,
+        ),
+    )
+
+
+def _get_legacy_forecast_coverage_configurations_statement(
+    *,
+    name_filter: Optional[str] = None,
+    conf_param_filter: Optional[LegacyConfParamFilterValues],
+):
     logger.debug(f"{conf_param_filter=}")
     statement = (
         sqlmodel.select(ForecastCoverageConfiguration)
@@ -1061,41 +1157,7 @@ def legacy_list_forecast_coverage_configurations(
                 conf_param_filter.year_period.name
                 == sqlalchemy.any_(ForecastYearPeriodGroup.year_periods)
             )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
-
-
-def legacy_collect_all_forecast_coverage_configurations(
-    session: sqlmodel.Session,
-    *,
-    name_filter: Optional[str] = None,
-    conf_param_filter: Optional[LegacyConfParamFilterValues] = None,
-) -> Sequence[ForecastCoverageConfiguration]:
-    """Collect all forecast coverage configurations.
-
-    NOTE:
-
-    This function supports a bunch of search filters that were previously provided by
-    the more generic `configuration_parameter` instances, which were available in
-    an early version of the project. This is kept only for compatibility reasons -
-    newer code should use `collect_all_forecast_coverage_configurations()` instead.
-    """
-    _, num_total = legacy_list_forecast_coverage_configurations(
-        session,
-        limit=1,
-        include_total=True,
-        name_filter=name_filter,
-        conf_param_filter=conf_param_filter,
-    )
-    result, _ = legacy_list_forecast_coverage_configurations(
-        session,
-        limit=num_total,
-        include_total=False,
-        name_filter=name_filter,
-        conf_param_filter=conf_param_filter,
-    )
-    return result
+    return statement
 
 
 def legacy_list_forecast_coverages(
@@ -1163,6 +1225,30 @@ def list_forecast_coverages(
     offset: Optional[int] = 0,
     include_total: bool = False,
 ) -> tuple[list[ForecastCoverageInternal], int]:
+    result = collect_all_forecast_coverages(
+        session,
+        climatological_variable_filter=climatological_variable_filter,
+        aggregation_period_filter=aggregation_period_filter,
+        climatological_model_filter=climatological_model_filter,
+        scenario_filter=scenario_filter,
+        measure_filter=measure_filter,
+        year_period_filter=year_period_filter,
+        time_window_filter=time_window_filter,
+    )
+    return result[offset : offset + limit], len(result) if include_total else None
+
+
+def collect_all_forecast_coverages(
+    session: sqlmodel.Session,
+    *,
+    climatological_variable_filter: Optional[list[str]] = None,
+    aggregation_period_filter: Optional[list[AggregationPeriod]] = None,
+    climatological_model_filter: Optional[list[str]] = None,
+    scenario_filter: Optional[list[ForecastScenario]] = None,
+    measure_filter: Optional[list[MeasureType]] = None,
+    year_period_filter: Optional[list[ForecastYearPeriod]] = None,
+    time_window_filter: Optional[list[str]] = None,
+) -> list[ForecastCoverageInternal]:
     climatic_indicators = collect_all_climatic_indicators(
         session,
         name_filter=climatological_variable_filter,
@@ -1251,44 +1337,6 @@ def list_forecast_coverages(
                         is_eligible = False
                     if is_eligible:
                         result.append(candidate)
-    return result[offset : offset + limit], len(result) if include_total else None
-
-
-def collect_all_forecast_coverages(
-    session: sqlmodel.Session,
-    *,
-    climatological_variable_filter: Optional[list[str]] = None,
-    aggregation_period_filter: Optional[list[AggregationPeriod]] = None,
-    climatological_model_filter: Optional[list[str]] = None,
-    scenario_filter: Optional[list[ForecastScenario]] = None,
-    measure_filter: Optional[list[MeasureType]] = None,
-    year_period_filter: Optional[list[ForecastYearPeriod]] = None,
-    time_window_filter: Optional[list[str]] = None,
-):
-    _, num_total = list_forecast_coverages(
-        session,
-        limit=1,
-        include_total=True,
-        climatological_variable_filter=climatological_variable_filter,
-        aggregation_period_filter=aggregation_period_filter,
-        climatological_model_filter=climatological_model_filter,
-        scenario_filter=scenario_filter,
-        measure_filter=measure_filter,
-        year_period_filter=year_period_filter,
-        time_window_filter=time_window_filter,
-    )
-    result, _ = list_forecast_coverages(
-        session,
-        limit=num_total,
-        include_total=False,
-        climatological_variable_filter=climatological_variable_filter,
-        aggregation_period_filter=aggregation_period_filter,
-        climatological_model_filter=climatological_model_filter,
-        scenario_filter=scenario_filter,
-        measure_filter=measure_filter,
-        year_period_filter=year_period_filter,
-        time_window_filter=time_window_filter,
-    )
     return result
 
 
@@ -1302,6 +1350,35 @@ def list_forecast_year_period_groups(
     include_total: bool = False,
 ) -> tuple[Sequence[ForecastYearPeriodGroup], Optional[int]]:
     """List existing forecast year period groups."""
+    statement = _get_forecast_year_period_groups_statement(
+        name_filter=name_filter,
+        perform_exact_matches=perform_exact_matches,
+    )
+    items = session.exec(statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def collect_all_forecast_year_period_groups(
+    session: sqlmodel.Session,
+    *,
+    name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+):
+    return collect_all_records(
+        session,
+        _get_forecast_year_period_groups_statement(
+            name_filter=name_filter,
+            perform_exact_matches=perform_exact_matches,
+        ),
+    )
+
+
+def _get_forecast_year_period_groups_statement(
+    *,
+    name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+):
     statement = sqlmodel.select(ForecastYearPeriodGroup).order_by(
         ForecastYearPeriodGroup.sort_order  # noqa
     )
@@ -1318,32 +1395,7 @@ def list_forecast_year_period_groups(
                 name_filter,
                 ForecastYearPeriodGroup.name,  # noqa
             )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
-
-
-def collect_all_forecast_year_period_groups(
-    session: sqlmodel.Session,
-    *,
-    name_filter: Optional[Union[list[str], str]] = None,
-    perform_exact_matches: bool = False,
-):
-    _, num_total = list_forecast_year_period_groups(
-        session,
-        limit=1,
-        name_filter=name_filter,
-        perform_exact_matches=perform_exact_matches,
-        include_total=True,
-    )
-    result, _ = list_forecast_year_period_groups(
-        session,
-        limit=num_total,
-        name_filter=name_filter,
-        perform_exact_matches=perform_exact_matches,
-        include_total=False,
-    )
-    return result
+    return statement
 
 
 def get_forecast_year_period_group(
@@ -34,13 +34,17 @@ from ..schemas.static import (
 )
 from .base import (
     add_multiple_values_filter,
-    add_values_in_list_filter,
     add_substring_filter,
+    add_values_in_list_filter,
+    collect_all_records,
+    get_related_name_expression,
     get_total_num_records,
+    lower_enum_name,
 )
 from .climaticindicators import (
     collect_all_climatic_indicators,
     get_climatic_indicator_by_identifier,
+    get_climatic_indicator_identifier_expression,
 )
 from .observationseries import get_observation_series_configuration
 from .spatialregions import get_spatial_region_by_name
@@ -65,6 +69,54 @@ def list_historical_coverage_configurations(
     decade_filter: Optional[Union[list[HistoricalDecade], HistoricalDecade]] = None,
 ) -> tuple[Sequence[HistoricalCoverageConfiguration], Optional[int]]:
     """List existing historical coverage configurations."""
+    statement = _get_historical_coverage_configurations_statement(
+        climatic_indicator_name_filter=climatic_indicator_name_filter,
+        climatic_indicator_filter=climatic_indicator_filter,
+        year_period_filter=year_period_filter,
+        reference_period_filter=reference_period_filter,
+        decade_filter=decade_filter,
+    )
+    items = session.exec(statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def collect_all_historical_coverage_configurations(
+    session: sqlmodel.Session,
+    climatic_indicator_name_filter: Optional[str] = None,
+    climatic_indicator_filter: Optional[ClimaticIndicator] = None,
+    year_period_filter: Optional[
+        Union[list[HistoricalYearPeriod], HistoricalYearPeriod]
+    ] = None,
+    reference_period_filter: Optional[
+        Union[list[HistoricalReferencePeriod], HistoricalReferencePeriod]
+    ] = None,
+    decade_filter: Optional[Union[list[HistoricalDecade], HistoricalDecade]] = None,
+) -> Sequence[HistoricalCoverageConfiguration]:
+    return collect_all_records(
+        session,
+        _get_historical_coverage_configurations_statement(
+            climatic_indicator_name_filter=climatic_indicator_name_filter,
+            climatic_indicator_filter=climatic_indicator_filter,
+            year_period_filter=year_period_filter,
+            reference_period_filter=reference_period_filter,
+            decade_filter=decade_filter,
+        ),
+    )
+
+
+def _get_historical_coverage_configurations_statement(
+    *,
+    climatic_indicator_name_filter: Optional[str] = None,
+    climatic_indicator_filter: Optional[ClimaticIndicator] = None,
+    year_period_filter: Optional[
+        Union[list[HistoricalYearPeriod], HistoricalYearPeriod]
+    ] = None,
+    reference_period_filter: Optional[
+        Union[list[HistoricalReferencePeriod], HistoricalReferencePeriod]
+    ] = None,
+    decade_filter: Optional[Union[list[HistoricalDecade], HistoricalDecade]] = None,
+):
     statement = sqlmodel.select(HistoricalCoverageConfiguration).order_by(
         HistoricalCoverageConfiguration.id
     )
@@ -121,56 +173,48 @@ def list_historical_coverage_configurations(
                     ]
                 )
             )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
-
-
-def collect_all_historical_coverage_configurations(
-    session: sqlmodel.Session,
-    climatic_indicator_name_filter: Optional[str] = None,
-    climatic_indicator_filter: Optional[ClimaticIndicator] = None,
-    year_period_filter: Optional[
-        Union[list[HistoricalYearPeriod], HistoricalYearPeriod]
-    ] = None,
-    reference_period_filter: Optional[
-        Union[list[HistoricalReferencePeriod], HistoricalReferencePeriod]
-    ] = None,
-    decade_filter: Optional[Union[list[HistoricalDecade], HistoricalDecade]] = None,
-) -> Sequence[HistoricalCoverageConfiguration]:
-    _, num_total = list_historical_coverage_configurations(
-        session,
-        limit=1,
-        include_total=True,
-        climatic_indicator_name_filter=climatic_indicator_name_filter,
-        climatic_indicator_filter=climatic_indicator_filter,
-        year_period_filter=year_period_filter,
-        reference_period_filter=reference_period_filter,
-        decade_filter=decade_filter,
-    )
-    result, _ = list_historical_coverage_configurations(
-        session,
-        limit=num_total,
-        include_total=False,
-        climatic_indicator_name_filter=climatic_indicator_name_filter,
-        climatic_indicator_filter=climatic_indicator_filter,
-        year_period_filter=year_period_filter,
-        reference_period_filter=reference_period_filter,
-        decade_filter=decade_filter,
-    )
-    return result
+    return statement
 
 
 def collect_all_historical_coverage_configurations_with_identifier_filter(
     session: sqlmodel.Session,
     identifier_filter: Optional[str] = None,
 ) -> list[HistoricalCoverageConfiguration]:
-    all_hccs = collect_all_historical_coverage_configurations(session)
+    statement = _get_historical_coverage_configurations_statement()
     if identifier_filter is not None:
-        result = [hcc for hcc in all_hccs if identifier_filter in hcc.identifier]
-    else:
-        result = all_hccs
-    return result
+        statement = statement.where(
+            get_historical_coverage_configuration_identifier_expression().contains(
+                identifier_filter, autoescape=True
+            )
+        )
+    return collect_all_records(session, statement)
+
+
+def get_historical_coverage_configuration_identifier_expression():
+    """Return an SQL expression rendering historical coverage configuration identifiers.
+
+    This mirrors ``HistoricalCoverageConfiguration.identifier``, allowing to filter
+    and sort on identifiers in the DB.
+    """
+    return (
+        sqlalchemy.literal(f"{DataCategory.HISTORICAL.value}-")
+        + get_climatic_indicator_identifier_expression(
+            HistoricalCoverageConfiguration.climatic_indicator_id
+        )
+        + "-"
+        + get_related_name_expression(
+            SpatialRegion, HistoricalCoverageConfiguration.spatial_region_id
+        )
+        + "-"
+        + get_related_name_expression(
+            HistoricalYearPeriodGroup,
+            HistoricalCoverageConfiguration.year_period_group_id,
+        )
+        + sqlalchemy.func.coalesce(
+            "-" + lower_enum_name(HistoricalCoverageConfiguration.reference_period),
+            "",
+        )
+    )
 
 
 def get_historical_coverage_configuration(
@@ -389,56 +433,62 @@ def generate_historical_coverages_from_configuration(
     return result
 
 
-def legacy_collect_all_historical_coverage_configurations(
+def legacy_list_historical_coverage_configurations(
     session: sqlmodel.Session,
     *,
+    limit: int = 20,
+    offset: int = 0,
+    include_total: bool = False,
     name_filter: Optional[str] = None,
-    conf_param_filter: Optional[LegacyConfParamFilterValues] = None,
-) -> Sequence[HistoricalCoverageConfiguration]:
-    """Collect all historical coverage configurations.
+    conf_param_filter: Optional[LegacyConfParamFilterValues],
+):
+    """List historical coverage configurations.
 
     NOTE:
 
     This function supports a bunch of search filters that were previously provided by
     the more generic `configuration_parameter` instances, which were available in
     an early version of the project. This is kept only for compatibility reasons -
-    newer code should use `collect_all_historical_coverage_configurations()` instead.
+    newer code should use `list_historical_coverage_configurations()` instead.
     """
-    _, num_total = legacy_list_historical_coverage_configurations(
-        session,
-        limit=1,
-        include_total=True,
+    statement = _get_legacy_historical_coverage_configurations_statement(
         name_filter=name_filter,
         conf_param_filter=conf_param_filter,
     )
-    result, _ = legacy_list_historical_coverage_configurations(
-        session,
-        limit=num_total,
-        include_total=False,
-        name_filter=name_filter,
-        conf_param_filter=conf_param_filter,
-    )
-    return result
+    items = session.exec(statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
 
 
-def legacy_list_historical_coverage_configurations(
+def legacy_collect_all_historical_coverage_configurations(
     session: sqlmodel.Session,
     *,
-    limit: int = 20,
-    offset: int = 0,
-    include_total: bool = False,
     name_filter: Optional[str] = None,
-    conf_param_filter: Optional[LegacyConfParamFilterValues],
-):
-    """List historical coverage configurations.
+    conf_param_filter: Optional[LegacyConfParamFilterValues] = None,
+) -> Sequence[HistoricalCoverageConfiguration]:
+    """Collect all historical coverage configurations.
 
     NOTE:
 
     This function supports a bunch of search filters that were previously provided by
     the more generic `configuration_parameter` instances, which were available in
     an early version of the project. This is kept only for compatibility reasons -
-    newer code should use `list_historical_coverage_configurations()` instead.
+    newer code should use `collect_all_historical_coverage_configurations()` instead.
     """
+    return collect_all_records(
+        session,
+        _get_legacy_historical_coverage_configurations_statement(
+            name_filter=name_filter,
+            conf_param_filter=conf_param_filter,
+        ),
+    )
+
+
+def _get_legacy_historical_coverage_configurations_statement(
+    *,
+    name_filter: Optional[str] = None,
+    conf_param_filter: Optional[LegacyConfParamFilterValues],
+):
     statement = (
         sqlmodel.select(HistoricalCoverageConfiguration)
         .join(
@@ -495,9 +545,7 @@ def legacy_list_historical_coverage_configurations(
                 conf_param_filter.historical_year_period.name
                 == sqlalchemy.any_(HistoricalYearPeriodGroup.year_periods)
             )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
+    return statement
 
 
 def get_historical_coverage(
@@ -622,6 +670,28 @@ def list_historical_coverages(
     offset: Optional[int] = 0,
     include_total: bool = False,
 ) -> tuple[list[HistoricalCoverageInternal], int]:
+    result = collect_all_historical_coverages(
+        session,
+        climatological_variable_filter=climatological_variable_filter,
+        aggregation_period_filter=aggregation_period_filter,
+        measure_filter=measure_filter,
+        year_period_filter=year_period_filter,
+        reference_period_filter=reference_period_filter,
+        decade_filter=decade_filter,
+    )
+    return result[offset : offset + limit], len(result) if include_total else None
+
+
+def collect_all_historical_coverages(
+    session: sqlmodel.Session,
+    *,
+    climatological_variable_filter: Optional[list[str]] = None,
+    aggregation_period_filter: Optional[list[AggregationPeriod]] = None,
+    measure_filter: Optional[list[MeasureType]] = None,
+    year_period_filter: Optional[list[HistoricalYearPeriod]] = None,
+    reference_period_filter: Optional[list[HistoricalReferencePeriod]] = None,
+    decade_filter: Optional[list[HistoricalDecade]] = None,
+) -> list[HistoricalCoverageInternal]:
     climatic_indicators = collect_all_climatic_indicators(
         session,
         name_filter=climatological_variable_filter,
@@ -683,41 +753,6 @@ def list_historical_coverages(
                         is_eligible = False
                     if is_eligible:
                         result.append(candidate)
-    return result[offset : offset + limit], len(result) if include_total else None
-
-
-def collect_all_historical_coverages(
-    session: sqlmodel.Session,
-    *,
-    climatological_variable_filter: Optional[list[str]] = None,
-    aggregation_period_filter: Optional[list[AggregationPeriod]] = None,
-    measure_filter: Optional[list[MeasureType]] = None,
-    year_period_filter: Optional[list[HistoricalYearPeriod]] = None,
-    reference_period_filter: Optional[list[HistoricalReferencePeriod]] = None,
-    decade_filter: Optional[list[HistoricalDecade]] = None,
-):
-    _, num_total = list_historical_coverages(
-        session,
-        limit=1,
-        include_total=True,
-        climatological_variable_filter=climatological_variable_filter,
-        aggregation_period_filter=aggregation_period_filter,
-        measure_filter=measure_filter,
-        year_period_filter=year_period_filter,
-        reference_period_filter=reference_period_filter,
-        decade_filter=decade_filter,
-    )
-    result, _ = list_historical_coverages(
-        session,
-        limit=num_total,
-        include_total=False,
-        climatological_variable_filter=climatological_variable_filter,
-        aggregation_period_filter=aggregation_period_filter,
-        measure_filter=measure_filter,
-        year_period_filter=year_period_filter,
-        reference_period_filter=reference_period_filter,
-        decade_filter=decade_filter,
-    )
     return result
 
 
@@ -731,6 +766,35 @@ def list_historical_year_period_groups(
     include_total: bool = False,
 ) -> tuple[Sequence[HistoricalYearPeriodGroup], Optional[int]]:
     """List existing historical year period groups."""
+    statement = _get_historical_year_period_groups_statement(
+        name_filter=name_filter,
+        perform_exact_matches=perform_exact_matches,
+    )
+    items = session.exec(statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def collect_all_historical_year_period_groups(
+    session: sqlmodel.Session,
+    *,
+    name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+):
+    return collect_all_records(
+        session,
+        _get_historical_year_period_groups_statement(
+            name_filter=name_filter,
+            perform_exact_matches=perform_exact_matches,
+        ),
+    )
+
+
+def _get_historical_year_period_groups_statement(
+    *,
+    name_filter: Optional[Union[list[str], str]] = None,
+    perform_exact_matches: bool = False,
+):
     statement = sqlmodel.select(HistoricalYearPeriodGroup).order_by(
         HistoricalYearPeriodGroup.sort_order  # noqa
     )
@@ -747,32 +811,7 @@ def list_historical_year_period_groups(
                 name_filter,
                 HistoricalYearPeriodGroup.name,  # noqa
             )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
-
-
-def collect_all_historical_year_period_groups(
-    session: sqlmodel.Session,
-    *,
-    name_filter: Optional[Union[list[str], str]] = None,
-    perform_exact_matches: bool = False,
-):
-    _, num_total = list_historical_year_period_groups(
-        session,
-        limit=1,
-        name_filter=name_filter,
-        perform_exact_matches=perform_exact_matches,
-        include_total=True,
-    )
-    result, _ = list_historical_year_period_groups(
-        session,
-        limit=num_total,
-        name_filter=name_filter,
-        perform_exact_matches=perform_exact_matches,
-        include_total=False,
-    )
-    return result
+    return statement
 
 
 def get_historical_year_period_group(
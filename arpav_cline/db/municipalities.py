@@ -1,3 +1,4 @@
+import uuid
 from typing import (
     Optional,
     Sequence,
@@ -14,11 +15,16 @@ from ..schemas.municipalities import (
     Municipality,
     MunicipalityCentroid,
     MunicipalityCreate,
+    MunicipalityGeoJsonFeature,
 )
+from ..schemas.static import MunicipalityGeometryResolution
 
 from .base import (
+    add_keyset_filter,
     add_substring_filter,
+    collect_all_records,
     get_total_num_records,
+    get_vector_tile,
 )
 
 
@@ -32,13 +38,20 @@ def list_municipality_centroids(
     name_filter: Optional[str] = None,
     province_name_filter: Optional[str] = None,
     region_name_filter: Optional[str] = None,
+    after_id: Optional[uuid.UUID] = None,
 ) -> tuple[Sequence[MunicipalityCentroid], Optional[int]]:
     """List existing municipality centroids.
 
     ``polygon_intersection_filter`` parameter is expected to be express a geometry in
     the EPSG:4326 CRS.
+
+    When ``after_id`` is given, only the centroids of the municipalities which come
+    after it are listed, which allows paginating without an offset.
     """
-    statement = sqlmodel.select(Municipality).order_by(Municipality.name)  # noqa
+    statement = sqlmodel.select(Municipality).order_by(
+        Municipality.name,  # noqa
+        Municipality.id,  # noqa
+    )
     if name_filter is not None:
         statement = add_substring_filter(
             statement,
@@ -66,7 +79,15 @@ def list_municipality_centroids(
                 ),
             )
         )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
+    page_statement = statement
+    if after_id is not None:
+        page_statement = add_keyset_filter(
+            statement,
+            Municipality.id,  # noqa
+            after_id,
+            Municipality.name,  # noqa
+        )
+    items = session.exec(page_statement.offset(offset).limit(limit)).all()
     num_items = get_total_num_records(session, statement) if include_total else None
     return [
         MunicipalityCentroid(
@@ -94,14 +115,149 @@ def list_municipalities(
     name_filter: Optional[str] = None,
     province_name_filter: Optional[str] = None,
     region_name_filter: Optional[str] = None,
+    after_id: Optional[uuid.UUID] = None,
 ) -> tuple[Sequence[Municipality], Optional[int]]:
     """List existing municipalities.
 
     Both ``polygon_intersection_filter`` and ``point_filter`` parameters are expected
     to be a geometries in the EPSG:4326 CRS.
+
+    When ``after_id`` is given, only the municipalities which come after it are
+    listed, which allows paginating without an offset.
+    """
+    statement = _get_municipalities_statement(
+        polygon_intersection_filter=polygon_intersection_filter,
+        point_filter=point_filter,
+        name_filter=name_filter,
+        province_name_filter=province_name_filter,
+        region_name_filter=region_name_filter,
+    )
+    page_statement = statement
+    if after_id is not None:
+        page_statement = add_keyset_filter(
+            statement,
+            Municipality.id,  # noqa
+            after_id,
+            Municipality.name,  # noqa
+        )
+    items = session.exec(page_statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def list_municipality_geojson_features(
+    session: sqlmodel.Session,
+    *,
+    resolution: MunicipalityGeometryResolution = MunicipalityGeometryResolution.FULL,
+    limit: int = 20,
+    offset: int = 0,
+    include_total: bool = False,
+    polygon_intersection_filter: shapely.Polygon = None,
+    point_filter: shapely.Point = None,
+    name_filter: Optional[str] = None,
+    province_name_filter: Optional[str] = None,
+    region_name_filter: Optional[str] = None,
+    id_filter: Optional[Sequence[uuid.UUID]] = None,
+    after_id: Optional[uuid.UUID] = None,
+) -> tuple[list[MunicipalityGeoJsonFeature], Optional[int]]:
+    """List municipalities, with their geometry already encoded as GeoJSON.
+
+    This is a leaner alternative to ``list_municipalities()``, which lets the DB
+    pick the geometry column that matches ``resolution`` and encode it, with the
+    coordinates rounded to the resolution's precision.
+
+    ``id_filter`` restricts results to the given municipalities, e.g. those
+    found by the in-memory municipality index.
     """
+    statement = _get_municipalities_statement(
+        polygon_intersection_filter=polygon_intersection_filter,
+        point_filter=point_filter,
+        name_filter=name_filter,
+        province_name_filter=province_name_filter,
+        region_name_filter=region_name_filter,
+        id_filter=id_filter,
+    )
+    page_statement = statement
+    if after_id is not None:
+        page_statement = add_keyset_filter(
+            statement,
+            Municipality.id,  # noqa
+            after_id,
+            Municipality.name,  # noqa
+        )
+    page_statement = page_statement.with_only_columns(
+        Municipality.id,  # noqa
+        Municipality.name,  # noqa
+        Municipality.province_name,  # noqa
+        Municipality.region_name,  # noqa
+        Municipality.centroid_epsg_4326_lon,  # noqa
+        Municipality.centroid_epsg_4326_lat,  # noqa
+        func.ST_AsGeoJSON(
+            _get_geometry_column(resolution), resolution.get_coordinate_precision()
+        ),
+    )
+    items = [
+        MunicipalityGeoJsonFeature(*row)
+        for row in session.execute(page_statement.offset(offset).limit(limit))
+    ]
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def get_municipalities_vector_tile(
+    session: sqlmodel.Session,
+    z: int,
+    x: int,
+    y: int,
+    *,
+    name_filter: Optional[str] = None,
+    province_name_filter: Optional[str] = None,
+    region_name_filter: Optional[str] = None,
+) -> bytes:
+    """Render municipalities as a Mapbox Vector Tile.
+
+    Geometries are taken at the resolution that suits the tile's zoom level.
+    """
+    return get_vector_tile(
+        session,
+        _get_municipalities_statement(
+            name_filter=name_filter,
+            province_name_filter=province_name_filter,
+            region_name_filter=region_name_filter,
+        ),
+        Municipality.geom,  # noqa
+        sqlalchemy.cast(Municipality.id, sqlalchemy.String).label("id"),  # noqa
+        Municipality.name,  # noqa
+        Municipality.province_name,  # noqa
+        Municipality.region_name,  # noqa
+        output_geom_column=_get_geometry_column(
+            MunicipalityGeometryResolution.from_zoom(z)
+        ),
+        layer_name="municipalities",
+        z=z,
+        x=x,
+        y=y,
+    )
+
+
+def collect_all_municipalities(
+    session: sqlmodel.Session,
+) -> Sequence[Municipality]:
+    return collect_all_records(session, _get_municipalities_statement())
+
+
+def _get_municipalities_statement(
+    *,
+    polygon_intersection_filter: shapely.Polygon = None,
+    point_filter: shapely.Point = None,
+    name_filter: Optional[str] = None,
+    province_name_filter: Optional[str] = None,
+    region_name_filter: Optional[str] = None,
+    id_filter: Optional[Sequence[uuid.UUID]] = None,
+):
     statement = sqlmodel.select(Municipality).order_by(
-        Municipality.name  # noqa
+        Municipality.name,  # noqa
+        Municipality.id,  # noqa
     )
     if name_filter is not None:
         statement = add_substring_filter(
@@ -137,17 +293,9 @@ def list_municipalities(
                 func.ST_GeomFromWKB(shapely.io.to_wkb(point_filter), 4326),
             )
         )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
-
-
-def collect_all_municipalities(
-    session: sqlmodel.Session,
-) -> Sequence[Municipality]:
-    _, num_total = list_municipalities(session, limit=1, include_total=True)
-    result, _ = list_municipalities(session, limit=num_total, include_total=False)
-    return result
+    if id_filter is not None:
+        statement = statement.where(Municipality.id.in_(id_filter))  # noqa
+    return statement
 
 
 def create_many_municipalities(
@@ -170,11 +318,55 @@ def create_many_municipalities(
     except sqlalchemy.exc.DBAPIError:
         raise
     else:
+        update_municipality_simplified_geometries(
+            session, municipality_ids=[r.id for r in db_records]
+        )
         for db_record in db_records:
             session.refresh(db_record)
         return db_records
 
 
+def update_municipality_simplified_geometries(
+    session: sqlmodel.Session,
+    municipality_ids: Optional[Sequence[uuid.UUID]] = None,
+) -> None:
+    """Compute the simplified geometries of municipalities, from their full geometry."""
+    statement = sqlalchemy.update(Municipality).values(
+        geom_simplified_medium=_get_simplified_geometry(
+            MunicipalityGeometryResolution.MEDIUM
+        ),
+        geom_simplified_low=_get_simplified_geometry(
+            MunicipalityGeometryResolution.LOW
+        ),
+    )
+    if municipality_ids is not None:
+        statement = statement.where(
+            Municipality.id.in_(municipality_ids)  # noqa
+        )
+    session.execute(statement)
+    session.commit()
+
+
+def _get_geometry_column(resolution: MunicipalityGeometryResolution):
+    simplified_geom_column = {
+        MunicipalityGeometryResolution.MEDIUM: Municipality.geom_simplified_medium,
+        MunicipalityGeometryResolution.LOW: Municipality.geom_simplified_low,
+    }.get(resolution)
+    if simplified_geom_column is None:
+        return Municipality.geom  # noqa
+    # fallback to the full geometry if the simplified one has not been computed
+    return func.coalesce(simplified_geom_column, Municipality.geom)
+
+
+def _get_simplified_geometry(resolution: MunicipalityGeometryResolution):
+    return func.ST_Multi(
+        func.ST_SimplifyPreserveTopology(
+            Municipality.geom,  # noqa
+            resolution.get_simplification_tolerance(),
+        )
+    )
+
+
 def delete_all_municipalities(session: sqlmodel.Session) -> None:
     """Delete all municipalities."""
     for db_municipality in collect_all_municipalities(session):
@@ -1,15 +1,22 @@
+import datetime as dt
+import io
 from typing import (
+    Iterable,
+    Iterator,
     Optional,
     Sequence,
 )
 
+import numpy as np
 import sqlalchemy
 import sqlmodel
 
 from .. import exceptions
 from ..schemas.observations import (
+    OBSERVATION_MEASUREMENT_UNIQUE_CONSTRAINT_NAME,
     ObservationMeasurement,
     ObservationMeasurementCreate,
+    ObservationMeasurementLoadResult,
     ObservationMeasurementUpdate,
     ObservationSeriesConfiguration,
     ObservationSeriesConfigurationCreate,
@@ -21,7 +28,9 @@ from ..schemas.static import (
 )
 
 from .base import (
+    collect_all_records,
     get_total_num_records,
+    stream_all_records,
 )
 from .climaticindicators import get_climatic_indicator_by_identifier
 from .observationstations import get_observation_station
@@ -44,6 +53,57 @@ def list_observation_measurements(
     include_total: bool = False,
 ) -> tuple[Sequence[ObservationMeasurement], Optional[int]]:
     """List existing observation measurements."""
+    statement = _get_observation_measurements_statement(
+        observation_station_id_filter=observation_station_id_filter,
+        climatic_indicator_id_filter=climatic_indicator_id_filter,
+        aggregation_type_filter=aggregation_type_filter,
+    )
+    items = session.exec(statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def collect_all_observation_measurements(
+    session: sqlmodel.Session,
+    *,
+    observation_station_id_filter: Optional[int] = None,
+    climatic_indicator_id_filter: Optional[int] = None,
+    aggregation_type_filter: Optional[MeasurementAggregationType] = None,
+) -> Sequence[ObservationMeasurement]:
+    return collect_all_records(
+        session,
+        _get_observation_measurements_statement(
+            observation_station_id_filter=observation_station_id_filter,
+            climatic_indicator_id_filter=climatic_indicator_id_filter,
+            aggregation_type_filter=aggregation_type_filter,
+        ),
+    )
+
+
+def stream_all_observation_measurements(
+    session: sqlmodel.Session,
+    *,
+    observation_station_id_filter: Optional[int] = None,
+    climatic_indicator_id_filter: Optional[int] = None,
+    aggregation_type_filter: Optional[MeasurementAggregationType] = None,
+) -> Iterator[ObservationMeasurement]:
+    """Iterate over observation measurements, without loading them all in memory."""
+    return stream_all_records(
+        session,
+        _get_observation_measurements_statement(
+            observation_station_id_filter=observation_station_id_filter,
+            climatic_indicator_id_filter=climatic_indicator_id_filter,
+            aggregation_type_filter=aggregation_type_filter,
+        ),
+    )
+
+
+def _get_observation_measurements_statement(
+    *,
+    observation_station_id_filter: Optional[int] = None,
+    climatic_indicator_id_filter: Optional[int] = None,
+    aggregation_type_filter: Optional[MeasurementAggregationType] = None,
+):
     statement = sqlmodel.select(ObservationMeasurement).order_by(
         ObservationMeasurement.date  # noqa
     )
@@ -62,35 +122,85 @@ def list_observation_measurements(
             ObservationMeasurement.measurement_aggregation_type  # noqa
             == aggregation_type_filter.name
         )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
+    return statement
 
 
-def collect_all_observation_measurements(
+def get_observation_measurement_series(
     session: sqlmodel.Session,
     *,
-    observation_station_id_filter: Optional[int] = None,
-    climatic_indicator_id_filter: Optional[int] = None,
-    aggregation_type_filter: Optional[MeasurementAggregationType] = None,
-) -> Sequence[ObservationMeasurement]:
-    _, num_total = list_observation_measurements(
-        session,
-        limit=1,
-        observation_station_id_filter=observation_station_id_filter,
-        climatic_indicator_id_filter=climatic_indicator_id_filter,
-        aggregation_type_filter=aggregation_type_filter,
-        include_total=True,
+    observation_station_id: int,
+    climatic_indicator_id: int,
+    aggregation_type: MeasurementAggregationType,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Retrieve the dates and values of a station's measurements, sorted by date.
+
+    Only the two relevant columns are selected, which allows postgres to answer
+    the query straight from the measurements unique index, and rows are loaded
+    directly into numpy arrays, without building ORM instances.
+    """
+    statement = (
+        sqlalchemy.select(
+            ObservationMeasurement.date,  # noqa
+            ObservationMeasurement.value,  # noqa
+        )
+        .where(
+            ObservationMeasurement.observation_station_id  # noqa
+            == observation_station_id,
+            ObservationMeasurement.climatic_indicator_id  # noqa
+            == climatic_indicator_id,
+            ObservationMeasurement.measurement_aggregation_type  # noqa
+            == aggregation_type.name,
+        )
+        .order_by(ObservationMeasurement.date)  # noqa
     )
-    result, _ = list_observation_measurements(
-        session,
-        limit=num_total,
-        observation_station_id_filter=observation_station_id_filter,
-        climatic_indicator_id_filter=climatic_indicator_id_filter,
-        aggregation_type_filter=aggregation_type_filter,
-        include_total=False,
+    rows = session.execute(statement).all()
+    dates = np.fromiter((r[0] for r in rows), dtype="datetime64[D]", count=len(rows))
+    values = np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))
+    return dates, values
+
+
+def get_latest_observation_measurement_dates(
+    session: sqlmodel.Session,
+    *,
+    observation_station_ids: Optional[Sequence[int]] = None,
+    climatic_indicator_ids: Optional[Sequence[int]] = None,
+) -> dict[tuple[int, int, MeasurementAggregationType], dt.date]:
+    """Return the date of the most recent measurement of each series.
+
+    The result is keyed by ``(observation_station_id, climatic_indicator_id,
+    aggregation_type)``. Series without any measurement are not included.
+    """
+    statement = sqlalchemy.select(
+        ObservationMeasurement.observation_station_id,  # noqa
+        ObservationMeasurement.climatic_indicator_id,  # noqa
+        ObservationMeasurement.measurement_aggregation_type,  # noqa
+        sqlalchemy.func.max(ObservationMeasurement.date),  # noqa
+    ).group_by(
+        ObservationMeasurement.observation_station_id,  # noqa
+        ObservationMeasurement.climatic_indicator_id,  # noqa
+        ObservationMeasurement.measurement_aggregation_type,  # noqa
     )
-    return result
+    if observation_station_ids is not None:
+        statement = statement.where(
+            ObservationMeasurement.observation_station_id.in_(  # noqa
+                observation_station_ids
+            )
+        )
+    if climatic_indicator_ids is not None:
+        statement = statement.where(
+            ObservationMeasurement.climatic_indicator_id.in_(  # noqa
+                climatic_indicator_ids
+            )
+        )
+    return {
+        (station_id, indicator_id, aggregation_type): latest_date
+        for (
+            station_id,
+            indicator_id,
+            aggregation_type,
+            latest_date,
+        ) in session.execute(statement)
+    }
 
 
 def create_observation_measurement(
@@ -137,6 +247,120 @@ def create_many_observation_measurements(
         return db_records
 
 
+class _CopyStream(io.RawIOBase):
+    """Expose an iterator of text lines as a readable stream, suitable for COPY."""
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while len(self._buffer) < len(buffer):
+            try:
+                self._buffer += next(self._lines).encode("utf-8")
+            except StopIteration:
+                break
+        chunk, self._buffer = self._buffer[: len(buffer)], self._buffer[len(buffer) :]
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def _serialize_measurements_for_copy(
+    measurements: Iterable[ObservationMeasurementCreate],
+) -> Iterator[str]:
+    for measurement in measurements:
+        yield (
+            f"{measurement.observation_station_id}\t"
+            f"{measurement.climatic_indicator_id}\t"
+            f"{measurement.measurement_aggregation_type.name}\t"
+            f"{measurement.date.isoformat()}\t"
+            f"{measurement.value!r}\n"
+        )
+
+
+def bulk_load_observation_measurements(
+    session: sqlmodel.Session,
+    measurements: Iterable[ObservationMeasurementCreate],
+    *,
+    update_existing: bool = False,
+    return_ids: bool = False,
+) -> ObservationMeasurementLoadResult:
+    """Load a large number of observation measurements efficiently.
+
+    Measurements are streamed into a temporary staging table with PostgreSQL's
+    ``COPY`` and are then merged into the main table with a single statement.
+    Existing measurements are either skipped or, if ``update_existing`` is true,
+    have their value overwritten. When there are repeated measurements in the
+    input, the last one wins.
+
+    The input is consumed lazily, so it can be a generator. Only counts are
+    returned, unless ``return_ids`` is true, in which case the ids of the
+    inserted measurements are also included.
+    """
+    connection = session.connection()
+    connection.exec_driver_sql(
+        "CREATE TEMPORARY TABLE IF NOT EXISTS observationmeasurement_staging ("
+        "seq bigserial, "
+        "observation_station_id integer, "
+        "climatic_indicator_id integer, "
+        "measurement_aggregation_type text, "
+        "date date, "
+        "value double precision"
+        ") ON COMMIT DROP"
+    )
+    connection.exec_driver_sql("TRUNCATE observationmeasurement_staging")
+    with connection.connection.cursor() as cursor:
+        cursor.copy_expert(
+            "COPY observationmeasurement_staging ("
+            "observation_station_id, climatic_indicator_id, "
+            "measurement_aggregation_type, date, value"
+            ") FROM STDIN",
+            _CopyStream(_serialize_measurements_for_copy(measurements)),
+        )
+    conflict_action = (
+        "DO UPDATE SET value = excluded.value" if update_existing else "DO NOTHING"
+    )
+    # postgres sets the system column `xmax` to zero on freshly inserted rows,
+    # which allows telling apart inserts from updates
+    merge_result = connection.exec_driver_sql(
+        "INSERT INTO observationmeasurement ("
+        "observation_station_id, climatic_indicator_id, "
+        "measurement_aggregation_type, date, value"
+        ") "
+        "SELECT DISTINCT ON ("
+        "observation_station_id, climatic_indicator_id, "
+        "measurement_aggregation_type, date"
+        ") "
+        "observation_station_id, climatic_indicator_id, "
+        "measurement_aggregation_type::measurementaggregationtype, date, value "
+        "FROM observationmeasurement_staging "
+        "ORDER BY observation_station_id, climatic_indicator_id, "
+        "measurement_aggregation_type, date, seq DESC "
+        f"ON CONFLICT ON CONSTRAINT {OBSERVATION_MEASUREMENT_UNIQUE_CONSTRAINT_NAME} "
+        f"{conflict_action} "
+        "RETURNING id, xmax = 0"
+    )
+    num_inserted = 0
+    num_updated = 0
+    inserted_ids = [] if return_ids else None
+    for measurement_id, inserted in merge_result:
+        if inserted:
+            num_inserted += 1
+            if return_ids:
+                inserted_ids.append(measurement_id)
+        else:
+            num_updated += 1
+    session.commit()
+    return ObservationMeasurementLoadResult(
+        num_inserted=num_inserted,
+        num_updated=num_updated,
+        inserted_ids=inserted_ids,
+    )
+
+
 def delete_observation_measurement(
     session: sqlmodel.Session, observation_measurement_id: int
 ) -> None:
@@ -195,9 +419,7 @@ def list_observation_series_configurations(
     include_total: bool = False,
 ) -> tuple[Sequence[ObservationSeriesConfiguration], Optional[int]]:
     """List existing observation series configurations."""
-    statement = sqlmodel.select(ObservationSeriesConfiguration).order_by(
-        ObservationSeriesConfiguration.id  # noqa
-    )
+    statement = _get_observation_series_configurations_statement()
     items = session.exec(statement.offset(offset).limit(limit)).all()
     num_items = get_total_num_records(session, statement) if include_total else None
     return items, num_items
@@ -207,17 +429,16 @@ def collect_all_observation_series_configurations(
     session: sqlmodel.Session,
 ) -> Sequence[ObservationSeriesConfiguration]:
     """Collect all observation series configurations."""
-    _, num_total = list_observation_series_configurations(
+    return collect_all_records(
         session,
-        limit=1,
-        include_total=True,
+        _get_observation_series_configurations_statement(),
     )
-    result, _ = list_observation_series_configurations(
-        session,
-        limit=num_total,
-        include_total=False,
+
+
+def _get_observation_series_configurations_statement():
+    return sqlmodel.select(ObservationSeriesConfiguration).order_by(
+        ObservationSeriesConfiguration.id  # noqa
     )
-    return result
 
 
 def create_observation_series_configuration(
@@ -263,32 +484,3 @@ def delete_observation_series_configuration(
         session.commit()
     else:
         raise RuntimeError("Observation series configuration not found")
-
-
-def find_new_station_measurements(
-    session: sqlmodel.Session,
-    *,
-    station_id: int,
-    candidates: Sequence[ObservationMeasurementCreate],
-) -> list[ObservationMeasurementCreate]:
-    """Filter the list of candidate measurements, leaving only those that are new."""
-    existing_measurements = collect_all_observation_measurements(
-        session, observation_station_id_filter=station_id
-    )
-    to_drop = []
-    for candidate in candidates:
-        for existing in existing_measurements:
-            is_same_aggregation_type = (
-                candidate.measurement_aggregation_type
-                == existing.measurement_aggregation_type
-            )
-            is_same_date = candidate.date == existing.date
-            is_same_climatic_indicator = (
-                candidate.climatic_indicator_id == existing.climatic_indicator.id
-            )
-            if all(
-                (is_same_aggregation_type, is_same_climatic_indicator, is_same_date)
-            ):
-                to_drop.append(candidate.identifier)
-                break
-    return [m for m in candidates if m.identifier not in to_drop]
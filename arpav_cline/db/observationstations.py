@@ -1,14 +1,17 @@
 import logging
+import math
 from typing import (
     Optional,
     Sequence,
 )
 
+import geoalchemy2
 import shapely
 import sqlalchemy
 import sqlmodel
 from geoalchemy2.shape import from_shape
 from sqlalchemy import func
+from sqlalchemy.dialects import postgresql
 
 from ..schemas.observations import (
     ObservationStation,
@@ -21,13 +24,22 @@ from ..schemas.static import (
 )
 
 from .base import (
+    add_keyset_filter,
     add_substring_filter,
+    collect_all_records,
     get_total_num_records,
+    get_vector_tile,
 )
 from .climaticindicators import get_climatic_indicator
 
 logger = logging.getLogger(__name__)
 
+# the shortest length of a degree of latitude, which is found at the equator, and
+# the length of a degree of longitude at the equator
+_MIN_METERS_PER_DEGREE_OF_LATITUDE = 110_574
+_METERS_PER_DEGREE_OF_LONGITUDE_AT_EQUATOR = 111_319
+_NUM_NEAREST_STATION_CANDIDATES = 16
+
 
 def get_observation_station(
     session: sqlmodel.Session, observation_station_id: int
@@ -62,14 +74,95 @@ def list_observation_stations(
     polygon_intersection_filter: Optional[shapely.Polygon] = None,
     manager_filter: Optional[ObservationStationManager] = None,
     climatic_indicator_id_filter: Optional[int] = None,
+    after_id: Optional[int] = None,
 ) -> tuple[Sequence[ObservationStation], Optional[int]]:
     """List existing observation stations.
 
+    The ``polygon_intersection_filter`` parameter is expected to be a polygon
+    geometry in the EPSG:4326 CRS.
+
+    When ``after_id`` is given, only the stations which come after it are listed,
+    which allows paginating without an offset.
+    """
+    statement = _get_observation_stations_statement(
+        name_filter=name_filter,
+        polygon_intersection_filter=polygon_intersection_filter,
+        manager_filter=manager_filter,
+        climatic_indicator_id_filter=climatic_indicator_id_filter,
+    )
+    page_statement = statement
+    if after_id is not None:
+        page_statement = add_keyset_filter(
+            statement,
+            ObservationStation.id,  # noqa
+            after_id,
+            ObservationStation.code,  # noqa
+        )
+    items = session.exec(page_statement.offset(offset).limit(limit)).all()
+    num_items = get_total_num_records(session, statement) if include_total else None
+    return items, num_items
+
+
+def collect_all_observation_stations(
+    session: sqlmodel.Session,
+    polygon_intersection_filter: Optional[shapely.Polygon] = None,
+    manager_filter: Optional[ObservationStationManager] = None,
+    climatic_indicator_id_filter: Optional[int] = None,
+) -> Sequence[ObservationStation]:
+    """Collect all observation stations.
+
     The ``polygon_intersection_filter`` parameter is expected to be a polygon
     geometry in the EPSG:4326 CRS.
     """
+    return collect_all_records(
+        session,
+        _get_observation_stations_statement(
+            polygon_intersection_filter=polygon_intersection_filter,
+            manager_filter=manager_filter,
+            climatic_indicator_id_filter=climatic_indicator_id_filter,
+        ),
+    )
+
+
+def get_observation_stations_vector_tile(
+    session: sqlmodel.Session,
+    z: int,
+    x: int,
+    y: int,
+    *,
+    manager_filter: Optional[ObservationStationManager] = None,
+    climatic_indicator_id_filter: Optional[int] = None,
+) -> bytes:
+    """Render observation stations as a Mapbox Vector Tile."""
+    return get_vector_tile(
+        session,
+        _get_observation_stations_statement(
+            manager_filter=manager_filter,
+            climatic_indicator_id_filter=climatic_indicator_id_filter,
+        ),
+        ObservationStation.geom,  # noqa
+        ObservationStation.id,  # noqa
+        ObservationStation.code,  # noqa
+        ObservationStation.name,  # noqa
+        ObservationStation.managed_by,  # noqa
+        ObservationStation.altitude_m,  # noqa
+        layer_name="stations",
+        z=z,
+        x=x,
+        y=y,
+    )
+
+
+def _get_observation_stations_statement(
+    *,
+    name_filter: Optional[str] = None,
+    polygon_intersection_filter: Optional[shapely.Polygon] = None,
+    manager_filter: Optional[ObservationStationManager] = None,
+    climatic_indicator_id_filter: Optional[int] = None,
+):
     statement = sqlmodel.select(ObservationStation).order_by(
-        ObservationStation.code  # noqa
+        ObservationStation.code,  # noqa
+        ObservationStation.id,  # noqa
     )
     if name_filter is not None:
         statement = add_substring_filter(
@@ -99,39 +192,105 @@ def list_observation_stations(
             ObservationStationClimaticIndicatorLink.climatic_indicator_id  # noqa
             == climatic_indicator_id_filter,
         )
-    items = session.exec(statement.offset(offset).limit(limit)).all()
-    num_items = get_total_num_records(session, statement) if include_total else None
-    return items, num_items
+    return statement
 
 
-def collect_all_observation_stations(
+def get_climatic_indicator_stations_view_name(
+    climatic_indicator_identifier: str,
+) -> str:
+    """Return the name of the materialized view with an indicator's stations."""
+    sanitized_identifier = (
+        climatic_indicator_identifier.lower().replace(" ", "_").replace("-", "_")
+    )
+    return f"stations_{sanitized_identifier}"
+
+
+def find_nearest_observation_station(
     session: sqlmodel.Session,
-    polygon_intersection_filter: Optional[shapely.Polygon] = None,
-    manager_filter: Optional[ObservationStationManager] = None,
-    climatic_indicator_id_filter: Optional[int] = None,
-) -> Sequence[ObservationStation]:
-    """Collect all observation stations.
+    point_geom: shapely.Point,
+    *,
+    max_distance_meters: float,
+    climatic_indicator_identifier: Optional[str] = None,
+    stations_view_db_schema: Optional[str] = None,
+) -> Optional[tuple[ObservationStation, float]]:
+    """Find the station nearest to the input point, together with its distance.
 
-    The ``polygon_intersection_filter`` parameter is expected to be a polygon
-    geometry in the EPSG:4326 CRS.
+    The input point is expected to be in the EPSG:4326 CRS. Only stations closer
+    than ``max_distance_meters`` are considered.
+
+    When a climatic indicator is provided, the search is restricted to stations
+    that collect data for it, by means of the indicator's stations materialized
+    view, which lives in the ``stations_view_db_schema`` DB schema.
+
+    Stations are first narrowed down to the ones inside a bounding box that
+    contains the search radius and then the nearest ones are found with the
+    KNN distance operator, both of which use the GiST index on the stations'
+    geometries. KNN distances are in degrees though, which are not uniform
+    across directions, so the candidates are then ranked by their actual
+    distance in meters. This is all done in a single query.
     """
-    _, num_total = list_observation_stations(
-        session,
-        limit=1,
-        include_total=True,
-        polygon_intersection_filter=polygon_intersection_filter,
-        manager_filter=manager_filter,
-        climatic_indicator_id_filter=climatic_indicator_id_filter,
+    point = func.ST_GeomFromWKB(shapely.io.to_wkb(point_geom), 4326)
+    if climatic_indicator_identifier is not None:
+        source = sqlalchemy.table(
+            get_climatic_indicator_stations_view_name(climatic_indicator_identifier),
+            sqlalchemy.column("id"),
+            sqlalchemy.column("geom", geoalchemy2.Geometry("POINT", srid=4326)),
+            schema=stations_view_db_schema,
+        )
+        source_id = source.c.id
+        source_geom = source.c.geom
+    else:
+        source_id = ObservationStation.id  # noqa
+        source_geom = ObservationStation.geom  # noqa
+    candidates = (
+        sqlalchemy.select(source_id.label("id"), source_geom.label("geom"))
+        .where(
+            source_geom.intersects(
+                func.ST_MakeEnvelope(
+                    *_get_bounding_box(point_geom, max_distance_meters), 4326
+                )
+            )
+        )
+        .order_by(source_geom.distance_centroid(point))
+        .limit(_NUM_NEAREST_STATION_CANDIDATES)
+        .subquery()
     )
-    result, _ = list_observation_stations(
-        session,
-        limit=num_total,
-        include_total=False,
-        polygon_intersection_filter=polygon_intersection_filter,
-        manager_filter=manager_filter,
-        climatic_indicator_id_filter=climatic_indicator_id_filter,
+    geography = geoalchemy2.Geography(srid=4326)
+    distance = func.ST_Distance(
+        sqlalchemy.cast(candidates.c.geom, geography),
+        sqlalchemy.cast(point, geography),
+    )
+    statement = (
+        sqlmodel.select(ObservationStation, distance.label("distance"))
+        .join(candidates, candidates.c.id == ObservationStation.id)  # noqa
+        .where(distance <= max_distance_meters)
+        .order_by(distance)
+        .limit(1)
+    )
+    result = session.exec(statement).first()
+    return (result[0], result[1]) if result is not None else None
+
+
+def _get_bounding_box(
+    point_geom: shapely.Point, distance_meters: float
+) -> tuple[float, float, float, float]:
+    """Return a lon/lat box which contains all points within the distance.
+
+    The box is conservative - it uses the shortest lengths of a degree that can
+    be found inside it.
+    """
+    lat_delta = distance_meters / _MIN_METERS_PER_DEGREE_OF_LATITUDE
+    farthest_lat = min(abs(point_geom.y) + lat_delta, 89.9)
+    lon_delta = distance_meters / (
+        _METERS_PER_DEGREE_OF_LONGITUDE_AT_EQUATOR
+        * math.cos(math.radians(farthest_lat))
+    )
+    return (
+        point_geom.x - lon_delta,
+        point_geom.y - lat_delta,
+        point_geom.x + lon_delta,
+        point_geom.y + lat_delta,
     )
-    return result
 
 
 def create_observation_station(
@@ -206,6 +365,74 @@ def create_many_observation_stations(
         return db_records
 
 
+def upsert_observation_stations(
+    session: sqlmodel.Session,
+    stations: Sequence[ObservationStationCreate],
+) -> list[ObservationStation]:
+    """Create missing observation stations and link stations to climatic indicators.
+
+    Stations are matched by their code. Existing stations are not modified,
+    other than gaining links to any climatic indicators listed in their
+    ``climatic_indicators`` attribute - existing links are never removed.
+
+    Everything is done in two statements, regardless of the number of stations.
+    Returns the stations that have been created.
+    """
+    if len(stations) == 0:
+        return []
+    insert_statement = (
+        postgresql.insert(ObservationStation)
+        .values(
+            [
+                {
+                    **station.model_dump(exclude={"geom", "climatic_indicators"}),
+                    "geom": from_shape(
+                        shapely.io.from_geojson(station.geom.model_dump_json()),
+                        srid=4326,
+                    ),
+                }
+                for station in stations
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=[ObservationStation.code])
+        .returning(ObservationStation)
+    )
+    created = list(session.scalars(insert_statement))
+    codes = {station.code for station in stations}
+    links = [
+        (station.code, climatic_indicator_id)
+        for station in stations
+        for climatic_indicator_id in set(station.climatic_indicators or [])
+    ]
+    if len(links) > 0:
+        link_table = ObservationStationClimaticIndicatorLink.__table__
+        links_data = sqlalchemy.values(
+            sqlalchemy.column("code", sqlalchemy.String),
+            sqlalchemy.column("climatic_indicator_id", sqlalchemy.Integer),
+            name="links_data",
+        ).data(links)
+        session.execute(
+            postgresql.insert(link_table)
+            .from_select(
+                ["observation_station_id", "climatic_indicator_id"],
+                sqlalchemy.select(
+                    ObservationStation.id,  # noqa
+                    links_data.c.climatic_indicator_id,
+                ).join(
+                    links_data,
+                    links_data.c.code == ObservationStation.code,  # noqa
+                ),
+            )
+            .on_conflict_do_nothing()
+        )
+    session.commit()
+    logger.debug(
+        f"Upserted {len(codes)} stations ({len(created)} new) and "
+        f"{len(links)} climatic indicator links"
+    )
+    return created
+
+
 def update_observation_station(
     session: sqlmodel.Session,
     db_observation_station: ObservationStation,
@@ -2,6 +2,7 @@ from typing import (
     Optional,
     Sequence,
 )
+import sqlalchemy
 import sqlmodel
 
 from .. import exceptions
@@ -18,8 +19,14 @@ from ..schemas.overviews import (
 from ..schemas.static import (
     DataCategory,
 )
-from .base import get_total_num_records
-from .climaticindicators import get_climatic_indicator_by_identifier
+from .base import (
+    collect_all_records,
+    get_total_num_records,
+)
+from .climaticindicators import (
+    get_climatic_indicator_by_identifier,
+    get_climatic_indicator_identifier_expression,
+)
 
 
 def list_forecast_overview_series_configurations(
@@ -30,9 +37,7 @@ def list_forecast_overview_series_configurations(
     include_total: bool = False,
 ) -> tuple[Sequence[ForecastOverviewSeriesConfiguration], Optional[int]]:
     """List existing forecast overview series configurations."""
-    statement = sqlmodel.select(ForecastOverviewSeriesConfiguration).order_by(
-        ForecastOverviewSeriesConfiguration.id  # noqa
-    )
+    statement = _get_forecast_overview_series_configurations_statement()
     items = session.exec(statement.offset(offset).limit(limit)).all()
     num_items = get_total_num_records(session, statement) if include_total else None
     return items, num_items
@@ -41,17 +46,28 @@ def list_forecast_overview_series_configurations(
 def collect_all_forecast_overview_series_configurations(
     session: sqlmodel.Session,
 ) -> Sequence[ForecastOverviewSeriesConfiguration]:
-    _, num_total = list_forecast_overview_series_configurations(
+    return collect_all_records(
         session,
-        limit=1,
-        include_total=True,
+        _get_forecast_overview_series_configurations_statement(),
     )
-    result, _ = list_forecast_overview_series_configurations(
-        session,
-        limit=num_total,
-        include_total=False,
+
+
+def _get_forecast_overview_series_configurations_statement():
+    return sqlmodel.select(ForecastOverviewSeriesConfiguration).order_by(
+        ForecastOverviewSeriesConfiguration.id  # noqa
+    )
+
+
+def get_forecast_overview_identifier_expression():
+    """Return an SQL expression rendering forecast overview identifiers.
+
+    This mirrors ``ForecastOverviewSeriesConfiguration.identifier``.
+    """
+    return sqlalchemy.literal(
+        f"overview-{DataCategory.FORECAST.value}-"
+    ) + get_climatic_indicator_identifier_expression(
+        ForecastOverviewSeriesConfiguration.climatic_indicator_id  # noqa
     )
-    return result
 
 
 def get_forecast_overview_series_configuration(
@@ -144,9 +160,7 @@ def list_observation_overview_series_configurations(
     include_total: bool = False,
 ) -> tuple[Sequence[ObservationOverviewSeriesConfiguration], Optional[int]]:
     """List existing observation overview series configurations."""
-    statement = sqlmodel.select(ObservationOverviewSeriesConfiguration).order_by(
-        ObservationOverviewSeriesConfiguration.id
-    )  # noqa
+    statement = _get_observation_overview_series_configurations_statement()
     items = session.exec(statement.offset(offset).limit(limit)).all()
     num_items = get_total_num_records(session, statement) if include_total else None
     return items, num_items
@@ -155,17 +169,28 @@ def list_observation_overview_series_configurations(
 def collect_all_observation_overview_series_configurations(
     session: sqlmodel.Session,
 ) -> Sequence[ObservationOverviewSeriesConfiguration]:
-    _, num_total = list_observation_overview_series_configurations(
+    return collect_all_records(
         session,
-        limit=1,
-        include_total=True,
+        _get_observation_overview_series_configurations_statement(),
     )
-    result, _ = list_observation_overview_series_configurations(
-        session,
-        limit=num_total,
-        include_total=False,
+
+
+def _get_observation_overview_series_configurations_statement():
+    return sqlmodel.select(ObservationOverviewSeriesConfiguration).order_by(
+        ObservationOverviewSeriesConfiguration.id
+    )  # noqa
+
+
+def get_observation_overview_identifier_expression():
+    """Return an SQL expression rendering observation overview identifiers.
+
+    This mirrors ``ObservationOverviewSeriesConfiguration.identifier``.
+    """
+    return sqlalchemy.literal(
+        f"overview-{DataCategory.HISTORICAL.value}-"
+    ) + get_climatic_indicator_identifier_expression(
+        ObservationOverviewSeriesConfiguration.climatic_indicator_id  # noqa
     )
-    return result
 
 
 def get_observation_overview_series_configuration(
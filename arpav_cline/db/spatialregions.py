@@ -14,7 +14,10 @@ from ..schemas.base import (
     SpatialRegionUpdate,
 )
 
-from .base import get_total_num_records
+from .base import (
+    collect_all_records,
+    get_total_num_records,
+)
 
 
 def list_spatial_regions(
@@ -24,7 +27,7 @@ def list_spatial_regions(
     offset: int = 0,
     include_total: bool = False,
 ) -> tuple[Sequence[SpatialRegion], Optional[int]]:
-    statement = sqlmodel.select(SpatialRegion).order_by(SpatialRegion.name)  # noqa
+    statement = _get_spatial_regions_statement()
     items = session.exec(statement.offset(offset).limit(limit)).all()
     num_items = get_total_num_records(session, statement) if include_total else None
     return items, num_items
@@ -33,17 +36,11 @@ def list_spatial_regions(
 def collect_all_spatial_regions(
     session: sqlmodel.Session,
 ) -> Sequence[SpatialRegion]:
-    _, num_total = list_spatial_regions(
-        session,
-        limit=1,
-        include_total=True,
-    )
-    result, _ = list_spatial_regions(
-        session,
-        limit=num_total,
-        include_total=False,
-    )
-    return result
+    return collect_all_records(session, _get_spatial_regions_statement())
+
+
+def _get_spatial_regions_statement():
+    return sqlmodel.select(SpatialRegion).order_by(SpatialRegion.name)  # noqa
 
 
 def get_spatial_region(
@@ -120,3 +120,7 @@ class ObservationDataRetrievalError(ArpavError):
 
 class InvalidOverviewSeriesConfigurationIdentifierError(ArpavError):
     ...
+
+
+class DatasetMirrorError(ArpavError):
+    ...
@@ -1,9 +1,11 @@
 """Command-line interface for the project."""
 
+import functools
 import logging
 import logging.config
 import os
 import sys
+import tempfile
 from typing import Annotated, Optional
 from pathlib import Path
 
@@ -27,6 +29,7 @@ from rich.panel import Panel
 from . import (
     config,
     db,
+    metrics,
 )
 from .bootstrapper.cliapp import app as bootstrapper_app
 from .observations_harvester.cliapp import app as observations_harvester_app
@@ -162,6 +165,18 @@ def run_server(ctx: typer.Context):
         style="green",
     )
     print(Padding(panel, 1))
+    # metrics must be aggregated across worker processes, which requires a
+    # directory that is shared between them
+    metrics_dir = settings.metrics_multiprocess_dir
+    if (
+        metrics_dir is None
+        and not metrics.is_multiprocess()
+        and settings.num_uvicorn_worker_processes > 1
+    ):
+        metrics_dir = Path(tempfile.mkdtemp(prefix="arpav-cline-metrics-"))
+    if metrics_dir is not None:
+        metrics.prepare_multiprocess_dir(metrics_dir)
+        os.environ[metrics.MULTIPROCESS_DIR_ENV_VAR] = str(metrics_dir)
     sys.stdout.flush()
     sys.stderr.flush()
     os.execvp("uvicorn", uvicorn_args)
@@ -206,8 +221,51 @@ def import_thredds_datasets(
             )
         ),
     ] = False,
+    max_concurrent_downloads: Annotated[
+        Optional[int],
+        typer.Option(
+            help=(
+                "How many datasets to download concurrently. If not provided, the "
+                "value is taken from the settings."
+            )
+        ),
+    ] = None,
+    manifest_path: Annotated[
+        Optional[Path],
+        typer.Option(
+            help=(
+                "Where to write the JSON manifest describing the mirrored datasets. "
+                "If not provided, it is written to the output base dir."
+            )
+        ),
+    ] = None,
+    change_list_path: Annotated[
+        Optional[Path],
+        typer.Option(
+            help=(
+                "Where to write the JSON list of datasets that were transferred by "
+                "this run. If not provided, it is written to the output base dir."
+            )
+        ),
+    ] = None,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            help=(
+                "Compare the size and modification date published in the THREDDS "
+                "catalogs with the ones recorded in the manifest and only "
+                "transfer datasets which are new or have changed."
+            )
+        ),
+    ] = False,
 ):
-    """Import NetCDF datasets from a THREDDS server."""
+    """Import NetCDF datasets from a THREDDS server.
+
+    Datasets are mirrored locally - partial downloads are resumed and datasets
+    that are already up to date are skipped, unless ``--force-download`` is used.
+    Each run writes a JSON change list with the datasets that were transferred,
+    which can be used for invalidating downstream caches.
+    """
     with sqlmodel.Session(ctx.obj["engine"]) as session:
         relevant_forecast_cov_confs = (
             db.collect_all_forecast_coverage_configurations_with_identifier_filter(
@@ -290,13 +348,31 @@ def import_thredds_datasets(
     print(f"Trying to download {len(urls)} datasets...")
     # for url in urls:
     #     print(url)
-    anyio.run(
-        crawler.download_datasets,  # noqa
-        urls,
-        base_thredds_url,
-        output_base_dir,
-        force_download,
+    mirror_settings = settings.dataset_mirror.model_copy()
+    if max_concurrent_downloads is not None:
+        mirror_settings.max_concurrent_downloads = max_concurrent_downloads
+    manifest = anyio.run(
+        functools.partial(
+            crawler.download_datasets,
+            urls,
+            base_thredds_url,
+            output_base_dir,
+            force_download,
+            mirror_settings=mirror_settings,
+            manifest_path=manifest_path,
+            change_list_path=change_list_path,
+            http_timeout_seconds=settings.http_client_timeout_seconds,
+            incremental=incremental,
+        )
+    )
+    summary = manifest.last_run
+    print(
+        f"Downloaded {summary.num_downloaded}, resumed {summary.num_resumed}, "
+        f"skipped {summary.num_skipped} and failed {summary.num_failed} datasets - "
+        f"transferred {summary.bytes_transferred} bytes in "
+        f"{summary.duration_seconds:.1f}s"
     )
+    print(f"{len(summary.changes)} datasets were added or modified")
 
 
 @translations_app.callback()
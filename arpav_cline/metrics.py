@@ -0,0 +1,182 @@
+"""Prometheus metrics, which are exposed by the web application at ``/metrics``.
+
+When the web application runs with more than one uvicorn worker process, each
+worker keeps its own metric values. In order for ``/metrics`` to report the
+values of all of them, regardless of which worker serves the request, metrics
+are then kept in files inside a directory that is shared by all processes. This
+is prometheus_client's multiprocess mode, which is enabled by setting the
+``PROMETHEUS_MULTIPROC_DIR`` environment variable before any process starts.
+Other processes, like the one harvesting observations, may share the same
+directory, in which case their metrics are also reported.
+"""
+
+import contextlib
+import enum
+import os
+import time
+from pathlib import Path
+from typing import Iterator
+
+import prometheus_client
+import sqlalchemy
+from prometheus_client import multiprocess
+
+MULTIPROCESS_DIR_ENV_VAR = "PROMETHEUS_MULTIPROC_DIR"
+
+_CONNECT_STARTED_INFO_KEY = "arpav_cline_connect_started"
+_THREDDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_DB_CONNECT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class ThreddsService(enum.Enum):
+    NCSS = "ncss"
+    WMS = "wms"
+    OPENDAP = "opendap"
+    CATALOG = "catalog"
+
+
+HTTP_REQUEST_DURATION = prometheus_client.Histogram(
+    "arpav_cline_http_request_duration_seconds",
+    "Time spent processing web requests",
+    ["method", "route", "status_code"],
+)
+THREDDS_REQUEST_DURATION = prometheus_client.Histogram(
+    "arpav_cline_thredds_request_duration_seconds",
+    "Time spent waiting for THREDDS",
+    ["service"],
+    buckets=_THREDDS_BUCKETS,
+)
+THREDDS_REQUEST_ERRORS = prometheus_client.Counter(
+    "arpav_cline_thredds_request_errors",
+    "Failed THREDDS requests",
+    ["service"],
+)
+CACHE_REQUESTS = prometheus_client.Counter(
+    "arpav_cline_cache_requests",
+    "Lookups of in-process caches",
+    ["cache", "result"],
+)
+DB_CONNECT_DURATION = prometheus_client.Histogram(
+    "arpav_cline_db_connect_duration_seconds",
+    "Time spent opening new DB connections for the pool",
+    buckets=_DB_CONNECT_BUCKETS,
+)
+DB_POOL_CONNECTIONS_IN_USE = prometheus_client.Gauge(
+    "arpav_cline_db_pool_connections_in_use",
+    "DB connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OPEN_CONNECTIONS = prometheus_client.Gauge(
+    "arpav_cline_db_pool_open_connections",
+    "DB connections currently opened by the pool, including the overflow ones",
+    multiprocess_mode="livesum",
+)
+HARVESTER_REQUESTS = prometheus_client.Counter(
+    "arpav_cline_harvester_requests",
+    "Requests made to the observation data providers' APIs",
+    ["client", "outcome"],
+)
+
+
+@contextlib.contextmanager
+def track_thredds_request(service: ThreddsService) -> Iterator[None]:
+    """Measure the duration of the THREDDS request made within the block.
+
+    The request is counted as failed if the block raises an exception. This can
+    also decorate a (non-async) function.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        count_thredds_error(service)
+        raise
+    finally:
+        THREDDS_REQUEST_DURATION.labels(service=service.value).observe(
+            time.perf_counter() - started
+        )
+
+
+def count_thredds_error(service: ThreddsService) -> None:
+    THREDDS_REQUEST_ERRORS.labels(service=service.value).inc()
+
+
+def count_cache_request(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def instrument_engine_pool(engine: sqlalchemy.Engine) -> None:
+    """Measure the usage of the engine's connection pool, by means of its events.
+
+    Gauges are kept up to date as the events fire, rather than by asking the
+    pool, whose counts do not yet reflect a connection being checked in while
+    its ``checkin`` event runs.
+    """
+    if not sqlalchemy.event.contains(engine, "checkout", _on_pool_checkout):
+        sqlalchemy.event.listen(engine, "do_connect", _on_before_connect)
+        sqlalchemy.event.listen(engine, "connect", _on_pool_connect)
+        sqlalchemy.event.listen(engine, "close", _on_pool_close)
+        sqlalchemy.event.listen(engine, "checkout", _on_pool_checkout)
+        sqlalchemy.event.listen(engine, "checkin", _on_pool_checkin)
+        sqlalchemy.event.listen(engine, "detach", _on_pool_detach)
+
+
+def _on_before_connect(dialect, connection_record, cargs, cparams) -> None:
+    if connection_record is not None:
+        connection_record.info[_CONNECT_STARTED_INFO_KEY] = time.perf_counter()
+
+
+def _on_pool_connect(dbapi_connection, connection_record) -> None:
+    DB_POOL_OPEN_CONNECTIONS.inc()
+    started = connection_record.info.pop(_CONNECT_STARTED_INFO_KEY, None)
+    if started is not None:
+        DB_CONNECT_DURATION.observe(time.perf_counter() - started)
+
+
+def _on_pool_close(dbapi_connection, connection_record) -> None:
+    DB_POOL_OPEN_CONNECTIONS.dec()
+
+
+def _on_pool_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    DB_POOL_CONNECTIONS_IN_USE.inc()
+
+
+def _on_pool_checkin(dbapi_connection, connection_record) -> None:
+    DB_POOL_CONNECTIONS_IN_USE.dec()
+
+
+def _on_pool_detach(dbapi_connection, connection_record) -> None:
+    # detached connections leave the pool, without ever being checked in
+    DB_POOL_OPEN_CONNECTIONS.dec()
+    DB_POOL_CONNECTIONS_IN_USE.dec()
+
+
+def is_multiprocess() -> bool:
+    return MULTIPROCESS_DIR_ENV_VAR in os.environ
+
+
+def prepare_multiprocess_dir(path: Path) -> None:
+    """Create the directory for multiprocess mode, removing stale metric files.
+
+    Metric files of dead processes are otherwise reported forever, so this must
+    be done before starting the processes which share the directory.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    for metric_file in path.glob("*.db"):
+        metric_file.unlink()
+
+
+def mark_process_dead() -> None:
+    """Stop reporting the live gauges of the current process."""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def generate_latest() -> bytes:
+    """Render the current metric values in the Prometheus text format."""
+    if is_multiprocess():
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry)
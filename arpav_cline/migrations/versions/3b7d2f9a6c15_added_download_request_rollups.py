@@ -0,0 +1,54 @@
+"""added download request rollups
+
+Revision ID: 3b7d2f9a6c15
+Revises: 5e1d7a3c9b24
+Create Date: 2026-10-19 16:02:47.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d2f9a6c15'
+down_revision: Union[str, None] = '5e1d7a3c9b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('downloadrequestdailyrollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('download_kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('climatological_variable', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('aggregation_period', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('measure_type', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('year_period', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('climatological_model', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('scenario', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('time_window', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('decade', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('reference_period', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('data_category', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('is_public_sector', sa.Boolean(), nullable=False),
+    sa.Column('download_reason', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('num_requests', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'download_kind', 'climatological_variable', 'aggregation_period', 'measure_type', 'year_period', 'climatological_model', 'scenario', 'time_window', 'decade', 'reference_period', 'data_category', 'is_public_sector', 'download_reason', name='uq_downloadrequestdailyrollup_day_dimensions')
+    )
+    op.create_index('ix_downloadrequestdailyrollup_day_brin', 'downloadrequestdailyrollup', ['day'], unique=False, postgresql_using='brin')
+    op.create_index('ix_forecastcoveragedownloadrequest_request_datetime_brin', 'forecastcoveragedownloadrequest', ['request_datetime'], unique=False, postgresql_using='brin')
+    op.create_index('ix_historicalcoveragedownloadrequest_request_datetime_brin', 'historicalcoveragedownloadrequest', ['request_datetime'], unique=False, postgresql_using='brin')
+    op.create_index('ix_timeseriesdownloadrequest_request_datetime_brin', 'timeseriesdownloadrequest', ['request_datetime'], unique=False, postgresql_using='brin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_timeseriesdownloadrequest_request_datetime_brin', table_name='timeseriesdownloadrequest', postgresql_using='brin')
+    op.drop_index('ix_historicalcoveragedownloadrequest_request_datetime_brin', table_name='historicalcoveragedownloadrequest', postgresql_using='brin')
+    op.drop_index('ix_forecastcoveragedownloadrequest_request_datetime_brin', table_name='forecastcoveragedownloadrequest', postgresql_using='brin')
+    op.drop_index('ix_downloadrequestdailyrollup_day_brin', table_name='downloadrequestdailyrollup', postgresql_using='brin')
+    op.drop_table('downloadrequestdailyrollup')
@@ -0,0 +1,47 @@
+"""added unique constraint to observation measurements
+
+Revision ID: 3b9e2d7c41a8
+Revises: c9c28c2f26da
+Create Date: 2026-10-19 10:12:31.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e2d7c41a8'
+down_revision: Union[str, None] = 'c9c28c2f26da'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # remove any pre-existing duplicates, keeping the oldest record
+    op.execute(
+        """
+        DELETE FROM observationmeasurement AS om
+        USING observationmeasurement AS other
+        WHERE om.observation_station_id = other.observation_station_id
+          AND om.climatic_indicator_id = other.climatic_indicator_id
+          AND om.measurement_aggregation_type = other.measurement_aggregation_type
+          AND om.date = other.date
+          AND om.id > other.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_observationmeasurement_station_indicator_aggregation_date',
+        'observationmeasurement',
+        ['observation_station_id', 'climatic_indicator_id', 'measurement_aggregation_type', 'date'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        'uq_observationmeasurement_station_indicator_aggregation_date',
+        'observationmeasurement',
+        type_='unique',
+    )
@@ -0,0 +1,44 @@
+"""added simplified municipality geometries
+
+Revision ID: 5e1d7a3c9b24
+Revises: 8a4f1e6b90c3
+Create Date: 2026-10-19 14:21:05.331870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from geoalchemy2 import Geometry
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1d7a3c9b24'
+down_revision: Union[str, None] = '8a4f1e6b90c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'municipality',
+        sa.Column('geom_simplified_medium', Geometry(geometry_type='MULTIPOLYGON', srid=4326, spatial_index=False, from_text='ST_GeomFromEWKT', name='geometry'), nullable=True),
+    )
+    op.add_column(
+        'municipality',
+        sa.Column('geom_simplified_low', Geometry(geometry_type='MULTIPOLYGON', srid=4326, spatial_index=False, from_text='ST_GeomFromEWKT', name='geometry'), nullable=True),
+    )
+    # tolerances must be kept in sync with MunicipalityGeometryResolution
+    op.execute(
+        """
+        UPDATE municipality SET
+            geom_simplified_medium = ST_Multi(ST_SimplifyPreserveTopology(geom, 0.0005)),
+            geom_simplified_low = ST_Multi(ST_SimplifyPreserveTopology(geom, 0.005))
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('municipality', 'geom_simplified_low')
+    op.drop_column('municipality', 'geom_simplified_medium')
@@ -0,0 +1,50 @@
+"""made observation measurement unique constraint covering
+
+Revision ID: 8a4f1e6b90c3
+Revises: 3b9e2d7c41a8
+Create Date: 2026-10-19 11:02:47.518920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4f1e6b90c3'
+down_revision: Union[str, None] = '3b9e2d7c41a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # the unique constraint also serves reading a station's series with an
+    # index-only scan, which needs the measurement value to be in the index
+    op.drop_constraint(
+        'uq_observationmeasurement_station_indicator_aggregation_date',
+        'observationmeasurement',
+        type_='unique',
+    )
+    op.execute(
+        """
+        ALTER TABLE observationmeasurement
+        ADD CONSTRAINT uq_observationmeasurement_station_indicator_aggregation_date
+        UNIQUE (observation_station_id, climatic_indicator_id, measurement_aggregation_type, date)
+        INCLUDE (value)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        'uq_observationmeasurement_station_indicator_aggregation_date',
+        'observationmeasurement',
+        type_='unique',
+    )
+    op.create_unique_constraint(
+        'uq_observationmeasurement_station_indicator_aggregation_date',
+        'observationmeasurement',
+        ['observation_station_id', 'climatic_indicator_id', 'measurement_aggregation_type', 'date'],
+    )
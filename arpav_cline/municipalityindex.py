@@ -0,0 +1,195 @@
+"""In-memory reverse geocoder, which finds the municipality a point lies in.
+
+Municipalities are bootstrapped once and then hardly ever change, so rather
+than asking the DB which municipality contains a point, the web application
+keeps all municipality polygons in memory, as prepared shapely geometries
+indexed by an ``STRtree``.
+
+The index is loaded when the web application starts and is then reloaded
+whenever the municipality table changes, e.g. when municipalities are
+bootstrapped again. Just like for the station index, changes are detected by
+polling the postgres table statistics.
+
+The index also serves the municipality centroids, which are part of the same
+static dataset. Responses derived from the index can be cached on it, so that
+they are discarded together with it.
+"""
+
+import collections
+import logging
+import threading
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Optional,
+    Sequence,
+)
+
+import anyio
+import anyio.to_thread
+import numpy as np
+import shapely
+import sqlalchemy
+import sqlmodel
+from geoalchemy2.shape import to_shape
+
+from . import metrics
+from .schemas.municipalities import (
+    Municipality,
+    MunicipalityLabel,
+)
+from .stationindex import get_change_marker
+
+logger = logging.getLogger(__name__)
+
+# this is a module global, which is managed by the web application's lifespan
+_MUNICIPALITY_INDEX: Optional["MunicipalityIndex"] = None
+
+_WATCHED_TABLES = (Municipality.__tablename__,)
+_MAX_CACHED_RESPONSES = 256
+
+
+class MunicipalityIndex:
+    """Point to municipality lookups, without DB access.
+
+    Municipalities are kept in the same order as the DB lists them, by name.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[MunicipalityLabel],
+        geoms: Sequence[shapely.Geometry],
+        change_marker: Optional[int] = None,
+    ):
+        self._labels = list(labels)
+        self._geoms = np.array(geoms, dtype=object)
+        shapely.prepare(self._geoms)
+        self._tree = shapely.STRtree(self._geoms)
+        self.change_marker = change_marker
+        self._cached_responses: collections.OrderedDict[
+            Hashable, Any
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    @classmethod
+    def from_db(cls, session: sqlmodel.Session) -> "MunicipalityIndex":
+        change_marker = get_change_marker(session, _WATCHED_TABLES)
+        statement = sqlalchemy.select(
+            Municipality.geom,  # noqa
+            Municipality.id,  # noqa
+            Municipality.name,  # noqa
+            Municipality.province_name,  # noqa
+            Municipality.region_name,  # noqa
+            Municipality.centroid_epsg_4326_lon,  # noqa
+            Municipality.centroid_epsg_4326_lat,  # noqa
+        ).order_by(
+            Municipality.name,  # noqa
+            Municipality.id,  # noqa
+        )
+        labels = []
+        geoms = []
+        for geom, *label_attributes in session.execute(statement):
+            labels.append(MunicipalityLabel(*label_attributes))
+            geoms.append(to_shape(geom))
+        logger.info(f"Loaded municipality index with {len(labels)} municipalities")
+        return cls(labels, geoms, change_marker)
+
+    def find_containing(self, point_geom: shapely.Point) -> list[MunicipalityLabel]:
+        """Find the municipalities which intersect the input point.
+
+        The input point is expected to be in the EPSG:4326 CRS. There is usually
+        a single result, but a point lying on a border belongs to all of the
+        municipalities that share it.
+        """
+        candidates = self._tree.query(point_geom)
+        matches = candidates[shapely.intersects(self._geoms[candidates], point_geom)]
+        return [self._labels[int(index)] for index in matches]
+
+    def filter(
+        self,
+        *,
+        province_name_filter: Optional[str] = None,
+        region_name_filter: Optional[str] = None,
+    ) -> list[MunicipalityLabel]:
+        """Find municipalities by name of their province and region.
+
+        Filters are case-insensitive substring matches, like the DB ones.
+        """
+        result = self._labels
+        if province_name_filter is not None:
+            result = [
+                m for m in result if _contains(m.province_name, province_name_filter)
+            ]
+        if region_name_filter is not None:
+            result = [m for m in result if _contains(m.region_name, region_name_filter)]
+        return list(result)
+
+    def get_cached_response(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return a response derived from the index, building it if needed.
+
+        Only a bounded number of responses is kept, the least recently used ones
+        are evicted first.
+        """
+        with self._lock:
+            response = self._cached_responses.get(key)
+            if response is not None:
+                self._cached_responses.move_to_end(key)
+        metrics.count_cache_request("municipality_responses", hit=response is not None)
+        if response is not None:
+            return response
+        response = build()
+        with self._lock:
+            self._cached_responses[key] = response
+            self._cached_responses.move_to_end(key)
+            while len(self._cached_responses) > _MAX_CACHED_RESPONSES:
+                self._cached_responses.popitem(last=False)
+        return response
+
+
+def get_municipality_index() -> Optional[MunicipalityIndex]:
+    return _MUNICIPALITY_INDEX
+
+
+def load_municipality_index(engine: sqlalchemy.Engine) -> MunicipalityIndex:
+    global _MUNICIPALITY_INDEX
+    with sqlmodel.Session(engine) as session:
+        _MUNICIPALITY_INDEX = MunicipalityIndex.from_db(session)
+    return _MUNICIPALITY_INDEX
+
+
+def clear_municipality_index() -> None:
+    global _MUNICIPALITY_INDEX
+    _MUNICIPALITY_INDEX = None
+
+
+def refresh_municipality_index_if_changed(engine: sqlalchemy.Engine) -> bool:
+    """Reload the municipality index, if the municipality table has changed."""
+    current = get_municipality_index()
+    with sqlmodel.Session(engine) as session:
+        change_marker = get_change_marker(session, _WATCHED_TABLES)
+    if current is not None and change_marker == current.change_marker:
+        return False
+    load_municipality_index(engine)
+    return True
+
+
+async def keep_municipality_index_fresh(
+    engine: sqlalchemy.Engine, check_interval_seconds: float
+) -> None:
+    """Periodically check the DB for changes and reload the municipality index."""
+    while True:
+        await anyio.sleep(check_interval_seconds)
+        try:
+            await anyio.to_thread.run_sync(
+                refresh_municipality_index_if_changed, engine
+            )
+        except sqlalchemy.exc.SQLAlchemyError:
+            logger.exception("Could not refresh the municipality index")
+
+
+def _contains(value: str, substring: str) -> bool:
+    return substring.replace("%", "").casefold() in value.casefold()
@@ -1,15 +1,13 @@
+import datetime as dt
 import logging
 from typing import (
-    Generator,
     Optional,
     TYPE_CHECKING,
 )
 
 import geojson_pydantic
-import httpx
 import shapely
 
-from .. import exceptions
 from ..schemas.observations import (
     ObservationMeasurementCreate,
     ObservationSeriesConfiguration,
@@ -21,7 +19,10 @@ from ..schemas.static import (
     ObservationStationManager,
     ObservationYearPeriod,
 )
-from . import common
+from . import (
+    common,
+    httpclient,
+)
 
 if TYPE_CHECKING:
     from ..schemas.climaticindicators import ClimaticIndicator
@@ -31,13 +32,13 @@ logger = logging.getLogger(__name__)
 _STATION_CODE_PROPERTY = "statid"
 
 
-def fetch_remote_stations(
-    client: httpx.Client,
+async def fetch_remote_stations(
+    client: httpclient.HarvesterClient,
     series_configuration: ObservationSeriesConfiguration,
     observations_base_url: str,
     auth_token: str,
     ignore_station_codes: list[str] | None = None,
-) -> Generator[dict, None, None]:
+) -> list[dict]:
     # periodo:
     # - 0 means yearly data
     # - 1, 2, 3, 4 means winter, spring, summer, autumn
@@ -61,7 +62,7 @@ def fetch_remote_stations(
         period = 1  # any month works
     else:
         raise NotImplementedError()
-    response = client.get(
+    response = await client.get_json(
         f"{observations_base_url}/clima/indicatori/localita",
         headers={
             "authorization": f"Bearer {auth_token}",
@@ -70,18 +71,17 @@ def fetch_remote_stations(
             "indicatore": indicator_internal_name,
             "periodo": period,
         },
+        use_cache=True,
     )
-    if response.status_code != httpx.codes.OK:
-        raise exceptions.ObservationDataRetrievalError(
-            f"Could not retrieve observation data: {response.status_code - response.text}"
-        )
     station_blacklist = ignore_station_codes or []
-    for raw_station in response.json().get("data", []):
+    result = []
+    for raw_station in response.get("data", []):
         raw_code = str(raw_station.get(_STATION_CODE_PROPERTY))
         if raw_code in station_blacklist:
             logger.info(f"station {raw_code!r} is blacklisted - ignoring...")
         else:
-            yield raw_station
+            result.append(raw_station)
+    return result
 
 
 def parse_station(
@@ -102,21 +102,20 @@ def parse_station(
     )
 
 
-def fetch_station_measurements(
-    client: httpx.Client,
+async def fetch_station_measurements(
+    client: httpclient.HarvesterClient,
     observation_station: ObservationStation,
     series_configuration: ObservationSeriesConfiguration,
     observations_base_url: str,
     auth_token: str,
-) -> Generator[
-    tuple[
-        Optional[MeasurementAggregationType],
-        Optional[ObservationYearPeriod],
-        Optional[dict],
-    ],
-    None,
-    None,
-]:
+    newer_than: Optional[dt.date] = None,
+) -> list[tuple[MeasurementAggregationType, ObservationYearPeriod, dict]]:
+    """Fetch the station's raw measurements for the series configuration.
+
+    When ``newer_than`` is given, measurements dated on or before it are
+    discarded as soon as they are received. The upstream API offers no way to
+    filter by date, so the full history still travels over the wire.
+    """
     measurements_url = f"{observations_base_url}/clima/indicatori/dati"
     headers = {"Authorization": f"Bearer {auth_token}"}
     station_identifier = observation_station.code.split("-")[-1]
@@ -130,45 +129,50 @@ def fetch_station_measurements(
     if (
         aggregation_type := series_configuration.measurement_aggregation_type
     ) == MeasurementAggregationType.YEARLY:
-        response = client.get(
-            measurements_url,
-            headers=headers,
-            params={
-                **base_params,
-                "tabella": "A",
-                "periodo": "0",
-            },
-        )
-        response.raise_for_status()
-        for raw_measurement in response.json():
-            yield aggregation_type, ObservationYearPeriod.ALL_YEAR, raw_measurement
+        table = "A"
+        year_periods = (("0", ObservationYearPeriod.ALL_YEAR),)
     elif aggregation_type == MeasurementAggregationType.SEASONAL:
-        for idx, year_period in enumerate(
-            (
-                ObservationYearPeriod.WINTER,
-                ObservationYearPeriod.SPRING,
-                ObservationYearPeriod.SUMMER,
-                ObservationYearPeriod.AUTUMN,
-            )
-        ):
-            response = client.get(
-                measurements_url,
-                headers=headers,
-                params={
-                    **base_params,
-                    "tabella": "S",
-                    "periodo": idx + 1,
-                },
+        table = "S"
+        year_periods = tuple(
+            (str(idx + 1), year_period)
+            for idx, year_period in enumerate(
+                (
+                    ObservationYearPeriod.WINTER,
+                    ObservationYearPeriod.SPRING,
+                    ObservationYearPeriod.SUMMER,
+                    ObservationYearPeriod.AUTUMN,
+                )
             )
-            response.raise_for_status()
-            for raw_measurement in response.json():
-                yield aggregation_type, year_period, raw_measurement
+        )
     elif aggregation_type == MeasurementAggregationType.MONTHLY:
-        yield None, None, None  # ARPA_FVG observation stations do not have monthly data
+        return []  # ARPA_FVG observation stations do not have monthly data
     else:
         raise NotImplementedError(
             f"measurement aggregation type {aggregation_type!r} not implemented"
         )
+    responses = await client.get_many_json(
+        measurements_url,
+        [
+            {
+                **base_params,
+                "tabella": table,
+                "periodo": period,
+            }
+            for period, _ in year_periods
+        ],
+        headers=headers,
+    )
+    result = []
+    for (_, year_period), response in zip(year_periods, responses):
+        for raw_measurement in response:
+            if newer_than is None or (
+                common.parse_measurement_date(
+                    raw_measurement["anno"], aggregation_type, year_period
+                )
+                > newer_than
+            ):
+                result.append((aggregation_type, year_period, raw_measurement))
+    return result
 
 
 def parse_measurement(
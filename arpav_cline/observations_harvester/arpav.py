@@ -2,12 +2,11 @@ import datetime as dt
 import logging
 from typing import (
     Callable,
-    Generator,
+    Optional,
     TYPE_CHECKING,
 )
 
 import geojson_pydantic
-import httpx
 import shapely
 import shapely.ops
 
@@ -22,7 +21,10 @@ from ..schemas.static import (
     ObservationStationManager,
     ObservationYearPeriod,
 )
-from . import common
+from . import (
+    common,
+    httpclient,
+)
 
 if TYPE_CHECKING:
     from ..schemas.climaticindicators import ClimaticIndicator
@@ -31,84 +33,96 @@ logger = logging.getLogger(__name__)
 
 _STATION_CODE_PROPERTY = "statcd"
 
+# maps each aggregation type to the upstream API's ``tabella`` parameter and the
+# values of its ``periodo`` parameter
+_AGGREGATION_TYPE_REQUEST_PARAMS = {
+    MeasurementAggregationType.YEARLY: (
+        "A",
+        (("0", ObservationYearPeriod.ALL_YEAR),),
+    ),
+    MeasurementAggregationType.SEASONAL: (
+        "S",
+        tuple(
+            (str(idx + 1), year_period)
+            for idx, year_period in enumerate(
+                (
+                    ObservationYearPeriod.WINTER,
+                    ObservationYearPeriod.SPRING,
+                    ObservationYearPeriod.SUMMER,
+                    ObservationYearPeriod.AUTUMN,
+                )
+            )
+        ),
+    ),
+    MeasurementAggregationType.MONTHLY: (
+        "M",
+        tuple(
+            (str(idx + 1), year_period)
+            for idx, year_period in enumerate(
+                (
+                    ObservationYearPeriod.JANUARY,
+                    ObservationYearPeriod.FEBRUARY,
+                    ObservationYearPeriod.MARCH,
+                    ObservationYearPeriod.APRIL,
+                    ObservationYearPeriod.MAY,
+                    ObservationYearPeriod.JUNE,
+                    ObservationYearPeriod.JULY,
+                    ObservationYearPeriod.AUGUST,
+                    ObservationYearPeriod.SEPTEMBER,
+                    ObservationYearPeriod.OCTOBER,
+                    ObservationYearPeriod.NOVEMBER,
+                    ObservationYearPeriod.DECEMBER,
+                )
+            )
+        ),
+    ),
+}
+
 
-def fetch_remote_stations(
-    client: httpx.Client,
+async def fetch_remote_stations(
+    client: httpclient.HarvesterClient,
     series_configuration: ObservationSeriesConfiguration,
     observations_base_url: str,
     ignore_station_codes: list[str] | None = None,
-) -> Generator[dict, None, None]:
+) -> list[dict]:
+    """Fetch the stations which have data for the series configuration.
+
+    The upstream API publishes stations per period of the year, so one request
+    per period is needed. These are performed concurrently. Responses are
+    cached by the client, as series configurations that share the same climatic
+    indicator ask for the same payloads.
+    """
     station_url = f"{observations_base_url}/clima_indicatori/staz_attive_lunghe"
     indicator_internal_name = common.get_indicator_internal_name(
         series_configuration.climatic_indicator, ObservationStationManager.ARPAV
     )
-    station_blacklist = ignore_station_codes or []
-    if (
-        series_configuration.measurement_aggregation_type
-        == MeasurementAggregationType.MONTHLY
-    ):
-        for month in range(1, 13):
-            logger.info(f"Processing month {month}...")
-            month_response = client.get(
-                station_url,
-                params={
-                    "indicatore": indicator_internal_name,
-                    "tabella": "M",
-                    "periodo": str(month),
-                },
-            )
-            month_response.raise_for_status()
-            for raw_station in month_response.json().get("data", []):
-                raw_code = str(raw_station.get(_STATION_CODE_PROPERTY))
-                if raw_code in station_blacklist:
-                    logger.info(f"station {raw_code!r} is blacklisted - ignoring...")
-                else:
-                    yield raw_station
-    elif (
-        series_configuration.measurement_aggregation_type
-        == MeasurementAggregationType.SEASONAL
-    ):
-        for season in range(1, 5):
-            logger.info(f"Processing season {season}...")
-            season_response = client.get(
-                station_url,
-                params={
-                    "indicatore": indicator_internal_name,
-                    "tabella": "S",
-                    "periodo": str(season),
-                },
-            )
-            season_response.raise_for_status()
-            for raw_station in season_response.json().get("data", []):
-                raw_code = str(raw_station.get(_STATION_CODE_PROPERTY))
-                if raw_code in station_blacklist:
-                    logger.info(f"station {raw_code!r} is blacklisted - ignoring...")
-                else:
-                    yield raw_station
-    elif (
-        series_configuration.measurement_aggregation_type
-        == MeasurementAggregationType.YEARLY
-    ):
-        logger.info("Processing years...")
-        year_response = client.get(
-            station_url,
-            params={
+    aggregation_type = series_configuration.measurement_aggregation_type
+    try:
+        table, year_periods = _AGGREGATION_TYPE_REQUEST_PARAMS[aggregation_type]
+    except KeyError as err:
+        raise NotImplementedError(f"{aggregation_type} not implemented") from err
+    responses = await client.get_many_json(
+        station_url,
+        [
+            {
                 "indicatore": indicator_internal_name,
-                "tabella": "A",
-                "periodo": "0",
-            },
-        )
-        year_response.raise_for_status()
-        for raw_station in year_response.json().get("data", []):
+                "tabella": table,
+                "periodo": period,
+            }
+            for period, _ in year_periods
+        ],
+        use_cache=True,
+    )
+    station_blacklist = ignore_station_codes or []
+    result = []
+    for response in responses:
+        for raw_station in response.get("data", []):
             raw_code = str(raw_station.get(_STATION_CODE_PROPERTY))
             if raw_code in station_blacklist:
                 logger.info(f"station {raw_code!r} is blacklisted - ignoring...")
             else:
-                yield raw_station
-    else:
-        raise NotImplementedError(
-            f"{series_configuration.measurement_aggregation_type} not implemented"
-        )
+                result.append(raw_station)
+    return result
 
 
 def parse_station(
@@ -150,89 +164,54 @@ def parse_station(
     )
 
 
-def fetch_station_measurements(
-    client: httpx.Client,
+async def fetch_station_measurements(
+    client: httpclient.HarvesterClient,
     observation_station: ObservationStation,
     series_configuration: ObservationSeriesConfiguration,
     observations_base_url: str,
-) -> Generator[
-    tuple[MeasurementAggregationType, ObservationYearPeriod, dict], None, None
-]:
+    newer_than: Optional[dt.date] = None,
+) -> list[tuple[MeasurementAggregationType, ObservationYearPeriod, dict]]:
+    """Fetch the station's raw measurements for the series configuration.
+
+    When ``newer_than`` is given, measurements dated on or before it are
+    discarded as soon as they are received. The upstream API offers no way to
+    filter by date, so the full history still travels over the wire.
+    """
     measurements_url = f"{observations_base_url}/clima_indicatori"
     station_identifier = observation_station.code.split("-")[-1]
     indicator_internal_name = common.get_indicator_internal_name(
         series_configuration.climatic_indicator, observation_station.managed_by
     )
-    base_params = {
-        "statcd": station_identifier,
-        "indicatore": indicator_internal_name,
-    }
-    if (
-        aggregation_type := series_configuration.measurement_aggregation_type
-    ) == MeasurementAggregationType.YEARLY:
-        response = client.get(
-            measurements_url,
-            params={
-                **base_params,
-                "tabella": "A",
-                "periodo": "0",
-            },
-        )
-        response.raise_for_status()
-        for raw_measurement in response.json().get("data", []):
-            yield aggregation_type, ObservationYearPeriod.ALL_YEAR, raw_measurement
-    elif aggregation_type == MeasurementAggregationType.SEASONAL:
-        for idx, year_period in enumerate(
-            (
-                ObservationYearPeriod.WINTER,
-                ObservationYearPeriod.SPRING,
-                ObservationYearPeriod.SUMMER,
-                ObservationYearPeriod.AUTUMN,
-            )
-        ):
-            response = client.get(
-                measurements_url,
-                params={
-                    **base_params,
-                    "tabella": "S",
-                    "periodo": idx + 1,
-                },
-            )
-            response.raise_for_status()
-            for raw_measurement in response.json().get("data", []):
-                yield aggregation_type, year_period, raw_measurement
-    elif aggregation_type == MeasurementAggregationType.MONTHLY:
-        for idx, year_period in enumerate(
-            (
-                ObservationYearPeriod.JANUARY,
-                ObservationYearPeriod.FEBRUARY,
-                ObservationYearPeriod.MARCH,
-                ObservationYearPeriod.APRIL,
-                ObservationYearPeriod.MAY,
-                ObservationYearPeriod.JUNE,
-                ObservationYearPeriod.JULY,
-                ObservationYearPeriod.AUGUST,
-                ObservationYearPeriod.SEPTEMBER,
-                ObservationYearPeriod.OCTOBER,
-                ObservationYearPeriod.NOVEMBER,
-                ObservationYearPeriod.DECEMBER,
-            )
-        ):
-            response = client.get(
-                measurements_url,
-                params={
-                    **base_params,
-                    "tabella": "M",
-                    "periodo": idx + 1,
-                },
-            )
-            response.raise_for_status()
-            for raw_measurement in response.json().get("data", []):
-                yield aggregation_type, year_period, raw_measurement
-    else:
+    aggregation_type = series_configuration.measurement_aggregation_type
+    try:
+        table, year_periods = _AGGREGATION_TYPE_REQUEST_PARAMS[aggregation_type]
+    except KeyError as err:
         raise NotImplementedError(
             f"measurement aggregation type {aggregation_type!r} not implemented"
-        )
+        ) from err
+    responses = await client.get_many_json(
+        measurements_url,
+        [
+            {
+                "statcd": station_identifier,
+                "indicatore": indicator_internal_name,
+                "tabella": table,
+                "periodo": period,
+            }
+            for period, _ in year_periods
+        ],
+    )
+    result = []
+    for (_, year_period), response in zip(year_periods, responses):
+        for raw_measurement in response.get("data", []):
+            if newer_than is None or (
+                common.parse_measurement_date(
+                    raw_measurement["anno"], aggregation_type, year_period
+                )
+                > newer_than
+            ):
+                result.append((aggregation_type, year_period, raw_measurement))
+    return result
 
 
 def parse_measurement(
@@ -45,8 +45,19 @@ def refresh_measurements(
             ),
         ),
     ] = None,
+    full_history: Annotated[
+        bool,
+        typer.Option(
+            help=(
+                "Harvest the full history of each station, instead of only the "
+                "measurements which are more recent than those already stored. "
+                "Useful for backfills."
+            ),
+        ),
+    ] = False,
 ) -> None:
     observations_flows.refresh_measurements(
         station_code=station,
         observation_series_configuration_identifier=series_configuration_identifier,
+        full_history=full_history,
     )
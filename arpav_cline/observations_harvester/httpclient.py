@@ -0,0 +1,289 @@
+"""Async HTTP client for the observation data providers' APIs.
+
+Each upstream API gets a ``HarvesterClient``, which wraps a pooled
+``httpx.AsyncClient``, bounds the number of in-flight requests and retries
+failed requests with exponential backoff and full jitter.
+
+Harvesting is driven by Prefect tasks, which are synchronous and run in worker
+threads. In order for all of them to share the same clients, and thus the same
+connection pools and concurrency bounds, the clients are hosted by a
+``HarvesterClientPool``, which runs an event loop in a background thread and
+lets synchronous code call into it.
+"""
+
+import contextlib
+import dataclasses
+import functools
+import logging
+import random
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Optional,
+    Sequence,
+)
+
+import anyio
+import anyio.from_thread
+import httpx
+
+from .. import (
+    exceptions,
+    metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS_CODES = frozenset(
+    (
+        httpx.codes.TOO_MANY_REQUESTS,
+        httpx.codes.BAD_GATEWAY,
+        httpx.codes.SERVICE_UNAVAILABLE,
+        httpx.codes.GATEWAY_TIMEOUT,
+        httpx.codes.INTERNAL_SERVER_ERROR,
+    )
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 30.0
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Compute how long to wait before the next attempt.
+
+        Uses exponential backoff with full jitter, unless the server told us how
+        long to wait by means of the ``Retry-After`` header.
+        """
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_delay_seconds)
+            except ValueError:
+                pass  # an HTTP date, fallback to our own backoff
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * 2**attempt)
+        return random.uniform(0, ceiling)
+
+
+class HarvesterClient:
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        *,
+        max_concurrency: int,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        name: str = "",
+    ):
+        self.http_client = http_client
+        self.limiter = anyio.CapacityLimiter(max_concurrency)
+        self.retry_policy = retry_policy
+        self.name = name
+        self.num_requests = 0
+        self.num_retries = 0
+        self.num_cache_hits = 0
+        self._response_cache: dict[tuple, Any] = {}
+        self._in_flight: dict[tuple, anyio.Event] = {}
+
+    async def get_json(
+        self,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        use_cache: bool = False,
+    ) -> Any:
+        """Perform a GET request and return the decoded JSON response.
+
+        Transport errors and transient HTTP errors are retried, according to the
+        client's retry policy. Other HTTP errors are raised immediately.
+
+        With ``use_cache``, responses are kept for the lifetime of the client
+        and concurrent requests for the same URL and parameters are coalesced
+        into a single one. Cached responses are shared, callers must not modify
+        them.
+        """
+        if not use_cache:
+            return await self._get_json(url, params=params, headers=headers)
+        key = (url, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+        while key not in self._response_cache:
+            if (in_flight := self._in_flight.get(key)) is None:
+                metrics.count_cache_request("harvester_responses", hit=False)
+                finished = self._in_flight[key] = anyio.Event()
+                try:
+                    result = await self._get_json(url, params=params, headers=headers)
+                    self._response_cache[key] = result
+                    return result
+                finally:
+                    del self._in_flight[key]
+                    finished.set()
+            # if the in-flight request fails, the next loop iteration retries it
+            await in_flight.wait()
+        self.num_cache_hits += 1
+        metrics.count_cache_request("harvester_responses", hit=True)
+        return self._response_cache[key]
+
+    async def _get_json(
+        self,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+    ) -> Any:
+        attempt = 0
+        while True:
+            retry_after = None
+            async with self.limiter:
+                self.num_requests += 1
+                try:
+                    response = await self.http_client.get(
+                        url, params=params, headers=headers
+                    )
+                except httpx.TransportError as err:
+                    error = err
+                else:
+                    if response.status_code not in _RETRYABLE_STATUS_CODES:
+                        self._count_request(success=not response.is_error)
+                        response.raise_for_status()
+                        return response.json()
+                    error = httpx.HTTPStatusError(
+                        f"{response.status_code} response from {url!r}",
+                        request=response.request,
+                        response=response,
+                    )
+                    retry_after = response.headers.get("retry-after")
+            self._count_request(success=False)
+            attempt += 1
+            if attempt >= self.retry_policy.max_attempts:
+                raise exceptions.ObservationDataRetrievalError(
+                    f"{self.name} request for {url!r} with params {params!r} failed "
+                    f"after {attempt} attempts: {error}"
+                ) from error
+            delay = self.retry_policy.get_delay(attempt, retry_after)
+            self.num_retries += 1
+            logger.warning(
+                f"{self.name} request for {url!r} failed ({error}), retrying in "
+                f"{delay:.1f}s (attempt {attempt + 1}/{self.retry_policy.max_attempts})"
+            )
+            # sleep outside the limiter, so that other requests can proceed
+            await anyio.sleep(delay)
+
+    def _count_request(self, success: bool) -> None:
+        metrics.HARVESTER_REQUESTS.labels(
+            client=self.name, outcome="success" if success else "error"
+        ).inc()
+
+    async def get_many_json(
+        self,
+        url: str,
+        all_params: Sequence[dict],
+        *,
+        headers: Optional[dict] = None,
+        use_cache: bool = False,
+    ) -> list[Any]:
+        """Perform concurrent GET requests, returning responses in the input order.
+
+        If any of the requests fails, the remaining ones are cancelled and the
+        first error is raised.
+        """
+        results = [None] * len(all_params)
+        errors = []
+
+        # errors are caught in each task, rather than letting the task group wrap
+        # them in an exception group, so that callers get the original error
+        async def fetch(index: int, params: dict) -> None:
+            try:
+                results[index] = await self.get_json(
+                    url, params=params, headers=headers, use_cache=use_cache
+                )
+            except Exception as err:
+                errors.append(err)
+                task_group.cancel_scope.cancel()
+
+        async with anyio.create_task_group() as task_group:
+            for idx, params in enumerate(all_params):
+                task_group.start_soon(fetch, idx, params)
+        if len(errors) > 0:
+            raise errors[0]
+        return results
+
+
+@contextlib.asynccontextmanager
+async def get_harvester_client(
+    *,
+    max_concurrency: int,
+    retry_policy: RetryPolicy = RetryPolicy(),
+    timeout_seconds: float = 30.0,
+    name: str = "",
+) -> AsyncIterator[HarvesterClient]:
+    http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=max_concurrency,
+            max_keepalive_connections=max_concurrency,
+        ),
+    )
+    async with http_client:
+        yield HarvesterClient(
+            http_client,
+            max_concurrency=max_concurrency,
+            retry_policy=retry_policy,
+            name=name,
+        )
+
+
+class HarvesterClientPool:
+    """Harvester clients which can be used from synchronous code, in any thread."""
+
+    def __init__(
+        self,
+        portal: anyio.from_thread.BlockingPortal,
+        clients: dict[str, HarvesterClient],
+    ):
+        self._portal = portal
+        self._clients = clients
+
+    def call(
+        self,
+        client_name: str,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        **kwargs,
+    ) -> Any:
+        """Run ``func(client, *args, **kwargs)`` and wait for its result."""
+        return self._portal.call(
+            functools.partial(func, self._clients[client_name], *args, **kwargs)
+        )
+
+
+@contextlib.contextmanager
+def start_harvester_client_pool(
+    max_concurrency: dict[str, int],
+    *,
+    retry_policy: RetryPolicy = RetryPolicy(),
+    timeout_seconds: float = 30.0,
+) -> Iterator[HarvesterClientPool]:
+    """Start an event loop in a background thread and create clients in it.
+
+    ``max_concurrency`` maps the name of each client to be created to its
+    maximum number of in-flight requests.
+    """
+    with anyio.from_thread.start_blocking_portal() as portal:
+        with contextlib.ExitStack() as stack:
+            clients = {
+                name: stack.enter_context(
+                    portal.wrap_async_context_manager(
+                        get_harvester_client(
+                            max_concurrency=limit,
+                            retry_policy=retry_policy,
+                            timeout_seconds=timeout_seconds,
+                            name=name,
+                        )
+                    )
+                )
+                for name, limit in max_concurrency.items()
+            }
+            yield HarvesterClientPool(portal, clients)
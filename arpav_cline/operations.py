@@ -1,5 +1,6 @@
 import datetime as dt
 import logging
+import time
 from typing import (
     Optional,
     Sequence,
@@ -17,6 +18,7 @@ from .schemas import (
     base,
     coverages,
     legacy,
+    observations,
     static,
 )
 
@@ -129,32 +131,96 @@ def refresh_station_climatic_indicator_database_view(
     session: sqlmodel.Session,
     climatic_indicator: "ClimaticIndicator",
     db_schema_name: Optional[str] = "public",
-):
-    """Refresh DB view with stations that have data for input climatic indicator."""
+    force: bool = False,
+) -> observations.StationsViewRefreshResult:
+    """Refresh DB view with stations that have data for input climatic indicator.
+
+    The materialized view is created the first time, together with a unique
+    index, which allows it to be refreshed concurrently afterwards - readers,
+    like the vector tile server, are not locked out while the view refreshes.
+
+    Views are only refreshed when the indicator's stations have changed, unless
+    ``force`` is given. Changes are detected by comparing a fingerprint of the
+    related stations with the one that was stored as the view's comment when
+    it was last refreshed.
+    """
+    started = time.perf_counter()
     sanitized_name = sanitize_observation_variable_name(climatic_indicator.identifier)
-    view_name = f"{db_schema_name}.stations_{sanitized_name}"
-    drop_view_statement = sqlmodel.text(f"DROP MATERIALIZED VIEW IF EXISTS {view_name}")
-    create_view_statement = sqlmodel.text(
-        f"CREATE MATERIALIZED VIEW {view_name} "
-        f"AS SELECT s.* "
-        f"FROM observationstation AS s "
-        f"JOIN observationstationclimaticindicatorlink AS scil ON s.id = scil.observation_station_id "
-        f"JOIN climaticindicator AS ci ON ci.id = scil.climatic_indicator_id "
-        f"WHERE ci.name = '{climatic_indicator.name}' "
-        f"AND ci.measure_type = '{climatic_indicator.measure_type.name}' "
-        f"AND ci.aggregation_period = '{climatic_indicator.aggregation_period.name}' "
-        f"WITH DATA"
+    bare_view_name = db.get_climatic_indicator_stations_view_name(
+        climatic_indicator.identifier
     )
-    index_name = f"idx_{sanitized_name}"
-    drop_index_statement = sqlmodel.text(f"DROP INDEX IF EXISTS {index_name}")
-    create_index_statement = sqlmodel.text(
-        f"CREATE INDEX {index_name} ON {view_name} USING gist (geom)"
+    view_name = f"{db_schema_name}.{bare_view_name}"
+    fingerprint = session.execute(
+        sqlmodel.text(
+            "SELECT md5(coalesce("
+            "string_agg(s.id::text || ':' || s.xmin::text, ',' ORDER BY s.id), ''"
+            ")) "
+            "FROM observationstation AS s "
+            "JOIN observationstationclimaticindicatorlink AS scil "
+            "ON s.id = scil.observation_station_id "
+            "WHERE scil.climatic_indicator_id = :climatic_indicator_id"
+        ),
+        {"climatic_indicator_id": climatic_indicator.id},
+    ).scalar_one()
+    existing_view = session.execute(
+        sqlmodel.text(
+            "SELECT obj_description(c.oid, 'pg_class') "
+            "FROM pg_class AS c "
+            "JOIN pg_namespace AS n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = :schema_name "
+            "AND c.relname = :view_name "
+            "AND c.relkind = 'm'"
+        ),
+        {"schema_name": db_schema_name, "view_name": bare_view_name},
+    ).first()
+    create_unique_index_statement = sqlmodel.text(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS uidx_{sanitized_name} "
+        f"ON {view_name} (id)"
     )
-    session.execute(drop_view_statement)
-    session.execute(drop_index_statement)
-    session.execute(create_view_statement)
-    session.execute(create_index_statement)
+    if existing_view is None:
+        session.execute(
+            sqlmodel.text(
+                f"CREATE MATERIALIZED VIEW {view_name} "
+                f"AS SELECT s.* "
+                f"FROM observationstation AS s "
+                f"JOIN observationstationclimaticindicatorlink AS scil ON s.id = scil.observation_station_id "
+                f"JOIN climaticindicator AS ci ON ci.id = scil.climatic_indicator_id "
+                f"WHERE ci.name = '{climatic_indicator.name}' "
+                f"AND ci.measure_type = '{climatic_indicator.measure_type.name}' "
+                f"AND ci.aggregation_period = '{climatic_indicator.aggregation_period.name}' "
+                f"WITH DATA"
+            )
+        )
+        session.execute(create_unique_index_statement)
+        session.execute(
+            sqlmodel.text(
+                f"CREATE INDEX IF NOT EXISTS idx_{sanitized_name} "
+                f"ON {view_name} USING gist (geom)"
+            )
+        )
+        action = static.StationsViewRefreshAction.CREATED
+    elif force or existing_view[0] != fingerprint:
+        # views created by previous versions lack the unique index
+        session.execute(create_unique_index_statement)
+        session.execute(
+            sqlmodel.text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name}")
+        )
+        action = static.StationsViewRefreshAction.REFRESHED
+    else:
+        action = static.StationsViewRefreshAction.SKIPPED
+    if action != static.StationsViewRefreshAction.SKIPPED:
+        # the fingerprint is an md5 hex digest, so it is safe to inline it
+        session.execute(
+            sqlmodel.text(
+                f"COMMENT ON MATERIALIZED VIEW {view_name} IS '{fingerprint}'"
+            )
+        )
     session.commit()
+    return observations.StationsViewRefreshResult(
+        view_name=view_name,
+        action=action,
+        duration_seconds=time.perf_counter() - started,
+    )
 
 
 def sanitize_observation_variable_name(name: str) -> str:
@@ -5,6 +5,7 @@ import uuid
 from prefect.client.orchestration import SyncPrefectClient
 
 from ..config import ArpavPpcvSettings
+from .flows import analytics as analytics_flows
 from .flows import observations as observations_flows
 from .static import PrefectTaskTag
 
@@ -18,6 +19,7 @@ def start_periodic_tasks(
     refresh_stations: bool = False,
     refresh_measurements: bool = False,
     refresh_station_variables: bool = False,
+    refresh_download_request_rollups: bool = False,
 ):
     """Starts a prefect worker to perform background tasks.
 
@@ -28,6 +30,8 @@ def start_periodic_tasks(
     - refreshing observation measurements for known stations
     - refreshing the database views which contain available observation stations for
       each indicator
+    - refreshing the daily rollups of download requests, which back the download
+      stats shown in the admin
 
     Additionally, it creates prefect task concurrency limits in order to keep it from
     executing too many concurrent tasks.
@@ -72,6 +76,14 @@ def start_periodic_tasks(
             )
         )
         to_serve.append(station_variables_deployment)
+    if refresh_download_request_rollups:
+        rollups_deployment = analytics_flows.refresh_download_request_rollups.to_deployment(
+            name="download_request_rollups_refresher",
+            cron=(
+                settings.prefect.download_request_rollups_refresher_flow_cron_schedule
+            ),
+        )
+        to_serve.append(rollups_deployment)
     prefect.serve(*to_serve)
 
 
@@ -0,0 +1,40 @@
+import datetime as dt
+from typing import Optional
+
+import sqlmodel
+import prefect
+import prefect.artifacts
+
+from arpav_cline import db
+from arpav_cline.config import get_settings
+
+# this is a module global because we need to configure the prefect flow with
+# values from it
+_settings = get_settings()
+_db_engine = db.get_engine(_settings)
+
+
+@prefect.flow(
+    log_prints=True,
+    retries=_settings.prefect.num_flow_retries,
+    retry_delay_seconds=_settings.prefect.flow_retry_delay_seconds,
+)
+def refresh_download_request_rollups(since: Optional[dt.date] = None):
+    """Update the daily rollups of download requests.
+
+    Only days starting at the last rolled up one are recomputed, unless
+    ``since`` is given.
+    """
+    with sqlmodel.Session(_db_engine) as db_session:
+        num_created = db.refresh_download_request_rollups(db_session, since=since)
+    print(f"Created {num_created} download request rollup records")
+    prefect.artifacts.create_table_artifact(
+        key="download-request-rollups-refreshed",
+        table=[
+            {
+                "since": since.isoformat() if since is not None else None,
+                "num_created": num_created,
+            }
+        ],
+        description=f"# Created {num_created} download request rollup records",
+    )
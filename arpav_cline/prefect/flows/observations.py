@@ -1,9 +1,12 @@
-from collections.abc import Iterable
+import contextlib
+import datetime as dt
+from collections.abc import Iterator
+from typing import Optional
 
-import httpx
 import sqlmodel
 import prefect
 import prefect.artifacts
+import prefect.cache_policies
 import pyproj
 
 from arpav_cline import (
@@ -13,6 +16,7 @@ from arpav_cline import (
 from arpav_cline.config import get_settings
 from arpav_cline.observations_harvester import arpav as arpav_operations
 from arpav_cline.observations_harvester import arpafvg as arpafvg_operations
+from arpav_cline.observations_harvester import httpclient
 from arpav_cline.operations import (
     create_db_schema,
     refresh_station_climatic_indicator_database_view,
@@ -32,6 +36,40 @@ from arpav_cline.prefect.static import PrefectTaskTag
 _settings = get_settings()
 _db_engine = db.get_engine(_settings)
 
+# shared by all tasks of a flow run, in order to reuse connections and to bound
+# the number of in-flight requests to each upstream API
+_harvester_client_pool: Optional[httpclient.HarvesterClientPool] = None
+
+
+@contextlib.contextmanager
+def _get_harvester_client_pool() -> Iterator[httpclient.HarvesterClientPool]:
+    global _harvester_client_pool
+    if _harvester_client_pool is not None:
+        yield _harvester_client_pool
+    else:
+        harvester_settings = _settings.observations_harvester
+        with httpclient.start_harvester_client_pool(
+            {
+                ObservationStationManager.ARPAV.value: (
+                    _settings.prefect.arpav_rest_api_task_concurrency_limit
+                ),
+                ObservationStationManager.ARPAFVG.value: (
+                    _settings.prefect.arpafvg_rest_api_task_concurrency_limit
+                ),
+            },
+            retry_policy=httpclient.RetryPolicy(
+                max_attempts=harvester_settings.max_request_attempts,
+                base_delay_seconds=harvester_settings.retry_base_delay_seconds,
+                max_delay_seconds=harvester_settings.retry_max_delay_seconds,
+            ),
+            timeout_seconds=harvester_settings.http_timeout_seconds,
+        ) as pool:
+            _harvester_client_pool = pool
+            try:
+                yield pool
+            finally:
+                _harvester_client_pool = None
+
 
 @prefect.task(
     retries=_settings.prefect.num_task_retries,
@@ -40,14 +78,14 @@ _db_engine = db.get_engine(_settings)
     tags=[PrefectTaskTag.USES_DB.value],
 )
 def refresh_stations_for_climatic_indicator(
-    climatic_indicator_id: int, db_schema_name: str
-):
+    climatic_indicator_id: int, db_schema_name: str, force: bool = False
+) -> observations.StationsViewRefreshResult:
     with sqlmodel.Session(_db_engine) as db_session:
         climatic_indicator = db.get_climatic_indicator(
             db_session, climatic_indicator_id
         )
         return refresh_station_climatic_indicator_database_view(
-            db_session, climatic_indicator, db_schema_name=db_schema_name
+            db_session, climatic_indicator, db_schema_name=db_schema_name, force=force
         )
 
 
@@ -58,7 +96,13 @@ def refresh_stations_for_climatic_indicator(
 )
 def refresh_station_variables(
     climatic_indicator_identifier: str | None = None,
+    force: bool = False,
 ):
+    """Refresh the per-climatic indicator materialized views of stations.
+
+    Views are refreshed concurrently and only when their stations have changed,
+    unless ``force`` is given.
+    """
     with sqlmodel.Session(_db_engine) as db_session:
         create_db_schema(db_session, _settings.variable_stations_db_schema)
         to_wait_on = []
@@ -73,6 +117,7 @@ def refresh_station_variables(
                 var_future = refresh_stations_for_climatic_indicator.submit(
                     climatic_indicator.id,
                     _settings.variable_stations_db_schema,
+                    force=force,
                 )
                 to_wait_on.append(var_future)
             else:
@@ -81,8 +126,29 @@ def refresh_station_variables(
                     f"specify {MeasureType.ABSOLUTE.value!r} as its measure type, "
                     f"skipping..."
                 )
+        results = []
         for future in to_wait_on:
-            future.result()
+            result = future.result()
+            print(
+                f"{result.view_name}: {result.action.value} in "
+                f"{result.duration_seconds:.2f}s"
+            )
+            results.append(result)
+        prefect.artifacts.create_table_artifact(
+            key="station-views-refreshed",
+            table=[
+                {
+                    "view": r.view_name,
+                    "action": r.action.value,
+                    "duration_seconds": round(r.duration_seconds, 3),
+                }
+                for r in results
+            ],
+            description=(
+                f"# Processed {len(results)} station views in "
+                f"{sum(r.duration_seconds for r in results):.2f}s"
+            ),
+        )
 
 
 @prefect.task(
@@ -109,18 +175,19 @@ def harvest_arpav_stations(
             pyproj.CRS("epsg:4258"), pyproj.CRS("epsg:4326"), always_xy=True
         ).transform
         stations = set()
-        client = httpx.Client()
-        retriever = arpav_operations.fetch_remote_stations(
-            client,
-            series_configuration,
-            observations_base_url=_settings.arpav_observations_base_url,
-            ignore_station_codes=[
-                code.rpartition("-")[-1]
-                for code in _settings.observation_stations_blacklist
-                if code.startswith("arpa_v")
-            ],
-        )
-        for raw_station in retriever:
+        with _get_harvester_client_pool() as client_pool:
+            raw_stations = client_pool.call(
+                ObservationStationManager.ARPAV.value,
+                arpav_operations.fetch_remote_stations,
+                series_configuration,
+                observations_base_url=_settings.arpav_observations_base_url,
+                ignore_station_codes=[
+                    code.rpartition("-")[-1]
+                    for code in _settings.observation_stations_blacklist
+                    if code.startswith("arpa_v")
+                ],
+            )
+        for raw_station in raw_stations:
             stations.add(arpav_operations.parse_station(raw_station, coord_converter))
         return series_configuration_id, stations
 
@@ -146,83 +213,35 @@ def harvest_arpafvg_stations(
                 f"Series configuration with id: {series_configuration_id!r} not found"
             )
         stations = set()
-        client = httpx.Client()
-        retriever = arpafvg_operations.fetch_remote_stations(
-            client,
-            series_configuration,
-            observations_base_url=_settings.arpafvg_observations_base_url,
-            auth_token=_settings.arpafvg_auth_token,
-            ignore_station_codes=[
-                code.rpartition("-")[-1]
-                for code in _settings.observation_stations_blacklist
-                if code.startswith("arpa_fvg")
-            ],
-        )
-        for raw_station in retriever:
+        with _get_harvester_client_pool() as client_pool:
+            raw_stations = client_pool.call(
+                ObservationStationManager.ARPAFVG.value,
+                arpafvg_operations.fetch_remote_stations,
+                series_configuration,
+                observations_base_url=_settings.arpafvg_observations_base_url,
+                auth_token=_settings.arpafvg_auth_token,
+                ignore_station_codes=[
+                    code.rpartition("-")[-1]
+                    for code in _settings.observation_stations_blacklist
+                    if code.startswith("arpa_fvg")
+                ],
+            )
+        for raw_station in raw_stations:
             stations.add(arpafvg_operations.parse_station(raw_station))
         return series_configuration_id, stations
 
 
-@prefect.task(
-    retries=_settings.prefect.num_task_retries,
-    retry_delay_seconds=_settings.prefect.task_retry_delay_seconds,
-    retry_jitter_factor=0.5,
-    tags=[PrefectTaskTag.USES_DB.value],
-)
-def find_new_stations(
-    candidate_stations: Iterable[observations.ObservationStationCreate],
-) -> list[observations.ObservationStationCreate]:
-    with sqlmodel.Session(_db_engine) as session:
-        db_stations = db.collect_all_observation_stations(session)
-        existing_stations = {(s.managed_by, s.code): s for s in db_stations}
-        possibly_new_stations = {(s.managed_by, s.code): s for s in candidate_stations}
-        to_create = []
-        for possibly_new_station in possibly_new_stations.values():
-            if (
-                existing_stations.get(
-                    (possibly_new_station.managed_by, possibly_new_station.code)
-                )
-                is None
-            ):
-                print(
-                    f"About to create station {possibly_new_station.managed_by} "
-                    f"{possibly_new_station.code} - {possibly_new_station.name}..."
-                )
-                to_create.append(possibly_new_station)
-            else:
-                print(
-                    f"Station {possibly_new_station.managed_by} "
-                    f"{possibly_new_station.code} - {possibly_new_station.name} "
-                    f"is already known"
-                )
-        for existing_station in existing_stations.values():
-            if (
-                possibly_new_stations.get(
-                    (existing_station.managed_by, existing_station.code)
-                )
-                is None
-            ):
-                print(
-                    f"Station {existing_station.code} is not "
-                    f"found on the remote. Maybe it can be deleted? The system does not "
-                    f"delete stations so please check manually if this should be deleted "
-                    f"or not"
-                )
-        return to_create
-
-
 @prefect.flow(
     log_prints=True,
     retries=_settings.prefect.num_flow_retries,
     retry_delay_seconds=_settings.prefect.flow_retry_delay_seconds,
 )
 def refresh_stations(observation_series_configuration_identifier: str | None = None):
-    with sqlmodel.Session(_db_engine) as session:
+    with sqlmodel.Session(_db_engine) as session, _get_harvester_client_pool():
         db_series_configurations = _get_observation_series_configurations(
             session, observation_series_configuration_identifier
         )
         if len(db_series_configurations) > 0:
-            all_harvested_stations = {}
             to_wait_on = []
             for series_conf in db_series_configurations:
                 print(
@@ -241,21 +260,40 @@ def refresh_stations(observation_series_configuration_identifier: str | None = N
                         )
                         continue
                     to_wait_on.append(fut)
+            # a station may be harvested for many series configurations - merge
+            # them, keeping track of all the climatic indicators they relate to
+            candidate_stations = {}
+            series_confs_by_id = {sc.id: sc for sc in db_series_configurations}
             for future in to_wait_on:
                 series_id, series_harvested_stations = future.result()
-                series_stations = all_harvested_stations.setdefault(series_id, [])
-                series_stations.extend(series_harvested_stations)
-
-            candidate_stations = set()
-            for harvested_stations in all_harvested_stations.values():
-                candidate_stations.update(harvested_stations)
-            to_create = find_new_stations(candidate_stations)
-            if len(to_create) > 0:
-                print(f"Found {len(to_create)} new stations. Creating them now...")
-                created = db.create_many_observation_stations(session, to_create)
-            else:
-                created = []
-                print("No new stations found.")
+                series_conf = series_confs_by_id[series_id]
+                for harvested_station in series_harvested_stations:
+                    candidate = candidate_stations.setdefault(
+                        harvested_station.code,
+                        harvested_station.model_copy(
+                            update={"climatic_indicators": []}
+                        ),
+                    )
+                    candidate.climatic_indicators.append(
+                        series_conf.climatic_indicator_id
+                    )
+            created = db.upsert_observation_stations(
+                session, list(candidate_stations.values())
+            )
+            print(
+                f"Found {len(candidate_stations)} stations on the remotes, "
+                f"{len(created)} of which are new."
+            )
+            existing_codes = session.exec(
+                sqlmodel.select(observations.ObservationStation.code)
+            )
+            for existing_code in existing_codes:
+                if existing_code not in candidate_stations:
+                    print(
+                        f"Station {existing_code} is not found on the remote. Maybe "
+                        f"it can be deleted? The system does not delete stations so "
+                        f"please check manually if this should be deleted or not"
+                    )
             prefect.artifacts.create_table_artifact(
                 key="stations-created",
                 table=[
@@ -263,37 +301,6 @@ def refresh_stations(observation_series_configuration_identifier: str | None = N
                 ],
                 description=f"# Created {len(created)} stations",
             )
-            # now we need to associate stations with their respective climatic indicator
-            for osc_id, series_harvested_stations in all_harvested_stations.items():
-                observation_series_configuration = (
-                    db.get_observation_series_configuration(session, osc_id)
-                )
-                if observation_series_configuration is not None:
-                    for harvested_station in series_harvested_stations:
-                        # by now all harvested stations should be present in the DB
-                        existing_db_station = db.get_observation_station_by_code(
-                            session, harvested_station.code
-                        )
-                        if existing_db_station is not None:
-                            new_indicator_ids = set(
-                                ci.id for ci in existing_db_station.climatic_indicators
-                            )
-                            new_indicator_ids.add(
-                                observation_series_configuration.climatic_indicator_id
-                            )
-                            db.update_observation_station(
-                                session,
-                                existing_db_station,
-                                observations.ObservationStationUpdate(
-                                    climatic_indicators=list(new_indicator_ids),
-                                ),
-                            )
-                else:
-                    print(
-                        f"Observation series configuration with id {osc_id} not found, "
-                        f"ignoring..."
-                    )
-
         else:
             print("There are no variables to process, skipping...")
 
@@ -306,30 +313,58 @@ def refresh_stations(observation_series_configuration_identifier: str | None = N
 def refresh_measurements(
     station_code: str | None = None,
     observation_series_configuration_identifier: str | None = None,
+    full_history: bool = False,
 ):
-    with sqlmodel.Session(_db_engine) as db_session:
+    """Harvest observation measurements and save the new ones.
+
+    By default, only measurements that are more recent than the latest one
+    stored for each series are harvested. Pass ``full_history=True`` in order to
+    harvest everything, for example when backfilling.
+    """
+    with sqlmodel.Session(_db_engine) as db_session, _get_harvester_client_pool():
         stations_to_process = _get_stations(db_session, station_code)
         series_confs_to_process = _get_observation_series_configurations(
             db_session, observation_series_configuration_identifier
         )
-        to_wait_on = []
+        if full_history:
+            latest_dates = {}
+        else:
+            latest_dates = db.get_latest_observation_measurement_dates(
+                db_session,
+                observation_station_ids=(
+                    [s.id for s in stations_to_process] if station_code else None
+                ),
+                climatic_indicator_ids=list(
+                    {sc.climatic_indicator_id for sc in series_confs_to_process}
+                ),
+            )
+        # harvests are all submitted upfront and run concurrently, up to the
+        # task concurrency limits. Each climatic indicator gets a single save
+        # task, which starts as soon as all of its harvests are finished
+        harvest_futures = {}
         for station in stations_to_process:
+            station_indicator_ids = {ci.id for ci in station.climatic_indicators}
             for series_configuration in series_confs_to_process:
-                if series_configuration.climatic_indicator.id in [
-                    ci.id for ci in station.climatic_indicators
-                ]:
+                if series_configuration.climatic_indicator_id in station_indicator_ids:
                     harvester_task = {
                         ObservationStationManager.ARPAV: harvest_arpav_station_measurements,
                         ObservationStationManager.ARPAFVG: harvest_arpafvg_station_measurements,
                     }.get(station.managed_by)
                     if harvester_task is not None:
                         harvested_measurements_fut = harvester_task.submit(
-                            station.id, series_configuration.id
-                        )
-                        creation_fut = save_observation_station_measurements.submit(
-                            station.id, harvested_measurements_fut.result()
+                            station.id,
+                            series_configuration.id,
+                            newer_than=latest_dates.get(
+                                (
+                                    station.id,
+                                    series_configuration.climatic_indicator_id,
+                                    series_configuration.measurement_aggregation_type,
+                                )
+                            ),
                         )
-                        to_wait_on.append(creation_fut)
+                        harvest_futures.setdefault(
+                            series_configuration.climatic_indicator, []
+                        ).append(harvested_measurements_fut)
                     else:
                         raise NotImplementedError(
                             f"Observation stations managed by {station.managed_by} "
@@ -341,23 +376,45 @@ def refresh_measurements(
                         f"{series_configuration.climatic_indicator.identifier!r} "
                         f"climatic indicator"
                     )
-        artifact_table = []
-        for station_created_measurements_fut in to_wait_on:
-            new_measurements = station_created_measurements_fut.result()
-            for new_measurement in new_measurements or []:
-                artifact_table.append(
-                    {
-                        "id": str(new_measurement.id),
-                        "station": new_measurement.observation_station.code,
-                        "climatic_indicator": new_measurement.climatic_indicator.identifier,
-                        "date": new_measurement.date.strftime("%Y-%m-%d"),
-                        "value": new_measurement.value,
-                    }
-                )
+        save_futures = {
+            climatic_indicator.identifier: (
+                indicator_harvest_futures,
+                save_observation_measurements.submit(
+                    climatic_indicator.id,
+                    # a failed harvest must not prevent saving the other ones
+                    [prefect.allow_failure(f) for f in indicator_harvest_futures],
+                ),
+            )
+            for climatic_indicator, indicator_harvest_futures in harvest_futures.items()
+        }
+        summary = []
+        for indicator_identifier, (
+            indicator_harvest_futures,
+            save_future,
+        ) in save_futures.items():
+            summary.append(
+                {
+                    "climatic_indicator": indicator_identifier,
+                    "num_series": len(indicator_harvest_futures),
+                    "num_failed_series": sum(
+                        1 for f in indicator_harvest_futures if f.state.is_failed()
+                    ),
+                    "num_created": save_future.result(),
+                }
+            )
+        total_created = sum(r["num_created"] for r in summary)
+        total_failed = sum(r["num_failed_series"] for r in summary)
+        print(
+            f"Created {total_created} measurements - {total_failed} station series "
+            f"could not be harvested"
+        )
         prefect.artifacts.create_table_artifact(
             key="measurements-created",
-            table=artifact_table,
-            description=f"# Created {len(artifact_table)} measurements",
+            table=summary,
+            description=(
+                f"# Created {total_created} measurements\n\n"
+                f"{total_failed} station series could not be harvested"
+            ),
         )
 
 
@@ -367,30 +424,39 @@ def refresh_measurements(
     retry_delay_seconds=_settings.prefect.task_retry_delay_seconds,
     retry_jitter_factor=0.5,
     tags=[PrefectTaskTag.USES_DB.value],
+    # inputs can be very large, don't waste time hashing them
+    cache_policy=prefect.cache_policies.NONE,
 )
-def save_observation_station_measurements(
-    station_id: int, measurements: list[observations.ObservationMeasurementCreate]
-) -> list[observations.ObservationMeasurement] | None:
+def save_observation_measurements(
+    climatic_indicator_id: int,
+    harvested: list[list[observations.ObservationMeasurementCreate] | BaseException],
+) -> int:
+    """Save harvested measurements of a climatic indicator in a single batch.
+
+    Harvests that failed are passed in as their exception and are ignored.
+    Measurements that already exist are skipped. Returns the number of newly
+    created measurements.
+    """
     with sqlmodel.Session(_db_engine) as session:
-        station = db.get_observation_station(session, station_id)
-        if station is not None:
-            to_create = db.find_new_station_measurements(
-                session,
-                station_id=station.id,
-                candidates=measurements,
-            )
-            if len(to_create) > 0:
-                print(
-                    f"Found {len(to_create)} new measurements for station "
-                    f"{station.code!r}. Creating them now..."
-                )
-                return db.create_many_observation_measurements(session, to_create)
-            else:
-                print(f"No new measurements found for station {station.code!r}.")
-        else:
-            raise exceptions.InvalidObservationStationIdError(
-                f"Station {station_id} does not exist."
+        climatic_indicator = db.get_climatic_indicator(session, climatic_indicator_id)
+        if climatic_indicator is None:
+            raise exceptions.InvalidClimaticIndicatorIdError(
+                f"Climatic indicator {climatic_indicator_id} does not exist."
             )
+        load_result = db.bulk_load_observation_measurements(
+            session,
+            (
+                measurement
+                for series_measurements in harvested
+                if not isinstance(series_measurements, BaseException)
+                for measurement in series_measurements
+            ),
+        )
+        print(
+            f"Created {load_result.num_inserted} new measurements for climatic "
+            f"indicator {climatic_indicator.identifier!r}."
+        )
+        return load_result.num_inserted
 
 
 @prefect.task(
@@ -406,8 +472,8 @@ def save_observation_station_measurements(
 def harvest_arpafvg_station_measurements(
     station_id: int,
     series_configuration_id: int,
+    newer_than: Optional[dt.date] = None,
 ) -> list[observations.ObservationMeasurementCreate]:
-    client = httpx.Client()
     with sqlmodel.Session(_db_engine) as session:
         station = db.get_observation_station(session, station_id)
         if station is None:
@@ -421,25 +487,27 @@ def harvest_arpafvg_station_measurements(
             raise exceptions.InvalidObservationSeriesConfigurationIdError(
                 f"Series configuration {series_configuration_id!r} does not exist."
             )
+        with _get_harvester_client_pool() as client_pool:
+            raw_measurements = client_pool.call(
+                ObservationStationManager.ARPAFVG.value,
+                arpafvg_operations.fetch_station_measurements,
+                station,
+                series_configuration,
+                _settings.arpafvg_observations_base_url,
+                _settings.arpafvg_auth_token,
+                newer_than=newer_than,
+            )
         harvested_measurements = []
-        raw_measurement_gen = arpafvg_operations.fetch_station_measurements(
-            client,
-            station,
-            series_configuration,
-            _settings.arpafvg_observations_base_url,
-            _settings.arpafvg_auth_token,
-        )
-        for aggregation_type, year_period, raw_measurement in raw_measurement_gen:
-            if all((aggregation_type, year_period, raw_measurement)):
-                harvested_measurements.append(
-                    arpafvg_operations.parse_measurement(
-                        raw_measurement,
-                        aggregation_type,
-                        year_period,
-                        station,
-                        series_configuration.climatic_indicator,
-                    )
+        for aggregation_type, year_period, raw_measurement in raw_measurements:
+            harvested_measurements.append(
+                arpafvg_operations.parse_measurement(
+                    raw_measurement,
+                    aggregation_type,
+                    year_period,
+                    station,
+                    series_configuration.climatic_indicator,
                 )
+            )
         return harvested_measurements
 
 
@@ -455,8 +523,8 @@ def harvest_arpafvg_station_measurements(
 def harvest_arpav_station_measurements(
     station_id: int,
     series_configuration_id: int,
+    newer_than: Optional[dt.date] = None,
 ) -> list[observations.ObservationMeasurementCreate]:
-    client = httpx.Client()
     with sqlmodel.Session(_db_engine) as session:
         station = db.get_observation_station(session, station_id)
         if station is None:
@@ -470,11 +538,17 @@ def harvest_arpav_station_measurements(
             raise exceptions.InvalidObservationSeriesConfigurationIdError(
                 f"Series configuration {series_configuration_id!r} does not exist."
             )
+        with _get_harvester_client_pool() as client_pool:
+            raw_measurements = client_pool.call(
+                ObservationStationManager.ARPAV.value,
+                arpav_operations.fetch_station_measurements,
+                station,
+                series_configuration,
+                _settings.arpav_observations_base_url,
+                newer_than=newer_than,
+            )
         harvested_measurements = []
-        raw_measurement_gen = arpav_operations.fetch_station_measurements(
-            client, station, series_configuration, _settings.arpav_observations_base_url
-        )
-        for aggregation_type, year_period, raw_measurement in raw_measurement_gen:
+        for aggregation_type, year_period, raw_measurement in raw_measurements:
             harvested_measurements.append(
                 arpav_operations.parse_measurement(
                     raw_measurement,
@@ -0,0 +1,141 @@
+"""Context-local profiling of DB statements, which helps finding N+1 queries.
+
+While a query profile is active, each statement executed through an
+instrumented engine is recorded, along with its duration and the location of
+the code that caused it. Statements are grouped by their SQL text, which has
+placeholders instead of the actual parameter values, so a lazy relationship
+load done in a loop shows up as the same statement repeated many times, all
+coming from the same location.
+
+Finding the calling location means walking the stack, so this is meant for
+development only. The web application profiles all of its requests when
+running in debug mode.
+"""
+
+import collections
+import contextlib
+import contextvars
+import dataclasses
+import sys
+import threading
+import time
+from typing import (
+    Iterator,
+    Optional,
+)
+
+import sqlalchemy
+
+_CURRENT_PROFILE: contextvars.ContextVar[
+    Optional["QueryProfile"]
+] = contextvars.ContextVar("query_profile", default=None)
+
+_EXECUTION_STARTED_ATTRIBUTE = "_queryprofiling_execution_started"
+_PACKAGE_PREFIX = f"{__name__.partition('.')[0]}."
+_UNKNOWN_LOCATION = "unknown"
+
+
+@dataclasses.dataclass
+class StatementStats:
+    statement: str
+    count: int = 0
+    duration_seconds: float = 0.0
+    locations: collections.Counter[str] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+
+    @property
+    def most_common_location(self) -> str:
+        most_common = self.locations.most_common(1)
+        return most_common[0][0] if len(most_common) > 0 else _UNKNOWN_LOCATION
+
+
+class QueryProfile:
+    """Statements executed within a query profiling context.
+
+    Like ``timings.Timings``, it may be shared by multiple threads.
+    """
+
+    def __init__(self):
+        self._statements: dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def add(self, statement: str, duration_seconds: float, location: str) -> None:
+        with self._lock:
+            if (stats := self._statements.get(statement)) is None:
+                stats = self._statements[statement] = StatementStats(statement)
+            stats.count += 1
+            stats.duration_seconds += duration_seconds
+            stats.locations[location] += 1
+
+    def get_statements(self) -> list[StatementStats]:
+        """Return a snapshot of the statements, the most repeated ones first."""
+        with self._lock:
+            snapshot = [
+                dataclasses.replace(s, locations=collections.Counter(s.locations))
+                for s in self._statements.values()
+            ]
+        return sorted(snapshot, key=lambda s: s.count, reverse=True)
+
+    @property
+    def num_statements(self) -> int:
+        with self._lock:
+            return sum(s.count for s in self._statements.values())
+
+    @property
+    def duration_seconds(self) -> float:
+        with self._lock:
+            return sum(s.duration_seconds for s in self._statements.values())
+
+
+def get_current_query_profile() -> Optional[QueryProfile]:
+    return _CURRENT_PROFILE.get()
+
+
+@contextlib.contextmanager
+def start_query_profile() -> Iterator[QueryProfile]:
+    """Activate a new query profiling context, for the duration of the block."""
+    profile = QueryProfile()
+    token = _CURRENT_PROFILE.set(profile)
+    try:
+        yield profile
+    finally:
+        _CURRENT_PROFILE.reset(token)
+
+
+def instrument_engine(engine: sqlalchemy.Engine) -> None:
+    """Profile the statements issued through the engine."""
+    if not sqlalchemy.event.contains(
+        engine, "before_cursor_execute", _before_cursor_execute
+    ):
+        sqlalchemy.event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        sqlalchemy.event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    if _CURRENT_PROFILE.get() is not None:
+        setattr(context, _EXECUTION_STARTED_ATTRIBUTE, time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    started = getattr(context, _EXECUTION_STARTED_ATTRIBUTE, None)
+    if started is not None and (profile := _CURRENT_PROFILE.get()) is not None:
+        profile.add(statement, time.perf_counter() - started, _find_calling_location())
+
+
+def _find_calling_location() -> str:
+    """Find the innermost frame of our own code which led to the current one.
+
+    This skips the frames of SQLAlchemy and of any other library.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        module_name = frame.f_globals.get("__name__", "")
+        if module_name.startswith(_PACKAGE_PREFIX) and module_name != __name__:
+            return f"{module_name}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return _UNKNOWN_LOCATION
@@ -1,7 +1,35 @@
 import datetime as dt
 
+import sqlalchemy
 import sqlmodel
 
+# dimensions by which download requests are rolled up, in addition to the day
+DOWNLOAD_REQUEST_ROLLUP_DIMENSIONS = (
+    "download_kind",
+    "climatological_variable",
+    "aggregation_period",
+    "measure_type",
+    "year_period",
+    "climatological_model",
+    "scenario",
+    "time_window",
+    "decade",
+    "reference_period",
+    "data_category",
+    "is_public_sector",
+    "download_reason",
+)
+
+
+def _get_request_datetime_index(table_name: str) -> sqlalchemy.Index:
+    # download requests are append-only, so the physical order of their rows
+    # follows request_datetime and a tiny BRIN index is enough for range scans
+    return sqlalchemy.Index(
+        f"ix_{table_name}_request_datetime_brin",
+        "request_datetime",
+        postgresql_using="brin",
+    )
+
 
 class _BaseDownloadRequest(sqlmodel.SQLModel):
     id: int | None = sqlmodel.Field(default=None, primary_key=True)
@@ -27,6 +55,7 @@ class _BaseDownloadRequestCreate(sqlmodel.SQLModel):
 
 
 class ForecastCoverageDownloadRequest(_BaseDownloadRequest, table=True):
+    __table_args__ = (_get_request_datetime_index("forecastcoveragedownloadrequest"),)
     climatological_model: str
     scenario: str
     time_window: str | None
@@ -39,6 +68,7 @@ class ForecastCoverageDownloadRequestCreate(_BaseDownloadRequestCreate):
 
 
 class HistoricalCoverageDownloadRequest(_BaseDownloadRequest, table=True):
+    __table_args__ = (_get_request_datetime_index("historicalcoveragedownloadrequest"),)
     decade: str | None
     reference_period: str | None
 
@@ -49,6 +79,7 @@ class HistoricalCoverageDownloadRequestCreate(_BaseDownloadRequestCreate):
 
 
 class TimeSeriesDownloadRequest(_BaseDownloadRequest, table=True):
+    __table_args__ = (_get_request_datetime_index("timeseriesdownloadrequest"),)
     data_category: str
     longitude: float
     latitude: float
@@ -58,3 +89,60 @@ class TimeSeriesDownloadRequestCreate(_BaseDownloadRequestCreate):
     data_category: str
     longitude: float
     latitude: float
+
+
+class DownloadRequestDailyRollup(sqlmodel.SQLModel, table=True):
+    """Number of download requests of a day, for a combination of dimensions.
+
+    Dimensions which do not apply to a kind of download request are stored as
+    empty strings, so that they take part in the unique constraint.
+    """
+
+    __table_args__ = (
+        sqlalchemy.UniqueConstraint(
+            "day",
+            *DOWNLOAD_REQUEST_ROLLUP_DIMENSIONS,
+            name="uq_downloadrequestdailyrollup_day_dimensions",
+        ),
+        sqlalchemy.Index(
+            "ix_downloadrequestdailyrollup_day_brin",
+            "day",
+            postgresql_using="brin",
+        ),
+    )
+    id: int | None = sqlmodel.Field(default=None, primary_key=True)
+    day: dt.date
+    download_kind: str
+    climatological_variable: str
+    aggregation_period: str
+    measure_type: str
+    year_period: str
+    climatological_model: str = ""
+    scenario: str = ""
+    time_window: str = ""
+    decade: str = ""
+    reference_period: str = ""
+    data_category: str = ""
+    is_public_sector: bool
+    download_reason: str
+    num_requests: int
+
+
+class DownloadRequestAggregate(sqlmodel.SQLModel):
+    """Number of download requests of a period, for a combination of dimensions."""
+
+    period_start: dt.date
+    download_kind: str
+    climatological_variable: str
+    aggregation_period: str
+    measure_type: str
+    year_period: str
+    climatological_model: str
+    scenario: str
+    time_window: str
+    decade: str
+    reference_period: str
+    data_category: str
+    is_public_sector: bool
+    download_reason: str
+    num_requests: int
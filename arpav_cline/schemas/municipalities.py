@@ -1,3 +1,4 @@
+import dataclasses
 import uuid
 
 import geoalchemy2
@@ -22,6 +23,29 @@ class Municipality(sqlmodel.SQLModel, table=True):
             )
         )
     )
+    # simplified versions of geom, see MunicipalityGeometryResolution
+    geom_simplified_medium: fields.WkbElement | None = sqlmodel.Field(
+        default=None,
+        sa_column=sqlalchemy.Column(
+            geoalchemy2.Geometry(
+                srid=4326,
+                geometry_type="MULTIPOLYGON",
+                spatial_index=False,
+            ),
+            nullable=True,
+        ),
+    )
+    geom_simplified_low: fields.WkbElement | None = sqlmodel.Field(
+        default=None,
+        sa_column=sqlalchemy.Column(
+            geoalchemy2.Geometry(
+                srid=4326,
+                geometry_type="MULTIPOLYGON",
+                spatial_index=False,
+            ),
+            nullable=True,
+        ),
+    )
     name: str
     province_name: str
     region_name: str
@@ -46,3 +70,28 @@ class MunicipalityCentroid(sqlmodel.SQLModel):
     name: str
     province_name: str
     region_name: str
+
+
+@dataclasses.dataclass(frozen=True)
+class MunicipalityGeoJsonFeature:
+    """A municipality whose geometry has already been encoded as GeoJSON."""
+
+    id: uuid.UUID
+    name: str
+    province_name: str
+    region_name: str
+    centroid_epsg_4326_lon: float | None
+    centroid_epsg_4326_lat: float | None
+    geometry_geojson: str
+
+
+@dataclasses.dataclass(frozen=True)
+class MunicipalityLabel:
+    """The attributes that identify a municipality, without its geometry."""
+
+    id: uuid.UUID
+    name: str
+    province_name: str
+    region_name: str
+    centroid_epsg_4326_lon: float | None = None
+    centroid_epsg_4326_lat: float | None = None
@@ -1,3 +1,4 @@
+import dataclasses
 import datetime as dt
 import uuid
 from typing import (
@@ -564,6 +565,11 @@ class ObservationStationUpdate(sqlmodel.SQLModel):
     climatic_indicators: Optional[list[int]] = None
 
 
+OBSERVATION_MEASUREMENT_UNIQUE_CONSTRAINT_NAME = (
+    "uq_observationmeasurement_station_indicator_aggregation_date"
+)
+
+
 class ObservationMeasurement(sqlmodel.SQLModel, table=True):
     __table_args__ = (
         sqlalchemy.ForeignKeyConstraint(
@@ -586,6 +592,16 @@ class ObservationMeasurement(sqlmodel.SQLModel, table=True):
             onupdate="CASCADE",
             ondelete="CASCADE",  # i.e. delete a measurement if its climatic_indicator station is deleted
         ),
+        # the constraint's index also covers `value`, which allows retrieving a
+        # station's series with an index-only scan. SQLAlchemy 2.0 cannot
+        # render INCLUDE for constraints, so it is only added by the migrations
+        sqlalchemy.UniqueConstraint(
+            "observation_station_id",
+            "climatic_indicator_id",
+            "measurement_aggregation_type",
+            "date",
+            name=OBSERVATION_MEASUREMENT_UNIQUE_CONSTRAINT_NAME,
+        ),
     )
     id: int | None = sqlmodel.Field(default=None, primary_key=True)
     value: float
@@ -614,6 +630,20 @@ class ObservationMeasurement(sqlmodel.SQLModel, table=True):
     )
 
 
+@dataclasses.dataclass(frozen=True)
+class ObservationMeasurementLoadResult:
+    num_inserted: int
+    num_updated: int
+    inserted_ids: Optional[list[int]] = None
+
+
+@dataclasses.dataclass(frozen=True)
+class StationsViewRefreshResult:
+    view_name: str
+    action: static.StationsViewRefreshAction
+    duration_seconds: float
+
+
 class ObservationMeasurementCreate(sqlmodel.SQLModel):
     value: float
     date: dt.date
@@ -816,6 +816,60 @@ class ObservationStationManager(str, enum.Enum):
         }.get(self, 0)
 
 
+class StationsViewRefreshAction(str, enum.Enum):
+    CREATED = "created"
+    REFRESHED = "refreshed"
+    SKIPPED = "skipped"
+
+
+class MunicipalityGeometryResolution(str, enum.Enum):
+    FULL = "full"
+    MEDIUM = "medium"
+    LOW = "low"
+
+    @classmethod
+    def from_zoom(cls, zoom: int) -> "MunicipalityGeometryResolution":
+        """Return the coarsest resolution which still looks right at a map zoom level."""
+        if zoom <= 8:
+            result = cls.LOW
+        elif zoom <= 11:
+            result = cls.MEDIUM
+        else:
+            result = cls.FULL
+        return result
+
+    def get_simplification_tolerance(self) -> float | None:
+        """Return the simplification tolerance, in degrees."""
+        return {
+            self.MEDIUM: 0.0005,
+            self.LOW: 0.005,
+        }.get(self)
+
+    def get_coordinate_precision(self) -> int:
+        """Return the number of decimal digits used for output coordinates."""
+        return {
+            self.FULL: 6,
+            self.MEDIUM: 4,
+            self.LOW: 3,
+        }[self]
+
+
+class VectorTileLayer(str, enum.Enum):
+    MUNICIPALITIES = "municipalities"
+    STATIONS = "stations"
+
+
+class DownloadRequestKind(str, enum.Enum):
+    FORECAST_COVERAGE = "forecast_coverage"
+    HISTORICAL_COVERAGE = "historical_coverage"
+    TIME_SERIES = "time_series"
+
+
+class AnalyticsRollupGranularity(str, enum.Enum):
+    DAY = "day"
+    MONTH = "month"
+
+
 @dataclasses.dataclass(frozen=True)
 class StaticForecastCoverage:
     """This class provides static access to properties of a forecast coverage.
@@ -0,0 +1,202 @@
+"""In-memory spatial index of observation stations.
+
+Station locations change seldom, so rather than asking the DB for the nearest
+station on every time series request, the web application keeps an index of
+all stations in memory. There is one shapely ``STRtree`` for each climatic
+indicator, built from the coordinates of the stations that collect data for it,
+projected to a metric CRS. These are the same stations as the ones in the
+climatic indicator's stations materialized view, which is what the DB lookup
+uses.
+
+The index is loaded when the web application starts and is then reloaded
+whenever the station-related tables change. Changes are detected by polling the
+postgres table statistics, which is a single cheap query that does not touch
+the tables themselves.
+"""
+
+import dataclasses
+import logging
+from typing import (
+    Optional,
+    Sequence,
+)
+
+import anyio
+import anyio.to_thread
+import pyproj
+import shapely
+import sqlalchemy
+import sqlmodel
+from geoalchemy2.shape import to_shape
+
+from .schemas.observations import (
+    ObservationStation,
+    ObservationStationClimaticIndicatorLink,
+)
+
+logger = logging.getLogger(__name__)
+
+# this is a module global, which is managed by the web application's lifespan
+_STATION_INDEX: Optional["ObservationStationIndex"] = None
+
+_PROJECTED_CRS = "EPSG:3004"
+_TO_PROJECTED_CRS = pyproj.Transformer.from_crs(
+    pyproj.CRS("EPSG:4326"), pyproj.CRS(_PROJECTED_CRS), always_xy=True
+)
+_WATCHED_TABLES = (
+    ObservationStation.__tablename__,
+    ObservationStationClimaticIndicatorLink.__tablename__,
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class _StationTree:
+    tree: shapely.STRtree
+    stations: list[ObservationStation]
+
+
+class ObservationStationIndex:
+    """Nearest station lookups, without DB access.
+
+    Stations held by the index are detached from their DB session - only their
+    column attributes are available, not their relationships.
+    """
+
+    def __init__(
+        self,
+        trees: dict[int, _StationTree],
+        change_marker: Optional[int] = None,
+    ):
+        self._trees = trees
+        self.change_marker = change_marker
+
+    @classmethod
+    def from_db(cls, session: sqlmodel.Session) -> "ObservationStationIndex":
+        change_marker = get_change_marker(session)
+        stations = {s.id: s for s in session.exec(sqlmodel.select(ObservationStation))}
+        links_statement = sqlalchemy.select(
+            ObservationStationClimaticIndicatorLink.climatic_indicator_id,  # noqa
+            ObservationStationClimaticIndicatorLink.observation_station_id,  # noqa
+        )
+        grouped_station_ids = {}
+        for indicator_id, station_id in session.execute(links_statement):
+            grouped_station_ids.setdefault(indicator_id, []).append(station_id)
+        for station in stations.values():
+            session.expunge(station)
+        return cls.from_stations(
+            {
+                indicator_id: [stations[id_] for id_ in sorted(station_ids)]
+                for indicator_id, station_ids in grouped_station_ids.items()
+            },
+            change_marker=change_marker,
+        )
+
+    @classmethod
+    def from_stations(
+        cls,
+        grouped_stations: dict[int, list[ObservationStation]],
+        change_marker: Optional[int] = None,
+    ) -> "ObservationStationIndex":
+        projected_points = {}
+        trees = {}
+        for indicator_id, stations in grouped_stations.items():
+            points = []
+            for station in stations:
+                if (point := projected_points.get(station.id)) is None:
+                    point = _project(to_shape(station.geom))
+                    projected_points[station.id] = point
+                points.append(point)
+            trees[indicator_id] = _StationTree(
+                tree=shapely.STRtree(points), stations=list(stations)
+            )
+        logger.info(
+            f"Loaded station index with {len(projected_points)} stations and "
+            f"{len(trees)} climatic indicators"
+        )
+        return cls(trees, change_marker)
+
+    def find_nearest(
+        self,
+        point_geom: shapely.Point,
+        *,
+        climatic_indicator_id: int,
+        max_distance_meters: float,
+    ) -> Optional[tuple[ObservationStation, float]]:
+        """Find the nearest station and its distance, in meters.
+
+        The input point is expected to be in the EPSG:4326 CRS.
+        """
+        result = None
+        if (station_tree := self._trees.get(climatic_indicator_id)) is not None:
+            indexes, distances = station_tree.tree.query_nearest(
+                _project(point_geom),
+                max_distance=max_distance_meters,
+                return_distance=True,
+                all_matches=False,
+            )
+            if len(indexes) > 0:
+                result = (
+                    station_tree.stations[int(indexes[0])],
+                    float(distances[0]),
+                )
+        return result
+
+
+def get_station_index() -> Optional[ObservationStationIndex]:
+    return _STATION_INDEX
+
+
+def load_station_index(engine: sqlalchemy.Engine) -> ObservationStationIndex:
+    global _STATION_INDEX
+    with sqlmodel.Session(engine) as session:
+        _STATION_INDEX = ObservationStationIndex.from_db(session)
+    return _STATION_INDEX
+
+
+def clear_station_index() -> None:
+    global _STATION_INDEX
+    _STATION_INDEX = None
+
+
+def get_change_marker(
+    session: sqlmodel.Session, table_names: Sequence[str] = _WATCHED_TABLES
+) -> Optional[int]:
+    """Return a number which changes whenever any of the given tables change.
+
+    By default, the station-related tables are checked.
+    """
+    return session.execute(
+        sqlalchemy.text(
+            "SELECT sum(n_tup_ins + n_tup_upd + n_tup_del) "
+            "FROM pg_stat_user_tables "
+            "WHERE relname = ANY(:table_names)"
+        ),
+        {"table_names": list(table_names)},
+    ).scalar()
+
+
+def refresh_station_index_if_changed(engine: sqlalchemy.Engine) -> bool:
+    """Reload the station index, if the underlying DB tables have changed."""
+    current = get_station_index()
+    with sqlmodel.Session(engine) as session:
+        change_marker = get_change_marker(session)
+    if current is not None and change_marker == current.change_marker:
+        return False
+    load_station_index(engine)
+    return True
+
+
+async def keep_station_index_fresh(
+    engine: sqlalchemy.Engine, check_interval_seconds: float
+) -> None:
+    """Periodically check the DB for changes and reload the station index."""
+    while True:
+        await anyio.sleep(check_interval_seconds)
+        try:
+            await anyio.to_thread.run_sync(refresh_station_index_if_changed, engine)
+        except sqlalchemy.exc.SQLAlchemyError:
+            logger.exception("Could not refresh the station index")
+
+
+def _project(point_geom: shapely.Point) -> shapely.Point:
+    return shapely.Point(*_TO_PROJECTED_CRS.transform(point_geom.x, point_geom.y))
@@ -1,18 +1,19 @@
 import fnmatch
 import logging
-import traceback
 import typing
 from pathlib import Path
 from typing import Optional
 from xml.etree import ElementTree as etree
 
 import anyio
-import anyio.to_thread
-import exceptiongroup
 import httpx
 
-from ..config import ThreddsServerSettings
-from ..utils import batched
+from .. import metrics
+from ..config import (
+    DatasetMirrorSettings,
+    ThreddsServerSettings,
+)
+from . import mirror
 
 if typing.TYPE_CHECKING:
     from ..schemas import coverages
@@ -28,6 +29,15 @@ _NAMESPACES: typing.Final = {
 
 _THREDDS_FILE_SERVER_URL_FRAGMENT = "fileServer"
 
+# THREDDS reports dataset sizes with SI multiples
+_CATALOG_SIZE_UNIT_FACTORS: typing.Final = {
+    "bytes": 1,
+    "kbytes": 10**3,
+    "mbytes": 10**6,
+    "gbytes": 10**9,
+    "tbytes": 10**12,
+}
+
 
 def get_opendap_url(
     rendered_fragment: str, thredds_settings: ThreddsServerSettings
@@ -239,6 +249,103 @@ def find_thredds_dataset_url_fragment(
     return result
 
 
+def parse_catalog_datasets(
+    catalog_content: bytes, base_thredds_url: str
+) -> list[mirror.CatalogDatasetInfo]:
+    """Extract the size and modification date of each dataset in a THREDDS catalog.
+
+    Datasets are identified by their file download service URL.
+    """
+    root = etree.fromstring(catalog_content)
+    thredds_ns = _NAMESPACES["thredds"]
+    result = []
+    for ds_el in root.iter(f"{{{thredds_ns}}}dataset"):
+        if (url_path := ds_el.get("urlPath")) is None:
+            continue
+        size_bytes = None
+        if (size_el := ds_el.find(f"{{{thredds_ns}}}dataSize")) is not None:
+            factor = _CATALOG_SIZE_UNIT_FACTORS.get(
+                size_el.get("units", "bytes").lower()
+            )
+            try:
+                size_bytes = round(float(size_el.text) * factor)
+            except (TypeError, ValueError):
+                logger.warning(
+                    f"Could not parse size of dataset {url_path!r}: "
+                    f"{size_el.text!r} {size_el.get('units')!r}"
+                )
+        modified_el = ds_el.find(f"{{{thredds_ns}}}date[@type='modified']")
+        result.append(
+            mirror.CatalogDatasetInfo(
+                url="/".join(
+                    (
+                        base_thredds_url.strip("/"),
+                        _THREDDS_FILE_SERVER_URL_FRAGMENT,
+                        url_path.strip("/"),
+                    )
+                ),
+                size_bytes=size_bytes,
+                modified=(
+                    modified_el.text.strip()
+                    if modified_el is not None and modified_el.text
+                    else None
+                ),
+            )
+        )
+    return result
+
+
+async def fetch_catalog_metadata(
+    dataset_urls: typing.Sequence[str],
+    base_thredds_url: str,
+    *,
+    max_concurrency: int = 8,
+    http_timeout_seconds: float = 30.0,
+) -> dict[str, mirror.CatalogDatasetInfo]:
+    """Retrieve catalog metadata for the input datasets.
+
+    Each catalog is requested only once, regardless of how many of the input
+    datasets it lists. Catalogs which cannot be retrieved are logged and
+    skipped, which means their datasets will not be part of the result.
+    """
+    prefix = f"{base_thredds_url.strip('/')}/{_THREDDS_FILE_SERVER_URL_FRAGMENT}/"
+    catalog_fragments = {
+        url[len(prefix) :].rpartition("/")[0]
+        for url in dataset_urls
+        if url.startswith(prefix)
+    }
+    result = {}
+    limiter = anyio.CapacityLimiter(max_concurrency)
+
+    async def _fetch_catalog(client: httpx.AsyncClient, catalog_fragment: str):
+        catalog_url = "/".join(
+            part
+            for part in (base_thredds_url.strip("/"), "catalog", catalog_fragment)
+            if part
+        )
+        catalog_url = f"{catalog_url}/catalog.xml"
+        async with limiter:
+            try:
+                with metrics.track_thredds_request(metrics.ThreddsService.CATALOG):
+                    response = await client.get(catalog_url)
+                    response.raise_for_status()
+                catalog_datasets = parse_catalog_datasets(
+                    response.content, base_thredds_url
+                )
+            except (httpx.HTTPError, etree.ParseError):
+                logger.exception(f"Could not retrieve catalog {catalog_url!r}")
+            else:
+                result.update({ds.url: ds for ds in catalog_datasets})
+
+    async with httpx.AsyncClient(
+        timeout=httpx.Timeout(http_timeout_seconds), follow_redirects=True
+    ) as client:
+        async with anyio.create_task_group() as task_group:
+            for fragment in sorted(catalog_fragments):
+                task_group.start_soon(_fetch_catalog, client, fragment)
+    return result
+
+
 # def get_coverage_configuration_urls(
 #     base_thredds_url: str,
 #     coverage_configuration: coverages.CoverageConfiguration,
@@ -274,52 +381,41 @@ async def download_datasets(
     base_thredds_url: str,
     output_base_directory: Path,
     force_download: bool = False,
-) -> None:
-    client = httpx.AsyncClient()
-    for batch in batched(dataset_urls, 10):
-        with exceptiongroup.catch({Exception: handle_thredds_download_exception}):
-            async with anyio.create_task_group() as tg:
-                for dataset_url in batch:
-                    output_path = Path(
-                        dataset_url.replace(
-                            f"{base_thredds_url}/{_THREDDS_FILE_SERVER_URL_FRAGMENT}",
-                            str(output_base_directory),
-                        )
-                    )
-                    tg.start_soon(
-                        download_individual_dataset,
-                        client,
-                        output_path,
-                        dataset_url,
-                        force_download,
-                    )
+    *,
+    mirror_settings: Optional[DatasetMirrorSettings] = None,
+    manifest_path: Optional[Path] = None,
+    change_list_path: Optional[Path] = None,
+    http_timeout_seconds: float = 30.0,
+    incremental: bool = False,
+) -> mirror.MirrorManifest:
+    """Download datasets from the THREDDS server's file download service.
 
-
-def handle_thredds_download_exception(excgroup: exceptiongroup.ExceptionGroup):
-    for exc in excgroup.exceptions:
-        logger.warning("\n".join(traceback.format_exception(exc)))
-
-
-async def download_individual_dataset(
-    http_client: httpx.AsyncClient,
-    output_path: Path,
-    dataset_url: str,
-    force_download: bool = False,
-) -> None:
-    if (not output_path.exists()) or force_download:
-        async with http_client.stream("GET", dataset_url) as response:
-            try:
-                # we catch the exception here because anyio task groups seem
-                # to cancel all tasks as soon as one of them raises an exception
-                response.raise_for_status()
-            except (httpx.HTTPStatusError, httpx.ReadTimeout):
-                logger.exception(f"Could not download dataset: {dataset_url}")
-            else:
-                logger.info(f"Downloading {dataset_url!r}...")
-                output_dir = output_path.parent
-                output_dir.mkdir(parents=True, exist_ok=True)
-                with output_path.open("wb") as fh:
-                    async for chunk in response.aiter_bytes():
-                        fh.write(chunk)
-    else:
-        logger.info(f"dataset {output_path!r} already exists locally, skipping...")
+    This delegates to the mirror engine, check the ``mirror`` module for details.
+    When ``incremental`` is true, the THREDDS catalogs are read first and only
+    datasets which are new or have changed are transferred.
+    """
+    settings = mirror_settings or DatasetMirrorSettings()
+    catalog_metadata = None
+    if incremental:
+        catalog_metadata = await fetch_catalog_metadata(
+            dataset_urls,
+            base_thredds_url,
+            max_concurrency=settings.max_concurrent_downloads,
+            http_timeout_seconds=http_timeout_seconds,
+        )
+    return await mirror.mirror_datasets(
+        dataset_urls,
+        base_thredds_url=base_thredds_url,
+        output_base_directory=output_base_directory,
+        manifest_path=(
+            manifest_path or output_base_directory / settings.manifest_file_name
+        ),
+        max_concurrency=settings.max_concurrent_downloads,
+        force_download=force_download,
+        http_timeout_seconds=http_timeout_seconds,
+        chunk_size_bytes=settings.download_chunk_size_bytes,
+        catalog_metadata=catalog_metadata,
+        change_list_path=(
+            change_list_path or output_base_directory / settings.change_list_file_name
+        ),
+    )
@@ -0,0 +1,703 @@
+"""Mirror NetCDF datasets from the THREDDS server's file download service.
+
+The mirror engine downloads datasets using a sliding window of concurrent
+transfers - as soon as one transfer finishes the next dataset is picked up, which
+means a slow file does not hold back the remaining ones. Partial downloads are
+kept in ``.part`` files and are resumed with HTTP range requests. Datasets whose
+local copy is still current are skipped, based on their size and on the
+``ETag``/``Last-Modified`` validators reported by the server.
+
+Each run writes a JSON manifest with the state of every mirrored dataset, which
+is also used by subsequent runs to decide whether a local copy is still current.
+
+In incremental mode, the size and modification date published in the THREDDS
+catalog are compared with the ones recorded in the manifest, and only datasets
+that are new or have changed are contacted at all. Each run also writes a JSON
+change list, with the datasets that were transferred, which can be used by
+downstream consumers to invalidate their caches.
+"""
+
+import dataclasses
+import datetime as dt
+import email.utils
+import enum
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import (
+    Optional,
+    Sequence,
+)
+
+import anyio
+import anyio.streams.memory
+import httpx
+
+from ..exceptions import DatasetMirrorError
+
+logger = logging.getLogger(__name__)
+
+_PARTIAL_DOWNLOAD_SUFFIX = ".part"
+_THREDDS_FILE_SERVER_URL_FRAGMENT = "fileServer"
+
+
+class MirrorEntryStatus(enum.Enum):
+    DOWNLOADED = "downloaded"
+    RESUMED = "resumed"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+class DatasetChangeType(enum.Enum):
+    NEW = "new"
+    MODIFIED = "modified"
+
+
+@dataclasses.dataclass(frozen=True)
+class CatalogDatasetInfo:
+    """Dataset metadata, as published in the THREDDS catalog.
+
+    The size reported by THREDDS catalogs is rounded, so it is only suitable
+    for comparing against the size reported by an earlier catalog listing, not
+    against the size of the local file.
+    """
+
+    url: str
+    size_bytes: Optional[int]
+    modified: Optional[str]
+
+
+@dataclasses.dataclass
+class RemoteDatasetInfo:
+    size_bytes: Optional[int]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    accepts_ranges: bool
+
+    @classmethod
+    def from_headers(cls, headers: httpx.Headers) -> "RemoteDatasetInfo":
+        raw_size = headers.get("content-length")
+        return cls(
+            size_bytes=int(raw_size) if raw_size is not None else None,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            accepts_ranges=headers.get("accept-ranges", "").lower() == "bytes",
+        )
+
+    @property
+    def last_modified_timestamp(self) -> Optional[float]:
+        return _parse_http_date(self.last_modified)
+
+
+@dataclasses.dataclass
+class MirrorEntry:
+    url: str
+    path: str
+    status: MirrorEntryStatus
+    size_bytes: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    bytes_transferred: int = 0
+    duration_seconds: float = 0.0
+    synced_at: Optional[dt.datetime] = None
+    error: Optional[str] = None
+    catalog_size_bytes: Optional[int] = None
+    catalog_modified: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        result = dataclasses.asdict(self)
+        result["status"] = self.status.value
+        result["synced_at"] = (
+            self.synced_at.isoformat() if self.synced_at is not None else None
+        )
+        return result
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "MirrorEntry":
+        raw_synced_at = raw.get("synced_at")
+        return cls(
+            **{
+                **raw,
+                "status": MirrorEntryStatus(raw["status"]),
+                "synced_at": (
+                    dt.datetime.fromisoformat(raw_synced_at)
+                    if raw_synced_at is not None
+                    else None
+                ),
+            }
+        )
+
+
+@dataclasses.dataclass
+class DatasetChange:
+    url: str
+    path: str
+    change_type: DatasetChangeType
+    size_bytes: Optional[int] = None
+    last_modified: Optional[str] = None
+    catalog_modified: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        result = dataclasses.asdict(self)
+        result["change_type"] = self.change_type.value
+        return result
+
+
+@dataclasses.dataclass
+class MirrorRunSummary:
+    started_at: dt.datetime
+    finished_at: Optional[dt.datetime] = None
+    num_downloaded: int = 0
+    num_resumed: int = 0
+    num_skipped: int = 0
+    num_failed: int = 0
+    bytes_transferred: int = 0
+    changes: list[DatasetChange] = dataclasses.field(default_factory=list)
+
+    @property
+    def duration_seconds(self) -> float:
+        end = self.finished_at or dt.datetime.now(dt.timezone.utc)
+        return (end - self.started_at).total_seconds()
+
+    @property
+    def throughput_bytes_per_second(self) -> float:
+        duration = self.duration_seconds
+        return self.bytes_transferred / duration if duration > 0 else 0.0
+
+    def register(self, entry: MirrorEntry) -> None:
+        if entry.status == MirrorEntryStatus.DOWNLOADED:
+            self.num_downloaded += 1
+        elif entry.status == MirrorEntryStatus.RESUMED:
+            self.num_resumed += 1
+        elif entry.status == MirrorEntryStatus.SKIPPED:
+            self.num_skipped += 1
+        else:
+            self.num_failed += 1
+        self.bytes_transferred += entry.bytes_transferred
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": (
+                self.finished_at.isoformat() if self.finished_at is not None else None
+            ),
+            "num_downloaded": self.num_downloaded,
+            "num_resumed": self.num_resumed,
+            "num_skipped": self.num_skipped,
+            "num_failed": self.num_failed,
+            "bytes_transferred": self.bytes_transferred,
+            "num_changed": len(self.changes),
+            "duration_seconds": self.duration_seconds,
+            "throughput_bytes_per_second": self.throughput_bytes_per_second,
+        }
+
+
+@dataclasses.dataclass
+class MirrorManifest:
+    """State of the local mirror.
+
+    ``entries`` is keyed by the path of each dataset, relative to the mirror's
+    base directory. Entries that were not part of the latest run are kept as-is,
+    so that the manifest always describes the whole local mirror.
+    """
+
+    base_thredds_url: str
+    entries: dict[str, MirrorEntry] = dataclasses.field(default_factory=dict)
+    last_run: Optional[MirrorRunSummary] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "base_thredds_url": self.base_thredds_url,
+            "last_run": self.last_run.to_dict() if self.last_run else None,
+            "entries": [e.to_dict() for e in self.entries.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "MirrorManifest":
+        entries = [MirrorEntry.from_dict(e) for e in raw.get("entries", [])]
+        return cls(
+            base_thredds_url=raw["base_thredds_url"],
+            entries={e.path: e for e in entries},
+        )
+
+    @classmethod
+    def load(cls, manifest_path: Path) -> Optional["MirrorManifest"]:
+        result = None
+        if manifest_path.is_file():
+            try:
+                result = cls.from_dict(json.loads(manifest_path.read_text()))
+            except (ValueError, KeyError, TypeError):
+                logger.warning(
+                    f"Could not parse mirror manifest {str(manifest_path)!r}, "
+                    f"ignoring it..."
+                )
+        return result
+
+    def write(self, manifest_path: Path) -> None:
+        """Write manifest to disk atomically."""
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = manifest_path.with_name(f"{manifest_path.name}.tmp")
+        temporary_path.write_text(json.dumps(self.to_dict(), indent=2))
+        os.replace(temporary_path, manifest_path)
+
+
+@dataclasses.dataclass
+class SyncPlan:
+    """Datasets to mirror, classified by comparing the catalog with the manifest.
+
+    ``unlisted`` holds the datasets which were not found in the THREDDS catalog -
+    these are still mirrored, relying on the validators sent by the server.
+    """
+
+    new: list[str] = dataclasses.field(default_factory=list)
+    modified: list[str] = dataclasses.field(default_factory=list)
+    unchanged: list[str] = dataclasses.field(default_factory=list)
+    unlisted: list[str] = dataclasses.field(default_factory=list)
+
+    @property
+    def urls_to_transfer(self) -> list[str]:
+        return [*self.new, *self.modified, *self.unlisted]
+
+
+def get_local_dataset_path(
+    dataset_url: str, base_thredds_url: str, output_base_directory: Path
+) -> Path:
+    """Map a THREDDS file download URL to its path in the local mirror."""
+    prefix = f"{base_thredds_url.strip('/')}/{_THREDDS_FILE_SERVER_URL_FRAGMENT}/"
+    if not dataset_url.startswith(prefix):
+        raise DatasetMirrorError(
+            f"dataset URL {dataset_url!r} is not served by the THREDDS file "
+            f"download service at {base_thredds_url!r}"
+        )
+    return output_base_directory / dataset_url[len(prefix) :]
+
+
+def is_local_copy_current(
+    local_path: Path,
+    remote_info: RemoteDatasetInfo,
+    previous_entry: Optional[MirrorEntry] = None,
+) -> bool:
+    """Check whether the local copy of a dataset matches its remote counterpart.
+
+    The sizes must match. Then the remote validators are compared against the ones
+    stored in the previous manifest entry, with a fallback to comparing the
+    remote ``Last-Modified`` with the local file's modification time. When the
+    server does not provide any validators, matching sizes are deemed sufficient.
+    """
+    if not local_path.is_file():
+        return False
+    local_stat = local_path.stat()
+    if remote_info.size_bytes is not None:
+        if local_stat.st_size != remote_info.size_bytes:
+            return False
+    if previous_entry is not None and previous_entry.status != MirrorEntryStatus.FAILED:
+        if remote_info.etag is not None and previous_entry.etag is not None:
+            return remote_info.etag == previous_entry.etag
+        if (
+            remote_info.last_modified is not None
+            and previous_entry.last_modified is not None
+        ):
+            return remote_info.last_modified == previous_entry.last_modified
+    if (remote_timestamp := remote_info.last_modified_timestamp) is not None:
+        return local_stat.st_mtime >= remote_timestamp
+    return True
+
+
+def compute_sync_plan(
+    dataset_urls: Sequence[str],
+    catalog_metadata: dict[str, CatalogDatasetInfo],
+    previous_entries: dict[str, MirrorEntry],
+    base_thredds_url: str,
+    output_base_directory: Path,
+) -> SyncPlan:
+    """Find out which datasets are new or have been modified in the catalog.
+
+    A dataset is only deemed unchanged when its previous mirror run succeeded,
+    its local copy still exists and the catalog reports the same size and
+    modification date as the ones that were recorded in the manifest.
+    """
+    plan = SyncPlan()
+    for dataset_url in dataset_urls:
+        if (catalog_info := catalog_metadata.get(dataset_url)) is None:
+            plan.unlisted.append(dataset_url)
+            continue
+        try:
+            local_path = get_local_dataset_path(
+                dataset_url, base_thredds_url, output_base_directory
+            )
+        except DatasetMirrorError:
+            plan.unlisted.append(dataset_url)
+            continue
+        relative_path = str(local_path.relative_to(output_base_directory))
+        previous_entry = previous_entries.get(relative_path)
+        if previous_entry is None:
+            plan.new.append(dataset_url)
+        elif (
+            previous_entry.status == MirrorEntryStatus.FAILED
+            or not local_path.is_file()
+            or previous_entry.catalog_modified is None
+            or previous_entry.catalog_modified != catalog_info.modified
+            or previous_entry.catalog_size_bytes != catalog_info.size_bytes
+        ):
+            plan.modified.append(dataset_url)
+        else:
+            plan.unchanged.append(dataset_url)
+    return plan
+
+
+def build_change_list(
+    run_entries: Sequence[MirrorEntry], previous_entries: dict[str, MirrorEntry]
+) -> list[DatasetChange]:
+    """Build the list of datasets whose local copy was (re)written by a run."""
+    result = []
+    for entry in run_entries:
+        if entry.status not in (
+            MirrorEntryStatus.DOWNLOADED,
+            MirrorEntryStatus.RESUMED,
+        ):
+            continue
+        result.append(
+            DatasetChange(
+                url=entry.url,
+                path=entry.path,
+                change_type=(
+                    DatasetChangeType.MODIFIED
+                    if entry.path in previous_entries
+                    else DatasetChangeType.NEW
+                ),
+                size_bytes=entry.size_bytes,
+                last_modified=entry.last_modified,
+                catalog_modified=entry.catalog_modified,
+            )
+        )
+    return sorted(result, key=lambda c: c.path)
+
+
+def write_change_list(
+    change_list_path: Path,
+    changes: Sequence[DatasetChange],
+    base_thredds_url: str,
+    generated_at: dt.datetime,
+) -> None:
+    """Write change list to disk atomically."""
+    change_list_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = change_list_path.with_name(f"{change_list_path.name}.tmp")
+    temporary_path.write_text(
+        json.dumps(
+            {
+                "generated_at": generated_at.isoformat(),
+                "base_thredds_url": base_thredds_url,
+                "changes": [c.to_dict() for c in changes],
+            },
+            indent=2,
+        )
+    )
+    os.replace(temporary_path, change_list_path)
+
+
+def get_partial_download_path(local_path: Path) -> Path:
+    return local_path.with_name(f"{local_path.name}{_PARTIAL_DOWNLOAD_SUFFIX}")
+
+
+def get_resume_offset(partial_path: Path, remote_info: RemoteDatasetInfo) -> int:
+    """Return the byte offset from where a partial download can be resumed."""
+    result = 0
+    if partial_path.is_file() and remote_info.accepts_ranges:
+        partial_size = partial_path.stat().st_size
+        if remote_info.size_bytes is None or partial_size < remote_info.size_bytes:
+            result = partial_size
+    return result
+
+
+async def mirror_datasets(
+    dataset_urls: Sequence[str],
+    *,
+    base_thredds_url: str,
+    output_base_directory: Path,
+    manifest_path: Path,
+    max_concurrency: int = 8,
+    force_download: bool = False,
+    http_timeout_seconds: float = 30.0,
+    chunk_size_bytes: int = 1024 * 1024,
+    catalog_metadata: Optional[dict[str, CatalogDatasetInfo]] = None,
+    change_list_path: Optional[Path] = None,
+) -> MirrorManifest:
+    """Mirror THREDDS datasets into the local output directory.
+
+    Datasets are processed by ``max_concurrency`` workers, which share a single
+    connection pool. The resulting manifest is written to ``manifest_path``.
+
+    When ``catalog_metadata`` is provided the run is incremental - datasets which
+    the catalog reports as unchanged are skipped without contacting the server.
+    When ``change_list_path`` is provided, the list of transferred datasets is
+    written to it.
+    """
+    previous_manifest = MirrorManifest.load(manifest_path)
+    manifest = MirrorManifest(
+        base_thredds_url=base_thredds_url,
+        entries=dict(previous_manifest.entries) if previous_manifest else {},
+        last_run=MirrorRunSummary(started_at=dt.datetime.now(dt.timezone.utc)),
+    )
+    previous_entries = dict(manifest.entries)
+    run_entries: list[MirrorEntry] = []
+    if catalog_metadata is not None and not force_download:
+        plan = compute_sync_plan(
+            dataset_urls,
+            catalog_metadata,
+            previous_entries,
+            base_thredds_url,
+            output_base_directory,
+        )
+        logger.info(
+            f"Catalog comparison found {len(plan.new)} new, {len(plan.modified)} "
+            f"modified, {len(plan.unchanged)} unchanged and {len(plan.unlisted)} "
+            f"unlisted datasets"
+        )
+        for dataset_url in plan.unchanged:
+            relative_path = str(
+                get_local_dataset_path(
+                    dataset_url, base_thredds_url, output_base_directory
+                ).relative_to(output_base_directory)
+            )
+            entry = dataclasses.replace(
+                previous_entries[relative_path],
+                status=MirrorEntryStatus.SKIPPED,
+                bytes_transferred=0,
+                duration_seconds=0.0,
+                synced_at=dt.datetime.now(dt.timezone.utc),
+            )
+            manifest.entries[relative_path] = entry
+            manifest.last_run.register(entry)
+        urls_to_transfer = plan.urls_to_transfer
+    else:
+        urls_to_transfer = list(dataset_urls)
+    send_stream, receive_stream = anyio.create_memory_object_stream[str](
+        max_buffer_size=max_concurrency
+    )
+    client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_concurrency,
+            max_keepalive_connections=max_concurrency,
+        ),
+        timeout=httpx.Timeout(http_timeout_seconds),
+        follow_redirects=True,
+    )
+    async with client:
+        async with anyio.create_task_group() as task_group:
+            for _ in range(max_concurrency):
+                task_group.start_soon(
+                    _mirror_worker,
+                    client,
+                    receive_stream.clone(),
+                    manifest,
+                    run_entries,
+                    previous_entries,
+                    catalog_metadata or {},
+                    base_thredds_url,
+                    output_base_directory,
+                    force_download,
+                    chunk_size_bytes,
+                )
+            receive_stream.close()
+            async with send_stream:
+                for dataset_url in urls_to_transfer:
+                    await send_stream.send(dataset_url)
+    manifest.last_run.finished_at = dt.datetime.now(dt.timezone.utc)
+    manifest.last_run.changes = build_change_list(run_entries, previous_entries)
+    manifest.write(manifest_path)
+    if change_list_path is not None:
+        write_change_list(
+            change_list_path,
+            manifest.last_run.changes,
+            base_thredds_url,
+            manifest.last_run.finished_at,
+        )
+    summary = manifest.last_run
+    logger.info(
+        f"Mirror run finished in {summary.duration_seconds:.1f}s - "
+        f"downloaded: {summary.num_downloaded}, resumed: {summary.num_resumed}, "
+        f"skipped: {summary.num_skipped}, failed: {summary.num_failed}, "
+        f"changed: {len(summary.changes)}, transferred: {summary.bytes_transferred} bytes "
+        f"({_format_throughput(summary.throughput_bytes_per_second)})"
+    )
+    return manifest
+
+
+async def _mirror_worker(
+    http_client: httpx.AsyncClient,
+    url_stream: anyio.streams.memory.MemoryObjectReceiveStream[str],
+    manifest: MirrorManifest,
+    run_entries: list[MirrorEntry],
+    previous_entries: dict[str, MirrorEntry],
+    catalog_metadata: dict[str, CatalogDatasetInfo],
+    base_thredds_url: str,
+    output_base_directory: Path,
+    force_download: bool,
+    chunk_size_bytes: int,
+) -> None:
+    async with url_stream:
+        async for dataset_url in url_stream:
+            try:
+                local_path = get_local_dataset_path(
+                    dataset_url, base_thredds_url, output_base_directory
+                )
+            except DatasetMirrorError as err:
+                logger.warning(str(err))
+                continue
+            relative_path = str(local_path.relative_to(output_base_directory))
+            previous_entry = previous_entries.get(relative_path)
+            entry = await mirror_individual_dataset(
+                http_client,
+                dataset_url,
+                local_path,
+                relative_path,
+                previous_entry=previous_entry,
+                force_download=force_download,
+                chunk_size_bytes=chunk_size_bytes,
+            )
+            if entry.status != MirrorEntryStatus.FAILED:
+                if (catalog_info := catalog_metadata.get(dataset_url)) is not None:
+                    entry.catalog_size_bytes = catalog_info.size_bytes
+                    entry.catalog_modified = catalog_info.modified
+                elif previous_entry is not None:
+                    # keep what the last catalog listing said, otherwise the next
+                    # incremental run would deem the dataset modified
+                    entry.catalog_size_bytes = previous_entry.catalog_size_bytes
+                    entry.catalog_modified = previous_entry.catalog_modified
+            manifest.entries[relative_path] = entry
+            manifest.last_run.register(entry)
+            run_entries.append(entry)
+
+
+async def mirror_individual_dataset(
+    http_client: httpx.AsyncClient,
+    dataset_url: str,
+    local_path: Path,
+    relative_path: str,
+    *,
+    previous_entry: Optional[MirrorEntry] = None,
+    force_download: bool = False,
+    chunk_size_bytes: int = 1024 * 1024,
+) -> MirrorEntry:
+    """Mirror a single dataset, resuming a previous partial download if possible.
+
+    Errors are not raised, but rather reported in the returned entry, as we do not
+    want a single failed dataset to cancel the remaining transfers.
+    """
+    start = time.perf_counter()
+    try:
+        head_response = await http_client.head(dataset_url)
+        head_response.raise_for_status()
+        remote_info = RemoteDatasetInfo.from_headers(head_response.headers)
+        if not force_download and is_local_copy_current(
+            local_path, remote_info, previous_entry
+        ):
+            logger.info(f"dataset {relative_path!r} is up to date, skipping...")
+            return _build_entry(
+                dataset_url, relative_path, MirrorEntryStatus.SKIPPED, remote_info
+            )
+        partial_path = get_partial_download_path(local_path)
+        partial_path.parent.mkdir(parents=True, exist_ok=True)
+        if force_download:
+            resume_offset = 0
+        else:
+            resume_offset = get_resume_offset(partial_path, remote_info)
+        request_headers = {}
+        if resume_offset > 0:
+            request_headers["range"] = f"bytes={resume_offset}-"
+            if (validator := remote_info.etag or remote_info.last_modified) is not None:
+                # if the remote has changed the server replies with the full dataset
+                request_headers["if-range"] = validator
+        bytes_transferred = 0
+        async with http_client.stream(
+            "GET", dataset_url, headers=request_headers
+        ) as response:
+            response.raise_for_status()
+            if response.status_code == httpx.codes.PARTIAL_CONTENT:
+                logger.info(
+                    f"Resuming download of {dataset_url!r} from byte {resume_offset}..."
+                )
+                status = MirrorEntryStatus.RESUMED
+                file_mode = "ab"
+            else:
+                logger.info(f"Downloading {dataset_url!r}...")
+                status = MirrorEntryStatus.DOWNLOADED
+                file_mode = "wb"
+                remote_info = RemoteDatasetInfo.from_headers(response.headers)
+            with partial_path.open(file_mode) as fh:
+                async for chunk in response.aiter_bytes(chunk_size_bytes):
+                    fh.write(chunk)
+                    bytes_transferred += len(chunk)
+        downloaded_size = partial_path.stat().st_size
+        if (
+            remote_info.size_bytes is not None
+            and downloaded_size != remote_info.size_bytes
+        ):
+            # the partial file is kept, in order to be resumed on a later run
+            raise DatasetMirrorError(
+                f"size of downloaded dataset ({downloaded_size} bytes) does not "
+                f"match the expected size ({remote_info.size_bytes} bytes)"
+            )
+        os.replace(partial_path, local_path)
+        if (remote_timestamp := remote_info.last_modified_timestamp) is not None:
+            os.utime(local_path, (remote_timestamp, remote_timestamp))
+        duration = max(time.perf_counter() - start, 1e-6)
+        logger.info(
+            f"Mirrored {relative_path!r} - {bytes_transferred} bytes in "
+            f"{duration:.1f}s ({_format_throughput(bytes_transferred / duration)})"
+        )
+        return _build_entry(
+            dataset_url,
+            relative_path,
+            status,
+            remote_info,
+            bytes_transferred=bytes_transferred,
+            duration_seconds=duration,
+        )
+    except (httpx.HTTPError, OSError, DatasetMirrorError) as err:
+        logger.exception(f"Could not mirror dataset {dataset_url!r}")
+        return MirrorEntry(
+            url=dataset_url,
+            path=relative_path,
+            status=MirrorEntryStatus.FAILED,
+            duration_seconds=time.perf_counter() - start,
+            synced_at=dt.datetime.now(dt.timezone.utc),
+            error=str(err),
+        )
+
+
+def _build_entry(
+    dataset_url: str,
+    relative_path: str,
+    status: MirrorEntryStatus,
+    remote_info: RemoteDatasetInfo,
+    bytes_transferred: int = 0,
+    duration_seconds: float = 0.0,
+) -> MirrorEntry:
+    return MirrorEntry(
+        url=dataset_url,
+        path=relative_path,
+        status=status,
+        size_bytes=remote_info.size_bytes,
+        etag=remote_info.etag,
+        last_modified=remote_info.last_modified,
+        bytes_transferred=bytes_transferred,
+        duration_seconds=duration_seconds,
+        synced_at=dt.datetime.now(dt.timezone.utc),
+    )
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    result = None
+    if value is not None:
+        try:
+            result = email.utils.parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError):
+            logger.warning(f"Could not parse {value!r} as an HTTP date")
+    return result
+
+
+def _format_throughput(bytes_per_second: float) -> str:
+    return f"{bytes_per_second / (1024 * 1024):.2f} MiB/s"
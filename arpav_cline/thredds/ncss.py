@@ -21,6 +21,10 @@ import pandas as pd
 import shapely
 from pandas.core.indexes.datetimes import DatetimeIndex
 
+from .. import (
+    metrics,
+    timings,
+)
 from ..exceptions import CoverageDataRetrievalError
 from . import models
 
@@ -152,6 +156,7 @@ class ForecastCoverageDataRetriever(SimpleCoverageDataRetriever):
             return None
 
 
+@timings.timed_function("ncss_parse")
 def _parse_ncss_dataset(
     raw_data: str,
     source_main_ds_name: str,
@@ -290,6 +295,7 @@ def get_dataset_description(
     )
 
 
+@timings.timed_function("ncss")
 async def async_query_dataset_area(
     http_client: httpx.AsyncClient,
     thredds_ncss_url: str,
@@ -341,9 +347,14 @@ async def async_query_dataset_area(
         **spatial_parameters,
     }
     request = http_client.build_request("GET", thredds_ncss_url, params=ncss_params)
-    return await http_client.send(request, stream=True)
+    with metrics.track_thredds_request(metrics.ThreddsService.NCSS):
+        response = await http_client.send(request, stream=True)
+    if response.is_error:
+        metrics.count_thredds_error(metrics.ThreddsService.NCSS)
+    return response
 
 
+@timings.timed_function("ncss")
 async def async_query_dataset(
     http_client: httpx.AsyncClient,
     thredds_ncss_url: str,
@@ -363,19 +374,20 @@ async def async_query_dataset(
             "time_start": time_start.isoformat(),
             "time_end": time_end.isoformat(),
         }
-    response = await http_client.get(
-        thredds_ncss_url,
-        params={
-            "var": netcdf_variable_name,
-            "latitude": latitude,
-            "longitude": longitude,
-            "accept": "CSV",
-            **temporal_parameters,
-        },
-    )
     try:
-        response.raise_for_status()
-    except httpx.HTTPError as err:
+        with metrics.track_thredds_request(metrics.ThreddsService.NCSS):
+            response = await http_client.get(
+                thredds_ncss_url,
+                params={
+                    "var": netcdf_variable_name,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "accept": "CSV",
+                    **temporal_parameters,
+                },
+            )
+            response.raise_for_status()
+    except httpx.HTTPStatusError as err:
         logger.exception(msg="Could not retrieve data")
         logger.debug(f"upstream NCSS error: {response.content}")
         raise CoverageDataRetrievalError() from err
@@ -384,6 +396,7 @@ async def async_query_dataset(
     return result
 
 
+@timings.timed_function("ncss")
 def query_dataset(
     http_client: httpx.Client,
     thredds_ncss_url: str,
@@ -403,19 +416,20 @@ def query_dataset(
             "time_start": time_start.isoformat(),
             "time_end": time_end.isoformat(),
         }
-    response = http_client.get(
-        thredds_ncss_url,
-        params={
-            "var": variable_name,
-            "latitude": latitude,
-            "longitude": longitude,
-            "accept": "CSV",
-            **temporal_parameters,
-        },
-    )
     try:
-        response.raise_for_status()
-    except httpx.HTTPError:
+        with metrics.track_thredds_request(metrics.ThreddsService.NCSS):
+            response = http_client.get(
+                thredds_ncss_url,
+                params={
+                    "var": variable_name,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "accept": "CSV",
+                    **temporal_parameters,
+                },
+            )
+            response.raise_for_status()
+    except httpx.HTTPStatusError:
         logger.exception(msg="Could not retrieve data")
         logger.debug(f"upstream NCSS error: {response.content}")
         result = None
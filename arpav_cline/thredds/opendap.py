@@ -9,6 +9,11 @@ import cftime
 import netCDF4
 import pandas as pd
 
+from .. import (
+    metrics,
+    timings,
+)
+
 if TYPE_CHECKING:
     from ..config import ThreddsServerSettings
     from ..schemas.static import (
@@ -84,6 +89,8 @@ class ForecastOverviewDataRetriever:
         return result
 
 
+@timings.timed_function("opendap")
+@metrics.track_thredds_request(metrics.ThreddsService.OPENDAP)
 def _retrieve_data(
     opendap_url: str,
     netcdf_variable_name: str,
@@ -1,10 +1,8 @@
 import datetime as dt
-import functools
 import logging
 import warnings
 from typing import (
     Optional,
-    Sequence,
     TYPE_CHECKING,
 )
 
@@ -12,12 +10,13 @@ import numpy as np
 import pandas as pd
 import pyloess
 import pymannkendall
-import pyproj
-from pyproj.enums import TransformDirection
 import shapely
-from shapely.ops import transform
 
-from . import db
+from . import (
+    db,
+    stationindex,
+    timings,
+)
 from .exceptions import MannKendallInsufficientYearError
 from .schemas import (
     dataseries,
@@ -42,6 +41,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@timings.timed_function("processing")
 def generate_derived_overview_series(
     data_series: dataseries.OverviewDataSeriesProtocol,
     processing_method: static.CoverageTimeSeriesProcessingMethod,
@@ -146,6 +146,7 @@ def _generate_mann_kendall_series(
     }
 
 
+@timings.timed_function("processing")
 def generate_derived_forecast_series(
     data_series: dataseries.ForecastDataSeries,
     processing_method: static.CoverageTimeSeriesProcessingMethod,
@@ -193,32 +194,7 @@ def _apply_loess_smoothing(
     return loess_smoothed[:, 1]
 
 
-def _get_spatial_buffer(
-    point_geom: shapely.Point, distance_meters: int
-) -> shapely.Polygon:
-    """Buffer input point.
-
-    This function expects the input point geometry to be in EPSG:4326 CRS and will
-    return a buffer also in the same CRS. However, the buffer's distance is expected
-    to be provided in meters. This function takes care of reprojecting the input
-    geometry and the output buffer too.
-    """
-    coordinate_transformer = pyproj.Transformer.from_crs(
-        pyproj.CRS("EPSG:4326"), pyproj.CRS("EPSG:3004"), always_xy=True
-    ).transform
-    forward_coordinate_transformer = functools.partial(
-        coordinate_transformer, direction=TransformDirection.FORWARD
-    )
-    inverse_coordinate_transformer = functools.partial(
-        coordinate_transformer, direction=TransformDirection.INVERSE
-    )
-    point_geom_projected = transform(forward_coordinate_transformer, point_geom)
-    buffer_geom_projected = shapely.buffer(
-        point_geom_projected, distance=distance_meters
-    )
-    return transform(inverse_coordinate_transformer, buffer_geom_projected)
-
-
+@timings.timed_function("stations")
 def find_nearby_observation_station(
     session: "sqlmodel.Session",
     location: shapely.Point,
@@ -226,21 +202,33 @@ def find_nearby_observation_station(
     observation_series_configuration: Optional[
         "observations.ObservationSeriesConfiguration"
     ] = None,
-) -> Optional["observations.ObservationStation"]:
+    stations_view_db_schema: Optional[str] = None,
+) -> Optional[tuple["observations.ObservationStation", float]]:
     """
-    Find close station that collects data for input series conf's climatic indicator.
+    Find the nearest station that collects data for input series conf's climatic indicator.
+
+    Returns the station and its distance to the input location, in meters. The
+    in-memory station index is used when it is available, otherwise the DB is
+    queried.
     """
-    point_buffer_geom = _get_spatial_buffer(location, distance_threshold_meters)
-    nearby_stations = db.collect_all_observation_stations(
+    station_index = stationindex.get_station_index()
+    if station_index is not None and observation_series_configuration is not None:
+        return station_index.find_nearest(
+            location,
+            climatic_indicator_id=observation_series_configuration.climatic_indicator_id,
+            max_distance_meters=distance_threshold_meters,
+        )
+    return db.find_nearest_observation_station(
         session,
-        polygon_intersection_filter=point_buffer_geom,
-        climatic_indicator_id_filter=(
-            observation_series_configuration.climatic_indicator_id
+        location,
+        max_distance_meters=distance_threshold_meters,
+        climatic_indicator_identifier=(
+            observation_series_configuration.climatic_indicator.identifier
             if observation_series_configuration is not None
             else None
         ),
+        stations_view_db_schema=stations_view_db_schema,
     )
-    return nearby_stations[0] if len(nearby_stations) > 0 else None
 
 
 def filter_series_by_year_period(
@@ -256,12 +244,22 @@ def get_nearby_observation_station_time_series(
     distance_threshold_meters: int,
     temporal_range: tuple[Optional[dt.datetime], Optional[dt.datetime]],
     year_period: static.ObservationYearPeriod | None = None,
+    stations_view_db_schema: Optional[str] = None,
 ) -> Optional[dataseries.ObservationStationDataSeries]:
     result = None
-    nearby_station = find_nearby_observation_station(
-        session, location, distance_threshold_meters, observation_series_configuration
+    nearby = find_nearby_observation_station(
+        session,
+        location,
+        distance_threshold_meters,
+        observation_series_configuration,
+        stations_view_db_schema=stations_view_db_schema,
     )
-    if nearby_station is not None:
+    if nearby is not None:
+        nearby_station, distance = nearby
+        logger.debug(
+            f"Found station {nearby_station.code!r} at {distance:.0f}m from "
+            f"{location!r}"
+        )
         result = dataseries.ObservationStationDataSeries(
             observation_series_configuration=observation_series_configuration,
             dataset_type=static.DatasetType.OBSERVATION,
@@ -269,15 +267,16 @@ def get_nearby_observation_station_time_series(
             processing_method=static.ObservationTimeSeriesProcessingMethod.NO_PROCESSING,
             location=location,
         )
-        raw_data = db.collect_all_observation_measurements(
+        dates, values = db.get_observation_measurement_series(
             session,
-            observation_station_id_filter=nearby_station.id,
-            climatic_indicator_id_filter=observation_series_configuration.climatic_indicator_id,
-            aggregation_type_filter=observation_series_configuration.measurement_aggregation_type,
+            observation_station_id=nearby_station.id,
+            climatic_indicator_id=observation_series_configuration.climatic_indicator_id,
+            aggregation_type=observation_series_configuration.measurement_aggregation_type,
         )
-        if len(raw_data) > 0:
+        if len(dates) > 0:
             parsed_data = parse_observation_station_data(
-                raw_data,
+                dates,
+                values,
                 base_name=result.identifier,
                 temporal_range=temporal_range,
             )
@@ -296,29 +295,26 @@ def get_nearby_observation_station_time_series(
 
 
 def parse_observation_station_data(
-    raw_data: Sequence["observations.ObservationMeasurement"],
+    dates: np.ndarray,
+    values: np.ndarray,
     base_name: str,
     temporal_range: tuple[Optional[dt.datetime], Optional[dt.datetime]],
 ) -> pd.Series:
-    df = pd.DataFrame([i.model_dump() for i in raw_data])
-    df = df.rename(
-        columns={
-            "value": base_name,
-            "date": "time",
-        },
-    )
-    df = df[[base_name, "time"]]
-    df["time"] = pd.to_datetime(df["time"])
-    df.set_index("time", inplace=True)
+    series = pd.Series(
+        values,
+        index=pd.DatetimeIndex(dates.astype("datetime64[ns]"), name="time"),
+        name=base_name,
+    )
     if temporal_range is not None:
         start, end = temporal_range
         if start is not None:
-            df = df[start:]
+            series = series[start:]
         if end is not None:
-            df = df[:end]
-    return df.squeeze()
+            series = series[:end]
+    return series
 
 
+@timings.timed_function("processing")
 def generate_decade_derived_observation_station_series(
     original_series: dataseries.ObservationStationDataSeries,
     point_geom: shapely.geometry.Point,
@@ -346,6 +342,7 @@ def generate_decade_derived_observation_station_series(
     return result
 
 
+@timings.timed_function("processing")
 def generate_loess_derived_observation_station_series(
     original_series: dataseries.ObservationStationDataSeries,
     point_geom: shapely.geometry.Point,
@@ -367,6 +364,7 @@ def generate_loess_derived_observation_station_series(
     return derived_series
 
 
+@timings.timed_function("processing")
 def generate_moving_average_derived_observation_station_series(
     original_series: dataseries.ObservationStationDataSeries,
     point_geom: shapely.geometry.Point,
@@ -390,6 +388,7 @@ def generate_moving_average_derived_observation_station_series(
     return derived_series
 
 
+@timings.timed_function("processing")
 def generate_mann_kendall_derived_observation_station_series(
     original_series: dataseries.ObservationStationDataSeries,
     point_geom: shapely.geometry.Point,
@@ -419,6 +418,7 @@ def generate_mann_kendall_derived_observation_station_series(
     return derived_series
 
 
+@timings.timed_function("processing")
 def generate_moving_average_derived_historical_coverage_series(
     original_series: dataseries.HistoricalDataSeries,
 ) -> dataseries.HistoricalDataSeries:
@@ -440,6 +440,7 @@ def generate_moving_average_derived_historical_coverage_series(
     return derived_series
 
 
+@timings.timed_function("processing")
 def generate_decade_derived_historical_coverage_series(
     original_series: dataseries.HistoricalDataSeries,
 ) -> Optional[dataseries.HistoricalDataSeries]:
@@ -465,6 +466,7 @@ def generate_decade_derived_historical_coverage_series(
     return result
 
 
+@timings.timed_function("processing")
 def generate_loess_derived_historical_coverage_series(
     original_series: dataseries.HistoricalDataSeries,
 ) -> dataseries.HistoricalDataSeries:
@@ -484,6 +486,7 @@ def generate_loess_derived_historical_coverage_series(
     return derived_series
 
 
+@timings.timed_function("processing")
 def generate_mann_kendall_derived_historical_coverage_series(
     original_series: dataseries.HistoricalDataSeries,
     *,
@@ -544,6 +547,7 @@ def get_historical_observation_series(
             obs_series_conf,
             distance_threshold_meters=settings.nearest_station_radius_meters_historical,
             temporal_range=temporal_range,
+            stations_view_db_schema=settings.variable_stations_db_schema,
             year_period=static.ObservationYearPeriod(coverage.year_period.value),
         )
         if obs_data_series is not None:
@@ -727,6 +731,7 @@ def get_forecast_coverage_time_series(
     return result
 
 
+@timings.timed_function("processing")
 def generate_derived_observation_series(
     data_series: dataseries.ObservationStationDataSeries,
     processing_method: static.ObservationTimeSeriesProcessingMethod,
@@ -770,6 +775,7 @@ def _get_forecast_coverage_observation_time_series(
             observation_series_conf,
             distance_threshold_meters=settings.nearest_station_radius_meters_forecasts,
             temporal_range=temporal_range,
+            stations_view_db_schema=settings.variable_stations_db_schema,
             year_period=year_period,
         )
         if observation_data_series is not None:
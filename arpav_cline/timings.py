@@ -0,0 +1,161 @@
+"""Context-local timers, which break down where a request spends its time.
+
+Timers only record something while a timing context is active. The web
+application starts one for a sample of its requests and reports the collected
+timings in a ``Server-Timing`` header. Outside of a timing context, timed code
+pays for little more than a context variable lookup, so instrumentation can
+stay in place in production.
+
+Timings are accumulated per name, so a timer that runs several times in a
+request, like one around each DB statement, reports its total duration along
+with its number of runs. Timers with different names may overlap, e.g. the
+time spent waiting for THREDDS is part of the time spent in the endpoint, but
+a timer must not be nested within another one of the same name.
+"""
+
+import contextlib
+import contextvars
+import dataclasses
+import functools
+import inspect
+import threading
+import time
+from typing import (
+    Callable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+import sqlalchemy
+
+_CURRENT_TIMINGS: contextvars.ContextVar[Optional["Timings"]] = contextvars.ContextVar(
+    "timings", default=None
+)
+
+_DB_TIMER_NAME = "db"
+_EXECUTION_STARTED_ATTRIBUTE = "_timings_execution_started"
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclasses.dataclass
+class TimingEntry:
+    name: str
+    duration_seconds: float = 0.0
+    count: int = 0
+
+
+class Timings:
+    """Accumulated durations of the timers which ran within a timing context.
+
+    Work done on behalf of a request may be run in worker threads, which share
+    the same instance, so it is safe to use from multiple threads.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, TimingEntry] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, duration_seconds: float, count: int = 1) -> None:
+        """Record a duration, which may sum up ``count`` runs."""
+        with self._lock:
+            if (entry := self._entries.get(name)) is None:
+                entry = self._entries[name] = TimingEntry(name)
+            entry.duration_seconds += duration_seconds
+            entry.count += count
+
+    def get_duration_seconds(self, name: str) -> float:
+        with self._lock:
+            entry = self._entries.get(name)
+            return entry.duration_seconds if entry is not None else 0.0
+
+    def get_entries(self) -> list[TimingEntry]:
+        """Return a snapshot of the entries, in the order they were first added."""
+        with self._lock:
+            return [dataclasses.replace(e) for e in self._entries.values()]
+
+
+def get_current_timings() -> Optional[Timings]:
+    return _CURRENT_TIMINGS.get()
+
+
+@contextlib.contextmanager
+def start_timings() -> Iterator[Timings]:
+    """Activate a new timing context, for the duration of the block."""
+    timings = Timings()
+    token = _CURRENT_TIMINGS.set(timings)
+    try:
+        yield timings
+    finally:
+        _CURRENT_TIMINGS.reset(token)
+
+
+@contextlib.contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Time the block, if a timing context is active."""
+    if (timings := _CURRENT_TIMINGS.get()) is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def timed_function(name: str) -> Callable[[F], F]:
+    """Decorate a function, or a coroutine function, in order to time its calls."""
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _CURRENT_TIMINGS.get() is None:
+                    return await func(*args, **kwargs)
+                with timed(name):
+                    return await func(*args, **kwargs)
+
+            wrapper = async_wrapper
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if _CURRENT_TIMINGS.get() is None:
+                    return func(*args, **kwargs)
+                with timed(name):
+                    return func(*args, **kwargs)
+
+        wrapper.timer_name = name
+        return wrapper
+
+    return decorator
+
+
+def instrument_engine(engine: sqlalchemy.Engine) -> None:
+    """Time the execution of all statements issued through the engine.
+
+    Executions are recorded under the ``db`` name. Fetching rows from a cursor
+    after the statement has been executed is not included.
+    """
+    if not sqlalchemy.event.contains(
+        engine, "before_cursor_execute", _before_cursor_execute
+    ):
+        sqlalchemy.event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        sqlalchemy.event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    if _CURRENT_TIMINGS.get() is not None:
+        setattr(context, _EXECUTION_STARTED_ATTRIBUTE, time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    started = getattr(context, _EXECUTION_STARTED_ATTRIBUTE, None)
+    if started is not None and (timings := _CURRENT_TIMINGS.get()) is not None:
+        timings.add(_DB_TIMER_NAME, time.perf_counter() - started)
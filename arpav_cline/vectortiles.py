@@ -0,0 +1,152 @@
+"""In-memory cache of Mapbox Vector Tiles.
+
+Rendering a tile is a single DB query, but map clients request many tiles at a
+time and mostly the same ones. The web application thus keeps the most recently
+used tiles in memory, in a cache with a bounded number of entries.
+
+Tiles become stale when the underlying tables change, which happens when the
+station refresh flows and the municipalities bootstrap command run, in other
+processes. Just like for the station index, changes are detected by polling the
+postgres table statistics and the whole cache is then cleared.
+"""
+
+import collections
+import dataclasses
+import hashlib
+import logging
+import threading
+from typing import (
+    Callable,
+    Hashable,
+    Optional,
+)
+
+import anyio
+import anyio.to_thread
+import sqlalchemy
+import sqlmodel
+
+from . import metrics
+from .schemas.municipalities import Municipality
+from .schemas.observations import (
+    ObservationStation,
+    ObservationStationClimaticIndicatorLink,
+)
+from .stationindex import get_change_marker
+
+logger = logging.getLogger(__name__)
+
+# this is a module global, which is managed by the web application's lifespan
+_TILE_CACHE: Optional["VectorTileCache"] = None
+
+_WATCHED_TABLES = (
+    ObservationStation.__tablename__,
+    ObservationStationClimaticIndicatorLink.__tablename__,
+    Municipality.__tablename__,
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class VectorTile:
+    content: bytes
+    etag: str
+
+    @classmethod
+    def from_content(cls, content: bytes) -> "VectorTile":
+        # the etag depends only on the content, which keeps it valid across
+        # cache invalidations and application restarts, as long as the tile
+        # itself does not change
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        return cls(content=content, etag=f'"{digest}"')
+
+
+class VectorTileCache:
+    """A least recently used cache of vector tiles.
+
+    It is accessed by the web application's worker threads, so all operations
+    are guarded by a lock. Tiles are rendered outside of the lock, which means
+    that concurrent misses for the same tile may render it more than once.
+    """
+
+    def __init__(self, max_entries: int, change_marker: Optional[int] = None):
+        self.max_entries = max_entries
+        self.change_marker = change_marker
+        self.num_hits = 0
+        self.num_misses = 0
+        self._generation = 0
+        self._tiles: collections.OrderedDict[
+            Hashable, VectorTile
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def get_or_render(self, key: Hashable, render: Callable[[], bytes]) -> VectorTile:
+        """Return the cached tile, or render it with ``render()`` and cache it."""
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                self.num_hits += 1
+                metrics.count_cache_request("vector_tiles", hit=True)
+                return tile
+            self.num_misses += 1
+            metrics.count_cache_request("vector_tiles", hit=False)
+            generation = self._generation
+        tile = VectorTile.from_content(render())
+        with self._lock:
+            # do not keep the tile if the cache was cleared while rendering it,
+            # as it may have been rendered from stale data
+            if generation == self._generation:
+                self._tiles[key] = tile
+                self._tiles.move_to_end(key)
+                while len(self._tiles) > self.max_entries:
+                    self._tiles.popitem(last=False)
+        return tile
+
+    def clear(self, change_marker: Optional[int] = None) -> None:
+        with self._lock:
+            self._tiles.clear()
+            self._generation += 1
+            self.change_marker = change_marker
+
+
+def get_tile_cache() -> Optional[VectorTileCache]:
+    return _TILE_CACHE
+
+
+def start_tile_cache(max_entries: int) -> VectorTileCache:
+    global _TILE_CACHE
+    _TILE_CACHE = VectorTileCache(max_entries)
+    return _TILE_CACHE
+
+
+def clear_tile_cache() -> None:
+    global _TILE_CACHE
+    _TILE_CACHE = None
+
+
+def invalidate_tile_cache_if_changed(engine: sqlalchemy.Engine) -> bool:
+    """Clear the tile cache, if the underlying DB tables have changed."""
+    if (cache := get_tile_cache()) is None:
+        return False
+    with sqlmodel.Session(engine) as session:
+        change_marker = get_change_marker(session, _WATCHED_TABLES)
+    if change_marker == cache.change_marker:
+        return False
+    logger.info(f"Clearing {len(cache)} cached vector tiles")
+    cache.clear(change_marker)
+    return True
+
+
+async def keep_tile_cache_fresh(
+    engine: sqlalchemy.Engine, check_interval_seconds: float
+) -> None:
+    """Periodically check the DB for changes and clear the tile cache."""
+    while True:
+        try:
+            await anyio.to_thread.run_sync(invalidate_tile_cache_if_changed, engine)
+        except sqlalchemy.exc.SQLAlchemyError:
+            logger.exception("Could not check whether vector tiles are stale")
+        await anyio.sleep(check_interval_seconds)
@@ -15,6 +15,7 @@ from starlette_admin.views import (
 
 from ...db import get_engine
 from ...schemas.analytics import (
+    DownloadRequestDailyRollup,
     ForecastCoverageDownloadRequest,
     HistoricalCoverageDownloadRequest,
     TimeSeriesDownloadRequest,
@@ -162,6 +163,15 @@ def create_admin(settings: "ArpavPpcvSettings") -> ArpavPpcvAdmin:
                 analytics_views.TimeSeriesDownloadRequestView(
                     TimeSeriesDownloadRequest
                 ),
+                analytics_views.DownloadRequestDailyRollupView(
+                    DownloadRequestDailyRollup
+                ),
+                analytics_views.DownloadRequestAggregatesExportView(
+                    "Export totals (CSV)",
+                    icon="fa-solid fa-file-csv",
+                    path="/download-stats/export",
+                    name="download_stats_export",
+                ),
             ],
         )
     )
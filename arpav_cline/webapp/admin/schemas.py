@@ -243,3 +243,22 @@ class TimeSeriesDownloadRequestRead(sqlmodel.SQLModel):
     data_category: str
     longitude: float
     latitude: float
+
+
+class DownloadRequestDailyRollupRead(sqlmodel.SQLModel):
+    id: int
+    day: dt.date
+    download_kind: str
+    climatological_variable: str
+    aggregation_period: str
+    measure_type: str
+    year_period: str
+    climatological_model: str
+    scenario: str
+    time_window: str
+    decade: str
+    reference_period: str
+    data_category: str
+    is_public_sector: bool
+    download_reason: str
+    num_requests: int
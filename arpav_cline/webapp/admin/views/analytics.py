@@ -1,31 +1,45 @@
-import functools
+import csv
+import datetime as dt
+import io
 from typing import (
     Any,
+    Iterator,
     Optional,
-    Sequence,
-    Union,
 )
 
 import anyio.to_thread
+import sqlalchemy
+import sqlmodel
 import starlette_admin
+from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette_admin.contrib.sqlmodel import ModelView
+from starlette.responses import (
+    Response,
+    StreamingResponse,
+)
+from starlette.templating import Jinja2Templates
+from starlette_admin.views import CustomView
 
 from .... import db
 from ....schemas.analytics import (
+    DOWNLOAD_REQUEST_ROLLUP_DIMENSIONS,
+    DownloadRequestDailyRollup,
     ForecastCoverageDownloadRequest,
     HistoricalCoverageDownloadRequest,
     TimeSeriesDownloadRequest,
 )
+from ....schemas.static import AnalyticsRollupGranularity
 
 from ..schemas import (
+    DownloadRequestDailyRollupRead,
     ForecastCoverageDownloadRequestRead,
     HistoricalCoverageDownloadRequestRead,
     TimeSeriesDownloadRequestRead,
 )
+from .base import SqlPaginatedModelView
 
 
-class ForecastCoverageDownloadRequestView(ModelView):
+class ForecastCoverageDownloadRequestView(SqlPaginatedModelView):
     identity = "forecast_coverage_download_requests"
     name = "Forecast Coverage Download Request"
     label = "Forecasts"
@@ -34,6 +48,7 @@ class ForecastCoverageDownloadRequestView(ModelView):
     exclude_fields_from_list = ("id",)
     exclude_fields_from_detail = ("id",)
     search_builder = False
+    fields_default_sort = (("request_datetime", True),)
 
     fields = (
         starlette_admin.IntegerField("id"),
@@ -75,36 +90,8 @@ class ForecastCoverageDownloadRequestView(ModelView):
         )
         return self._serialize_instance(db_item)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[ForecastCoverageDownloadRequestRead]:
-        finder = functools.partial(
-            db.collect_all_forecast_coverage_download_requests,
-        )
-        db_items = await anyio.to_thread.run_sync(finder, request.state.session)
-        return [self._serialize_instance(ind) for ind in db_items]
-
-    async def count(
-        self,
-        request: Request,
-        where: Union[dict[str, Any], str, None] = None,
-    ) -> int:
-        finder = functools.partial(
-            db.collect_all_forecast_coverage_download_requests,
-        )
-        found = await anyio.to_thread.run_sync(
-            finder,
-            request.state.session,
-        )
-        return len(found)
 
-
-class HistoricalCoverageDownloadRequestView(ModelView):
+class HistoricalCoverageDownloadRequestView(SqlPaginatedModelView):
     identity = "historical_coverage_download_requests"
     name = "Historical Coverage Download Request"
     label = "historical"
@@ -113,6 +100,7 @@ class HistoricalCoverageDownloadRequestView(ModelView):
     exclude_fields_from_list = ("id",)
     exclude_fields_from_detail = ("id",)
     search_builder = False
+    fields_default_sort = (("request_datetime", True),)
 
     fields = (
         starlette_admin.IntegerField("id"),
@@ -153,36 +141,8 @@ class HistoricalCoverageDownloadRequestView(ModelView):
         )
         return self._serialize_instance(db_item)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[HistoricalCoverageDownloadRequestRead]:
-        finder = functools.partial(
-            db.collect_all_historical_coverage_download_requests,
-        )
-        db_items = await anyio.to_thread.run_sync(finder, request.state.session)
-        return [self._serialize_instance(ind) for ind in db_items]
-
-    async def count(
-        self,
-        request: Request,
-        where: Union[dict[str, Any], str, None] = None,
-    ) -> int:
-        finder = functools.partial(
-            db.collect_all_historical_coverage_download_requests,
-        )
-        found = await anyio.to_thread.run_sync(
-            finder,
-            request.state.session,
-        )
-        return len(found)
-
 
-class TimeSeriesDownloadRequestView(ModelView):
+class TimeSeriesDownloadRequestView(SqlPaginatedModelView):
     identity = "time_series_download_requests"
     name = "Time Series Download Request"
     label = "Time series"
@@ -191,6 +151,7 @@ class TimeSeriesDownloadRequestView(ModelView):
     exclude_fields_from_list = ("id",)
     exclude_fields_from_detail = ("id",)
     search_builder = False
+    fields_default_sort = (("request_datetime", True),)
 
     fields = (
         starlette_admin.IntegerField("id"),
@@ -232,30 +193,125 @@ class TimeSeriesDownloadRequestView(ModelView):
         )
         return self._serialize_instance(db_item)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[TimeSeriesDownloadRequestRead]:
-        finder = functools.partial(
-            db.collect_all_time_series_download_requests,
+
+class DownloadRequestDailyRollupView(SqlPaginatedModelView):
+    identity = "download_request_daily_rollups"
+    name = "Daily Download Stats"
+    label = "Daily totals"
+    pk_attr = "id"
+
+    exclude_fields_from_list = ("id",)
+    exclude_fields_from_detail = ("id",)
+    search_builder = False
+    fields_default_sort = (("day", True),)
+
+    fields = (
+        starlette_admin.IntegerField("id"),
+        starlette_admin.DateField("day"),
+        starlette_admin.StringField("download_kind"),
+        starlette_admin.StringField("climatological_variable"),
+        starlette_admin.StringField("aggregation_period"),
+        starlette_admin.StringField("measure_type"),
+        starlette_admin.StringField("year_period"),
+        starlette_admin.StringField("climatological_model"),
+        starlette_admin.StringField("scenario"),
+        starlette_admin.StringField("time_window"),
+        starlette_admin.StringField("decade"),
+        starlette_admin.StringField("reference_period"),
+        starlette_admin.StringField("data_category"),
+        starlette_admin.BooleanField("is_public_sector"),
+        starlette_admin.StringField("download_reason"),
+        starlette_admin.IntegerField("num_requests"),
+    )
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.icon = "fa-solid fa-calendar-day"
+
+    def can_create(self, request: Request) -> bool:
+        return False
+
+    def can_edit(self, request: Request) -> bool:
+        return False
+
+    def can_delete(self, request: Request) -> bool:
+        return False
+
+    def can_view_details(self, request: Request) -> bool:
+        return False
+
+    @staticmethod
+    def _serialize_instance(instance: DownloadRequestDailyRollup):
+        return DownloadRequestDailyRollupRead(**instance.model_dump())
+
+    async def find_by_pk(
+        self, request: Request, pk: Any
+    ) -> DownloadRequestDailyRollupRead:
+        db_item = await anyio.to_thread.run_sync(
+            request.state.session.get, DownloadRequestDailyRollup, pk
         )
-        db_items = await anyio.to_thread.run_sync(finder, request.state.session)
-        return [self._serialize_instance(ind) for ind in db_items]
-
-    async def count(
-        self,
-        request: Request,
-        where: Union[dict[str, Any], str, None] = None,
-    ) -> int:
-        finder = functools.partial(
-            db.collect_all_time_series_download_requests,
+        return self._serialize_instance(db_item)
+
+
+class DownloadRequestAggregatesExportView(CustomView):
+    """Export numbers of download requests per period as CSV.
+
+    The period is given by the ``granularity`` query parameter, which is either
+    ``day`` or ``month`` (the default). Exported days can be restricted with the
+    ``start`` and ``end`` query parameters, which are inclusive ISO dates.
+    """
+
+    async def render(self, request: Request, templates: Jinja2Templates) -> Response:
+        try:
+            granularity = AnalyticsRollupGranularity(
+                request.query_params.get(
+                    "granularity", AnalyticsRollupGranularity.MONTH.value
+                )
+            )
+            start = _parse_optional_date(request.query_params.get("start"))
+            end = _parse_optional_date(request.query_params.get("end"))
+        except ValueError as err:
+            raise HTTPException(status_code=400, detail=str(err))
+        # the request's session is closed before the response body is sent, so
+        # rows are streamed with a session of their own
+        engine = request.state.session.get_bind()
+        return StreamingResponse(
+            _stream_download_request_aggregates_csv(
+                engine, granularity=granularity, start=start, end=end
+            ),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="download-stats-{granularity.value}.csv"'
+                )
+            },
         )
-        found = await anyio.to_thread.run_sync(
-            finder,
-            request.state.session,
+
+
+def _parse_optional_date(value: Optional[str]) -> Optional[dt.date]:
+    return dt.date.fromisoformat(value) if value else None
+
+
+def _stream_download_request_aggregates_csv(
+    engine: sqlalchemy.Engine,
+    *,
+    granularity: AnalyticsRollupGranularity,
+    start: Optional[dt.date],
+    end: Optional[dt.date],
+    rows_per_chunk: int = 1000,
+) -> Iterator[str]:
+    field_names = ["period_start", *DOWNLOAD_REQUEST_ROLLUP_DIMENSIONS, "num_requests"]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=field_names)
+    writer.writeheader()
+    with sqlmodel.Session(engine) as session:
+        aggregates = db.stream_all_download_request_aggregates(
+            session, granularity=granularity, start=start, end=end
         )
-        return len(found)
+        for index, aggregate in enumerate(aggregates, start=1):
+            writer.writerow(aggregate.model_dump())
+            if index % rows_per_chunk == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    yield buffer.getvalue()
@@ -1,4 +1,3 @@
-import functools
 import logging
 from typing import (
     Any,
@@ -9,8 +8,12 @@ from typing import (
 
 import anyio.to_thread
 import shapely.io
+import sqlalchemy
+import sqlalchemy.orm
+import sqlmodel
 import starlette_admin
 from starlette.requests import Request
+from starlette_admin.contrib.sqla.helpers import build_query
 from starlette_admin.contrib.sqlmodel import ModelView
 
 from .... import db
@@ -19,8 +22,114 @@ from .. import schemas as read_schemas
 
 logger = logging.getLogger(__name__)
 
+_TEXT_FIELD_TYPES = (
+    starlette_admin.StringField,
+    starlette_admin.TextAreaField,
+    starlette_admin.EmailField,
+    starlette_admin.URLField,
+)
+
+
+class SqlPaginatedModelView(ModelView):
+    """Base view for models whose listings are resolved entirely by the DB.
+
+    starlette-admin's ``where`` and ``order_by`` parameters are translated into
+    SQLAlchemy clauses, so that paginating, sorting, searching and counting
+    records never loads more than the requested page.
+
+    Subclasses must provide a ``_serialize_instance()`` method, which converts
+    DB records into the view's read schema. They can customize the statement
+    being paginated by overriding ``get_list_query()``, text searches by
+    overriding ``get_search_query()`` and sorting on fields which are not
+    model columns by means of ``sortable_field_mapping``.
+    """
 
-class SpatialRegionView(ModelView):
+    def get_list_query(self):
+        return sqlmodel.select(self.model).order_by(getattr(self.model, self.pk_attr))
+
+    def get_search_query(self, request: Request, term: str):
+        clauses = []
+        for field in self.fields:
+            column = self._get_model_column(field.name)
+            if (
+                field.searchable
+                and type(field) in _TEXT_FIELD_TYPES
+                and column is not None
+            ):
+                clauses.append(column.icontains(term, autoescape=True))
+        # views without searchable columns ignore the search term
+        return sqlalchemy.or_(*clauses) if len(clauses) > 0 else sqlalchemy.true()
+
+    def build_order_clauses(self, request: Request, order_list: list[str], stmt):
+        clauses = []
+        for value in order_list:
+            field_name, direction = value.strip().split(maxsplit=1)
+            column = self.sortable_field_mapping.get(
+                field_name, self._get_model_column(field_name)
+            )
+            if column is not None:
+                clauses.append(
+                    column.desc() if direction.lower() == "desc" else column.asc()
+                )
+        if len(clauses) > 0:
+            # the primary key acts as a tie-breaker, keeping pages stable
+            stmt = stmt.order_by(None).order_by(
+                *clauses, getattr(self.model, self.pk_attr)
+            )
+        return stmt
+
+    async def find_all(
+        self,
+        request: Request,
+        skip: int = 0,
+        limit: int = 100,
+        where: Union[dict[str, Any], str, None] = None,
+        order_by: Optional[list[str]] = None,
+    ) -> Sequence[Any]:
+        statement = self.build_order_clauses(
+            request, order_by or [], self._get_filtered_query(request, where)
+        ).offset(skip)
+        if limit > 0:
+            statement = statement.limit(limit)
+        db_items = await anyio.to_thread.run_sync(
+            _exec_all, request.state.session, statement
+        )
+        return [self._serialize_instance(item) for item in db_items]
+
+    async def count(
+        self,
+        request: Request,
+        where: Union[dict[str, Any], str, None] = None,
+    ) -> int:
+        statement = self._get_filtered_query(request, where).order_by(None)
+        return await anyio.to_thread.run_sync(
+            db.get_total_num_records, request.state.session, statement.subquery()
+        )
+
+    def _get_filtered_query(
+        self, request: Request, where: Union[dict[str, Any], str, None]
+    ):
+        statement = self.get_list_query()
+        if isinstance(where, dict):
+            statement = statement.where(build_query(where, self.model))
+        elif where not in (None, ""):
+            statement = statement.where(self.get_search_query(request, str(where)))
+        return statement
+
+    def _get_model_column(self, name: str):
+        attribute = getattr(self.model, name, None)
+        if isinstance(attribute, sqlalchemy.orm.QueryableAttribute) and isinstance(
+            attribute.property, sqlalchemy.orm.ColumnProperty
+        ):
+            return attribute
+        return None
+
+
+def _exec_all(session: sqlmodel.Session, statement) -> Sequence[Any]:
+    return session.exec(statement).all()
+
+
+class SpatialRegionView(SqlPaginatedModelView):
     identity = "spatial_regions"
     name = "Spatial Region"
     label = "Spatial Regions"
@@ -69,22 +178,3 @@ class SpatialRegionView(ModelView):
             db.get_spatial_region, request.state.session, pk
         )
         return self._serialize_instance(db_spatial_region)
-
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.SpatialRegionRead]:
-        list_params = functools.partial(
-            db.list_spatial_regions,
-            limit=limit,
-            offset=skip,
-            include_total=False,
-        )
-        db_spatial_regions, _ = await anyio.to_thread.run_sync(
-            list_params, request.state.session
-        )
-        return [self._serialize_instance(sr) for sr in db_spatial_regions]
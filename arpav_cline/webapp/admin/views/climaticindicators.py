@@ -1,16 +1,9 @@
-import functools
 import logging
-from typing import (
-    Any,
-    Optional,
-    Sequence,
-    Union,
-)
+from typing import Any
 
 import anyio.to_thread
 import starlette_admin
 from starlette.requests import Request
-from starlette_admin.contrib.sqlmodel import ModelView
 
 from .... import db
 from ....schemas.static import (
@@ -23,11 +16,12 @@ from .. import (
     fields,
     schemas as read_schemas,
 )
+from .base import SqlPaginatedModelView
 
 logger = logging.getLogger(__name__)
 
 
-class ClimaticIndicatorView(ModelView):
+class ClimaticIndicatorView(SqlPaginatedModelView):
     identity = "climatic_indicators"
     name = "Climatic Indicator"
     label = "Climatic Indicators"
@@ -256,23 +250,3 @@ class ClimaticIndicatorView(ModelView):
             db.get_climatic_indicator, request.state.session, pk
         )
         return self._serialize_instance(db_climatic_indicator)
-
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.ClimaticIndicatorRead]:
-        list_params = functools.partial(
-            db.list_climatic_indicators,
-            limit=limit,
-            offset=skip,
-            name_filter=str(where) if where not in (None, "") else None,
-            include_total=False,
-        )
-        db_climatic_indicators, _ = await anyio.to_thread.run_sync(
-            list_params, request.state.session
-        )
-        return [self._serialize_instance(ind) for ind in db_climatic_indicators]
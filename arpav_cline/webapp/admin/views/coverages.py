@@ -13,19 +13,12 @@ starlette_admin.contrib.sqlmodel.ModelView. This is done mostly for two reasons:
 
 """
 
-import functools
 import logging
-from typing import (
-    Any,
-    Optional,
-    Sequence,
-    Union,
-)
+from typing import Any
 
 import anyio.to_thread
 import starlette_admin
 from starlette.requests import Request
-from starlette_admin.contrib.sqlmodel import ModelView
 
 from .... import db
 from ....schemas import (
@@ -36,11 +29,12 @@ from .. import (
     fields,
     schemas as read_schemas,
 )
+from .base import SqlPaginatedModelView
 
 logger = logging.getLogger(__name__)
 
 
-class ForecastTimeWindowView(ModelView):
+class ForecastTimeWindowView(SqlPaginatedModelView):
     identity = "forecast_time_windows"
     name = "Forecast Time Window"
     label = "Time Windows"
@@ -119,28 +113,8 @@ class ForecastTimeWindowView(ModelView):
         )
         return self._serialize_instance(db_forecast_time_window)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.ForecastTimeWindowRead]:
-        list_params = functools.partial(
-            db.list_forecast_time_windows,
-            limit=limit,
-            offset=skip,
-            name_filter=str(where) if where not in (None, "") else None,
-            include_total=False,
-        )
-        db_forecast_time_windows, _ = await anyio.to_thread.run_sync(
-            list_params, request.state.session
-        )
-        return [self._serialize_instance(fm) for fm in db_forecast_time_windows]
-
 
-class ForecastModelView(ModelView):
+class ForecastModelView(SqlPaginatedModelView):
     identity = "forecast_models"
     name = "Forecast Model"
     label = "Models"
@@ -219,28 +193,8 @@ class ForecastModelView(ModelView):
         )
         return self._serialize_instance(db_forecast_model)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.ForecastModelRead]:
-        list_params = functools.partial(
-            db.list_forecast_models,
-            limit=limit,
-            offset=skip,
-            name_filter=str(where) if where not in (None, "") else None,
-            include_total=False,
-        )
-        db_forecast_models, _ = await anyio.to_thread.run_sync(
-            list_params, request.state.session
-        )
-        return [self._serialize_instance(fm) for fm in db_forecast_models]
-
 
-class ForecastModelGroupView(ModelView):
+class ForecastModelGroupView(SqlPaginatedModelView):
     identity = "forecast_model_groups"
     name = "Forecast Model Group"
     label = "Model Groups"
@@ -321,28 +275,8 @@ class ForecastModelGroupView(ModelView):
         )
         return self._serialize_instance(db_forecast_model_group)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.ForecastModelGroupRead]:
-        list_params = functools.partial(
-            db.list_forecast_model_groups,
-            limit=limit,
-            offset=skip,
-            name_filter=str(where) if where not in (None, "") else None,
-            include_total=False,
-        )
-        db_forecast_model_groups, _ = await anyio.to_thread.run_sync(
-            list_params, request.state.session
-        )
-        return [self._serialize_instance(fm) for fm in db_forecast_model_groups]
-
 
-class ForecastYearPeriodGroupView(ModelView):
+class ForecastYearPeriodGroupView(SqlPaginatedModelView):
     identity = "forecast_year_period_groups"
     name = "Forecast Year Period Group"
     label = "Year Period Groups"
@@ -422,28 +356,8 @@ class ForecastYearPeriodGroupView(ModelView):
         )
         return self._serialize_instance(db_forecast_year_period_group)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.ForecastYearPeriodGroupRead]:
-        list_params = functools.partial(
-            db.list_forecast_year_period_groups,
-            limit=limit,
-            offset=skip,
-            name_filter=str(where) if where not in (None, "") else None,
-            include_total=False,
-        )
-        db_forecast_year_period_groups, _ = await anyio.to_thread.run_sync(
-            list_params, request.state.session
-        )
-        return [self._serialize_instance(fm) for fm in db_forecast_year_period_groups]
-
 
-class HistoricalYearPeriodGroupView(ModelView):
+class HistoricalYearPeriodGroupView(SqlPaginatedModelView):
     identity = "historical_year_period_groups"
     name = "Historical Year Period Group"
     label = "Year Period Groups"
@@ -526,28 +440,8 @@ class HistoricalYearPeriodGroupView(ModelView):
         )
         return self._serialize_instance(db_historical_year_period_group)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.HistoricalYearPeriodGroupRead]:
-        list_params = functools.partial(
-            db.list_historical_year_period_groups,
-            limit=limit,
-            offset=skip,
-            name_filter=str(where) if where not in (None, "") else None,
-            include_total=False,
-        )
-        db_historical_year_period_groups, _ = await anyio.to_thread.run_sync(
-            list_params, request.state.session
-        )
-        return [self._serialize_instance(fm) for fm in db_historical_year_period_groups]
 
-
-class ForecastCoverageConfigurationView(ModelView):
+class ForecastCoverageConfigurationView(SqlPaginatedModelView):
     identity = "forecast_coverage_configurations"
     name = "Forecast Coverage Configuration"
     label = "Coverage Configurations"
@@ -576,6 +470,9 @@ class ForecastCoverageConfigurationView(ModelView):
     exclude_fields_from_create = ("identifier",)
     searchable_fields = ("climatic_indicator",)
     search_builder = False
+    sortable_field_mapping = {
+        "identifier": db.get_forecast_coverage_configuration_identifier_expression()
+    }
 
     fields = (
         starlette_admin.IntegerField("id"),
@@ -665,6 +562,10 @@ class ForecastCoverageConfigurationView(ModelView):
         super().__init__(*args, **kwargs)
         self.icon = "fa-solid fa-map"
 
+    def get_search_query(self, request: Request, term: str):
+        identifier = db.get_forecast_coverage_configuration_identifier_expression()
+        return identifier.contains(term, autoescape=True)
+
     @staticmethod
     def _serialize_instance(instance: coverages.ForecastCoverageConfiguration):
         return read_schemas.ForecastCoverageConfigurationRead(
@@ -804,38 +705,8 @@ class ForecastCoverageConfigurationView(ModelView):
         )
         return self._serialize_instance(db_item)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.ForecastCoverageConfigurationRead]:
-        finder = functools.partial(
-            db.collect_all_forecast_coverage_configurations_with_identifier_filter,
-            identifier_filter=str(where) if where else None,
-        )
-        db_items = await anyio.to_thread.run_sync(finder, request.state.session)
-        return [self._serialize_instance(ind) for ind in db_items]
-
-    async def count(
-        self,
-        request: Request,
-        where: Union[dict[str, Any], str, None] = None,
-    ) -> int:
-        finder = functools.partial(
-            db.collect_all_forecast_coverage_configurations_with_identifier_filter,
-            identifier_filter=str(where) if where else None,
-        )
-        found = await anyio.to_thread.run_sync(
-            finder,
-            request.state.session,
-        )
-        return len(found)
 
-
-class HistoricalCoverageConfigurationView(ModelView):
+class HistoricalCoverageConfigurationView(SqlPaginatedModelView):
     identity = "historical_coverage_configurations"
     name = "Historical Coverage Configuration"
     label = "Coverage Configurations"
@@ -859,6 +730,9 @@ class HistoricalCoverageConfigurationView(ModelView):
     exclude_fields_from_create = ("identifier",)
     searchable_fields = ("climatic_indicator",)
     search_builder = False
+    sortable_field_mapping = {
+        "identifier": db.get_historical_coverage_configuration_identifier_expression()
+    }
 
     fields = (
         starlette_admin.IntegerField("id"),
@@ -922,6 +796,10 @@ class HistoricalCoverageConfigurationView(ModelView):
         super().__init__(*args, **kwargs)
         self.icon = "fa-solid fa-map"
 
+    def get_search_query(self, request: Request, term: str):
+        identifier = db.get_historical_coverage_configuration_identifier_expression()
+        return identifier.contains(term, autoescape=True)
+
     @staticmethod
     def _serialize_instance(
         instance: coverages.HistoricalCoverageConfiguration,
@@ -1025,33 +903,3 @@ class HistoricalCoverageConfigurationView(ModelView):
             db.get_historical_coverage_configuration, request.state.session, pk
         )
         return self._serialize_instance(db_item)
-
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.HistoricalCoverageConfigurationRead]:
-        finder = functools.partial(
-            db.collect_all_historical_coverage_configurations_with_identifier_filter,
-            identifier_filter=str(where) if where else None,
-        )
-        db_items = await anyio.to_thread.run_sync(finder, request.state.session)
-        return [self._serialize_instance(ind) for ind in db_items]
-
-    async def count(
-        self,
-        request: Request,
-        where: Union[dict[str, Any], str, None] = None,
-    ) -> int:
-        finder = functools.partial(
-            db.collect_all_historical_coverage_configurations_with_identifier_filter,
-            identifier_filter=str(where) if where else None,
-        )
-        found = await anyio.to_thread.run_sync(
-            finder,
-            request.state.session,
-        )
-        return len(found)
@@ -22,6 +22,7 @@ from ....schemas import (
 )
 from .. import fields
 from .. import schemas as read_schemas
+from .base import SqlPaginatedModelView
 
 logger = logging.getLogger(__name__)
 
@@ -188,7 +189,7 @@ class ObservationMeasurementView(ModelView):
         return [self._serialize_instance(item) for item in db_measurements]
 
 
-class ObservationStationView(ModelView):
+class ObservationStationView(SqlPaginatedModelView):
     identity = "observation_stations"
     name = "Observation Station"
     label = "Stations"
@@ -271,28 +272,8 @@ class ObservationStationView(ModelView):
         )
         return self._serialize_instance(db_station)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.ObservationStationRead]:
-        list_observation_stations = functools.partial(
-            db.list_observation_stations,
-            limit=limit,
-            offset=skip,
-            include_total=False,
-            name_filter=str(where) if where not in (None, "") else None,
-        )
-        db_stations, _ = await anyio.to_thread.run_sync(
-            list_observation_stations, request.state.session
-        )
-        return [self._serialize_instance(db_station) for db_station in db_stations]
-
 
-class ObservationSeriesConfigurationView(ModelView):
+class ObservationSeriesConfigurationView(SqlPaginatedModelView):
     identity = "observation_series_configurations"
     name = "Observation Series Configuration"
     label = "Series Configurations"
@@ -357,26 +338,6 @@ class ObservationSeriesConfigurationView(ModelView):
         )
         return self._serialize_instance(db_instance)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.ObservationSeriesConfigurationRead]:
-        item_lister = functools.partial(
-            db.list_observation_series_configurations,
-            limit=limit,
-            offset=skip,
-            include_total=False,
-        )
-        db_items, _ = await anyio.to_thread.run_sync(item_lister, request.state.session)
-        result = []
-        for db_item in db_items:
-            result.append(self._serialize_instance(db_item))
-        return result
-
     async def create(self, request: Request, data: dict[str, Any]) -> Any:
         session = request.state.session
         try:
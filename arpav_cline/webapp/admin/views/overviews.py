@@ -1,15 +1,8 @@
-import functools
-from typing import (
-    Any,
-    Optional,
-    Sequence,
-    Union,
-)
+from typing import Any
 
 import anyio
 import starlette_admin
 from starlette.requests import Request
-from starlette_admin.contrib.sqlmodel import ModelView
 
 from .... import db
 from ....schemas import (
@@ -18,6 +11,7 @@ from ....schemas import (
 )
 from .. import fields
 from .. import schemas as read_schemas
+from .base import SqlPaginatedModelView
 
 _thredds_url_pattern_help_text = (
     "Path pattern to the dataset's URL in THREDDS. This can be "
@@ -34,7 +28,7 @@ _thredds_url_pattern_help_text = (
 )
 
 
-class ObservationOverviewSeriesConfigurationView(ModelView):
+class ObservationOverviewSeriesConfigurationView(SqlPaginatedModelView):
     identity = "observation_overview_series_configurations"
     name = "Observation Overview Series Configuration"
     label = "Observations"
@@ -50,6 +44,9 @@ class ObservationOverviewSeriesConfigurationView(ModelView):
     exclude_fields_from_create = ("identifier",)
     searchable_fields = ("climatic_indicator",)
     search_builder = False
+    sortable_field_mapping = {
+        "identifier": db.get_observation_overview_identifier_expression()
+    }
 
     fields = (
         starlette_admin.IntegerField("id"),
@@ -78,6 +75,10 @@ class ObservationOverviewSeriesConfigurationView(ModelView):
         super().__init__(*args, **kwargs)
         self.icon = "fa-solid fa-map"
 
+    def get_search_query(self, request: Request, term: str):
+        identifier = db.get_observation_overview_identifier_expression()
+        return identifier.contains(term, autoescape=True)
+
     @staticmethod
     def _serialize_instance(instance: overviews.ForecastOverviewSeriesConfiguration):
         return read_schemas.ObservationOverviewSeriesConfigurationRead(
@@ -143,36 +144,8 @@ class ObservationOverviewSeriesConfigurationView(ModelView):
         )
         return self._serialize_instance(db_item)
 
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.ObservationSeriesConfigurationRead]:
-        finder = functools.partial(
-            db.collect_all_observation_overview_series_configurations,
-        )
-        db_items = await anyio.to_thread.run_sync(finder, request.state.session)
-        return [self._serialize_instance(ind) for ind in db_items]
-
-    async def count(
-        self,
-        request: Request,
-        where: Union[dict[str, Any], str, None] = None,
-    ) -> int:
-        finder = functools.partial(
-            db.collect_all_observation_overview_series_configurations,
-        )
-        found = await anyio.to_thread.run_sync(
-            finder,
-            request.state.session,
-        )
-        return len(found)
-
 
-class ForecastOverviewSeriesConfigurationView(ModelView):
+class ForecastOverviewSeriesConfigurationView(SqlPaginatedModelView):
     identity = "forecast_overview_series_configurations"
     name = "Forecast Overview Series Configuration"
     label = "Forecasts"
@@ -193,6 +166,9 @@ class ForecastOverviewSeriesConfigurationView(ModelView):
     exclude_fields_from_create = ("identifier",)
     searchable_fields = ("climatic_indicator",)
     search_builder = False
+    sortable_field_mapping = {
+        "identifier": db.get_forecast_overview_identifier_expression()
+    }
 
     fields = (
         starlette_admin.IntegerField("id"),
@@ -248,6 +224,10 @@ class ForecastOverviewSeriesConfigurationView(ModelView):
         super().__init__(*args, **kwargs)
         self.icon = "fa-solid fa-map"
 
+    def get_search_query(self, request: Request, term: str):
+        identifier = db.get_forecast_overview_identifier_expression()
+        return identifier.contains(term, autoescape=True)
+
     @staticmethod
     def _serialize_instance(instance: overviews.ForecastOverviewSeriesConfiguration):
         return read_schemas.ForecastOverviewSeriesConfigurationRead(
@@ -338,31 +318,3 @@ class ForecastOverviewSeriesConfigurationView(ModelView):
             db.get_forecast_overview_series_configuration, request.state.session, pk
         )
         return self._serialize_instance(db_item)
-
-    async def find_all(
-        self,
-        request: Request,
-        skip: int = 0,
-        limit: int = 100,
-        where: Union[dict[str, Any], str, None] = None,
-        order_by: Optional[list[str]] = None,
-    ) -> Sequence[read_schemas.ForecastOverviewSeriesConfigurationRead]:
-        finder = functools.partial(
-            db.collect_all_forecast_overview_series_configurations,
-        )
-        db_items = await anyio.to_thread.run_sync(finder, request.state.session)
-        return [self._serialize_instance(ind) for ind in db_items]
-
-    async def count(
-        self,
-        request: Request,
-        where: Union[dict[str, Any], str, None] = None,
-    ) -> int:
-        finder = functools.partial(
-            db.collect_all_forecast_overview_series_configurations,
-        )
-        found = await anyio.to_thread.run_sync(
-            finder,
-            request.state.session,
-        )
-        return len(found)
@@ -8,6 +8,7 @@ from .routers.coverages import router as coverages_router
 from .routers.maps import router as maps_router
 from .routers.municipalities import router as municipalities_router
 from .routers.observations import router as observations_router
+from .routers.tiles import router as tiles_router
 from .routers.base import router as base_router
 
 
@@ -18,6 +19,7 @@ class WebAppOpenApiTag(enum.Enum):
     MAPS = "maps"
     MUNICIPALITIES = "municipalities"
     OBSERVATIONS = "observations"
+    TILES = "tiles"
 
     def get_description(self) -> str:
         return {
@@ -31,6 +33,7 @@ class WebAppOpenApiTag(enum.Enum):
             self.OBSERVATIONS: (
                 "Operations related to observation stations and measurements"
             ),
+            self.TILES: "Operations that serve vector tiles for web maps",
         }.get(self)
 
     def as_app_tag(self) -> dict:
@@ -61,6 +64,7 @@ def create_app(settings: config.ArpavPpcvSettings) -> fastapi.FastAPI:
             WebAppOpenApiTag.OBSERVATIONS.as_app_tag(),
             WebAppOpenApiTag.CLIMATIC_INDICATORS.as_app_tag(),
             WebAppOpenApiTag.MUNICIPALITIES.as_app_tag(),
+            WebAppOpenApiTag.TILES.as_app_tag(),
             WebAppOpenApiTag.BASE.as_app_tag(),
         ],
     )
@@ -106,6 +110,13 @@ def create_app(settings: config.ArpavPpcvSettings) -> fastapi.FastAPI:
             WebAppOpenApiTag.MUNICIPALITIES,
         ],
     )
+    app.include_router(
+        tiles_router,
+        prefix="/tiles",
+        tags=[
+            WebAppOpenApiTag.TILES,
+        ],
+    )
     app.include_router(
         climaticindicators_router,
         prefix="/climatic-indicators",
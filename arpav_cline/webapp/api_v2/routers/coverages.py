@@ -31,9 +31,11 @@ from sqlmodel import Session
 from starlette.background import BackgroundTask
 
 from .... import (
+    analyticswriter,
     db,
     datadownloads,
     exceptions,
+    metrics,
     operations,
     palette,
     timeseries,
@@ -106,10 +108,11 @@ from ...frontendutils.schemas import (
     LegacyHistoricalMenuTranslations,
 )
 from ...frontendutils import navigation
+from ...servertiming import TimedRoute
 
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 _INVALID_COVERAGE_IDENTIFIER_ERROR_DETAIL = "Invalid coverage identifier"
 _INVALID_COVERAGE_CONFIGURATION_IDENTIFIER_ERROR_DETAIL = (
@@ -535,7 +538,8 @@ def wms_endpoint(
     ).geturl()
     logger.info(f"{wms_url=}")
     try:
-        wms_response = thredds_utils.proxy_request_sync(wms_url, http_client)
+        with metrics.track_thredds_request(metrics.ThreddsService.WMS):
+            wms_response = thredds_utils.proxy_request_sync(wms_url, http_client)
     except (httpx.HTTPError, httpx.HTTPStatusError) as err:
         msg = "THREDDS server replied with an error"
         try:
@@ -616,7 +620,7 @@ async def get_forecast_data(
     """Return forecast coverages in their native NetCDF format"""
     if (coverage := db.get_forecast_coverage(session, coverage_identifier)) is not None:
         await anyio.to_thread.run_sync(
-            db.create_forecast_coverage_download_request,
+            analyticswriter.record_download_request,
             session,
             ForecastCoverageDownloadRequestCreate(
                 request_datetime=dt.datetime.now(tz=dt.timezone.utc),
@@ -701,7 +705,7 @@ async def get_historical_data(
         coverage := db.get_historical_coverage(session, coverage_identifier)
     ) is not None:
         await anyio.to_thread.run_sync(
-            db.create_historical_coverage_download_request,
+            analyticswriter.record_download_request,
             session,
             HistoricalCoverageDownloadRequestCreate(
                 request_datetime=dt.datetime.now(tz=dt.timezone.utc),
@@ -1308,10 +1312,8 @@ def notify_time_series_download_request(
                 longitude=geom.centroid.x,
                 latitude=geom.centroid.y,
             )
-            download_request = db.create_time_series_download_request(
-                session, download_request_create
-            )
-            return TimeSeriesDownloadRequestRead(**download_request.model_dump())
+            analyticswriter.record_download_request(session, download_request_create)
+            return TimeSeriesDownloadRequestRead(**download_request_create.model_dump())
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
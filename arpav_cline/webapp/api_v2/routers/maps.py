@@ -11,9 +11,10 @@ from fastapi.responses import StreamingResponse
 from playwright.sync_api import Error as PlaywrightError
 
 from .... import mapdownloads
+from ...servertiming import TimedRoute
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get(
@@ -1,4 +1,6 @@
+import functools
 import logging
+import uuid
 from typing import Annotated
 
 import pydantic
@@ -7,17 +9,29 @@ from fastapi import (
     APIRouter,
     Depends,
     HTTPException,
+    Query,
     Request,
+    Response,
 )
 from sqlmodel import Session
 
-from .... import db
+from .... import (
+    db,
+    municipalityindex,
+)
+from ....config import ArpavPpcvSettings
+from ....schemas.municipalities import Municipality
+from ....schemas.static import MunicipalityGeometryResolution
 from ... import dependencies
-from ...responses import GeoJsonResponse
+from ...responses import (
+    GeoJsonResponse,
+    PreSerializedContent,
+)
 from ..schemas.geojson import municipalities as municipalities_geojson
+from ...servertiming import TimedRoute
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get(
@@ -27,45 +41,87 @@ router = APIRouter()
 )
 def list_municipalities(
     request: Request,
+    settings: Annotated[ArpavPpcvSettings, Depends(dependencies.get_settings)],
     db_session: Annotated[Session, Depends(dependencies.get_db_session)],
     list_params: Annotated[dependencies.CommonListFilterParameters, Depends()],
     coords: str | None = None,
     name: str | None = None,
     province: str | None = None,
     region: str | None = None,
+    after: uuid.UUID | None = None,
+    include_totals: bool = True,
+    resolution: MunicipalityGeometryResolution | None = None,
+    zoom: Annotated[int | None, Query(ge=0, le=24)] = None,
 ):
-    """List Italian municipalities."""
+    """List Italian municipalities.
+
+    Pages can be requested either by offset or by passing the id of the last
+    municipality of the previous page as ``after``, which is what the ``next``
+    link does. Totals can be left out with ``include_totals=false``.
+
+    Geometries are returned at full resolution, unless a coarser one is requested,
+    either explicitly with ``resolution`` or by passing the web map ``zoom`` level
+    they are going to be displayed at.
+    """
     geom_filter_kwarg = {}
     if coords is not None:
         geom = shapely.io.from_wkt(coords)
         if geom.geom_type == "Point":
-            geom_filter_kwarg = {"point_filter": geom}
+            if (index := municipalityindex.get_municipality_index()) is not None:
+                # resolve the point in memory, sparing the DB a spatial query
+                geom_filter_kwarg = {
+                    "id_filter": [m.id for m in index.find_containing(geom)]
+                }
+            else:
+                geom_filter_kwarg = {"point_filter": geom}
         elif geom.geom_type == "Polygon":
             geom_filter_kwarg = {"polygon_intersection_filter": geom}
         else:
             raise HTTPException(
                 status_code=400, detail="geometry be either point or polygon"
             )
-    municipalities, filtered_total = db.list_municipalities(
+    if resolution is None:
+        resolution = (
+            MunicipalityGeometryResolution.from_zoom(zoom)
+            if zoom is not None
+            else MunicipalityGeometryResolution.FULL
+        )
+    features, filtered_total = db.list_municipality_geojson_features(
         db_session,
+        resolution=resolution,
         limit=list_params.limit,
         offset=list_params.offset,
-        include_total=True,
+        include_total=include_totals,
         name_filter=name,
         province_name_filter=province,
         region_name_filter=region,
+        after_id=after,
         **geom_filter_kwarg,
     )
-    _, unfiltered_total = db.list_municipalities(
-        db_session, limit=1, offset=0, include_total=True
+    unfiltered_total = (
+        db.get_unfiltered_total_num_records(
+            db_session,
+            Municipality,
+            max_age_seconds=settings.unfiltered_totals_cache_ttl_seconds,
+        )
+        if include_totals
+        else None
     )
-    return municipalities_geojson.MunicipalityFeatureCollection.from_items(
-        municipalities,
-        request,
-        limit=list_params.limit,
-        offset=list_params.offset,
-        filtered_total=filtered_total,
-        unfiltered_total=unfiltered_total,
+    # geometries come from the DB already encoded, so the response body is
+    # rendered directly, rather than going through the response model
+    collection_type = municipalities_geojson.MunicipalityFeatureCollection
+    return Response(
+        content=collection_type.render_geojson_features(
+            features,
+            request,
+            limit=list_params.limit,
+            offset=list_params.offset,
+            filtered_total=filtered_total,
+            unfiltered_total=unfiltered_total,
+            after=after,
+            next_after=features[-1].id if len(features) > 0 else None,
+        ),
+        media_type=GeoJsonResponse.media_type,
     )
 
 
@@ -76,6 +132,7 @@ def list_municipalities(
 )
 def list_municipality_centroids(
     request: Request,
+    settings: Annotated[ArpavPpcvSettings, Depends(dependencies.get_settings)],
     db_session: Annotated[Session, Depends(dependencies.get_db_session)],
     offset: Annotated[int, pydantic.Field(ge=0)] = 0,
     limit: Annotated[int, pydantic.Field(ge=0, le=2000)] = 2000,
@@ -83,8 +140,44 @@ def list_municipality_centroids(
     name: str | None = None,
     province: str | None = None,
     region: str | None = None,
+    after: uuid.UUID | None = None,
+    include_totals: bool = True,
 ):
-    """List Italian municipality centroids."""
+    """List Italian municipality centroids.
+
+    Pages can be requested either by offset or by passing the id of the last
+    municipality of the previous page as ``after``, which is what the ``next``
+    link does. Totals can be left out with ``include_totals=false``.
+
+    Responses carry an ``ETag``, which clients can send back in the
+    ``If-None-Match`` header in order to avoid downloading unchanged centroids.
+    """
+    index = municipalityindex.get_municipality_index()
+    if index is not None and coords is None and name is None and after is None:
+        # the centroids are static, so responses are served from memory, already
+        # serialized and compressed. They are keyed on the parameters they depend
+        # on, plus the base of their absolute links, so that unknown parameters
+        # neither create new entries nor end up in the links of cached responses
+        return index.get_cached_response(
+            (
+                str(request.url_for("list_municipality_centroids")),
+                offset,
+                limit,
+                province,
+                region,
+                include_totals,
+            ),
+            functools.partial(
+                _build_centroids_content,
+                index,
+                request,
+                limit=limit,
+                offset=offset,
+                province=province,
+                region=region,
+                include_totals=include_totals,
+            ),
+        ).to_response(request)
     geom_filter_kwarg = {}
     if coords is not None:
         geom = shapely.io.from_wkt(coords)
@@ -96,14 +189,21 @@ def list_municipality_centroids(
         db_session,
         limit=limit,
         offset=offset,
-        include_total=True,
+        include_total=include_totals,
         name_filter=name,
         province_name_filter=province,
         region_name_filter=region,
+        after_id=after,
         **geom_filter_kwarg,
     )
-    _, unfiltered_total = db.list_municipalities(
-        db_session, limit=1, offset=0, include_total=True
+    unfiltered_total = (
+        db.get_unfiltered_total_num_records(
+            db_session,
+            Municipality,
+            max_age_seconds=settings.unfiltered_totals_cache_ttl_seconds,
+        )
+        if include_totals
+        else None
     )
     return municipalities_geojson.MunicipalityCentroidFeatureCollection.from_items(
         centroids,
@@ -112,4 +212,38 @@ def list_municipality_centroids(
         offset=offset,
         filtered_total=filtered_total,
         unfiltered_total=unfiltered_total,
+        after=after,
+        next_after=centroids[-1].id if len(centroids) > 0 else None,
+    )
+
+
+def _build_centroids_content(
+    index: municipalityindex.MunicipalityIndex,
+    request: Request,
+    *,
+    limit: int,
+    offset: int,
+    province: str | None,
+    region: str | None,
+    include_totals: bool,
+) -> PreSerializedContent:
+    centroids = index.filter(province_name_filter=province, region_name_filter=region)
+    page = centroids[offset : offset + limit]
+    collection_type = municipalities_geojson.MunicipalityCentroidFeatureCollection
+    content = collection_type.render_labels(
+        page,
+        request,
+        limit=limit,
+        offset=offset,
+        filtered_total=len(centroids) if include_totals else None,
+        unfiltered_total=len(index) if include_totals else None,
+        next_after=page[-1].id if len(page) > 0 else None,
+        filters={
+            "province": province,
+            "region": region,
+            "include_totals": None if include_totals else "false",
+        },
+    )
+    return PreSerializedContent.from_content(
+        content.encode(), GeoJsonResponse.media_type
     )
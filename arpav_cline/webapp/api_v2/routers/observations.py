@@ -14,13 +14,16 @@ from fastapi.responses import JSONResponse
 from sqlmodel import Session
 
 from .... import db
+from ....config import ArpavPpcvSettings
+from ....schemas.observations import ObservationStation
 from ...responses import GeoJsonResponse
 from ... import dependencies
 from ..schemas import observations
 from ..schemas.geojson import observations as observations_geojson
+from ...servertiming import TimedRoute
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get(
@@ -39,22 +42,38 @@ router = APIRouter()
 )
 def list_stations(
     request: Request,
+    settings: Annotated[ArpavPpcvSettings, Depends(dependencies.get_settings)],
     db_session: Annotated[Session, Depends(dependencies.get_db_session)],
     list_params: Annotated[dependencies.CommonListFilterParameters, Depends()],
+    after: int | None = None,
+    include_totals: bool = True,
     accept: Annotated[str | None, Header()] = None,
 ):
-    """List known stations."""
+    """List known stations.
+
+    Pages can be requested either by offset or by passing the id of the last
+    station of the previous page as ``after``, which is what the ``next`` link
+    does. Totals can be left out with ``include_totals=false``.
+    """
     filter_kwargs = {}
     stations, filtered_total = db.list_observation_stations(
         db_session,
         limit=list_params.limit,
         offset=list_params.offset,
-        include_total=True,
+        include_total=include_totals,
+        after_id=after,
         **filter_kwargs,
     )
-    _, unfiltered_total = db.list_observation_stations(
-        db_session, limit=1, offset=0, include_total=True
+    unfiltered_total = (
+        db.get_unfiltered_total_num_records(
+            db_session,
+            ObservationStation,
+            max_age_seconds=settings.unfiltered_totals_cache_ttl_seconds,
+        )
+        if include_totals
+        else None
     )
+    next_after = stations[-1].id if len(stations) > 0 else None
     if accept == "application/json":
         result = JSONResponse(
             content=jsonable_encoder(
@@ -65,6 +84,8 @@ def list_stations(
                     offset=list_params.offset,
                     filtered_total=filtered_total,
                     unfiltered_total=unfiltered_total,
+                    after=after,
+                    next_after=next_after,
                 )
             )
         )
@@ -76,6 +97,8 @@ def list_stations(
             offset=list_params.offset,
             filtered_total=filtered_total,
             unfiltered_total=unfiltered_total,
+            after=after,
+            next_after=next_after,
         )
     return result
 
@@ -0,0 +1,112 @@
+import logging
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Response,
+    status,
+)
+from sqlmodel import Session
+
+from .... import (
+    db,
+    vectortiles,
+)
+from ....schemas.static import (
+    ObservationStationManager,
+    VectorTileLayer,
+)
+from ... import dependencies
+from ...responses import is_not_modified
+from ...servertiming import TimedRoute
+
+logger = logging.getLogger(__name__)
+router = APIRouter(route_class=TimedRoute)
+
+_MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+@router.get(
+    "/{layer}/{z}/{x}/{y}.pbf",
+    response_class=Response,
+    responses={
+        200: {"content": {_MVT_MEDIA_TYPE: {}}},
+        304: {"description": "The tile has not changed"},
+    },
+)
+def get_vector_tile(
+    db_session: Annotated[Session, Depends(dependencies.get_db_session)],
+    layer: VectorTileLayer,
+    z: Annotated[int, Path(ge=0, le=24)],
+    x: Annotated[int, Path(ge=0)],
+    y: Annotated[int, Path(ge=0)],
+    climatic_indicator: str | None = None,
+    manager: ObservationStationManager | None = None,
+    province: str | None = None,
+    region: str | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    """Get a Mapbox Vector Tile with observation stations or municipalities.
+
+    Stations can be filtered by ``climatic_indicator`` and ``manager``, while
+    municipalities can be filtered by ``province`` and ``region``.
+
+    Tiles carry an ``ETag``, which clients can send back in the
+    ``If-None-Match`` header in order to avoid downloading unchanged tiles.
+    """
+    if x >= 2**z or y >= 2**z:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tile {z}/{x}/{y} does not exist",
+        )
+    if layer == VectorTileLayer.STATIONS:
+        climatic_indicator_id = None
+        if climatic_indicator is not None:
+            db_climatic_indicator = db.get_climatic_indicator_by_identifier(
+                db_session, climatic_indicator
+            )
+            if db_climatic_indicator is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid climatic indicator identifier",
+                )
+            climatic_indicator_id = db_climatic_indicator.id
+        key = (layer, z, x, y, climatic_indicator_id, manager)
+
+        def render() -> bytes:
+            return db.get_observation_stations_vector_tile(
+                db_session,
+                z,
+                x,
+                y,
+                manager_filter=manager,
+                climatic_indicator_id_filter=climatic_indicator_id,
+            )
+
+    else:
+        key = (layer, z, x, y, province, region)
+
+        def render() -> bytes:
+            return db.get_municipalities_vector_tile(
+                db_session,
+                z,
+                x,
+                y,
+                province_name_filter=province,
+                region_name_filter=region,
+            )
+
+    if (tile_cache := vectortiles.get_tile_cache()) is not None:
+        tile = tile_cache.get_or_render(key, render)
+    else:
+        tile = vectortiles.VectorTile.from_content(render())
+    # clients must revalidate, so that changes are picked up as soon as the
+    # cache is invalidated
+    headers = {"ETag": tile.etag, "Cache-Control": "no-cache"}
+    if is_not_modified(if_none_match, tile.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=tile.content, media_type=_MVT_MEDIA_TYPE, headers=headers)
@@ -1,3 +1,4 @@
+import json
 import typing
 
 import geojson_pydantic
@@ -33,8 +34,8 @@ class ArpavFeatureCollection(geojson_pydantic.FeatureCollection):
 
     type: str = "FeatureCollection"
     links: ListLinks
-    number_matched: int
-    number_total: int
+    number_matched: int | None
+    number_total: int | None
     number_returned: int
 
     @classmethod
@@ -45,39 +46,103 @@ class ArpavFeatureCollection(geojson_pydantic.FeatureCollection):
         *,
         limit: int,
         offset: int,
-        filtered_total: int,
-        unfiltered_total: int,
+        filtered_total: typing.Optional[int],
+        unfiltered_total: typing.Optional[int],
+        after: typing.Optional[typing.Any] = None,
+        next_after: typing.Optional[typing.Any] = None,
     ) -> "ArpavFeatureCollection":
         return cls(
             features=[cls.list_item_type.from_db_instance(i, request) for i in items],
             links=cls._get_list_links(
-                request, limit, offset, filtered_total, len(items)
+                request,
+                limit,
+                offset,
+                filtered_total,
+                len(items),
+                after=after,
+                next_after=next_after,
             ),
             number_matched=filtered_total,
             number_total=unfiltered_total,
             number_returned=len(items),
         )
 
+    @classmethod
+    def render_serialized_features(
+        cls,
+        serialized_features: typing.Sequence[str],
+        request: Request,
+        *,
+        limit: int,
+        offset: int,
+        filtered_total: typing.Optional[int],
+        unfiltered_total: typing.Optional[int],
+        after: typing.Optional[typing.Any] = None,
+        next_after: typing.Optional[typing.Any] = None,
+        filters: typing.Optional[dict[str, typing.Any]] = None,
+    ) -> str:
+        """Render the feature collection as a JSON string.
+
+        This is an alternative to ``from_items()`` for large collections, which
+        skips building and validating a model for each feature. Features are
+        expected to be already serialized as JSON and the output has the same
+        structure as the model.
+
+        Links carry over the request's query parameters, unless ``filters`` are
+        given.
+        """
+        links = cls._get_list_links(
+            request,
+            limit,
+            offset,
+            filtered_total,
+            len(serialized_features),
+            after=after,
+            next_after=next_after,
+            filters=filters,
+        )
+        remaining_members = dump_json(
+            {
+                "links": links.model_dump(),
+                "number_matched": filtered_total,
+                "number_total": unfiltered_total,
+                "number_returned": len(serialized_features),
+            }
+        )
+        return (
+            f'{{"type":"FeatureCollection","features":'
+            f'[{",".join(serialized_features)}],{remaining_members[1:]}'
+        )
+
     @classmethod
     def _get_list_links(
         cls,
         request: Request,
         limit: int,
         offset: int,
-        filtered_total: int,
+        filtered_total: typing.Optional[int],
         num_returned_records: int,
+        *,
+        after: typing.Optional[typing.Any] = None,
+        next_after: typing.Optional[typing.Any] = None,
+        filters: typing.Optional[dict[str, typing.Any]] = None,
     ) -> ListLinks:
-        filters = dict(request.query_params)
-        if "limit" in filters.keys():
-            del filters["limit"]
-        if "offset" in filters.keys():
-            del filters["offset"]
+        if filters is None:
+            filters = dict(request.query_params)
+            for pagination_param in ("limit", "offset", "after"):
+                filters.pop(pagination_param, None)
         pagination_urls = get_pagination_urls(
             request.url_for(cls.path_operation_name),
             num_returned_records,
             filtered_total,
             limit,
             offset,
+            after=after,
+            next_after=next_after,
             **filters,
         )
         return ListLinks(**pagination_urls)
+
+
+def dump_json(value: typing.Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
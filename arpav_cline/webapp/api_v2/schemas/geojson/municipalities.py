@@ -1,3 +1,5 @@
+import typing
+
 import geojson_pydantic
 import pydantic
 from fastapi import Request
@@ -6,7 +8,10 @@ from .....schemas import (
     fields,
     municipalities,
 )
-from .base import ArpavFeatureCollection
+from .base import (
+    ArpavFeatureCollection,
+    dump_json,
+)
 
 
 class MunicipalityFeatureCollectionItem(geojson_pydantic.Feature):
@@ -30,6 +35,8 @@ class MunicipalityFeatureCollectionItem(geojson_pydantic.Feature):
                     exclude={
                         "id",
                         "geom",
+                        "geom_simplified_medium",
+                        "geom_simplified_low",
                     }
                 ),
             },
@@ -67,7 +74,100 @@ class MunicipalityFeatureCollection(ArpavFeatureCollection):
     path_operation_name = "list_municipalities"
     list_item_type = MunicipalityFeatureCollectionItem
 
+    @classmethod
+    def render_geojson_features(
+        cls,
+        items: typing.Sequence[municipalities.MunicipalityGeoJsonFeature],
+        request: Request,
+        *,
+        limit: int,
+        offset: int,
+        filtered_total: typing.Optional[int],
+        unfiltered_total: typing.Optional[int],
+        after: typing.Optional[typing.Any] = None,
+        next_after: typing.Optional[typing.Any] = None,
+    ) -> str:
+        """Render the feature collection as a JSON string.
+
+        Geometries are already GeoJSON, as encoded by the DB, so they are embedded
+        as they are instead of being parsed and validated again.
+        """
+        return cls.render_serialized_features(
+            [
+                (
+                    f'{{"type":"Feature","geometry":{item.geometry_geojson},'
+                    f'"properties":{dump_json(_get_properties(item))},'
+                    f'"id":"{item.id}"}}'
+                )
+                for item in items
+            ],
+            request,
+            limit=limit,
+            offset=offset,
+            filtered_total=filtered_total,
+            unfiltered_total=unfiltered_total,
+            after=after,
+            next_after=next_after,
+        )
+
 
 class MunicipalityCentroidFeatureCollection(ArpavFeatureCollection):
     path_operation_name = "list_municipality_centroids"
     list_item_type = MunicipalityCentroidFeatureCollectionItem
+
+    @classmethod
+    def render_labels(
+        cls,
+        items: typing.Sequence[municipalities.MunicipalityLabel],
+        request: Request,
+        *,
+        limit: int,
+        offset: int,
+        filtered_total: typing.Optional[int],
+        unfiltered_total: typing.Optional[int],
+        after: typing.Optional[typing.Any] = None,
+        next_after: typing.Optional[typing.Any] = None,
+        filters: typing.Optional[dict[str, typing.Any]] = None,
+    ) -> str:
+        """Render the centroids of the input municipalities as a JSON string."""
+        return cls.render_serialized_features(
+            [
+                dump_json(
+                    {
+                        "type": "Feature",
+                        "geometry": {
+                            "type": "Point",
+                            "coordinates": [
+                                item.centroid_epsg_4326_lon,
+                                item.centroid_epsg_4326_lat,
+                            ],
+                        },
+                        "properties": {
+                            "name": item.name,
+                            "province_name": item.province_name,
+                            "region_name": item.region_name,
+                        },
+                        "id": str(item.id),
+                    }
+                )
+                for item in items
+            ],
+            request,
+            limit=limit,
+            offset=offset,
+            filtered_total=filtered_total,
+            unfiltered_total=unfiltered_total,
+            after=after,
+            next_after=next_after,
+            filters=filters,
+        )
+
+
+def _get_properties(item: municipalities.MunicipalityGeoJsonFeature) -> dict:
+    return {
+        "name": item.name,
+        "province_name": item.province_name,
+        "region_name": item.region_name,
+        "centroid_epsg_4326_lon": item.centroid_epsg_4326_lon,
+        "centroid_epsg_4326_lat": item.centroid_epsg_4326_lat,
+    }
@@ -5,10 +5,11 @@ import os
 from fastapi import APIRouter
 
 from ..schemas.base import AppInformation
+from ...servertiming import TimedRoute
 
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/", response_model=AppInformation)
@@ -12,11 +12,13 @@ from sqlmodel import Session
 
 from .... import db
 from ....config import ArpavPpcvSettings
+from ....schemas.climaticindicators import ClimaticIndicator
 from ... import dependencies
 from ..schemas import climaticindicators as read_schemas
+from ...servertiming import TimedRoute
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get(
@@ -31,22 +33,33 @@ def list_climatic_indicators(
     name_contains: str | None = None,
     measure_type_contains: str | None = None,
     aggregation_period_contains: str | None = None,
+    after: int | None = None,
+    include_totals: bool = True,
 ):
-    """List climatic indicators."""
+    """List climatic indicators.
+
+    Pages can be requested either by offset or by following the ``next`` link,
+    which uses keyset pagination. Totals can be left out with
+    ``include_totals=false``.
+    """
     climatic_indicators, filtered_total = db.list_climatic_indicators(
         db_session,
         limit=list_params.limit,
         offset=list_params.offset,
-        include_total=True,
+        include_total=include_totals,
         name_filter=name_contains,
         measure_type_filter=measure_type_contains,
         aggregation_period_filter=aggregation_period_contains,
+        after_id=after,
     )
-    _, unfiltered_total = db.list_climatic_indicators(
-        db_session,
-        limit=1,
-        offset=0,
-        include_total=True,
+    unfiltered_total = (
+        db.get_unfiltered_total_num_records(
+            db_session,
+            ClimaticIndicator,
+            max_age_seconds=settings.unfiltered_totals_cache_ttl_seconds,
+        )
+        if include_totals
+        else None
     )
     items = []
     for climatic_indicator in climatic_indicators:
@@ -62,6 +75,10 @@ def list_climatic_indicators(
         offset=list_params.offset,
         filtered_total=filtered_total,
         unfiltered_total=unfiltered_total,
+        after=after,
+        next_after=(
+            climatic_indicators[-1].id if len(climatic_indicators) > 0 else None
+        ),
     )
 
 
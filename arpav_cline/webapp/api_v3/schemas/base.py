@@ -64,8 +64,8 @@ class CoverageImageLegend(pydantic.BaseModel):
 
 class ListMeta(pydantic.BaseModel):
     returned_records: int
-    total_records: int
-    total_filtered_records: int
+    total_records: int | None
+    total_filtered_records: int | None
 
 
 class ListLinks(pydantic.BaseModel):
@@ -404,8 +404,10 @@ class WebResourceList(ResourceList):
         *,
         limit: int,
         offset: int,
-        filtered_total: int,
-        unfiltered_total: int,
+        filtered_total: typing.Optional[int],
+        unfiltered_total: typing.Optional[int],
+        after: typing.Optional[typing.Any] = None,
+        next_after: typing.Optional[typing.Any] = None,
     ):
         return cls(
             meta=get_meta(len(items), unfiltered_total, filtered_total),
@@ -416,6 +418,8 @@ class WebResourceList(ResourceList):
                 offset,
                 filtered_total,
                 len(items),
+                after=after,
+                next_after=next_after,
             ),
             items=items,
         )
@@ -424,14 +428,27 @@ class WebResourceList(ResourceList):
 def get_pagination_urls(
     base_url: str,
     returned_records: int,
-    total_records: int,
+    total_records: typing.Optional[int],
     limit: int,
     offset: int,
+    *,
+    after: typing.Optional[typing.Any] = None,
+    next_after: typing.Optional[typing.Any] = None,
     **filters,
 ) -> dict[str, str]:
-    """Build pagination-related urls."""
+    """Build pagination-related urls.
+
+    When ``next_after`` is given, which is the id of the last returned record,
+    the ``next`` url uses keyset pagination, by means of the ``after`` parameter,
+    unless the current page was requested with a non-zero offset.
+    """
+    is_keyset = after is not None
     pagination_offsets = _get_pagination_offsets(
-        returned_records, total_records, limit, offset
+        returned_records,
+        total_records,
+        limit,
+        offset,
+        has_known_position=not is_keyset,
     )
     pagination_urls = {}
     for link_rel, offset in pagination_offsets.items():
@@ -439,6 +456,18 @@ def get_pagination_urls(
             pagination_urls[link_rel] = _build_list_url(
                 base_url, limit, offset, **filters
             )
+    if is_keyset:
+        pagination_urls["self"] = _build_list_url(
+            base_url, limit, None, after=after, **filters
+        )
+    if (
+        next_after is not None
+        and "next" in pagination_urls
+        and (is_keyset or pagination_offsets["self"] == 0)
+    ):
+        pagination_urls["next"] = _build_list_url(
+            base_url, limit, None, after=next_after, **filters
+        )
     return pagination_urls
 
 
@@ -453,18 +482,33 @@ def _build_list_url(base_url: str, limit: int, offset: typing.Optional[int], **f
 
 
 def _get_pagination_offsets(
-    returned_records: int, total_records: int, limit: int, offset: int
+    returned_records: int,
+    total_records: typing.Optional[int],
+    limit: int,
+    offset: int,
+    *,
+    has_known_position: bool = True,
 ):
-    """Calculate pagination offsets."""
+    """Calculate pagination offsets.
+
+    When the total is unknown, or when the position of the current page is
+    unknown, as is the case with keyset pagination, a full page is assumed to
+    have a next one.
+    """
     shown = offset + returned_records
-    has_next = total_records > shown
-    has_previous = shown > returned_records
+    if total_records is not None and has_known_position:
+        has_next = total_records > shown
+    else:
+        has_next = returned_records == limit
+    has_previous = has_known_position and shown > returned_records
     return {
         "self": offset,
         "next": offset + limit if has_next else None,
         "previous": offset - limit if has_previous else None,
         "first": 0,
-        "last": (total_records // limit) * limit,
+        "last": (
+            (total_records // limit) * limit if total_records is not None else None
+        ),
     }
 
 
@@ -473,27 +517,32 @@ def get_list_links(
     path_operation_name: str,
     limit: int,
     offset: int,
-    filtered_total: int,
+    filtered_total: typing.Optional[int],
     num_returned_records: int,
+    *,
+    after: typing.Optional[typing.Any] = None,
+    next_after: typing.Optional[typing.Any] = None,
 ) -> ListLinks:
     filters = dict(request.query_params)
-    if "limit" in filters.keys():
-        del filters["limit"]
-    if "offset" in filters.keys():
-        del filters["offset"]
+    for pagination_param in ("limit", "offset", "after"):
+        filters.pop(pagination_param, None)
     pagination_urls = get_pagination_urls(
         request.url_for(path_operation_name),
         num_returned_records,
         filtered_total,
         limit,
         offset,
+        after=after,
+        next_after=next_after,
         **filters,
     )
     return ListLinks(**pagination_urls)
 
 
 def get_meta(
-    num_returned_records: int, unfiltered_total: int, filtered_total: int
+    num_returned_records: int,
+    unfiltered_total: typing.Optional[int],
+    filtered_total: typing.Optional[int],
 ) -> ListMeta:
     return ListMeta(
         returned_records=num_returned_records,
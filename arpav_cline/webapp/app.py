@@ -1,31 +1,123 @@
 import contextlib
+import logging
 
+import anyio
+import anyio.to_thread
+import sqlalchemy
 from starlette.applications import Starlette
+from starlette.middleware import Middleware
 from starlette.staticfiles import StaticFiles
 from starlette.templating import Jinja2Templates
 
 from .. import (
+    analyticswriter,
     config,
+    metrics,
+    municipalityindex,
+    queryprofiling,
+    stationindex,
+    timings,
+    vectortiles,
 )
 from ..db import engine as db_engine
 from .api_v2.app import create_app as create_v2_app
 from .api_v3.app import create_app as create_v3_app
 from .admin.app import create_admin
+from .requestmetrics import RequestMetricsMiddleware
 from .routes import routes
+from .queryprofiling import QueryProfilingMiddleware
+from .servertiming import ServerTimingMiddleware
+
+
+logger = logging.getLogger(__name__)
 
 
 @contextlib.asynccontextmanager
 async def lifespan(app: Starlette):
-    yield
+    settings: config.ArpavPpcvSettings = app.state.settings
+    if settings.server_timing_sample_rate > 0:
+        timings.instrument_engine(db_engine.get_engine(settings))
+    if settings.debug:
+        queryprofiling.instrument_engine(db_engine.get_engine(settings))
+    async with anyio.create_task_group() as task_group:
+        if settings.station_index_check_interval_seconds > 0:
+            engine = db_engine.get_engine(settings)
+            try:
+                await anyio.to_thread.run_sync(stationindex.load_station_index, engine)
+            except sqlalchemy.exc.SQLAlchemyError:
+                logger.exception(
+                    "Could not load the station index, will retry in the background"
+                )
+            task_group.start_soon(
+                stationindex.keep_station_index_fresh,
+                engine,
+                settings.station_index_check_interval_seconds,
+            )
+        if settings.municipality_index_check_interval_seconds > 0:
+            engine = db_engine.get_engine(settings)
+            try:
+                await anyio.to_thread.run_sync(
+                    municipalityindex.load_municipality_index, engine
+                )
+            except sqlalchemy.exc.SQLAlchemyError:
+                logger.exception(
+                    "Could not load the municipality index, will retry in the "
+                    "background"
+                )
+            task_group.start_soon(
+                municipalityindex.keep_municipality_index_fresh,
+                engine,
+                settings.municipality_index_check_interval_seconds,
+            )
+        if settings.vector_tile_cache_max_entries > 0:
+            vectortiles.start_tile_cache(settings.vector_tile_cache_max_entries)
+            task_group.start_soon(
+                vectortiles.keep_tile_cache_fresh,
+                db_engine.get_engine(settings),
+                settings.vector_tile_cache_check_interval_seconds,
+            )
+        if settings.analytics_writer_max_queue_size > 0:
+            analyticswriter.start_analytics_writer(
+                db_engine.get_engine(settings),
+                max_queue_size=settings.analytics_writer_max_queue_size,
+                batch_size=settings.analytics_writer_batch_size,
+                flush_interval_seconds=settings.analytics_writer_flush_interval_seconds,
+            )
+        yield
+        task_group.cancel_scope.cancel()
+    # save pending analytics before the DB engine is disposed of
+    await anyio.to_thread.run_sync(analyticswriter.stop_analytics_writer)
+    stationindex.clear_station_index()
+    municipalityindex.clear_municipality_index()
+    vectortiles.clear_tile_cache()
+    metrics.mark_process_dead()
     # ensure the database engine is properly disposed of, closing any connections
     db_engine._DB_ENGINE.dispose()  # noqa
     db_engine._DB_ENGINE = None
 
 
 def create_app_from_settings(settings: config.ArpavPpcvSettings) -> Starlette:
+    middleware = []
+    if settings.server_timing_sample_rate > 0:
+        middleware.append(
+            Middleware(
+                ServerTimingMiddleware, sample_rate=settings.server_timing_sample_rate
+            )
+        )
+    if settings.debug:
+        middleware.append(
+            Middleware(
+                QueryProfilingMiddleware,
+                max_statements=settings.query_profiling_max_statements,
+                max_repeated_statements=(
+                    settings.query_profiling_max_repeated_statements
+                ),
+            )
+        )
     app = Starlette(
         debug=settings.debug,
         routes=routes,
+        middleware=middleware,
         lifespan=lifespan,
     )
     settings.static_dir.mkdir(parents=True, exist_ok=True)
@@ -44,6 +136,8 @@ def create_app_from_settings(settings: config.ArpavPpcvSettings) -> Starlette:
     )
     app.mount(settings.v2_api_mount_prefix, v2_api)
     app.mount(settings.v3_api_mount_prefix, v3_api)
+    # added last, so that it sees all routes and also measures other middleware
+    app.add_middleware(RequestMetricsMiddleware, routes=app.routes)
     return app
 
 
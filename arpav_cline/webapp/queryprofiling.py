@@ -0,0 +1,120 @@
+"""Reporting of the DB statements of requests, as profiled by ``queryprofiling``.
+
+Requests which execute too many statements, or which repeat the same statement
+too many times, are logged as warnings, along with the code location that
+issued the offending statements. This is how N+1 queries usually show up.
+
+When the request is also being timed, its most repeated statement is reported
+in the ``Server-Timing`` header too, as ``db_repeated``.
+"""
+
+import logging
+
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from .. import (
+    queryprofiling,
+    timings,
+)
+
+logger = logging.getLogger(__name__)
+
+_REPEATED_TIMER_NAME = "db_repeated"
+_MAX_LOGGED_STATEMENT_LENGTH = 300
+
+
+class QueryProfilingMiddleware:
+    """Profile the DB statements of each request and warn about excessive ones.
+
+    It must be added after ``ServerTimingMiddleware``, in order to report to
+    its timings.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_statements: int,
+        max_repeated_statements: int,
+    ) -> None:
+        self.app = app
+        self.max_statements = max_statements
+        self.max_repeated_statements = max_repeated_statements
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with queryprofiling.start_query_profile() as profile:
+
+            async def send_with_profile(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    _add_to_timings(profile)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_profile)
+            finally:
+                self._check_profile(scope, profile)
+
+    def _check_profile(
+        self, scope: Scope, profile: queryprofiling.QueryProfile
+    ) -> None:
+        request_description = f"{scope['method']} {scope['path']}"
+        if (num_statements := profile.num_statements) > self.max_statements:
+            logger.warning(
+                f"{request_description} executed {num_statements} DB statements, "
+                f"taking {profile.duration_seconds * 1000:.1f}ms, which is more "
+                f"than the maximum of {self.max_statements}",
+                extra={
+                    "query_profile": {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "num_statements": num_statements,
+                        "duration_ms": round(profile.duration_seconds * 1000, 1),
+                    }
+                },
+            )
+        for stats in profile.get_statements():
+            if stats.count <= self.max_repeated_statements:
+                break  # statements are sorted by their number of repetitions
+            logger.warning(
+                f"{request_description} repeated the same DB statement "
+                f"{stats.count} times, taking {stats.duration_seconds * 1000:.1f}ms, "
+                f"mostly from {stats.most_common_location}: "
+                f"{_shorten(stats.statement)}",
+                extra={
+                    "query_profile": {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "statement": stats.statement,
+                        "count": stats.count,
+                        "duration_ms": round(stats.duration_seconds * 1000, 1),
+                        "locations": dict(stats.locations),
+                    }
+                },
+            )
+
+
+def _add_to_timings(profile: queryprofiling.QueryProfile) -> None:
+    if (request_timings := timings.get_current_timings()) is None:
+        return
+    statements = profile.get_statements()
+    if len(statements) > 0 and (most_repeated := statements[0]).count > 1:
+        request_timings.add(
+            _REPEATED_TIMER_NAME,
+            most_repeated.duration_seconds,
+            count=most_repeated.count,
+        )
+
+
+def _shorten(statement: str) -> str:
+    flattened = " ".join(statement.split())
+    if len(flattened) > _MAX_LOGGED_STATEMENT_LENGTH:
+        flattened = f"{flattened[:_MAX_LOGGED_STATEMENT_LENGTH]}..."
+    return flattened
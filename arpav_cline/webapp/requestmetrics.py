@@ -0,0 +1,82 @@
+"""Measurement of web request durations, as Prometheus metrics.
+
+Requests are labelled with the path template of the route that handles them,
+e.g. ``/api/v2/coverages/coverages/{coverage_identifier}``, rather than with
+their actual path, which would make for an unbounded number of label values.
+"""
+
+import time
+from typing import (
+    Optional,
+    Sequence,
+)
+
+from starlette.routing import (
+    BaseRoute,
+    Match,
+    Mount,
+)
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from .. import metrics
+
+_UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app: ASGIApp, routes: Sequence[BaseRoute]) -> None:
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # routing modifies the scope, so the route is found beforehand
+        route = get_route_path_template(self.routes, scope) or _UNMATCHED_ROUTE
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status_code(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status_code)
+        finally:
+            metrics.HTTP_REQUEST_DURATION.labels(
+                method=scope["method"], route=route, status_code=str(status_code)
+            ).observe(time.perf_counter() - started)
+
+
+def get_route_path_template(routes: Sequence[BaseRoute], scope: Scope) -> Optional[str]:
+    """Find the path template of the route which matches the request.
+
+    Routes of mounted applications are searched too. Mounted applications
+    without routes, like static files, are identified by their mount path.
+    """
+    partial = None
+    for route in routes:
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return _get_path_template(route, {**scope, **child_scope})
+        if match == Match.PARTIAL and partial is None:
+            partial = (route, {**scope, **child_scope})
+    if partial is not None:
+        return _get_path_template(*partial)
+    return None
+
+
+def _get_path_template(route: BaseRoute, scope: Scope) -> Optional[str]:
+    if isinstance(route, Mount) and len(route.routes) > 0:
+        child_template = get_route_path_template(route.routes, scope)
+        return route.path + child_template if child_template is not None else None
+    return getattr(route, "path", None)
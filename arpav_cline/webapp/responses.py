@@ -1,5 +1,81 @@
+import dataclasses
+import gzip
+import hashlib
+from typing import Optional
+
+from fastapi import (
+    Request,
+    Response,
+    status,
+)
 from fastapi.responses import JSONResponse
 
 
 class GeoJsonResponse(JSONResponse):
     media_type = "application/geo+json"
+
+
+@dataclasses.dataclass(frozen=True)
+class PreSerializedContent:
+    """A response body which has been serialized and compressed in advance.
+
+    Each encoding of the body gets its own strong ``ETag``, as their bytes
+    differ.
+    """
+
+    content: bytes
+    gzipped_content: bytes
+    media_type: str
+    digest: str
+
+    @classmethod
+    def from_content(cls, content: bytes, media_type: str) -> "PreSerializedContent":
+        return cls(
+            content=content,
+            # a fixed mtime keeps the compressed bytes, and thus the etag, stable
+            gzipped_content=gzip.compress(content, mtime=0),
+            media_type=media_type,
+            digest=hashlib.blake2b(content, digest_size=16).hexdigest(),
+        )
+
+    def to_response(self, request: Request) -> Response:
+        use_gzip = accepts_encoding(request.headers.get("accept-encoding"), "gzip")
+        etag = f'"{self.digest}-gzip"' if use_gzip else f'"{self.digest}"'
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "no-cache",
+        }
+        if is_not_modified(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+        return Response(
+            content=self.gzipped_content if use_gzip else self.content,
+            media_type=self.media_type,
+            headers=headers,
+        )
+
+
+def is_not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    """Check whether an ``If-None-Match`` header matches the given etag."""
+    if if_none_match is None:
+        return False
+    candidates = {v.strip() for v in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def accepts_encoding(accept_encoding: Optional[str], encoding: str) -> bool:
+    """Check whether an ``Accept-Encoding`` header allows the given encoding."""
+    for item in (accept_encoding or "").split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        if name.lower() in (encoding, "*"):
+            for param in params:
+                key, _, value = param.partition("=")
+                if key.strip() == "q":
+                    try:
+                        return float(value) > 0
+                    except ValueError:
+                        return False
+            return True
+    return False
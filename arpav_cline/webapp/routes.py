@@ -1,9 +1,18 @@
 """Routes for the main starlette application."""
 
+import ipaddress
+
+import prometheus_client
 from starlette.templating import Jinja2Templates
 from starlette.requests import Request
+from starlette.responses import (
+    PlainTextResponse,
+    Response,
+)
 from starlette.routing import Route
 
+from .. import metrics
+
 
 def landing_page(request: Request):
     templates: Jinja2Templates = request.app.state.templates
@@ -18,6 +27,31 @@ def landing_page(request: Request):
     )
 
 
+def prometheus_metrics(request: Request):
+    # metrics are meant for the monitoring infrastructure only. Behind the
+    # reverse proxy, the client address is the one it forwards
+    allowed_networks = request.app.state.settings.metrics_allowed_networks
+    if not _is_client_in_networks(request, allowed_networks):
+        return PlainTextResponse("Forbidden", status_code=403)
+    return Response(
+        metrics.generate_latest(), media_type=prometheus_client.CONTENT_TYPE_LATEST
+    )
+
+
+def _is_client_in_networks(
+    request: Request,
+    networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network],
+) -> bool:
+    if request.client is None:
+        return False
+    try:
+        address = ipaddress.ip_address(request.client.host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
 routes = [
     Route("/", landing_page),
+    Route("/metrics", prometheus_metrics),
 ]
@@ -0,0 +1,153 @@
+"""Reporting of per-request timings, as collected by ``arpav_cline.timings``.
+
+A sample of the requests is timed. Their responses get a ``Server-Timing``
+header, which browser developer tools know how to display, and their timings
+are also logged, once the response has been sent.
+"""
+
+import logging
+import random
+import time
+from typing import (
+    Callable,
+    Sequence,
+)
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from .. import timings
+
+logger = logging.getLogger(__name__)
+
+_ENDPOINT_TIMER_NAME = "endpoint"
+_ENCODE_TIMER_NAME = "encode"
+_TOTAL_TIMER_NAME = "total"
+
+
+class ServerTimingMiddleware:
+    """Time a sample of the requests and report their timings."""
+
+    def __init__(self, app: ASGIApp, sample_rate: float) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = None
+        with timings.start_timings() as request_timings:
+
+            async def send_with_server_timing(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        format_server_timing(
+                            request_timings.get_entries(),
+                            total_seconds=time.perf_counter() - started,
+                        ),
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_server_timing)
+            finally:
+                _log_timings(
+                    scope,
+                    status_code,
+                    request_timings.get_entries(),
+                    total_seconds=time.perf_counter() - started,
+                )
+
+
+class TimedRoute(APIRoute):
+    """API route which also times its endpoint and the encoding of its response.
+
+    Encoding time is what the route handler spends outside of the endpoint,
+    which is mostly validating and serializing the response, but also includes
+    parsing the request and resolving dependencies.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs) -> None:
+        # routers which are included in an app create their routes again, with
+        # the same endpoint, which must not be wrapped twice
+        if getattr(endpoint, "timer_name", None) != _ENDPOINT_TIMER_NAME:
+            endpoint = timings.timed_function(_ENDPOINT_TIMER_NAME)(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            if (request_timings := timings.get_current_timings()) is None:
+                return await handler(request)
+            endpoint_before = request_timings.get_duration_seconds(_ENDPOINT_TIMER_NAME)
+            started = time.perf_counter()
+            response = await handler(request)
+            elapsed = time.perf_counter() - started
+            endpoint_elapsed = (
+                request_timings.get_duration_seconds(_ENDPOINT_TIMER_NAME)
+                - endpoint_before
+            )
+            request_timings.add(
+                _ENCODE_TIMER_NAME, max(0.0, elapsed - endpoint_elapsed)
+            )
+            return response
+
+        return timed_handler
+
+
+def format_server_timing(
+    entries: Sequence[timings.TimingEntry], total_seconds: float
+) -> str:
+    """Format timings as the value of a ``Server-Timing`` header.
+
+    Durations are in milliseconds. Timers which ran more than once mention
+    their number of runs in the description.
+    """
+    metrics = []
+    for entry in entries:
+        metric = f"{entry.name};dur={entry.duration_seconds * 1000:.1f}"
+        if entry.count > 1:
+            metric += f';desc="{entry.count} runs"'
+        metrics.append(metric)
+    metrics.append(f"{_TOTAL_TIMER_NAME};dur={total_seconds * 1000:.1f}")
+    return ", ".join(metrics)
+
+
+def _log_timings(
+    scope: Scope,
+    status_code: int | None,
+    entries: Sequence[timings.TimingEntry],
+    total_seconds: float,
+) -> None:
+    durations_ms = {e.name: round(e.duration_seconds * 1000, 1) for e in entries}
+    durations_ms[_TOTAL_TIMER_NAME] = round(total_seconds * 1000, 1)
+    path = scope["path"]
+    logger.info(
+        f"{scope['method']} {path} {status_code} "
+        + " ".join(f"{name}={duration}ms" for name, duration in durations_ms.items()),
+        extra={
+            "server_timing": {
+                "method": scope["method"],
+                "path": path,
+                "status_code": status_code,
+                "durations_ms": durations_ms,
+                "counts": {e.name: e.count for e in entries},
+            }
+        },
+    )
@@ -121,6 +121,7 @@ class DeploymentConfiguration:
     webapp_env_db_pool_size: int
     webapp_env_debug: bool = dataclasses.field(init=False)
     webapp_env_http_client_timeout_seconds: float
+    webapp_env_metrics_allowed_networks: list[str]
     webapp_env_num_uvicorn_worker_processes: int
     webapp_env_public_url: str
     webapp_env_session_secret_key: str
@@ -290,6 +291,18 @@ class DeploymentConfiguration:
             webapp_env_http_client_timeout_seconds=float(
                 config_parser["webapp"].get("env_http_client_timeout_seconds", 30.0)
             ),
+            webapp_env_metrics_allowed_networks=[
+                i.strip()
+                for i in config_parser["webapp"]
+                .get(
+                    "env_metrics_allowed_networks",
+                    # loopback addresses, plus docker's default address pools,
+                    # from which compose networks get their subnets
+                    "127.0.0.0/8,::1/128,172.16.0.0/12,192.168.0.0/16",
+                )
+                .split(",")
+                if i.strip() != ""
+            ],
             webapp_env_num_uvicorn_worker_processes=config_parser.getint(
                 "webapp", "env_num_uvicorn_worker_processes"
             ),
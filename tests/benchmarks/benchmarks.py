@@ -0,0 +1,471 @@
+"""Microbenchmarks of the CPU-heavy, data processing code.
+
+Benchmarks run on synthetic inputs, which are built by the ``fixtures`` module,
+so they need neither a DB nor a THREDDS server. Run them and save the results
+as a JSON baseline with:
+
+    python tests/benchmarks/benchmarks.py run --output baseline.json
+
+Then, after making some changes, run them again and compare with the baseline:
+
+    python tests/benchmarks/benchmarks.py run --output current.json
+    python tests/benchmarks/benchmarks.py compare baseline.json current.json
+
+Comparisons exit with a non-zero code if any benchmark got slower by more than
+the threshold. Timings depend on the machine, so baselines are only comparable
+with results obtained on the same one.
+"""
+
+import contextlib
+import datetime as dt
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import timeit
+from pathlib import Path
+from typing import (
+    Annotated,
+    Callable,
+    ContextManager,
+    Iterator,
+    Optional,
+)
+from unittest import mock
+
+import typer
+from rich import print
+from rich.markup import escape
+from rich.table import Table
+
+# this is a sibling module, which is importable because this file is run as a
+# script - see the README
+import fixtures
+from arpav_cline import timeseries
+from arpav_cline.db import (
+    forecastcoverages,
+    observationseries,
+)
+from arpav_cline.schemas import static
+from arpav_cline.thredds import ncss
+from arpav_cline.webapp.api_v2.schemas.timeseries import (
+    LegacyTimeSeries,
+    LegacyTimeSeriesList,
+)
+
+# each benchmark sets up its inputs and then yields the function to be timed
+BENCHMARKS: dict[str, Callable[[], ContextManager[Callable[[], object]]]] = {}
+
+app = typer.Typer()
+
+
+def benchmark(name: str):
+    def decorator(func: Callable[[], Iterator[Callable[[], object]]]):
+        BENCHMARKS[name] = contextlib.contextmanager(func)
+        return func
+
+    return decorator
+
+
+for _frequency in ("daily", "monthly", "yearly"):
+
+    @benchmark(f"ncss.parse_ncss_dataset[{_frequency}]")
+    def _parse_ncss_dataset(frequency=_frequency):
+        raw_data = fixtures.build_ncss_csv(frequency)
+        yield lambda: ncss._parse_ncss_dataset(
+            raw_data, "tas", None, None, target_series_name="tas"
+        )
+
+
+@benchmark("timeseries.generate_derived_overview_series[loess]")
+def _derived_overview_series_loess():
+    series = fixtures.build_forecast_overview_data_series(
+        fixtures.build_series("yearly")
+    )
+    yield lambda: timeseries.generate_derived_overview_series(
+        series, static.CoverageTimeSeriesProcessingMethod.LOESS_SMOOTHING
+    )
+
+
+@benchmark("timeseries.generate_derived_overview_series[moving_average]")
+def _derived_overview_series_moving_average():
+    series = fixtures.build_forecast_overview_data_series(
+        fixtures.build_series("yearly")
+    )
+    yield lambda: timeseries.generate_derived_overview_series(
+        series, static.CoverageTimeSeriesProcessingMethod.MOVING_AVERAGE_11_YEARS
+    )
+
+
+@benchmark("timeseries.generate_derived_forecast_series[loess]")
+def _derived_forecast_series_loess():
+    series = fixtures.build_forecast_data_series(fixtures.build_series("yearly"))
+    yield lambda: timeseries.generate_derived_forecast_series(
+        series, static.CoverageTimeSeriesProcessingMethod.LOESS_SMOOTHING
+    )
+
+
+@benchmark("timeseries.generate_derived_forecast_series[moving_average]")
+def _derived_forecast_series_moving_average():
+    series = fixtures.build_forecast_data_series(fixtures.build_series("yearly"))
+    yield lambda: timeseries.generate_derived_forecast_series(
+        series, static.CoverageTimeSeriesProcessingMethod.MOVING_AVERAGE_11_YEARS
+    )
+
+
+@benchmark("timeseries.generate_decade_derived_observation_station_series")
+def _decade_observation_station_series():
+    series = fixtures.build_observation_station_data_series(
+        fixtures.build_series("yearly", start_year=1960, end_year=2023)
+    )
+    yield lambda: timeseries.generate_decade_derived_observation_station_series(
+        series, fixtures.LOCATION
+    )
+
+
+@benchmark("timeseries.generate_loess_derived_observation_station_series")
+def _loess_observation_station_series():
+    series = fixtures.build_observation_station_data_series(
+        fixtures.build_series("yearly", start_year=1960, end_year=2023)
+    )
+    yield lambda: timeseries.generate_loess_derived_observation_station_series(
+        series, fixtures.LOCATION
+    )
+
+
+@benchmark("timeseries.generate_moving_average_derived_observation_station_series")
+def _moving_average_observation_station_series():
+    series = fixtures.build_observation_station_data_series(
+        fixtures.build_series("yearly", start_year=1960, end_year=2023)
+    )
+    yield lambda: (
+        timeseries.generate_moving_average_derived_observation_station_series(
+            series, fixtures.LOCATION
+        )
+    )
+
+
+@benchmark("timeseries.generate_mann_kendall_derived_observation_station_series")
+def _mann_kendall_observation_station_series():
+    series = fixtures.build_observation_station_data_series(
+        fixtures.build_series("yearly", start_year=1960, end_year=2023)
+    )
+    yield lambda: timeseries.generate_mann_kendall_derived_observation_station_series(
+        series, fixtures.LOCATION, start_year=None, end_year=None
+    )
+
+
+@benchmark("timeseries.generate_derived_observation_series[monthly]")
+def _derived_observation_series():
+    series = fixtures.build_observation_station_data_series(
+        fixtures.build_series("monthly", start_year=1960, end_year=2023)
+    )
+    yield lambda: timeseries.generate_derived_observation_series(
+        series, static.ObservationTimeSeriesProcessingMethod.MOVING_AVERAGE_5_YEARS
+    )
+
+
+@benchmark("timeseries.generate_moving_average_derived_historical_coverage_series")
+def _moving_average_historical_coverage_series():
+    series = fixtures.build_historical_data_series(
+        fixtures.build_series("yearly", start_year=1960, end_year=2023)
+    )
+    yield lambda: timeseries.generate_moving_average_derived_historical_coverage_series(
+        series
+    )
+
+
+@benchmark("timeseries.generate_decade_derived_historical_coverage_series")
+def _decade_historical_coverage_series():
+    series = fixtures.build_historical_data_series(
+        fixtures.build_series("yearly", start_year=1960, end_year=2023)
+    )
+    yield lambda: timeseries.generate_decade_derived_historical_coverage_series(series)
+
+
+@benchmark("timeseries.generate_loess_derived_historical_coverage_series")
+def _loess_historical_coverage_series():
+    series = fixtures.build_historical_data_series(
+        fixtures.build_series("yearly", start_year=1960, end_year=2023)
+    )
+    yield lambda: timeseries.generate_loess_derived_historical_coverage_series(series)
+
+
+@benchmark("timeseries.generate_mann_kendall_derived_historical_coverage_series")
+def _mann_kendall_historical_coverage_series():
+    series = fixtures.build_historical_data_series(
+        fixtures.build_series("yearly", start_year=1960, end_year=2023)
+    )
+    yield lambda: timeseries.generate_mann_kendall_derived_historical_coverage_series(
+        series, start_year=None, end_year=None
+    )
+
+
+@benchmark("db.generate_forecast_coverages_from_configuration")
+def _generate_forecast_coverages_from_configuration():
+    configuration = fixtures.build_forecast_coverage_configuration(
+        fixtures.build_climatic_indicator()
+    )
+    yield lambda: forecastcoverages.generate_forecast_coverages_from_configuration(
+        configuration
+    )
+
+
+@benchmark("db.list_forecast_coverages")
+def _list_forecast_coverages():
+    # the DB queries are replaced with in-memory results, which leaves the
+    # generation and filtering of coverages from their configurations
+    indicators = [fixtures.build_climatic_indicator(i) for i in range(4)]
+    configurations = {
+        indicator.id: [fixtures.build_forecast_coverage_configuration(indicator)]
+        for indicator in indicators
+    }
+    with (
+        mock.patch.object(
+            forecastcoverages,
+            "collect_all_climatic_indicators",
+            return_value=indicators,
+        ),
+        mock.patch.object(
+            forecastcoverages,
+            "collect_all_forecast_coverage_configurations",
+            side_effect=lambda session, *, climatic_indicator_filter, **kwargs: (
+                configurations[climatic_indicator_filter.id]
+            ),
+        ),
+    ):
+        yield lambda: forecastcoverages.list_forecast_coverages(
+            None,
+            scenario_filter=[static.ForecastScenario.RCP45],
+            year_period_filter=[static.ForecastYearPeriod.ALL_YEAR],
+            limit=20,
+            include_total=True,
+        )
+
+
+class _CopyConsumingConnection:
+    """Stands in for a DB connection, consuming COPY input like psycopg2 does.
+
+    Other statements are not executed and return no rows.
+    """
+
+    def __init__(self):
+        self.connection = self
+
+    def exec_driver_sql(self, statement: str) -> Iterator[tuple]:
+        return iter(())
+
+    @contextlib.contextmanager
+    def cursor(self) -> Iterator["_CopyConsumingConnection"]:
+        yield self
+
+    def copy_expert(self, sql: str, stream) -> None:
+        while len(stream.read(8192)) > 0:
+            pass
+
+
+class _CopyConsumingSession:
+    def connection(self) -> _CopyConsumingConnection:
+        return _CopyConsumingConnection()
+
+    def commit(self) -> None:
+        pass
+
+
+@benchmark("db.bulk_load_observation_measurements")
+def _bulk_load_observation_measurements():
+    # harvested measurements used to be checked against the existing ones by
+    # find_new_station_measurements(), which the bulk loader superseded. Since
+    # existing measurements are now skipped by the DB, what remains in python
+    # is serializing the measurements and streaming them to COPY
+    measurements = fixtures.build_station_measurements()
+    yield lambda: observationseries.bulk_load_observation_measurements(
+        _CopyConsumingSession(), measurements
+    )
+
+
+@benchmark("webapp.LegacyTimeSeriesList[forecast]")
+def _legacy_forecast_time_series():
+    main_series = fixtures.build_forecast_data_series(fixtures.build_series("yearly"))
+    all_series = [main_series] + [
+        timeseries.generate_derived_forecast_series(main_series, processing_method)
+        for processing_method in (
+            static.CoverageTimeSeriesProcessingMethod.LOESS_SMOOTHING,
+            static.CoverageTimeSeriesProcessingMethod.MOVING_AVERAGE_11_YEARS,
+        )
+    ]
+    yield lambda: LegacyTimeSeriesList(
+        series=[LegacyTimeSeries.from_forecast_data_series(s) for s in all_series]
+    ).model_dump_json()
+
+
+@benchmark("webapp.LegacyTimeSeriesList[observation_station]")
+def _legacy_observation_station_time_series():
+    series = fixtures.build_observation_station_data_series(
+        fixtures.build_series("monthly", start_year=1960, end_year=2023)
+    )
+    yield lambda: LegacyTimeSeriesList(
+        series=[LegacyTimeSeries.from_observation_station_data_series(series)]
+    ).model_dump_json()
+
+
+def measure(
+    func: Callable[[], object], *, repeat: int, min_time_seconds: float
+) -> dict:
+    """Time a function, calling it enough times for each measurement to be reliable.
+
+    Each of the ``repeat`` measurements runs the function for at least
+    ``min_time_seconds`` and the reported durations are per call.
+    """
+    started = timeit.default_timer()
+    func()  # warm up and estimate how many calls fit in the minimum time
+    elapsed = timeit.default_timer() - started
+    number = max(1, math.ceil(min_time_seconds / max(elapsed, 1e-9)))
+    durations = [
+        total / number
+        for total in timeit.Timer(func).repeat(repeat=repeat, number=number)
+    ]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_seconds": min(durations),
+        "median_seconds": statistics.median(durations),
+        "mean_seconds": statistics.mean(durations),
+        "stdev_seconds": statistics.stdev(durations) if repeat > 1 else 0.0,
+    }
+
+
+def _get_git_revision() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def _format_duration(seconds: float) -> str:
+    for unit, factor in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+@app.command(name="list")
+def list_benchmarks():
+    """List the names of all benchmarks."""
+    for name in BENCHMARKS:
+        print(name)
+
+
+@app.command()
+def run(
+    output: Annotated[
+        Optional[Path], typer.Option(help="JSON file where to save the results")
+    ] = None,
+    name_filter: Annotated[
+        Optional[str],
+        typer.Option(help="Only run benchmarks whose name contains this text"),
+    ] = None,
+    repeat: Annotated[int, typer.Option(help="Measurements per benchmark")] = 5,
+    min_time_seconds: Annotated[
+        float, typer.Option(help="Minimum duration of each measurement")
+    ] = 0.2,
+):
+    """Run the benchmarks."""
+    results = {}
+    for name, benchmark_context in BENCHMARKS.items():
+        if name_filter is not None and name_filter not in name:
+            continue
+        with benchmark_context() as func:
+            results[name] = measure(
+                func, repeat=repeat, min_time_seconds=min_time_seconds
+            )
+        print(
+            f"{escape(name)}: {_format_duration(results[name]['min_seconds'])} "
+            f"[dim](median {_format_duration(results[name]['median_seconds'])}, "
+            f"{results[name]['number']} calls x {repeat})[/dim]"
+        )
+    if output is not None:
+        output.write_text(
+            json.dumps(
+                {
+                    "created_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+                    "git_revision": _get_git_revision(),
+                    "machine": {
+                        "node": platform.node(),
+                        "platform": platform.platform(),
+                        "processor": platform.processor(),
+                        "cpu_count": os.cpu_count(),
+                        "python": platform.python_version(),
+                    },
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+        print(f"Saved results to {str(output)!r}")
+
+
+@app.command()
+def compare(
+    baseline: Path,
+    current: Path,
+    threshold: Annotated[
+        float,
+        typer.Option(help="Relative slowdown above which a benchmark has regressed"),
+    ] = 0.1,
+):
+    """Compare results with a baseline, failing if any benchmark has regressed.
+
+    The fastest measurement of each benchmark is compared, as it is the one
+    least affected by other activity on the machine.
+    """
+    baseline_results = json.loads(baseline.read_text())["results"]
+    current_results = json.loads(current.read_text())["results"]
+    table = Table("benchmark", "baseline", "current", "change", "status")
+    regressions = []
+    for name in {**baseline_results, **current_results}:
+        if name not in current_results:
+            before = _format_duration(baseline_results[name]["min_seconds"])
+            table.add_row(escape(name), before, "", "", "[dim]missing[/dim]")
+            continue
+        if name not in baseline_results:
+            after = _format_duration(current_results[name]["min_seconds"])
+            table.add_row(escape(name), "", after, "", "[dim]new[/dim]")
+            continue
+        before = baseline_results[name]["min_seconds"]
+        after = current_results[name]["min_seconds"]
+        change = after / before - 1
+        if change > threshold:
+            status = "[red]regression[/red]"
+            regressions.append(name)
+        elif change < -threshold:
+            status = "[green]improvement[/green]"
+        else:
+            status = "ok"
+        table.add_row(
+            escape(name),
+            _format_duration(before),
+            _format_duration(after),
+            f"{change:+.1%}",
+            status,
+        )
+    print(table)
+    if len(regressions) > 0:
+        print(
+            f"[red]{len(regressions)} benchmark(s) regressed by more than "
+            f"{threshold:.0%}[/red]"
+        )
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,286 @@
+"""Synthetic, deterministic inputs for the benchmarks.
+
+Everything is built in memory, so that benchmarks run without a DB or a THREDDS
+server. Sizes are in the same range as the production data: forecast series
+span 1976-2100, observation series span some decades and there are a few dozen
+forecast models, year periods and time windows per coverage configuration.
+"""
+
+import datetime as dt
+import io
+from typing import Literal
+
+import babel
+import numpy as np
+import pandas as pd
+import shapely
+from geoalchemy2.shape import from_shape
+
+from arpav_cline.config import (
+    LOCALE_EN,
+    LOCALE_IT,
+)
+from arpav_cline.schemas import (
+    dataseries,
+    static,
+)
+from arpav_cline.schemas.base import SpatialRegion
+from arpav_cline.schemas.climaticindicators import ClimaticIndicator
+from arpav_cline.schemas.coverages import (
+    ForecastCoverageConfiguration,
+    ForecastCoverageConfigurationForecastTimeWindowLink,
+    ForecastModel,
+    ForecastModelForecastModelGroupLink,
+    ForecastModelGroup,
+    ForecastTimeWindow,
+    ForecastYearPeriodGroup,
+)
+from arpav_cline.schemas.observations import (
+    ObservationMeasurementCreate,
+    ObservationSeriesConfiguration,
+    ObservationStation,
+)
+
+Frequency = Literal["daily", "monthly", "yearly"]
+
+SEED = 20240101
+LOCATION = shapely.Point(11.547, 44.953)
+_PANDAS_FREQUENCIES = {"daily": "D", "monthly": "MS", "yearly": "YS"}
+
+
+def _translations(value: str) -> dict[babel.Locale, str]:
+    return {LOCALE_EN: value, LOCALE_IT: value}
+
+
+def build_series(
+    frequency: Frequency, start_year: int = 1976, end_year: int = 2100
+) -> pd.Series:
+    """A noisy, slightly trending temperature-like series, with some gaps."""
+    rng = np.random.default_rng(SEED)
+    index = pd.date_range(
+        f"{start_year}-01-01",
+        f"{end_year}-12-31",
+        freq=_PANDAS_FREQUENCIES[frequency],
+        tz="UTC",
+        name="time",
+    )
+    trend = np.linspace(10, 13, len(index))
+    values = trend + rng.normal(0, 1.5, len(index))
+    values[rng.random(len(index)) < 0.01] = np.nan
+    return pd.Series(values, index=index)
+
+
+def build_ncss_csv(frequency: Frequency, variable_name: str = "tas") -> str:
+    """A THREDDS NCSS point query response, in its CSV format."""
+    series = build_series(frequency)
+    buffer = io.StringIO()
+    buffer.write(
+        f'time,station,latitude[unit="degrees_north"],'
+        f'longitude[unit="degrees_east"],{variable_name}[unit="degC"]\n'
+    )
+    for timestamp, value in series.items():
+        buffer.write(
+            f"{timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')},"
+            f"GridPointRequestedAt[44.952N_11.547E],44.953,11.547,{value}\n"
+        )
+    return buffer.getvalue()
+
+
+def build_climatic_indicator(identifier_suffix: int = 0) -> ClimaticIndicator:
+    return ClimaticIndicator(
+        id=identifier_suffix + 1,
+        name=f"tas{identifier_suffix}" if identifier_suffix else "tas",
+        historical_coverages_internal_name="tas",
+        measure_type=static.MeasureType.ABSOLUTE,
+        aggregation_period=static.AggregationPeriod.ANNUAL,
+        palette="default/seq-YlOrRd",
+        color_scale_min=-3,
+        color_scale_max=32,
+    )
+
+
+def build_forecast_coverage_configuration(
+    climatic_indicator: ClimaticIndicator,
+    *,
+    num_forecast_models: int = 6,
+    num_time_windows: int = 3,
+) -> ForecastCoverageConfiguration:
+    """A coverage configuration, together with its related groups and links."""
+    forecast_model_group = ForecastModelGroup(id=1, name="all")
+    for index in range(num_forecast_models):
+        forecast_model = ForecastModel(id=index + 1, name=f"model{index}")
+        ForecastModelForecastModelGroupLink(
+            forecast_model_id=forecast_model.id,
+            forecast_model_group_id=forecast_model_group.id,
+            forecast_model=forecast_model,
+            forecast_model_group=forecast_model_group,
+        )
+    configuration = ForecastCoverageConfiguration(
+        netcdf_main_dataset_name="tas",
+        thredds_url_pattern="ensymbc/{climatic_indicator}/{scenario}.nc",
+        wms_main_layer_name="tas",
+        scenarios=list(static.ForecastScenario),
+        climatic_indicator=climatic_indicator,
+        spatial_region=SpatialRegion(id=1, name="arpa_vfvg", internal_value=""),
+        year_period_group=ForecastYearPeriodGroup(
+            id=1, name="all_seasons", year_periods=list(static.ForecastYearPeriod)
+        ),
+        forecast_model_group=forecast_model_group,
+    )
+    for index in range(num_time_windows):
+        time_window = ForecastTimeWindow(id=index + 1, name=f"tw{index}")
+        ForecastCoverageConfigurationForecastTimeWindowLink(
+            forecast_time_window_id=time_window.id,
+            forecast_time_window=time_window,
+            forecast_coverage_configuration=configuration,
+        )
+    return configuration
+
+
+def build_static_forecast_coverage() -> static.StaticForecastCoverage:
+    return static.StaticForecastCoverage(
+        aggregation_period=static.AggregationPeriod.ANNUAL,
+        climatic_indicator_name="tas",
+        climatic_indicator_name_translations=_translations("Mean temperature"),
+        climatic_indicator_description_translations=_translations("Description"),
+        color_scale_min=-3,
+        color_scale_max=32,
+        coverage_configuration_identifier="forecast-tas-absolute-annual",
+        coverage_identifier="forecast-tas-absolute-annual-model0-rcp26-all_year",
+        forecast_model_name="model0",
+        forecast_model_name_translations=_translations("Model 0"),
+        lower_uncertainty_identifier=None,
+        lower_uncertainty_ncss_url=None,
+        lower_uncertainy_netcdf_variable_name=None,
+        measure_type=static.MeasureType.ABSOLUTE,
+        netcdf_variable_name="tas",
+        ncss_url="http://localhost/thredds/ncss/tas.nc",
+        palette="default/seq-YlOrRd",
+        scenario=static.ForecastScenario.RCP26,
+        upper_uncertainty_identifier=None,
+        upper_uncertainty_ncss_url=None,
+        upper_uncertainy_netcdf_variable_name=None,
+        wms_base_url="http://localhost/thredds/wms/tas.nc",
+        year_period=static.ForecastYearPeriod.ALL_YEAR,
+    )
+
+
+def build_static_historical_coverage() -> static.StaticHistoricalCoverage:
+    return static.StaticHistoricalCoverage(
+        aggregation_period=static.AggregationPeriod.ANNUAL,
+        climatic_indicator_name="tas",
+        climatic_indicator_name_translations=_translations("Mean temperature"),
+        climatic_indicator_description_translations=_translations("Description"),
+        color_scale_min=-3,
+        color_scale_max=32,
+        coverage_configuration_identifier="historical-tas-absolute-annual",
+        coverage_identifier="historical-tas-absolute-annual-all_year",
+        measure_type=static.MeasureType.ABSOLUTE,
+        netcdf_variable_name="tas",
+        ncss_url="http://localhost/thredds/ncss/tas.nc",
+        palette="default/seq-YlOrRd",
+        wms_base_url="http://localhost/thredds/wms/tas.nc",
+        year_period=static.HistoricalYearPeriod.ALL_YEAR,
+    )
+
+
+def build_static_forecast_overview_series() -> static.StaticForecastOverviewSeries:
+    return static.StaticForecastOverviewSeries(
+        coverage_configuration_identifier="overview-forecast-tas",
+        climatic_indicator_identifier="tas-absolute-annual",
+        climatic_indicator_name="tas",
+        climatic_indicator_name_translations=_translations("Mean temperature"),
+        file_download_url=None,
+        lower_uncertainty_file_download_url=None,
+        lower_uncertainty_identifier=None,
+        lower_uncertainy_netcdf_variable_name="tas_lower",
+        lower_uncertainty_opendap_url=None,
+        opendap_url=None,
+        netcdf_variable_name="tas",
+        series_configuration_identifier="overview-forecast-tas-rcp26",
+        upper_uncertainty_file_download_url=None,
+        upper_uncertainty_identifier=None,
+        upper_uncertainy_netcdf_variable_name="tas_upper",
+        upper_uncertainty_opendap_url=None,
+    )
+
+
+def build_forecast_data_series(series: pd.Series) -> dataseries.ForecastDataSeries:
+    result = dataseries.ForecastDataSeries(
+        coverage=build_static_forecast_coverage(),
+        dataset_type=static.DatasetType.MAIN,
+        location=LOCATION,
+        processing_method=static.CoverageTimeSeriesProcessingMethod.NO_PROCESSING,
+        temporal_start=None,
+        temporal_end=None,
+    )
+    result.data_ = series.rename(result.identifier)
+    return result
+
+
+def build_historical_data_series(
+    series: pd.Series,
+) -> dataseries.HistoricalDataSeries:
+    result = dataseries.HistoricalDataSeries(
+        coverage=build_static_historical_coverage(),
+        dataset_type=static.DatasetType.MAIN,
+        location=LOCATION,
+        processing_method=static.HistoricalTimeSeriesProcessingMethod.NO_PROCESSING,
+        temporal_start=None,
+        temporal_end=None,
+    )
+    result.data_ = series.rename(result.identifier)
+    return result
+
+
+def build_forecast_overview_data_series(
+    series: pd.Series,
+) -> dataseries.ForecastOverviewDataSeries:
+    result = dataseries.ForecastOverviewDataSeries(
+        overview_series=build_static_forecast_overview_series(),
+        processing_method=static.CoverageTimeSeriesProcessingMethod.NO_PROCESSING,
+        dataset_type=static.DatasetType.MAIN,
+    )
+    result.data_ = series.rename(result.identifier)
+    return result
+
+
+def build_observation_station_data_series(
+    series: pd.Series,
+) -> dataseries.ObservationStationDataSeries:
+    result = dataseries.ObservationStationDataSeries(
+        observation_series_configuration=ObservationSeriesConfiguration(
+            climatic_indicator=build_climatic_indicator(),
+            measurement_aggregation_type=static.MeasurementAggregationType.YEARLY,
+            station_managers=[static.ObservationStationManager.ARPAV],
+        ),
+        observation_station=ObservationStation(
+            id=1,
+            code="arpa_v-1",
+            managed_by=static.ObservationStationManager.ARPAV,
+            geom=from_shape(LOCATION),
+        ),
+        dataset_type=static.DatasetType.OBSERVATION,
+        processing_method=static.ObservationTimeSeriesProcessingMethod.NO_PROCESSING,
+        location=LOCATION,
+    )
+    result.data_ = series.rename(result.identifier)
+    return result
+
+
+def build_station_measurements(
+    num_days: int = 10_000,
+) -> list[ObservationMeasurementCreate]:
+    """Daily measurements of a station, as harvested over a few decades."""
+    rng = np.random.default_rng(SEED)
+    first_day = dt.date(1990, 1, 1)
+    return [
+        ObservationMeasurementCreate(
+            value=float(value),
+            date=first_day + dt.timedelta(days=offset),
+            measurement_aggregation_type=static.MeasurementAggregationType.YEARLY,
+            observation_station_id=1,
+            climatic_indicator_id=1,
+        )
+        for offset, value in enumerate(rng.normal(12, 5, num_days))
+    ]
@@ -186,6 +186,7 @@ def arpav_db(settings):
     sqlmodel.SQLModel.metadata.create_all(engine)
     yield
     sqlmodel.SQLModel.metadata.drop_all(engine)
+    db.invalidate_unfiltered_totals()
     # tables_to_truncate = list(sqlmodel.SQLModel.metadata.tables.keys())
     # tables_fragment = ', '.join(f'"{t}"' for t in tables_to_truncate)
     # with engine.connect() as connection:
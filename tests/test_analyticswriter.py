@@ -0,0 +1,64 @@
+import datetime as dt
+
+from arpav_cline import analyticswriter
+from arpav_cline.schemas.analytics import TimeSeriesDownloadRequestCreate
+
+
+class _RecordingAnalyticsWriter(analyticswriter.AnalyticsWriter):
+    def __init__(self, **kwargs):
+        super().__init__(None, **kwargs)
+        self.batches = []
+
+    def _write(self, batch):
+        if len(batch) > 0:
+            self.batches.append(list(batch))
+
+
+def _build_download_request(index: int) -> TimeSeriesDownloadRequestCreate:
+    return TimeSeriesDownloadRequestCreate(
+        request_datetime=dt.datetime(2026, 1, 1, tzinfo=dt.timezone.utc),
+        entity_name=f"entity-{index}",
+        is_public_sector=False,
+        download_reason="research",
+        climatological_variable="tas",
+        aggregation_period="annual",
+        measure_type="absolute",
+        year_period="all_year",
+        data_category="forecast",
+        longitude=11.5,
+        latitude=45.5,
+    )
+
+
+def test_analytics_writer_writes_in_batches():
+    writer = _RecordingAnalyticsWriter(
+        max_queue_size=100, batch_size=4, flush_interval_seconds=60
+    )
+    writer.start()
+    for index in range(10):
+        assert writer.submit(_build_download_request(index))
+    writer.stop(timeout_seconds=5)
+    assert [len(batch) for batch in writer.batches] == [4, 4, 2]
+    assert [r.entity_name for batch in writer.batches for r in batch] == [
+        f"entity-{i}" for i in range(10)
+    ]
+
+
+def test_analytics_writer_flushes_after_interval():
+    writer = _RecordingAnalyticsWriter(
+        max_queue_size=100, batch_size=100, flush_interval_seconds=0
+    )
+    writer.start()
+    writer.submit(_build_download_request(0))
+    writer.stop(timeout_seconds=5)
+    assert [len(batch) for batch in writer.batches] == [1]
+
+
+def test_analytics_writer_drops_records_when_queue_is_full():
+    writer = _RecordingAnalyticsWriter(
+        max_queue_size=2, batch_size=100, flush_interval_seconds=60
+    )
+    # the writer is not started, so nothing drains the queue
+    results = [writer.submit(_build_download_request(i)) for i in range(3)]
+    assert results == [True, True, False]
+    assert writer.num_dropped == 1
@@ -1,9 +1,28 @@
+import datetime as dt
+import json
+import math
 from operator import attrgetter
 
+import geojson_pydantic
 import pytest
+import shapely
+import sqlalchemy
+import sqlmodel
 
 from arpav_cline import db
-from arpav_cline.schemas import static
+from arpav_cline.schemas import (
+    municipalities,
+    observations,
+    static,
+)
+from arpav_cline.schemas.analytics import (
+    ForecastCoverageDownloadRequestCreate,
+    TimeSeriesDownloadRequestCreate,
+)
+from arpav_cline.schemas.coverages import (
+    ForecastCoverageConfiguration,
+    HistoricalCoverageConfiguration,
+)
 
 
 @pytest.mark.parametrize(
@@ -57,6 +76,83 @@ def test_list_climatic_indicators(
         assert db_climatic_indicator.identifier == expected_identifiers[index]
 
 
+@pytest.mark.parametrize(
+    "point, max_distance_meters, expected_found",
+    [
+        pytest.param(shapely.Point(10.8326, 45.3724), 1000, True, id="on-station"),
+        pytest.param(shapely.Point(10.85, 45.38), 5000, True, id="within-radius"),
+        pytest.param(shapely.Point(12.5, 46.5), 5000, False, id="too-far"),
+    ],
+)
+def test_find_nearest_observation_station(
+    arpav_db_session, sample_real_station, point, max_distance_meters, expected_found
+):
+    result = db.find_nearest_observation_station(
+        arpav_db_session, point, max_distance_meters=max_distance_meters
+    )
+    if expected_found:
+        station, distance = result
+        assert station.id == sample_real_station.id
+        assert 0 <= distance <= max_distance_meters
+    else:
+        assert result is None
+
+
+def test_find_nearest_observation_station_ranks_by_meters(arpav_db_session):
+    # at this latitude a degree of longitude is shorter than one of latitude, so
+    # the station to the east is nearer, despite being more degrees away
+    point = shapely.Point(11.88, 45.41)
+    for code, lon, lat in (
+        ("east", point.x + 0.010, point.y),
+        ("north", point.x, point.y + 0.0085),
+    ):
+        db.create_observation_station(
+            arpav_db_session,
+            observations.ObservationStationCreate(
+                code=code,
+                managed_by=static.ObservationStationManager.ARPAV,
+                geom=geojson_pydantic.Point(type="Point", coordinates=(lon, lat)),
+            ),
+        )
+    station, distance = db.find_nearest_observation_station(
+        arpav_db_session, point, max_distance_meters=1000
+    )
+    assert station.code == "east"
+    assert distance == pytest.approx(783, abs=10)
+
+
+def test_upsert_observation_stations(
+    arpav_db_session, sample_real_station, sample_real_climatic_indicators
+):
+    indicator_ids = [ci.id for ci in sample_real_climatic_indicators[:2]]
+    result = db.upsert_observation_stations(
+        arpav_db_session,
+        [
+            observations.ObservationStationCreate(
+                code=sample_real_station.code,
+                name="changed name",
+                managed_by=static.ObservationStationManager.ARPAV,
+                geom=geojson_pydantic.Point(type="Point", coordinates=(10.8, 45.3)),
+                climatic_indicators=indicator_ids,
+            ),
+            observations.ObservationStationCreate(
+                code="arpa_v-fake",
+                name="new station",
+                managed_by=static.ObservationStationManager.ARPAV,
+                geom=geojson_pydantic.Point(type="Point", coordinates=(11.0, 45.5)),
+                climatic_indicators=indicator_ids[:1],
+            ),
+        ],
+    )
+    assert [s.code for s in result] == ["arpa_v-fake"]
+    arpav_db_session.expire_all()
+    existing = db.get_observation_station(arpav_db_session, sample_real_station.id)
+    assert existing.name == sample_real_station.name
+    assert sorted(ci.id for ci in existing.climatic_indicators) == sorted(indicator_ids)
+    created = db.get_observation_station_by_code(arpav_db_session, "arpa_v-fake")
+    assert [ci.id for ci in created.climatic_indicators] == indicator_ids[:1]
+
+
 @pytest.mark.parametrize(
     "limit, offset, include_total",
     [
@@ -83,3 +179,178 @@ def test_list_monthly_measurements(
         assert total is None
     for index, db_measurement in enumerate(db_measurements):
         assert db_measurement.date == expected_dates[index]
+
+
+def test_forecast_coverage_configuration_identifier_expression(
+    arpav_db_session, sample_real_forecast_coverage_configurations
+):
+    statement = sqlmodel.select(
+        ForecastCoverageConfiguration.id,
+        db.get_forecast_coverage_configuration_identifier_expression(),
+    )
+    db_identifiers = dict(arpav_db_session.exec(statement).all())
+    assert db_identifiers == {
+        fcc.id: fcc.identifier for fcc in sample_real_forecast_coverage_configurations
+    }
+
+
+def test_historical_coverage_configuration_identifier_expression(
+    arpav_db_session, sample_real_historical_coverage_configurations
+):
+    statement = sqlmodel.select(
+        HistoricalCoverageConfiguration.id,
+        db.get_historical_coverage_configuration_identifier_expression(),
+    )
+    db_identifiers = dict(arpav_db_session.exec(statement).all())
+    assert db_identifiers == {
+        hcc.id: hcc.identifier for hcc in sample_real_historical_coverage_configurations
+    }
+
+
+def test_collect_all_forecast_coverage_configurations_with_identifier_filter(
+    arpav_db_session, sample_real_forecast_coverage_configurations
+):
+    identifier_filter = "tas-absolute"
+    expected_ids = {
+        fcc.id
+        for fcc in sample_real_forecast_coverage_configurations
+        if identifier_filter in fcc.identifier
+    }
+    assert len(expected_ids) > 0
+    found = db.collect_all_forecast_coverage_configurations_with_identifier_filter(
+        arpav_db_session, identifier_filter
+    )
+    assert {fcc.id for fcc in found} == expected_ids
+
+
+def _build_time_series_download_request(
+    request_datetime: dt.datetime,
+) -> TimeSeriesDownloadRequestCreate:
+    return TimeSeriesDownloadRequestCreate(
+        request_datetime=request_datetime,
+        entity_name=None,
+        is_public_sector=True,
+        download_reason="research",
+        climatological_variable="tas",
+        aggregation_period="annual",
+        measure_type="absolute",
+        year_period="all_year",
+        data_category="forecast",
+        longitude=11.5,
+        latitude=45.5,
+    )
+
+
+def test_refresh_download_request_rollups(arpav_db_session):
+    db.create_many_download_requests(
+        arpav_db_session,
+        [
+            _build_time_series_download_request(dt.datetime(2026, 1, 30, 10)),
+            _build_time_series_download_request(dt.datetime(2026, 1, 31, 10)),
+            _build_time_series_download_request(dt.datetime(2026, 2, 1, 10)),
+            ForecastCoverageDownloadRequestCreate(
+                request_datetime=dt.datetime(2026, 2, 1, 11),
+                entity_name=None,
+                is_public_sector=False,
+                download_reason="research",
+                climatological_variable="tas",
+                aggregation_period="annual",
+                measure_type="absolute",
+                year_period="all_year",
+                climatological_model="model_ensemble",
+                scenario="rcp26",
+                time_window="tw1",
+            ),
+        ],
+    )
+    assert db.refresh_download_request_rollups(arpav_db_session) == 4
+    # a later refresh only recomputes the last rolled up day
+    db.create_many_download_requests(
+        arpav_db_session,
+        [_build_time_series_download_request(dt.datetime(2026, 2, 1, 12))],
+    )
+    assert db.refresh_download_request_rollups(arpav_db_session) == 2
+    monthly, num_monthly = db.list_download_request_aggregates(
+        arpav_db_session,
+        granularity=static.AnalyticsRollupGranularity.MONTH,
+        include_total=True,
+    )
+    assert num_monthly == 3
+    assert [
+        (a.period_start, a.download_kind, a.scenario, a.num_requests) for a in monthly
+    ] == [
+        (dt.date(2026, 1, 1), "time_series", "", 2),
+        (dt.date(2026, 2, 1), "forecast_coverage", "rcp26", 1),
+        (dt.date(2026, 2, 1), "time_series", "", 2),
+    ]
+
+
+def _create_wiggly_municipality(session, name: str = "wiggly"):
+    # a circle whose radius alternates by less than the medium simplification
+    # tolerance, so that each resolution ends up with fewer vertices
+    num_vertices = 360
+    coords = []
+    for i in range(num_vertices):
+        angle = 2 * math.pi * i / num_vertices
+        radius = 0.05 + (0.0002 if i % 2 else -0.0002)
+        coords.append(
+            (11.5 + radius * math.cos(angle), 45.5 + radius * math.sin(angle))
+        )
+    geom = shapely.MultiPolygon([shapely.Polygon(coords)])
+    return db.create_many_municipalities(
+        session,
+        [
+            municipalities.MunicipalityCreate(
+                geom=geojson_pydantic.MultiPolygon(
+                    **json.loads(shapely.to_geojson(geom))
+                ),
+                name=name,
+                province_name="PD",
+                region_name="Veneto",
+            )
+        ],
+    )[0]
+
+
+def _list_municipality_coordinates(
+    session, resolution: static.MunicipalityGeometryResolution
+) -> list[tuple[float, float]]:
+    features, _ = db.list_municipality_geojson_features(session, resolution=resolution)
+    return shapely.get_coordinates(
+        shapely.from_geojson(features[0].geometry_geojson)
+    ).tolist()
+
+
+def test_list_municipality_geojson_features_resolution(arpav_db_session):
+    _create_wiggly_municipality(arpav_db_session)
+    num_vertices = {}
+    for resolution in static.MunicipalityGeometryResolution:
+        coords = _list_municipality_coordinates(arpav_db_session, resolution)
+        precision = resolution.get_coordinate_precision()
+        for coord in (c for pair in coords for c in pair):
+            assert coord == round(coord, precision)
+        num_vertices[resolution] = len(coords)
+    assert num_vertices[static.MunicipalityGeometryResolution.FULL] == 361
+    assert (
+        num_vertices[static.MunicipalityGeometryResolution.FULL]
+        > num_vertices[static.MunicipalityGeometryResolution.MEDIUM]
+        > num_vertices[static.MunicipalityGeometryResolution.LOW]
+    )
+
+
+def test_list_municipality_geojson_features_falls_back_to_full_geometry(
+    arpav_db_session,
+):
+    _create_wiggly_municipality(arpav_db_session)
+    arpav_db_session.execute(
+        sqlalchemy.update(municipalities.Municipality).values(
+            geom_simplified_medium=None, geom_simplified_low=None
+        )
+    )
+    arpav_db_session.commit()
+    for resolution in (
+        static.MunicipalityGeometryResolution.MEDIUM,
+        static.MunicipalityGeometryResolution.LOW,
+    ):
+        coords = _list_municipality_coordinates(arpav_db_session, resolution)
+        assert len(coords) == 361
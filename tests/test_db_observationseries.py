@@ -7,120 +7,111 @@ from arpav_cline.schemas.observations import ObservationMeasurementCreate
 from arpav_cline.schemas.static import MeasurementAggregationType
 
 
-@pytest.mark.parametrize(
-    "indicator_identifier, candidate_date, candidate_aggregation_type, should_be_created",
-    [
-        pytest.param(
-            "tas-absolute-annual",
-            dt.date(1987, 1, 1),
-            MeasurementAggregationType.MONTHLY,
-            False,
-            id="already-exists",
-        ),
-        pytest.param(
-            "tas-absolute-annual",
-            dt.date(2025, 1, 1),
-            MeasurementAggregationType.MONTHLY,
-            True,
-            id="new-year",
-        ),
-        pytest.param(
-            "tasmax-absolute-annual",
-            dt.date(1987, 1, 1),
-            MeasurementAggregationType.MONTHLY,
-            True,
-            id="different-indicator",
-        ),
-        pytest.param(
-            "tas-absolute-annual",
-            dt.date(1987, 1, 1),
-            MeasurementAggregationType.SEASONAL,
-            True,
-            id="different-aggregation-type",
-        ),
-    ],
-)
-def test_find_new_station_measurements(
+@pytest.mark.parametrize("update_existing", [False, True])
+def test_bulk_load_observation_measurements_with_existing(
     arpav_db_session,
     sample_real_station,
     sample_monthly_measurements,  # noqa
     sample_real_climatic_indicators,  # noqa
-    indicator_identifier,
-    candidate_date,
-    candidate_aggregation_type,
-    should_be_created,
+    update_existing,
 ):
     indicator = db.get_climatic_indicator_by_identifier(
-        arpav_db_session, indicator_identifier
+        arpav_db_session, "tas-absolute-annual"
     )
     candidates = [
         ObservationMeasurementCreate(
-            value=0,
+            value=99,
             date=candidate_date,
-            measurement_aggregation_type=candidate_aggregation_type,
+            measurement_aggregation_type=MeasurementAggregationType.MONTHLY,
             observation_station_id=sample_real_station.id,
             climatic_indicator_id=indicator.id,
         )
+        # the first date already exists, the second one is repeated
+        for candidate_date in (
+            dt.date(1987, 1, 1),
+            dt.date(2025, 1, 1),
+            dt.date(2025, 1, 1),
+        )
     ]
-    new_measurements = db.find_new_station_measurements(
-        arpav_db_session, station_id=sample_real_station.id, candidates=candidates
+    result = db.bulk_load_observation_measurements(
+        arpav_db_session, candidates, update_existing=update_existing
+    )
+    assert result.num_inserted == 1
+    assert result.num_updated == (1 if update_existing else 0)
+    assert result.inserted_ids is None
+    existing = db.collect_all_observation_measurements(
+        arpav_db_session,
+        observation_station_id_filter=sample_real_station.id,
+        climatic_indicator_id_filter=indicator.id,
+        aggregation_type_filter=MeasurementAggregationType.MONTHLY,
+    )
+    assert len([m for m in existing if m.date == dt.date(2025, 1, 1)]) == 1
+    first = [m for m in existing if m.date == dt.date(1987, 1, 1)][0]
+    assert (first.value == 99) == update_existing
+
+
+def test_bulk_load_observation_measurements(
+    arpav_db_session,
+    sample_real_station,
+    sample_monthly_measurements,  # noqa
+    sample_real_climatic_indicators,  # noqa
+):
+    indicator = db.get_climatic_indicator_by_identifier(
+        arpav_db_session, "tas-absolute-annual"
+    )
+    candidates = (
+        ObservationMeasurementCreate(
+            value=idx,
+            date=candidate_date,
+            measurement_aggregation_type=MeasurementAggregationType.MONTHLY,
+            observation_station_id=sample_real_station.id,
+            climatic_indicator_id=indicator.id,
+        )
+        for idx, candidate_date in enumerate(
+            (dt.date(1987, 1, 1), dt.date(2025, 1, 1), dt.date(2025, 2, 1))
+        )
+    )
+    result = db.bulk_load_observation_measurements(
+        arpav_db_session, candidates, return_ids=True
+    )
+    assert result.num_inserted == 2
+    assert result.num_updated == 0
+    assert len(result.inserted_ids) == 2
+    for measurement_id in result.inserted_ids:
+        assert db.get_observation_measurement(arpav_db_session, measurement_id)
+
+
+def test_get_latest_observation_measurement_dates(
+    arpav_db_session,
+    sample_real_station,
+    sample_monthly_measurements,
+    sample_real_climatic_indicators,  # noqa
+):
+    indicator = db.get_climatic_indicator_by_identifier(
+        arpav_db_session, "tas-absolute-annual"
+    )
+    result = db.get_latest_observation_measurement_dates(
+        arpav_db_session, observation_station_ids=[sample_real_station.id]
     )
-    if should_be_created:
-        assert candidates[0] == new_measurements[0]
-    else:
-        assert len(new_measurements) == 0
+    assert result == {
+        (
+            sample_real_station.id,
+            indicator.id,
+            MeasurementAggregationType.MONTHLY,
+        ): max(m.date for m in sample_monthly_measurements)
+    }
 
 
-# def test_find_new_station_measurements_prevents_duplicate_dates(
-#         arpav_db_session,
-#         sample_real_station,
-#         sample_monthly_measurements,
-#         sample_real_climatic_indicators
-# ):
-#     tas_absolute_annual_indicator = db.get_climatic_indicator_by_identifier(
-#         arpav_db_session, "tas-absolute-annual")
-#     candidates = [
-#         # this date already exists in the db as it is created by the
-#         # `sample_monthly_measurements` fixture
-#         ObservationMeasurementCreate(
-#             value=0,
-#             date=dt.date(1987, 1, 1),
-#             measurement_aggregation_type=MeasurementAggregationType.MONTHLY,
-#             observation_station_id=sample_real_station.id,
-#             climatic_indicator_id=tas_absolute_annual_indicator.id,
-#         )
-#     ]
-#     new_measurements = db.find_new_station_measurements(
-#         arpav_db_session,
-#         station_id=sample_real_station.id,
-#         candidates=candidates
-#     )
-#     assert len(new_measurements) == 0
-#
-#
-# def test_find_new_station_measurements_distinguishes_between_different_aggregation_types(
-#         arpav_db_session,
-#         sample_real_station,
-#         sample_monthly_measurements,
-#         sample_real_climatic_indicators
-# ):
-#     tas_absolute_annual_indicator = db.get_climatic_indicator_by_identifier(
-#         arpav_db_session, "tas-absolute-annual")
-#     candidates = [
-#         # this date already exists in the db as it is created by the
-#         # `sample_monthly_measurements` fixture
-#         ObservationMeasurementCreate(
-#             value=0,
-#             date=dt.date(1987, 1, 1),
-#             measurement_aggregation_type=MeasurementAggregationType.YEARLY,
-#             observation_station_id=sample_real_station.id,
-#             climatic_indicator_id=tas_absolute_annual_indicator.id,
-#         )
-#     ]
-#     new_measurements = db.find_new_station_measurements(
-#         arpav_db_session,
-#         station_id=sample_real_station.id,
-#         candidates=candidates
-#     )
-#     for c in candidates:
-#         assert c in new_measurements
+def test_stream_all_observation_measurements(
+    arpav_db_session,
+    sample_real_station,
+    sample_monthly_measurements,
+):
+    collected = db.collect_all_observation_measurements(
+        arpav_db_session, observation_station_id_filter=sample_real_station.id
+    )
+    streamed = db.stream_all_observation_measurements(
+        arpav_db_session, observation_station_id_filter=sample_real_station.id
+    )
+    assert [m.id for m in streamed] == [m.id for m in collected]
+    assert len(collected) == len(sample_monthly_measurements)
@@ -0,0 +1,87 @@
+import uuid
+
+import pytest
+import shapely
+
+from arpav_cline import municipalityindex
+from arpav_cline.schemas import municipalities
+
+
+def _build_label(name: str) -> municipalities.MunicipalityLabel:
+    return municipalities.MunicipalityLabel(
+        id=uuid.uuid4(), name=name, province_name="PD", region_name="Veneto"
+    )
+
+
+@pytest.fixture
+def municipality_index() -> municipalityindex.MunicipalityIndex:
+    return municipalityindex.MunicipalityIndex(
+        [_build_label("west"), _build_label("east")],
+        [
+            shapely.MultiPolygon([shapely.box(11.0, 45.0, 11.5, 45.5)]),
+            shapely.MultiPolygon([shapely.box(11.5, 45.0, 12.0, 45.5)]),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "lon, lat, expected_names",
+    [
+        pytest.param(11.2, 45.2, ["west"], id="west"),
+        pytest.param(11.8, 45.2, ["east"], id="east"),
+        pytest.param(11.5, 45.2, ["west", "east"], id="border"),
+        pytest.param(13.0, 45.2, [], id="outside"),
+    ],
+)
+def test_find_containing(municipality_index, lon, lat, expected_names):
+    found = municipality_index.find_containing(shapely.Point(lon, lat))
+    assert sorted(m.name for m in found) == sorted(expected_names)
+
+
+def test_find_containing_empty_index():
+    index = municipalityindex.MunicipalityIndex([], [])
+    assert len(index) == 0
+    assert index.find_containing(shapely.Point(11.2, 45.2)) == []
+
+
+@pytest.mark.parametrize(
+    "province, region, expected_names",
+    [
+        pytest.param(None, None, ["west", "east"], id="no-filter"),
+        pytest.param("pd", None, ["west", "east"], id="province"),
+        pytest.param("vr", None, [], id="other-province"),
+        pytest.param(None, "vene", ["west", "east"], id="region-substring"),
+    ],
+)
+def test_filter(municipality_index, province, region, expected_names):
+    found = municipality_index.filter(
+        province_name_filter=province, region_name_filter=region
+    )
+    assert [m.name for m in found] == expected_names
+
+
+def test_get_cached_response_builds_once(municipality_index):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return b"response"
+
+    assert municipality_index.get_cached_response("key", build) == b"response"
+    assert municipality_index.get_cached_response("key", build) == b"response"
+    assert len(calls) == 1
+
+
+def test_get_cached_response_evicts_least_recently_used(
+    municipality_index, monkeypatch
+):
+    monkeypatch.setattr(municipalityindex, "_MAX_CACHED_RESPONSES", 2)
+    calls = []
+
+    def build(key):
+        calls.append(key)
+        return key
+
+    for key in ("first", "second", "first", "third", "first", "second"):
+        municipality_index.get_cached_response(key, lambda: build(key))
+    assert calls == ["first", "second", "third", "second"]
@@ -0,0 +1,131 @@
+import anyio
+import httpx
+import pytest
+
+from arpav_cline import exceptions
+from arpav_cline.observations_harvester import httpclient
+
+_NO_DELAY_RETRY_POLICY = httpclient.RetryPolicy(
+    max_attempts=3, base_delay_seconds=0, max_delay_seconds=0
+)
+
+
+def _run_with_client(handler, func, *args, max_concurrency=4):
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as http_client:
+            client = httpclient.HarvesterClient(
+                http_client,
+                max_concurrency=max_concurrency,
+                retry_policy=_NO_DELAY_RETRY_POLICY,
+            )
+            return await func(client, *args), client
+
+    return anyio.run(run)
+
+
+def test_get_json_retries_transient_errors():
+    responses = iter(
+        [
+            httpx.Response(503),
+            httpx.Response(429, headers={"retry-after": "0"}),
+            httpx.Response(200, json={"data": [1]}),
+        ]
+    )
+
+    def handler(request):
+        return next(responses)
+
+    result, client = _run_with_client(handler, lambda c: c.get_json("http://fake/data"))
+    assert result == {"data": [1]}
+    assert client.num_requests == 3
+    assert client.num_retries == 2
+
+
+def test_get_json_gives_up_after_max_attempts():
+    def handler(request):
+        return httpx.Response(502)
+
+    with pytest.raises(exceptions.ObservationDataRetrievalError):
+        _run_with_client(handler, lambda c: c.get_json("http://fake/data"))
+
+
+def test_get_json_does_not_retry_client_errors():
+    num_requests = 0
+
+    def handler(request):
+        nonlocal num_requests
+        num_requests += 1
+        return httpx.Response(404)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _run_with_client(handler, lambda c: c.get_json("http://fake/data"))
+    assert num_requests == 1
+
+
+def test_get_many_json_preserves_order():
+    def handler(request):
+        return httpx.Response(200, json={"period": request.url.params["periodo"]})
+
+    result, _ = _run_with_client(
+        handler,
+        lambda c: c.get_many_json(
+            "http://fake/data", [{"periodo": str(i)} for i in range(12)]
+        ),
+        max_concurrency=3,
+    )
+    assert [r["period"] for r in result] == [str(i) for i in range(12)]
+
+
+def test_get_many_json_raises_first_error():
+    def handler(request):
+        if request.url.params["periodo"] == "2":
+            return httpx.Response(502)
+        return httpx.Response(200, json={"period": request.url.params["periodo"]})
+
+    with pytest.raises(exceptions.ObservationDataRetrievalError):
+        _run_with_client(
+            handler,
+            lambda c: c.get_many_json(
+                "http://fake/data", [{"periodo": str(i)} for i in range(4)]
+            ),
+        )
+
+
+@pytest.mark.parametrize(
+    "attempt, retry_after, expected_max",
+    [
+        pytest.param(1, None, 2, id="backoff"),
+        pytest.param(10, None, 30, id="capped-backoff"),
+        pytest.param(1, "7", 7, id="retry-after"),
+        pytest.param(1, "120", 30, id="capped-retry-after"),
+    ],
+)
+def test_retry_policy_get_delay(attempt, retry_after, expected_max):
+    policy = httpclient.RetryPolicy(base_delay_seconds=1, max_delay_seconds=30)
+    delay = policy.get_delay(attempt, retry_after)
+    assert 0 <= delay <= expected_max
+
+
+def test_get_many_json_cache_coalesces_requests():
+    num_requests = 0
+
+    def handler(request):
+        nonlocal num_requests
+        num_requests += 1
+        return httpx.Response(200, json={"period": request.url.params["periodo"]})
+
+    async def fetch_twice(client):
+        first = await client.get_many_json(
+            "http://fake/data", [{"periodo": 1}] * 3, use_cache=True
+        )
+        second = await client.get_json(
+            "http://fake/data", params={"periodo": "1"}, use_cache=True
+        )
+        return first + [second]
+
+    result, client = _run_with_client(handler, fetch_twice)
+    assert result == [{"period": "1"}] * 4
+    assert num_requests == 1
+    assert client.num_cache_hits == 3
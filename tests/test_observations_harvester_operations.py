@@ -1,10 +1,14 @@
 import datetime as dt
+import types
 
+import anyio
 import geojson_pydantic
+import httpx
 import pyproj
 import pytest
 
 from arpav_cline.observations_harvester import arpav as arpav_operations
+from arpav_cline.observations_harvester import httpclient
 from arpav_cline.schemas import (
     observations,
     static,
@@ -46,3 +50,52 @@ def test_parse_station(raw_station, parsed):
         ).transform,
     )
     assert result == parsed
+
+
+def test_fetch_station_measurements_newer_than():
+    def handler(request):
+        return httpx.Response(
+            200,
+            json={
+                "data": [
+                    {"anno": year, "valore": float(year)} for year in (2020, 2021, 2022)
+                ]
+            },
+        )
+
+    series_configuration = types.SimpleNamespace(
+        measurement_aggregation_type=static.MeasurementAggregationType.YEARLY,
+        climatic_indicator=types.SimpleNamespace(
+            identifier="tdd-absolute-annual",
+            observation_names=[
+                types.SimpleNamespace(
+                    station_manager=static.ObservationStationManager.ARPAV,
+                    indicator_observation_name="TDd",
+                )
+            ],
+        ),
+    )
+    station = types.SimpleNamespace(
+        code="arpa_v-247", managed_by=static.ObservationStationManager.ARPAV
+    )
+
+    async def fetch():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as http_client:
+            return await arpav_operations.fetch_station_measurements(
+                httpclient.HarvesterClient(http_client, max_concurrency=1),
+                station,
+                series_configuration,
+                "http://fake",
+                newer_than=dt.date(2021, 7, 1),
+            )
+
+    result = anyio.run(fetch)
+    assert result == [
+        (
+            static.MeasurementAggregationType.YEARLY,
+            static.ObservationYearPeriod.ALL_YEAR,
+            {"anno": 2022, "valore": 2022.0},
+        )
+    ]
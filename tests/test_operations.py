@@ -2,10 +2,14 @@ import datetime as dt
 
 import pytest
 
-from arpav_cline import operations
+from arpav_cline import (
+    db,
+    operations,
+)
 from arpav_cline.schemas import static
 from arpav_cline.schemas.climaticindicators import ClimaticIndicator
 from arpav_cline.schemas.coverages import ForecastTimeWindow
+from arpav_cline.schemas.observations import ObservationStationUpdate
 
 
 @pytest.mark.parametrize(
@@ -98,3 +102,26 @@ def test_convert_conf_params_filter(
             assert result.time_window.name == expected_value
         else:
             assert getattr(result, key) == expected_value
+
+
+def test_refresh_station_climatic_indicator_database_view(
+    arpav_db_session, sample_real_station, sample_real_climatic_indicators
+):
+    climatic_indicator = sample_real_climatic_indicators[0]
+    db.update_observation_station(
+        arpav_db_session,
+        sample_real_station,
+        ObservationStationUpdate(climatic_indicators=[climatic_indicator.id]),
+    )
+    operations.create_db_schema(arpav_db_session, "stations")
+    results = [
+        operations.refresh_station_climatic_indicator_database_view(
+            arpav_db_session, climatic_indicator, db_schema_name="stations", **kwargs
+        ).action
+        for kwargs in ({}, {}, {"force": True})
+    ]
+    assert results == [
+        static.StationsViewRefreshAction.CREATED,
+        static.StationsViewRefreshAction.SKIPPED,
+        static.StationsViewRefreshAction.REFRESHED,
+    ]
@@ -0,0 +1,67 @@
+import logging
+
+import sqlalchemy
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from arpav_cline import queryprofiling
+from arpav_cline.webapp import (
+    queryprofiling as webapp_queryprofiling,
+    servertiming,
+)
+
+
+def _create_engine() -> sqlalchemy.Engine:
+    engine = sqlalchemy.create_engine("sqlite://")
+    queryprofiling.instrument_engine(engine)
+    return engine
+
+
+def test_query_profile_groups_statements():
+    engine = _create_engine()
+    with engine.connect() as connection:
+        connection.execute(sqlalchemy.text("SELECT 0"))
+        with queryprofiling.start_query_profile() as profile:
+            for value in range(3):
+                connection.execute(sqlalchemy.text("SELECT :v"), {"v": value})
+            connection.execute(sqlalchemy.text("SELECT 1"))
+    assert queryprofiling.get_current_query_profile() is None
+    assert profile.num_statements == 4
+    assert [(s.statement, s.count) for s in profile.get_statements()] == [
+        ("SELECT ?", 3),
+        ("SELECT 1", 1),
+    ]
+
+
+def test_query_profiling_middleware_warns_about_repeated_statements(caplog):
+    engine = _create_engine()
+
+    async def endpoint(request):
+        with engine.connect() as connection:
+            for value in range(3):
+                connection.execute(sqlalchemy.text("SELECT :v"), {"v": value})
+        return PlainTextResponse("done")
+
+    app = Starlette(
+        routes=[Route("/", endpoint)],
+        middleware=[
+            Middleware(servertiming.ServerTimingMiddleware, sample_rate=1),
+            Middleware(
+                webapp_queryprofiling.QueryProfilingMiddleware,
+                max_statements=2,
+                max_repeated_statements=2,
+            ),
+        ],
+    )
+    with caplog.at_level(logging.WARNING, logger=webapp_queryprofiling.__name__):
+        response = TestClient(app).get("/")
+    assert response.status_code == 200
+    assert "db_repeated;dur=" in response.headers["server-timing"]
+    assert 'desc="3 runs"' in response.headers["server-timing"]
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 2
+    assert "executed 3 DB statements" in messages[0]
+    assert "repeated the same DB statement 3 times" in messages[1]
@@ -0,0 +1,56 @@
+import pytest
+import shapely
+from geoalchemy2.shape import from_shape
+
+from arpav_cline import stationindex
+from arpav_cline.schemas import (
+    observations,
+    static,
+)
+
+
+def _build_station(id_: int, lon: float, lat: float) -> observations.ObservationStation:
+    return observations.ObservationStation(
+        id=id_,
+        code=f"station-{id_}",
+        name=f"Station {id_}",
+        managed_by=static.ObservationStationManager.ARPAV,
+        geom=from_shape(shapely.Point(lon, lat), srid=4326),
+    )
+
+
+@pytest.fixture
+def station_index() -> stationindex.ObservationStationIndex:
+    near = _build_station(1, 11.880, 45.410)
+    far = _build_station(2, 11.950, 45.410)
+    return stationindex.ObservationStationIndex.from_stations(
+        {1: [far, near], 2: [far]}
+    )
+
+
+@pytest.mark.parametrize(
+    "climatic_indicator_id, max_distance_meters, expected_id",
+    [
+        pytest.param(1, 2500, 1, id="nearest"),
+        pytest.param(1, 100, None, id="too-far"),
+        pytest.param(2, 10_000, 2, id="only-one"),
+        pytest.param(3, 10_000, None, id="no-tree"),
+    ],
+)
+def test_find_nearest(
+    station_index,
+    climatic_indicator_id,
+    max_distance_meters,
+    expected_id,
+):
+    result = station_index.find_nearest(
+        shapely.Point(11.885, 45.412),
+        climatic_indicator_id=climatic_indicator_id,
+        max_distance_meters=max_distance_meters,
+    )
+    if expected_id is None:
+        assert result is None
+    else:
+        station, distance = result
+        assert station.id == expected_id
+        assert 0 < distance <= max_distance_meters
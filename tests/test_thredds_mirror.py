@@ -0,0 +1,396 @@
+import datetime as dt
+from pathlib import Path
+
+import anyio
+import httpx
+import pytest
+
+from arpav_cline.exceptions import DatasetMirrorError
+from arpav_cline.thredds import (
+    crawler,
+    mirror,
+)
+
+_BASE_URL = "http://fake/thredds"
+
+_CATALOG_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<catalog xmlns="http://www.unidata.ucar.edu/namespaces/thredds/InvCatalog/v1.0"
+    xmlns:xlink="http://www.w3.org/1999/xlink" version="1.0.1">
+  <dataset name="clipped" ID="ensymbc/clipped">
+    <dataset name="tas_avg.nc" ID="ensymbc/clipped/tas_avg.nc"
+        urlPath="ensymbc/clipped/tas_avg.nc">
+      <dataSize units="Mbytes">12.34</dataSize>
+      <date type="modified">2024-05-01T10:00:00Z</date>
+    </dataset>
+    <dataset name="pr_avg.nc" ID="ensymbc/clipped/pr_avg.nc"
+        urlPath="ensymbc/clipped/pr_avg.nc">
+      <dataSize units="bytes">512</dataSize>
+    </dataset>
+  </dataset>
+</catalog>
+"""
+
+
+@pytest.mark.parametrize(
+    "local_size, remote_info, previous_entry, expected",
+    [
+        pytest.param(
+            None,
+            mirror.RemoteDatasetInfo(10, '"abc"', None, True),
+            None,
+            False,
+            id="missing-locally",
+        ),
+        pytest.param(
+            5,
+            mirror.RemoteDatasetInfo(10, '"abc"', None, True),
+            None,
+            False,
+            id="size-mismatch",
+        ),
+        pytest.param(
+            10,
+            mirror.RemoteDatasetInfo(10, '"abc"', None, True),
+            mirror.MirrorEntry(
+                url="fake",
+                path="fake.nc",
+                status=mirror.MirrorEntryStatus.DOWNLOADED,
+                etag='"abc"',
+            ),
+            True,
+            id="same-etag",
+        ),
+        pytest.param(
+            10,
+            mirror.RemoteDatasetInfo(10, '"def"', None, True),
+            mirror.MirrorEntry(
+                url="fake",
+                path="fake.nc",
+                status=mirror.MirrorEntryStatus.DOWNLOADED,
+                etag='"abc"',
+            ),
+            False,
+            id="different-etag",
+        ),
+        pytest.param(
+            10,
+            mirror.RemoteDatasetInfo(10, None, "Wed, 01 Jan 2200 00:00:00 GMT", True),
+            None,
+            False,
+            id="remote-newer-than-local-file",
+        ),
+        pytest.param(
+            10,
+            mirror.RemoteDatasetInfo(10, None, None, False),
+            None,
+            True,
+            id="no-validators-same-size",
+        ),
+    ],
+)
+def test_is_local_copy_current(
+    tmp_path, local_size, remote_info, previous_entry, expected
+):
+    local_path = tmp_path / "fake.nc"
+    if local_size is not None:
+        local_path.write_bytes(b"0" * local_size)
+    assert (
+        mirror.is_local_copy_current(local_path, remote_info, previous_entry)
+        == expected
+    )
+
+
+@pytest.mark.parametrize(
+    "partial_size, remote_info, expected",
+    [
+        pytest.param(None, mirror.RemoteDatasetInfo(10, None, None, True), 0),
+        pytest.param(4, mirror.RemoteDatasetInfo(10, None, None, True), 4),
+        pytest.param(4, mirror.RemoteDatasetInfo(10, None, None, False), 0),
+        pytest.param(10, mirror.RemoteDatasetInfo(10, None, None, True), 0),
+    ],
+)
+def test_get_resume_offset(tmp_path, partial_size, remote_info, expected):
+    partial_path = mirror.get_partial_download_path(tmp_path / "fake.nc")
+    if partial_size is not None:
+        partial_path.write_bytes(b"0" * partial_size)
+    assert mirror.get_resume_offset(partial_path, remote_info) == expected
+
+
+def test_get_local_dataset_path():
+    result = mirror.get_local_dataset_path(
+        "http://fake/thredds/fileServer/ensymbc/clipped/tas_avg.nc",
+        "http://fake/thredds",
+        Path("/data"),
+    )
+    assert result == Path("/data/ensymbc/clipped/tas_avg.nc")
+    with pytest.raises(DatasetMirrorError):
+        mirror.get_local_dataset_path(
+            "http://other/thredds/fileServer/tas_avg.nc",
+            "http://fake/thredds",
+            Path("/data"),
+        )
+
+
+def test_manifest_roundtrip(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest = mirror.MirrorManifest(
+        base_thredds_url="http://fake/thredds",
+        entries={
+            "tas_avg.nc": mirror.MirrorEntry(
+                url="http://fake/thredds/fileServer/tas_avg.nc",
+                path="tas_avg.nc",
+                status=mirror.MirrorEntryStatus.DOWNLOADED,
+                size_bytes=10,
+                etag='"abc"',
+                synced_at=dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc),
+            )
+        },
+        last_run=mirror.MirrorRunSummary(
+            started_at=dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        ),
+    )
+    manifest.write(manifest_path)
+    loaded = mirror.MirrorManifest.load(manifest_path)
+    assert loaded.entries == manifest.entries
+
+
+def test_parse_catalog_datasets():
+    result = crawler.parse_catalog_datasets(_CATALOG_XML, "http://fake/thredds")
+    assert result == [
+        mirror.CatalogDatasetInfo(
+            url="http://fake/thredds/fileServer/ensymbc/clipped/tas_avg.nc",
+            size_bytes=12_340_000,
+            modified="2024-05-01T10:00:00Z",
+        ),
+        mirror.CatalogDatasetInfo(
+            url="http://fake/thredds/fileServer/ensymbc/clipped/pr_avg.nc",
+            size_bytes=512,
+            modified=None,
+        ),
+    ]
+
+
+def test_compute_sync_plan(tmp_path):
+    base_url = "http://fake/thredds"
+    urls = [f"{base_url}/fileServer/{name}.nc" for name in ("a", "b", "c", "d", "e")]
+    catalog = {
+        url: mirror.CatalogDatasetInfo(url, 10, "2024-01-01T00:00:00Z")
+        for url in urls[:4]
+    }
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.nc").write_bytes(b"0" * 10)
+    previous_entries = {
+        "a.nc": mirror.MirrorEntry(
+            url=urls[0],
+            path="a.nc",
+            status=mirror.MirrorEntryStatus.DOWNLOADED,
+            catalog_size_bytes=10,
+            catalog_modified="2024-01-01T00:00:00Z",
+        ),
+        "b.nc": mirror.MirrorEntry(
+            url=urls[1],
+            path="b.nc",
+            status=mirror.MirrorEntryStatus.DOWNLOADED,
+            catalog_size_bytes=10,
+            catalog_modified="2023-01-01T00:00:00Z",
+        ),
+        "c.nc": mirror.MirrorEntry(
+            url=urls[2],
+            path="c.nc",
+            status=mirror.MirrorEntryStatus.FAILED,
+            catalog_size_bytes=10,
+            catalog_modified="2024-01-01T00:00:00Z",
+        ),
+    }
+    plan = mirror.compute_sync_plan(urls, catalog, previous_entries, base_url, tmp_path)
+    assert plan.unchanged == [urls[0]]
+    assert plan.modified == [urls[1], urls[2]]
+    assert plan.new == [urls[3]]
+    assert plan.unlisted == [urls[4]]
+
+
+def test_build_change_list():
+    previous_entries = {
+        "a.nc": mirror.MirrorEntry(
+            url="a", path="a.nc", status=mirror.MirrorEntryStatus.DOWNLOADED
+        )
+    }
+    run_entries = [
+        mirror.MirrorEntry(
+            url="b", path="b.nc", status=mirror.MirrorEntryStatus.DOWNLOADED
+        ),
+        mirror.MirrorEntry(
+            url="a", path="a.nc", status=mirror.MirrorEntryStatus.RESUMED
+        ),
+        mirror.MirrorEntry(
+            url="c", path="c.nc", status=mirror.MirrorEntryStatus.SKIPPED
+        ),
+        mirror.MirrorEntry(
+            url="d", path="d.nc", status=mirror.MirrorEntryStatus.FAILED
+        ),
+    ]
+    result = mirror.build_change_list(run_entries, previous_entries)
+    assert [(c.path, c.change_type) for c in result] == [
+        ("a.nc", mirror.DatasetChangeType.MODIFIED),
+        ("b.nc", mirror.DatasetChangeType.NEW),
+    ]
+
+
+def _mirror_individual_dataset(tmp_path, dataset_url, **kwargs):
+    async def run():
+        async with httpx.AsyncClient() as client:
+            return await mirror.mirror_individual_dataset(
+                client, dataset_url, tmp_path / "tas.nc", "tas.nc", **kwargs
+            )
+
+    return anyio.run(run)
+
+
+def test_mirror_individual_dataset_downloads_full_dataset(tmp_path, httpx_mock):
+    dataset_url = f"{_BASE_URL}/fileServer/tas.nc"
+    headers = {"content-length": "10", "etag": '"abc"', "accept-ranges": "bytes"}
+    httpx_mock.add_response(url=dataset_url, method="HEAD", headers=headers)
+    httpx_mock.add_response(
+        url=dataset_url, method="GET", headers=headers, content=b"0123456789"
+    )
+    entry = _mirror_individual_dataset(tmp_path, dataset_url)
+    assert entry.status == mirror.MirrorEntryStatus.DOWNLOADED
+    assert entry.bytes_transferred == 10
+    assert entry.etag == '"abc"'
+    assert (tmp_path / "tas.nc").read_bytes() == b"0123456789"
+    assert not mirror.get_partial_download_path(tmp_path / "tas.nc").exists()
+
+
+def test_mirror_individual_dataset_resumes_partial_download(tmp_path, httpx_mock):
+    dataset_url = f"{_BASE_URL}/fileServer/tas.nc"
+    mirror.get_partial_download_path(tmp_path / "tas.nc").write_bytes(b"0123")
+    httpx_mock.add_response(
+        url=dataset_url,
+        method="HEAD",
+        headers={"content-length": "10", "etag": '"abc"', "accept-ranges": "bytes"},
+    )
+    httpx_mock.add_response(
+        url=dataset_url,
+        method="GET",
+        match_headers={"range": "bytes=4-", "if-range": '"abc"'},
+        status_code=httpx.codes.PARTIAL_CONTENT,
+        headers={"content-range": "bytes 4-9/10"},
+        content=b"456789",
+    )
+    entry = _mirror_individual_dataset(tmp_path, dataset_url)
+    assert entry.status == mirror.MirrorEntryStatus.RESUMED
+    assert entry.bytes_transferred == 6
+    assert (tmp_path / "tas.nc").read_bytes() == b"0123456789"
+
+
+def test_mirror_individual_dataset_restarts_when_remote_changed(tmp_path, httpx_mock):
+    # the partial download is stale, so the server ignores the range request and
+    # replies with the whole dataset
+    dataset_url = f"{_BASE_URL}/fileServer/tas.nc"
+    mirror.get_partial_download_path(tmp_path / "tas.nc").write_bytes(b"old!")
+    httpx_mock.add_response(
+        url=dataset_url,
+        method="HEAD",
+        headers={"content-length": "10", "etag": '"abc"', "accept-ranges": "bytes"},
+    )
+    httpx_mock.add_response(
+        url=dataset_url,
+        method="GET",
+        match_headers={"range": "bytes=4-", "if-range": '"abc"'},
+        headers={"content-length": "10", "etag": '"def"', "accept-ranges": "bytes"},
+        content=b"abcdefghij",
+    )
+    entry = _mirror_individual_dataset(tmp_path, dataset_url)
+    assert entry.status == mirror.MirrorEntryStatus.DOWNLOADED
+    assert entry.bytes_transferred == 10
+    assert entry.etag == '"def"'
+    assert (tmp_path / "tas.nc").read_bytes() == b"abcdefghij"
+
+
+def test_mirror_individual_dataset_keeps_incomplete_download(tmp_path, httpx_mock):
+    dataset_url = f"{_BASE_URL}/fileServer/tas.nc"
+    headers = {"content-length": "10", "accept-ranges": "bytes"}
+    httpx_mock.add_response(url=dataset_url, method="HEAD", headers=headers)
+    httpx_mock.add_response(
+        url=dataset_url, method="GET", headers=headers, content=b"0123"
+    )
+    entry = _mirror_individual_dataset(tmp_path, dataset_url)
+    assert entry.status == mirror.MirrorEntryStatus.FAILED
+    assert "does not match the expected size" in entry.error
+    assert not (tmp_path / "tas.nc").exists()
+    partial_path = mirror.get_partial_download_path(tmp_path / "tas.nc")
+    assert partial_path.read_bytes() == b"0123"
+
+
+def test_mirror_datasets(tmp_path, httpx_mock):
+    dataset_urls = [f"{_BASE_URL}/fileServer/{name}.nc" for name in ("a", "b", "c")]
+    for dataset_url in dataset_urls[:2]:
+        headers = {"content-length": "3", "etag": '"abc"'}
+        httpx_mock.add_response(url=dataset_url, method="HEAD", headers=headers)
+        httpx_mock.add_response(
+            url=dataset_url, method="GET", headers=headers, content=b"abc"
+        )
+    httpx_mock.add_response(url=dataset_urls[2], method="HEAD", status_code=404)
+    manifest_path = tmp_path / "manifest.json"
+    manifest = anyio.run(
+        lambda: mirror.mirror_datasets(
+            dataset_urls,
+            base_thredds_url=_BASE_URL,
+            output_base_directory=tmp_path / "mirror",
+            manifest_path=manifest_path,
+            max_concurrency=2,
+        )
+    )
+    assert {path: e.status for path, e in manifest.entries.items()} == {
+        "a.nc": mirror.MirrorEntryStatus.DOWNLOADED,
+        "b.nc": mirror.MirrorEntryStatus.DOWNLOADED,
+        "c.nc": mirror.MirrorEntryStatus.FAILED,
+    }
+    assert manifest.last_run.num_downloaded == 2
+    assert manifest.last_run.num_failed == 1
+    assert [c.path for c in manifest.last_run.changes] == ["a.nc", "b.nc"]
+    assert (tmp_path / "mirror" / "b.nc").read_bytes() == b"abc"
+    assert mirror.MirrorManifest.load(manifest_path).entries == manifest.entries
+
+
+def test_mirror_datasets_keeps_catalog_metadata_of_previous_run(tmp_path, httpx_mock):
+    dataset_url = f"{_BASE_URL}/fileServer/a.nc"
+    headers = {"content-length": "3", "etag": '"abc"'}
+    httpx_mock.add_response(url=dataset_url, method="HEAD", headers=headers)
+    httpx_mock.add_response(
+        url=dataset_url, method="GET", headers=headers, content=b"abc"
+    )
+    manifest_path = tmp_path / "manifest.json"
+    catalog_info = mirror.CatalogDatasetInfo(dataset_url, 3, "2024-01-01T00:00:00Z")
+    mirror.MirrorManifest(
+        base_thredds_url=_BASE_URL,
+        entries={
+            "a.nc": mirror.MirrorEntry(
+                url=dataset_url,
+                path="a.nc",
+                status=mirror.MirrorEntryStatus.DOWNLOADED,
+                catalog_size_bytes=catalog_info.size_bytes,
+                catalog_modified=catalog_info.modified,
+            )
+        },
+    ).write(manifest_path)
+    manifest = anyio.run(
+        lambda: mirror.mirror_datasets(
+            [dataset_url],
+            base_thredds_url=_BASE_URL,
+            output_base_directory=tmp_path,
+            manifest_path=manifest_path,
+            force_download=True,
+        )
+    )
+    entry = manifest.entries["a.nc"]
+    assert entry.status == mirror.MirrorEntryStatus.DOWNLOADED
+    assert entry.catalog_modified == catalog_info.modified
+    plan = mirror.compute_sync_plan(
+        [dataset_url],
+        {dataset_url: catalog_info},
+        manifest.entries,
+        _BASE_URL,
+        tmp_path,
+    )
+    assert plan.unchanged == [dataset_url]
@@ -1,10 +1,23 @@
+import datetime as dt
 from contextlib import nullcontext
 
+import numpy as np
+import pandas as pd
 import pytest
+import shapely
 
-from arpav_cline import timeseries
+from arpav_cline import (
+    db,
+    stationindex,
+    timeseries,
+)
 from arpav_cline.exceptions import MannKendallInsufficientYearError
-from arpav_cline.schemas import static
+from arpav_cline.schemas import (
+    coverages,
+    dataseries,
+    observations,
+    static,
+)
 
 
 @pytest.mark.parametrize(
@@ -125,3 +138,156 @@ def test_generate_decade_series(
         "2020-01-01 00:00:00+00:00,3.828210342857143\n"
     )
     assert result[target_name].to_csv() == expected.format(variable_name=target_name)
+
+
+@pytest.mark.parametrize(
+    "temporal_range, expected_years",
+    [
+        pytest.param((None, None), list(range(1990, 2000)), id="no-range"),
+        pytest.param(
+            (dt.datetime(1995, 1, 1), None), list(range(1995, 2000)), id="start"
+        ),
+        pytest.param(
+            (dt.datetime(1992, 1, 1), dt.datetime(1994, 1, 1)),
+            [1992, 1993, 1994],
+            id="start-end",
+        ),
+    ],
+)
+def test_parse_observation_station_data(temporal_range, expected_years):
+    dates = np.array(
+        [f"{year}-01-01" for year in range(1990, 2000)], dtype="datetime64[D]"
+    )
+    values = np.arange(10, dtype=np.float64)
+    result = timeseries.parse_observation_station_data(
+        dates, values, base_name="fake", temporal_range=temporal_range
+    )
+    assert result.name == "fake"
+    assert result.index.name == "time"
+    assert list(result.index.year) == expected_years
+    assert list(result.values) == [float(y - 1990) for y in expected_years]
+
+
+@pytest.fixture()
+def sample_tas_station_index(
+    arpav_db_session,
+    sample_real_station,
+    sample_monthly_measurements,
+    sample_real_climatic_indicators,
+    monkeypatch,
+):
+    """Link the sample station to its indicator and serve it from the station index.
+
+    A yearly measurement is also added, which series of other aggregation types
+    must leave out.
+    """
+    indicator = db.get_climatic_indicator_by_identifier(
+        arpav_db_session, "tas-absolute-annual"
+    )
+    arpav_db_session.add(
+        observations.ObservationStationClimaticIndicatorLink(
+            observation_station_id=sample_real_station.id,
+            climatic_indicator_id=indicator.id,
+        )
+    )
+    arpav_db_session.add(
+        observations.ObservationMeasurement(
+            value=99,
+            date=dt.date(1990, 1, 1),
+            measurement_aggregation_type=static.MeasurementAggregationType.YEARLY,
+            climatic_indicator_id=indicator.id,
+            observation_station_id=sample_real_station.id,
+        )
+    )
+    arpav_db_session.commit()
+    index = stationindex.ObservationStationIndex.from_db(arpav_db_session)
+    monkeypatch.setattr(stationindex, "_STATION_INDEX", index)
+    return index
+
+
+def _get_expected_monthly_series(
+    measurements: list[observations.ObservationMeasurement],
+    months: tuple[int, ...],
+) -> pd.Series:
+    selected = sorted(
+        (pd.Timestamp(m.date), m.value) for m in measurements if m.date.month in months
+    )
+    return pd.Series(
+        [value for _, value in selected],
+        index=pd.DatetimeIndex([date for date, _ in selected], name="time"),
+    )
+
+
+def test_get_nearby_observation_station_time_series(
+    arpav_db_session,
+    sample_monthly_measurements,
+    sample_real_observation_series_configurations,
+    sample_tas_station_index,
+):
+    series_conf = [
+        osc
+        for osc in sample_real_observation_series_configurations
+        if osc.identifier == "tas-absolute-annual-arpa_v:arpa_fvg-monthly"
+    ][0]
+    result = timeseries.get_nearby_observation_station_time_series(
+        arpav_db_session,
+        shapely.Point(10.833, 45.372),
+        series_conf,
+        distance_threshold_meters=1000,
+        temporal_range=(None, None),
+    )
+    assert result.observation_station.code == "arpa_v-104"
+    pd.testing.assert_series_equal(
+        result.data_,
+        _get_expected_monthly_series(sample_monthly_measurements, tuple(range(1, 13))),
+        check_names=False,
+    )
+
+
+@pytest.mark.parametrize(
+    "year_period, expected_months",
+    [
+        pytest.param(static.HistoricalYearPeriod.JANUARY, (1,)),
+        pytest.param(static.HistoricalYearPeriod.JULY, (7,)),
+    ],
+)
+def test_get_historical_observation_series(
+    settings,
+    arpav_db_session,
+    sample_monthly_measurements,
+    sample_real_historical_coverage_configurations,
+    sample_tas_station_index,
+    year_period,
+    expected_months,
+):
+    coverage_configuration = [
+        c
+        for c in sample_real_historical_coverage_configurations
+        if c.climatic_indicator.identifier == "tas-absolute-annual"
+        and c.year_period_group.name == "all_months"
+    ][0]
+    result = timeseries.get_historical_observation_series(
+        settings=settings,
+        session=arpav_db_session,
+        coverage=coverages.HistoricalCoverageInternal(
+            configuration=coverage_configuration, year_period=year_period
+        ),
+        point_geom=shapely.Point(10.833, 45.372),
+        temporal_range=(None, None),
+        mann_kendall_params=None,
+        include_moving_average_series=False,
+        include_decade_aggregation_series=False,
+        include_loess_series=False,
+    )
+    assert len(result) == 1
+    series = result[0]
+    assert isinstance(series, dataseries.ObservationStationDataSeries)
+    assert (
+        series.observation_series_configuration.measurement_aggregation_type
+        == static.MeasurementAggregationType.MONTHLY
+    )
+    pd.testing.assert_series_equal(
+        series.data_,
+        _get_expected_monthly_series(sample_monthly_measurements, expected_months),
+        check_names=False,
+    )
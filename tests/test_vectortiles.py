@@ -0,0 +1,53 @@
+from arpav_cline import vectortiles
+
+
+def _render_counting(calls: list, content: bytes):
+    def render():
+        calls.append(content)
+        return content
+
+    return render
+
+
+def test_tile_cache_renders_once():
+    calls = []
+    cache = vectortiles.VectorTileCache(max_entries=2)
+    first = cache.get_or_render("a", _render_counting(calls, b"tile-a"))
+    second = cache.get_or_render("a", _render_counting(calls, b"tile-a"))
+    assert first == second
+    assert first.content == b"tile-a"
+    assert calls == [b"tile-a"]
+    assert (cache.num_hits, cache.num_misses) == (1, 1)
+
+
+def test_tile_cache_evicts_least_recently_used():
+    calls = []
+    cache = vectortiles.VectorTileCache(max_entries=2)
+    cache.get_or_render("a", _render_counting(calls, b"tile-a"))
+    cache.get_or_render("b", _render_counting(calls, b"tile-b"))
+    cache.get_or_render("a", _render_counting(calls, b"tile-a"))
+    cache.get_or_render("c", _render_counting(calls, b"tile-c"))
+    assert len(cache) == 2
+    cache.get_or_render("a", _render_counting(calls, b"tile-a"))
+    cache.get_or_render("b", _render_counting(calls, b"tile-b"))
+    assert calls == [b"tile-a", b"tile-b", b"tile-c", b"tile-b"]
+
+
+def test_tile_cache_does_not_keep_tiles_rendered_before_clear():
+    cache = vectortiles.VectorTileCache(max_entries=2)
+
+    def render():
+        cache.clear(change_marker=1)
+        return b"stale"
+
+    tile = cache.get_or_render("a", render)
+    assert tile.content == b"stale"
+    assert len(cache) == 0
+    assert cache.change_marker == 1
+
+
+def test_tile_etag_depends_on_content():
+    first = vectortiles.VectorTile.from_content(b"tile")
+    assert first.etag == vectortiles.VectorTile.from_content(b"tile").etag
+    assert first.etag != vectortiles.VectorTile.from_content(b"other").etag
+    assert first.etag.startswith('"') and first.etag.endswith('"')
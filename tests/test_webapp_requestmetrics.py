@@ -0,0 +1,139 @@
+import ipaddress
+
+import fastapi
+import prometheus_client
+import pytest
+import sqlalchemy
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import (
+    Mount,
+    Route,
+)
+
+from arpav_cline import (
+    config,
+    metrics,
+)
+from arpav_cline.webapp import requestmetrics
+from arpav_cline.webapp.routes import prometheus_metrics
+
+
+def _create_app() -> Starlette:
+    api = fastapi.FastAPI()
+
+    @api.get("/items/{item_id}")
+    def get_item(item_id: int):
+        return {"id": item_id}
+
+    app = Starlette(
+        routes=[
+            Route("/", lambda request: PlainTextResponse("hi")),
+            Route("/metrics", prometheus_metrics),
+            Mount("/api", api),
+        ]
+    )
+    app.add_middleware(requestmetrics.RequestMetricsMiddleware, routes=app.routes)
+    app.state.settings = config.ArpavPpcvSettings(
+        metrics_allowed_networks=[ipaddress.ip_network("10.0.0.0/8")]
+    )
+    return app
+
+
+def _from_client(app: Starlette, host: str):
+    async def asgi_app(scope, receive, send):
+        await app({**scope, "client": (host, 50000)}, receive, send)
+
+    return asgi_app
+
+
+def _get_count(route: str, status_code: str) -> float:
+    value = prometheus_client.REGISTRY.get_sample_value(
+        "arpav_cline_http_request_duration_seconds_count",
+        {"method": "GET", "route": route, "status_code": status_code},
+    )
+    return value or 0
+
+
+def test_request_durations_are_labelled_with_route_templates():
+    client = TestClient(_create_app())
+    before = _get_count("/api/items/{item_id}", "200")
+    before_unmatched = _get_count("unmatched", "404")
+    for item_id in range(3):
+        assert client.get(f"/api/items/{item_id}").status_code == 200
+    assert client.get("/nowhere").status_code == 404
+    assert _get_count("/api/items/{item_id}", "200") == before + 3
+    assert _get_count("unmatched", "404") == before_unmatched + 1
+
+
+def test_metrics_endpoint_reports_metrics():
+    client = TestClient(_from_client(_create_app(), "10.1.2.3"))
+    client.get("/")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/"' in response.text
+    assert "arpav_cline_thredds_request_duration_seconds" in response.text
+
+
+@pytest.mark.parametrize(
+    "host",
+    [
+        pytest.param("203.0.113.7", id="outside-network"),
+        pytest.param("testclient", id="not-an-address"),
+    ],
+)
+def test_metrics_endpoint_rejects_other_clients(host):
+    client = TestClient(_from_client(_create_app(), host))
+    assert client.get("/metrics").status_code == 403
+
+
+def test_db_pool_usage_is_tracked(tmp_path):
+    engine = sqlalchemy.create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        poolclass=sqlalchemy.pool.QueuePool,
+        pool_size=1,
+    )
+    metrics.instrument_engine_pool(engine)
+    metrics.instrument_engine_pool(engine)
+    registry = prometheus_client.REGISTRY
+
+    def get_values():
+        return (
+            registry.get_sample_value("arpav_cline_db_pool_connections_in_use"),
+            registry.get_sample_value("arpav_cline_db_pool_open_connections"),
+            registry.get_sample_value("arpav_cline_db_connect_duration_seconds_count"),
+        )
+
+    in_use, num_open, num_connects = get_values()
+    first = engine.connect()
+    second = engine.connect()
+    assert get_values() == (in_use + 2, num_open + 2, num_connects + 2)
+    first.close()
+    # the second connection overflows the pool, so it is closed when checked in
+    second.close()
+    assert get_values() == (in_use, num_open + 1, num_connects + 2)
+    engine.dispose()
+    assert get_values() == (in_use, num_open, num_connects + 2)
+
+
+def test_thredds_requests_are_tracked_by_service():
+    service = metrics.ThreddsService.WMS
+    labels = {"service": service.value}
+    registry = prometheus_client.REGISTRY
+    errors_before = (
+        registry.get_sample_value("arpav_cline_thredds_request_errors_total", labels)
+        or 0
+    )
+    with metrics.track_thredds_request(service):
+        pass
+    try:
+        with metrics.track_thredds_request(service):
+            raise RuntimeError("upstream failure")
+    except RuntimeError:
+        pass
+    assert (
+        registry.get_sample_value("arpav_cline_thredds_request_errors_total", labels)
+        == errors_before + 1
+    )
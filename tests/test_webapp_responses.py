@@ -0,0 +1,41 @@
+import gzip
+
+import pytest
+
+from arpav_cline.webapp import responses
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        pytest.param(None, False, id="missing"),
+        pytest.param("gzip, deflate, br", True, id="gzip"),
+        pytest.param("br;q=1.0, GZIP;q=0.5", True, id="gzip-with-q"),
+        pytest.param("gzip;q=0", False, id="gzip-refused"),
+        pytest.param("*", True, id="wildcard"),
+        pytest.param("identity", False, id="identity"),
+    ],
+)
+def test_accepts_encoding(accept_encoding, expected):
+    assert responses.accepts_encoding(accept_encoding, "gzip") == expected
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        pytest.param(None, False, id="missing"),
+        pytest.param('"abc"', True, id="match"),
+        pytest.param('"xyz", "abc"', True, id="one-of-many"),
+        pytest.param('"xyz"', False, id="no-match"),
+        pytest.param("*", True, id="wildcard"),
+    ],
+)
+def test_is_not_modified(if_none_match, expected):
+    assert responses.is_not_modified(if_none_match, '"abc"') == expected
+
+
+def test_pre_serialized_content():
+    first = responses.PreSerializedContent.from_content(b"{}", "application/json")
+    second = responses.PreSerializedContent.from_content(b"{}", "application/json")
+    assert gzip.decompress(first.gzipped_content) == b"{}"
+    assert first == second
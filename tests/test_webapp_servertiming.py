@@ -0,0 +1,58 @@
+import fastapi
+from fastapi.testclient import TestClient
+
+from arpav_cline import timings
+from arpav_cline.webapp import servertiming
+
+
+@timings.timed_function("lookup")
+def _lookup(value: int) -> int:
+    return value * 2
+
+
+def _create_app(sample_rate: float) -> fastapi.FastAPI:
+    router = fastapi.APIRouter(route_class=servertiming.TimedRoute)
+
+    @router.get("/double/{value}")
+    def double(value: int):
+        return {"first": _lookup(value), "second": _lookup(value)}
+
+    app = fastapi.FastAPI()
+    app.include_router(router, prefix="/api")
+    app.add_middleware(servertiming.ServerTimingMiddleware, sample_rate=sample_rate)
+    return app
+
+
+def _parse_server_timing(header: str) -> dict[str, list[str]]:
+    metrics = {}
+    for metric in header.split(","):
+        name, *params = (part.strip() for part in metric.split(";"))
+        metrics[name] = params
+    return metrics
+
+
+def test_server_timing_header_breaks_down_request():
+    client = TestClient(_create_app(sample_rate=1))
+    response = client.get("/api/double/2")
+    assert response.status_code == 200
+    assert response.json() == {"first": 4, "second": 4}
+    metrics = _parse_server_timing(response.headers["server-timing"])
+    assert set(metrics) == {"lookup", "endpoint", "encode", "total"}
+    assert 'desc="2 runs"' in metrics["lookup"]
+    assert all(params[0].startswith("dur=") for params in metrics.values())
+
+
+def test_server_timing_is_only_reported_for_sampled_requests():
+    client = TestClient(_create_app(sample_rate=0))
+    response = client.get("/api/double/2")
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+def test_timers_do_nothing_outside_of_a_timing_context():
+    assert timings.get_current_timings() is None
+    assert _lookup(3) == 6
+    with timings.start_timings() as request_timings:
+        _lookup(3)
+    assert [(e.name, e.count) for e in request_timings.get_entries()] == [("lookup", 1)]
+    assert timings.get_current_timings() is None
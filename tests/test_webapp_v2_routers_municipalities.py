@@ -0,0 +1,122 @@
+import json
+import uuid
+
+import pytest
+import shapely
+from geoalchemy2.shape import from_shape
+from starlette.requests import Request
+
+from arpav_cline import municipalityindex
+from arpav_cline.schemas import (
+    municipalities,
+    static,
+)
+from arpav_cline.webapp.api_v2.schemas.geojson.municipalities import (
+    MunicipalityFeatureCollection,
+)
+
+
+@pytest.mark.parametrize(
+    "zoom, expected",
+    [
+        pytest.param(0, static.MunicipalityGeometryResolution.LOW),
+        pytest.param(8, static.MunicipalityGeometryResolution.LOW),
+        pytest.param(9, static.MunicipalityGeometryResolution.MEDIUM),
+        pytest.param(11, static.MunicipalityGeometryResolution.MEDIUM),
+        pytest.param(12, static.MunicipalityGeometryResolution.FULL),
+        pytest.param(22, static.MunicipalityGeometryResolution.FULL),
+    ],
+)
+def test_municipality_geometry_resolution_from_zoom(zoom, expected):
+    assert static.MunicipalityGeometryResolution.from_zoom(zoom) == expected
+
+
+def test_render_geojson_features_matches_model(v2_app):
+    request = Request(
+        {
+            "type": "http",
+            "app": v2_app,
+            "router": v2_app.router,
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "root_path": "",
+            "path": "/municipalities/municipalities",
+            "query_string": b"province=PD&limit=2",
+            "headers": [],
+        }
+    )
+    geometries = {
+        'Padova "città"': shapely.MultiPolygon([shapely.box(11.0, 45.0, 11.5, 45.5)]),
+        "Abano Terme": shapely.MultiPolygon([shapely.box(11.5, 45.0, 12.0, 45.5)]),
+    }
+    db_municipalities = [
+        municipalities.Municipality(
+            id=uuid.uuid4(),
+            geom=from_shape(geom, srid=4326),
+            name=name,
+            province_name="PD",
+            region_name="Veneto",
+            centroid_epsg_4326_lon=11.25 if name.startswith("Padova") else None,
+            centroid_epsg_4326_lat=45.25,
+        )
+        for name, geom in geometries.items()
+    ]
+    features = [
+        municipalities.MunicipalityGeoJsonFeature(
+            id=m.id,
+            name=m.name,
+            province_name=m.province_name,
+            region_name=m.region_name,
+            centroid_epsg_4326_lon=m.centroid_epsg_4326_lon,
+            centroid_epsg_4326_lat=m.centroid_epsg_4326_lat,
+            geometry_geojson=shapely.to_geojson(geometries[m.name]),
+        )
+        for m in db_municipalities
+    ]
+    pagination = {"limit": 2, "offset": 0, "filtered_total": 5, "unfiltered_total": 9}
+    rendered = MunicipalityFeatureCollection.render_geojson_features(
+        features, request, **pagination
+    )
+    expected = MunicipalityFeatureCollection.from_items(
+        db_municipalities, request, **pagination
+    )
+    assert json.loads(rendered) == json.loads(expected.model_dump_json())
+
+
+def test_list_municipality_centroids_cache_ignores_unknown_parameters(
+    test_client_v2_app, monkeypatch
+):
+    index = municipalityindex.MunicipalityIndex(
+        [
+            municipalities.MunicipalityLabel(
+                id=uuid.uuid4(),
+                name=name,
+                province_name="PD",
+                region_name="Veneto",
+                centroid_epsg_4326_lon=lon,
+                centroid_epsg_4326_lat=45.25,
+            )
+            for name, lon in (("east", 11.75), ("west", 11.25))
+        ],
+        [
+            shapely.MultiPolygon([shapely.box(11.5, 45.0, 12.0, 45.5)]),
+            shapely.MultiPolygon([shapely.box(11.0, 45.0, 11.5, 45.5)]),
+        ],
+    )
+    monkeypatch.setattr(municipalityindex, "_MUNICIPALITY_INDEX", index)
+    url = test_client_v2_app.app.url_path_for("list_municipality_centroids")
+    responses = [
+        test_client_v2_app.get(url, params={"limit": 1, "province": "pd", **extra})
+        for extra in ({"cachebuster": "1"}, {"cachebuster": "2"}, {})
+    ]
+    assert len(index._cached_responses) == 1
+    for response in responses:
+        assert response.status_code == 200
+        assert "cachebuster" not in response.text
+        assert response.json() == responses[0].json()
+    first_id = responses[0].json()["features"][0]["id"]
+    assert (
+        responses[0]
+        .json()["links"]["next"]
+        .endswith(f"{url}?limit=1&after={first_id}&province=pd")
+    )
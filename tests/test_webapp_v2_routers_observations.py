@@ -24,6 +24,38 @@ def test_station_list_geojson(
     assert len(list_response.json()["features"]) == 20
 
 
+def test_station_list_keyset_pagination(
+    test_client_v2_app: httpx.Client, sample_stations: list[observations.Station]
+):
+    list_url = test_client_v2_app.app.url_path_for("list_stations")
+    seen_codes = []
+    next_url = f"{list_url}?limit=7"
+    while next_url is not None:
+        response = test_client_v2_app.get(
+            next_url, headers={"accept": "application/json"}
+        )
+        assert response.status_code == 200
+        payload = response.json()
+        seen_codes.extend(item["code"] for item in payload["items"])
+        next_url = payload["links"].get("next")
+    assert sorted(seen_codes) == sorted(s.code for s in sample_stations)
+
+
+def test_station_list_without_totals(
+    test_client_v2_app: httpx.Client, sample_stations: list[observations.Station]
+):
+    list_response = test_client_v2_app.get(
+        test_client_v2_app.app.url_path_for("list_stations"),
+        params={"include_totals": False},
+        headers={"accept": "application/json"},
+    )
+    assert list_response.status_code == 200
+    meta = list_response.json()["meta"]
+    assert meta["total_records"] is None
+    assert meta["total_filtered_records"] is None
+    assert "after=" in list_response.json()["links"]["next"]
+
+
 def test_station_detail(
     test_client_v2_app: httpx.Client,
     sample_stations: list[observations.ObservationStation],